@@ -8,6 +8,8 @@ Este módulo expone:
 - chat_blueprint: Blueprint de Flask con todos los endpoints REST
 - require_token: Decorador para proteger endpoints
 - optional_token: Decorador para autenticación opcional
+- rate_limit: Decorador de límite de tasa por cliente (429)
+- admission_control: Decorador que rechaza con 503 si la BD está saturada
 
 Uso:
     from api import db, TimeSlot, chat_blueprint, require_token
@@ -15,9 +17,32 @@ Uso:
     app.register_blueprint(chat_blueprint, url_prefix='/chat')
 """
 
-from .db import db
-from .models import TimeSlot, Appointment
-from .routes import chat_blueprint
-from .auth import require_token, optional_token
+import importlib
 
-__all__ = ['db', 'TimeSlot', 'Appointment', 'chat_blueprint', 'require_token', 'optional_token']
+# Import perezoso: `from api.models import TimeSlot` (gestor de turnos, CLI)
+# no carga las rutas ni los assets de la UI.
+_EXPORTS = {
+    'db': '.db',
+    'TimeSlot': '.models',
+    'Appointment': '.models',
+    'chat_blueprint': '.routes',
+    'require_token': '.auth',
+    'optional_token': '.auth',
+    'rate_limit': '.ratelimit',
+    'admission_control': '.ratelimit',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    'db', 'TimeSlot', 'Appointment', 'chat_blueprint', 'require_token', 'optional_token',
+    'rate_limit', 'admission_control'
+]
@@ -4,10 +4,38 @@ Módulo de autenticación para API REST.
 Proporciona decoradores para proteger endpoints con tokens de API.
 """
 from functools import wraps
+from typing import Any, Dict, Optional, Tuple
 from flask import request, jsonify
 from common import Config
 
 
+def check_token(token: Optional[str]) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Valida un token de API.
+    
+    Independiente de Flask para que también lo usen las vistas asíncronas.
+    
+    Args:
+        token: Valor del header X-API-Token (o None si no vino)
+        
+    Returns:
+        None si el token es válido, o (payload de error, status HTTP)
+    """
+    if not token:
+        return {
+            'error': 'Token de autenticación requerido',
+            'message': 'Incluya el header X-API-Token con su token de acceso'
+        }, 401
+    
+    if token != Config.API_TOKEN:
+        return {
+            'error': 'Token inválido',
+            'message': 'El token proporcionado no es válido'
+        }, 403
+    
+    return None
+
+
 def require_token(f):
     """
     Decorador que requiere un token de API válido en el header.
@@ -28,21 +56,11 @@ def require_token(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Obtener token del header
-        token = request.headers.get('X-API-Token')
-        
-        if not token:
-            return jsonify({
-                'error': 'Token de autenticación requerido',
-                'message': 'Incluya el header X-API-Token con su token de acceso'
-            }), 401
-        
-        # Validar token
-        if token != Config.API_TOKEN:
-            return jsonify({
-                'error': 'Token inválido',
-                'message': 'El token proporcionado no es válido'
-            }), 403
+        # Obtener y validar token del header
+        error = check_token(request.headers.get('X-API-Token'))
+        if error is not None:
+            payload, status = error
+            return jsonify(payload), status
         
         # Token válido, ejecutar función
         return f(*args, **kwargs)
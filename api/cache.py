@@ -0,0 +1,120 @@
+"""
+Cache de respuestas serializadas de la API.
+
+Guarda el cuerpo JSON ya serializado junto con su ETag. Cada entrada queda
+asociada a una versión (el último id del hub de disponibilidad): un cambio
+hecho en este proceso la invalida de inmediato, y el TTL acota cuánto tarda
+en verse un cambio hecho por otro proceso (socket server, worker).
+
+chat_body() guarda además los cuerpos ya serializados de POST /chat/.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, Hashable, NamedTuple, Optional
+
+from chatbot_logic.lru import LRUCache
+
+
+class CachedBody(NamedTuple):
+    """Cuerpo serializado y metadatos de una entrada de cache."""
+    body: bytes
+    etag: str
+    version: int
+    expires: float
+
+
+class ResponseCache:
+    """
+    Cache acotado de cuerpos de respuesta con versión y TTL.
+
+    Las lecturas no toman lock; las escrituras sí, para acotar el tamaño.
+
+    Attributes:
+        hits: Lecturas servidas desde el cache
+        misses: Lecturas que debieron recalcularse
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, CachedBody] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedBody]:
+        """
+        Busca una entrada vigente.
+
+        Args:
+            key: Clave de la respuesta (ej. fecha filtrada)
+            version: Versión actual de los datos
+
+        Returns:
+            CachedBody o None si no existe, expiró o es de otra versión
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version and entry.expires > time.monotonic():
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, version: int, body: bytes) -> CachedBody:
+        """
+        Guarda un cuerpo serializado.
+
+        Args:
+            key: Clave de la respuesta
+            version: Versión de los datos con que se generó
+            body: Cuerpo serializado
+
+        Returns:
+            La entrada creada
+        """
+        entry = CachedBody(
+            body=body,
+            etag=hashlib.sha256(body).hexdigest()[:16],
+            version=version,
+            expires=time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._entries.clear()
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        """Descarta todas las entradas."""
+        with self._lock:
+            self._entries.clear()
+
+    def hit_ratio(self) -> float:
+        """Proporción de lecturas servidas desde el cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+# Cuerpos {"response": ...} de POST /chat/ por texto de la respuesta. La
+# clave es el propio texto, así que no hace falta invalidarlo al recargar
+# la base de conocimiento.
+reply_bodies = LRUCache(256)
+
+
+def chat_body(reply: str) -> bytes:
+    """
+    Cuerpo JSON serializado de una respuesta del chatbot.
+
+    Args:
+        reply: Texto de la respuesta
+
+    Returns:
+        b'{"response": ...}' (igual que jsonify)
+    """
+    body = reply_bodies.get(reply)
+    if body is None:
+        body = json.dumps({'response': reply}).encode('utf-8')
+        reply_bodies.put(reply, body)
+    return body
@@ -0,0 +1,281 @@
+"""
+Métricas de la API en formato de texto de Prometheus.
+
+- Histogramas de latencia por ruta con buckets fijos
+- Contadores de requests por ruta y código de estado
+- Gauge de requests en curso
+- Collectors registrados para métricas externas (pool de la BD, caches,
+  sesiones de chat, limitador de tasa, suscriptores SSE)
+
+Registro sin locks en el camino caliente: cada hilo escribe sólo en su
+propio shard (threading.local) y /metrics suma los shards al leer. Los
+shards de hilos terminados se acumulan en uno retirado para no crecer sin
+límite con servidores que crean un hilo por request.
+
+Uso:
+    from api.metrics import init_metrics
+    init_metrics(app)   # registra el middleware y GET /metrics
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from flask import Flask, Response, g, request
+
+# Límites superiores (segundos) de los buckets de latencia
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Familia de métricas de un collector: (nombre, tipo, ayuda, [(labels, valor)])
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    """Contadores de un hilo. Sólo su hilo dueño los modifica."""
+
+    __slots__ = ('thread', 'histograms', 'statuses', 'inflight')
+
+    def __init__(self, thread: threading.Thread, n_buckets: int):
+        self.thread = thread
+        # (ruta, método) -> [conteo por bucket..., conteo +Inf, suma de segundos]
+        self.histograms: Dict[Tuple[str, str], List[float]] = {}
+        # (ruta, método, status) -> conteo
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.inflight = 0
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas HTTP por ruta.
+
+    Args:
+        buckets: Límites superiores de los buckets del histograma (segundos)
+        max_shards: Shards vivos antes de plegar los de hilos terminados
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, max_shards: int = 256):
+        self.buckets = buckets
+        self.max_shards = max_shards
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard(threading.current_thread(), len(buckets))
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = _Shard(threading.current_thread(), len(self.buckets))
+            with self._lock:
+                if len(self._shards) >= self.max_shards:
+                    self._retire_dead()
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _retire_dead(self):
+        """Suma los shards de hilos terminados al shard retirado (con lock)."""
+        alive = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                alive.append(shard)
+            else:
+                _merge(self._retired, shard)
+        self._shards = alive
+
+    def request_started(self):
+        """Marca el inicio de una request (gauge en curso)."""
+        self._shard().inflight += 1
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        """
+        Registra una request terminada.
+
+        Args:
+            route: Regla de la ruta (ej. '/chat/turnos')
+            method: Método HTTP
+            status: Código de estado de la respuesta
+            seconds: Duración de la request
+        """
+        shard = self._shard()
+        shard.inflight -= 1
+        key = (route, method)
+        hist = shard.histograms.get(key)
+        if hist is None:
+            hist = shard.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        hist[bisect_left(self.buckets, seconds)] += 1
+        hist[-1] += seconds
+        status_key = (route, method, status)
+        shard.statuses[status_key] = shard.statuses.get(status_key, 0) + 1
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """
+        Agrega una fuente de métricas evaluada en cada lectura de /metrics.
+
+        Args:
+            collector: Función que devuelve familias (nombre, tipo, ayuda, muestras)
+        """
+        self._collectors.append(collector)
+
+    def snapshot(self) -> _Shard:
+        """Suma de todos los shards (retirados y vivos)."""
+        total = _Shard(threading.current_thread(), len(self.buckets))
+        with self._lock:
+            self._retire_dead()
+            shards = [self._retired] + list(self._shards)
+        for shard in shards:
+            _merge(total, shard)
+        return total
+
+    def render(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus."""
+        total = self.snapshot()
+        lines: List[str] = []
+
+        name = 'chatbot_http_request_duration_seconds'
+        lines.append(f'# HELP {name} Latencia de requests HTTP por ruta.')
+        lines.append(f'# TYPE {name} histogram')
+        for (route, method), hist in sorted(total.histograms.items()):
+            labels = f'route="{_escape(route)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, hist):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += hist[len(self.buckets)]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {hist[-1]:.6f}')
+            lines.append(f'{name}_count{{{labels}}} {cumulative}')
+
+        name = 'chatbot_http_requests_total'
+        lines.append(f'# HELP {name} Requests HTTP por ruta y código de estado.')
+        lines.append(f'# TYPE {name} counter')
+        for (route, method, status), count in sorted(total.statuses.items()):
+            lines.append(f'{name}{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+
+        name = 'chatbot_http_requests_in_flight'
+        lines.append(f'# HELP {name} Requests HTTP en curso.')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {total.inflight}')
+
+        for collector in self._collectors:
+            for fam_name, fam_type, fam_help, samples in collector():
+                lines.append(f'# HELP {fam_name} {fam_help}')
+                lines.append(f'# TYPE {fam_name} {fam_type}')
+                for labels, value in samples:
+                    label_str = ','.join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                    lines.append(f'{fam_name}{{{label_str}}} {value}' if label_str else f'{fam_name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(into: _Shard, shard: _Shard):
+    for key, hist in list(shard.histograms.items()):
+        target = into.histograms.get(key)
+        if target is None:
+            into.histograms[key] = list(hist)
+        else:
+            for i, value in enumerate(hist):
+                target[i] += value
+    for key, count in list(shard.statuses.items()):
+        into.statuses[key] = into.statuses.get(key, 0) + count
+    into.inflight += shard.inflight
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Registro compartido por el proceso
+metrics = MetricsRegistry()
+
+
+def _default_collectors() -> Iterable[MetricFamily]:
+    """Pool de la BD, caches, base de conocimiento, sesiones, limitador de tasa y suscriptores SSE."""
+    from chatbot_logic.appointments import pool_stats
+    from chatbot_logic.booking import sessions
+    from chatbot_logic.events import availability_hub
+    from chatbot_logic.live import live_availability
+    from chatbot_logic.processor import knowledge_base_size, reload_stats, reply_cache
+    from api.ratelimit import db_admission, limiters
+    from api.routes import listing_cache
+
+    pools = pool_stats()
+    for stat in ('size', 'checked_out', 'overflow'):
+        yield (f'chatbot_db_pool_{stat}', 'gauge', f'Pool de conexiones de la BD: {stat}.',
+               [({'db': db}, values[stat]) for db, values in pools.items() if stat in values])
+
+    caches = (('turnos', listing_cache), ('chat', reply_cache))
+    yield ('chatbot_cache_hits_total', 'counter', 'Lecturas servidas desde cache.',
+           [({'cache': name}, cache.hits) for name, cache in caches])
+    yield ('chatbot_cache_misses_total', 'counter', 'Lecturas que no estaban en cache.',
+           [({'cache': name}, cache.misses) for name, cache in caches])
+    yield ('chatbot_cache_hit_ratio', 'gauge', 'Proporción de lecturas servidas desde cache.',
+           [({'cache': name}, round(cache.hit_ratio(), 4)) for name, cache in caches])
+    yield ('chatbot_reply_cache_entries', 'gauge', 'Respuestas del chatbot en cache.',
+           [({}, len(reply_cache))])
+    yield ('chatbot_kb_keywords', 'gauge', 'Palabras clave de la base de conocimiento cargada.',
+           [({}, knowledge_base_size())])
+    yield ('chatbot_kb_reloads_total', 'counter',
+           'Recargas de la base de conocimiento (error: archivo inválido, sigue la anterior).',
+           [({'result': result}, count) for result, count in reload_stats.items()])
+    yield ('chatbot_live_summary_refreshes_total', 'counter',
+           'Resúmenes de disponibilidad calculados para las respuestas con datos en vivo.',
+           [({}, live_availability.refreshes)])
+
+    session_stats = sessions.stats()
+    yield ('chatbot_sessions_active', 'gauge', 'Conversaciones de reserva en curso.',
+           [({}, session_stats['active'])])
+    yield ('chatbot_sessions_created_total', 'counter', 'Conversaciones de reserva iniciadas.',
+           [({}, session_stats['created'])])
+    yield ('chatbot_sessions_evicted_total', 'counter',
+           'Conversaciones descartadas por inactividad (ttl) o por falta de lugar (lru).',
+           [({'reason': 'ttl'}, session_stats['expired']), ({'reason': 'lru'}, session_stats['evicted'])])
+
+    yield ('chatbot_rate_limited_total', 'counter', 'Requests rechazadas con 429 por ruta.',
+           [({'route': name}, limiter.rejected) for name, limiter in sorted(limiters.items())])
+    yield ('chatbot_admission_rejected_total', 'counter', 'Requests rechazadas con 503 por BD saturada.',
+           [({}, db_admission.rejected)])
+    yield ('chatbot_sse_subscribers', 'gauge', 'Suscriptores activos de /chat/turnos/stream.',
+           [({}, availability_hub.subscriber_count())])
+
+
+def init_metrics(app: Flask, registry: MetricsRegistry = metrics):
+    """
+    Registra el middleware de tiempos y el endpoint GET /metrics.
+
+    Args:
+        app: Aplicación Flask
+        registry: Registro donde acumular las métricas
+    """
+    @app.before_request
+    def _metrics_start():
+        g._metrics_start = time.perf_counter()
+        registry.request_started()
+
+    @app.after_request
+    def _metrics_observe(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            registry.observe(rule, request.method, response.status_code, time.perf_counter() - start)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # Sólo llega acá con _metrics_start si after_request no corrió
+        # (excepción propagada): se cuenta como 500.
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            registry.observe(rule, request.method, 500, time.perf_counter() - start)
+
+    def metrics_endpoint():
+        """Métricas en formato de texto de Prometheus."""
+        return Response(registry.render(), mimetype=None, content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint, methods=['GET'])
+    if registry is metrics and _default_collectors not in registry._collectors:
+        registry.register_collector(_default_collectors)
@@ -0,0 +1,261 @@
+"""
+Limitación de tasa y control de admisión para la API.
+
+- RateLimiter: un token bucket por cliente (IP, separada según traiga o
+  no un token de API válido). El camino normal no toma locks globales: el
+  bucket se obtiene del dict y sólo se bloquea su propio lock, que casi
+  nunca tiene contención. Sólo el alta de un cliente nuevo toma el lock
+  del limitador, para no cambiar el dict mientras se descartan buckets.
+  Hay a lo sumo max_keys buckets.
+- AdmissionController: acota las requests que esperan a la base de datos
+  al tamaño del pool; cuando está lleno responde 503 de inmediato en lugar
+  de encolar la request hasta el timeout del pool.
+
+Los límites por ruta se configuran en Config.RATE_LIMITS.
+"""
+import heapq
+import math
+import threading
+import time
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import jsonify, request
+
+from common import Config
+
+
+class TokenBucket:
+    """Bucket de tokens que se recarga a `rate` tokens/s hasta `capacity`."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'lock')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, now: float) -> float:
+        """
+        Intenta consumir un token.
+
+        Args:
+            now: Tiempo actual (time.monotonic())
+
+        Returns:
+            0.0 si se consumió, o los segundos hasta que haya un token
+        """
+        with self.lock:
+            tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if tokens >= 1.0:
+                self.tokens = tokens - 1.0
+                return 0.0
+            self.tokens = tokens
+            return (1.0 - tokens) / self.rate if self.rate > 0 else 60.0
+
+
+class RateLimiter:
+    """
+    Token buckets por clave de cliente.
+
+    Al llegar a max_keys se descartan los buckets llenos (clientes
+    inactivos) y, si con eso no alcanza, los de uso más antiguo hasta
+    dejar lugar: la memoria queda acotada aunque haya muchas IPs activas.
+    Un cliente descartado vuelve con el bucket lleno.
+
+    Attributes:
+        rate: Tokens por segundo por cliente
+        burst: Capacidad del bucket (ráfaga máxima)
+        rejected: Requests rechazadas
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+        # Altas y bajas de buckets (la consulta de uno existente no lo toma)
+        self._keys_lock = threading.Lock()
+
+    def check(self, key: str) -> float:
+        """
+        Consume un token del cliente.
+
+        Args:
+            key: Identificador del cliente
+
+        Returns:
+            0.0 si la request se admite, o los segundos de Retry-After
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._keys_lock:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune()
+                # setdefault: si otro hilo ya creó el bucket se usa ése
+                bucket = self._buckets.setdefault(key, TokenBucket(self.rate, self.burst))
+        wait = bucket.acquire(time.monotonic())
+        if wait:
+            self.rejected += 1
+        return wait
+
+    def _prune(self):
+        """
+        Descarta los buckets llenos y, si hace falta, los de uso más antiguo.
+
+        Se llama con _keys_lock tomado: ningún otro hilo agrega ni quita
+        claves mientras se recorre el dict.
+        """
+        now = time.monotonic()
+        idle = [k for k, b in self._buckets.items() if b.tokens + (now - b.updated) * b.rate >= b.capacity]
+        for k in idle:
+            del self._buckets[k]
+        # Dejar un margen para no recorrer el dict en cada clave nueva
+        excess = len(self._buckets) - self.max_keys * 9 // 10
+        if excess > 0:
+            oldest = heapq.nsmallest(excess, self._buckets.items(), key=lambda kv: kv[1].updated)
+            for k, _ in oldest:
+                del self._buckets[k]
+
+    def reset(self):
+        """Vacía todos los buckets y el contador de rechazos."""
+        with self._keys_lock:
+            self._buckets.clear()
+        self.rejected = 0
+
+
+class AdmissionController:
+    """
+    Limita las requests concurrentes que usan la base de datos.
+
+    Attributes:
+        max_inflight: Máximo de requests simultáneas (0 = sin límite)
+        rejected: Requests rechazadas con 503
+    """
+
+    def __init__(self, max_inflight: int, wait: float = 0.0):
+        self.max_inflight = max_inflight
+        self.wait = wait
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_inflight) if max_inflight > 0 else None
+
+    def try_enter(self) -> bool:
+        """Reserva un lugar; False si está saturado."""
+        if self._slots is None:
+            return True
+        if self.wait > 0:
+            acquired = self._slots.acquire(timeout=self.wait)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if acquired:
+            return True
+        self.rejected += 1
+        return False
+
+    def leave(self):
+        """Libera el lugar reservado con try_enter()."""
+        if self._slots is not None:
+            self._slots.release()
+
+
+# Un limitador por ruta, creado en la primera request (ver get_limiter)
+limiters: Dict[str, RateLimiter] = {}
+
+# Control de admisión compartido por las rutas que consultan la BD
+db_admission = AdmissionController(Config.DB_MAX_INFLIGHT, Config.DB_ADMISSION_WAIT)
+
+
+def get_limiter(name: str) -> Optional[RateLimiter]:
+    """
+    Devuelve el limitador de una ruta según Config.RATE_LIMITS.
+
+    Args:
+        name: Nombre de la ruta (clave de Config.RATE_LIMITS)
+
+    Returns:
+        RateLimiter, o None si la ruta no tiene límite configurado
+    """
+    limiter = limiters.get(name)
+    if limiter is None and name in Config.RATE_LIMITS:
+        rate, burst = Config.RATE_LIMITS[name]
+        limiter = limiters.setdefault(name, RateLimiter(rate, burst))
+    return limiter
+
+
+def client_key(token: Optional[str], remote_addr: Optional[str]) -> str:
+    """
+    Clave del cliente: su IP, en un bucket aparte si trae el token válido.
+
+    Hay un único API_TOKEN compartido por todas las integraciones, así que
+    el token solo no identifica a un cliente: cada dirección tiene su propio
+    bucket. Un token inválido no abre un bucket propio, así que no sirve
+    para esquivar el límite por IP.
+    """
+    if token and token == Config.API_TOKEN:
+        return f'token:{remote_addr}'
+    return f'ip:{remote_addr}'
+
+
+def retry_after_header(seconds: float) -> Tuple[str, str]:
+    """Header Retry-After en segundos enteros (mínimo 1)."""
+    return 'Retry-After', str(max(1, math.ceil(seconds)))
+
+
+def rate_limit(name: str):
+    """
+    Decorador que aplica el límite de tasa configurado para la ruta.
+
+    Responde 429 con Retry-After cuando el cliente agota su bucket.
+
+    Uso:
+        @chat_blueprint.route('/reservar', methods=['POST'])
+        @rate_limit('reservar')
+        @require_token
+        def reservar(): ...
+
+    Args:
+        name: Clave de Config.RATE_LIMITS
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limiter = get_limiter(name) if Config.RATE_LIMIT_ENABLED else None
+            if limiter is not None:
+                wait = limiter.check(client_key(request.headers.get('X-API-Token'), request.remote_addr))
+                if wait:
+                    resp = jsonify({
+                        'error': 'Demasiadas solicitudes',
+                        'message': 'Se superó el límite de solicitudes, reintente más tarde'
+                    })
+                    resp.status_code = 429
+                    resp.headers.set(*retry_after_header(wait))
+                    return resp
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def admission_control(f):
+    """
+    Decorador que rechaza con 503 cuando la BD ya tiene el máximo de
+    requests en curso (Config.DB_MAX_INFLIGHT).
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not db_admission.try_enter():
+            resp = jsonify({
+                'error': 'Servicio saturado',
+                'message': 'El servidor está ocupado, reintente en unos segundos'
+            })
+            resp.status_code = 503
+            resp.headers.set(*retry_after_header(1))
+            return resp
+        try:
+            return f(*args, **kwargs)
+        finally:
+            db_admission.leave()
+    return decorated_function
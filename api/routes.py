@@ -3,23 +3,32 @@ Rutas del API REST para el ChatBot de turnos.
 
 Endpoints:
     POST /chat/           - Chatbot de procesamiento de lenguaje
+    POST /chat/batch-messages - Varios mensajes del chatbot en una request
     GET  /chat/turnos     - Listar turnos disponibles
+    GET  /chat/turnos/resumen - Turnos libres/reservados por día
+    GET  /chat/turnos/stream  - Cambios de disponibilidad (Server-Sent Events)
     POST /chat/reservar   - Reservar un turno (requiere autenticación)
     POST /chat/cancelar   - Cancelar una reserva (requiere autenticación)
-    GET  /chat/ui         - Interfaz web HTML
-"""
-from flask import Blueprint, request, jsonify, render_template_string
-import re
-import sys
-import os
+    POST /chat/admin/reload - Recargar la base de conocimiento (requiere autenticación)
+    GET  /chat/ui         - Interfaz web HTML (asset estático precomprimido)
 
-# Asegurar que el directorio backend esté en el path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+Los endpoints tienen límite de tasa por cliente (429) y los que consultan la
+BD pasan por control de admisión (503); ver api.ratelimit.
+"""
+from flask import Blueprint, Response, current_app, request, jsonify
+from datetime import date as date_cls, timedelta
+import json
 
-from chatbot_logic import process_message, AppointmentManager
+from chatbot_logic import process_message, process_messages, get_manager, availability_hub, booking_dialog
+from chatbot_logic.kb_watcher import reload_knowledge_base
 from api import db, Appointment
 from api.auth import require_token
-from common import setup_logging
+from api.ratelimit import admission_control, rate_limit
+from api.cache import ResponseCache, chat_body
+from api.static_assets import load_ui_assets
+from api.validation import (ValidationError, parse_batch_messages, parse_cancelacion, parse_conversation_id,
+                            parse_reserva, validate_date)
+from common import Config, setup_logging
 
 # Configurar logger
 logger = setup_logging(__name__)
@@ -27,19 +36,30 @@ logger = setup_logging(__name__)
 # Blueprint principal
 chat_blueprint = Blueprint('chat', __name__)
 
-# Servicios permitidos (validación)
-ALLOWED_SERVICES = ['Corte', 'Barba', 'Tinte', 'Peinado', 'General']
+# Rango de días por defecto y máximo para /turnos/resumen
+SUMMARY_DEFAULT_DAYS = 30
+SUMMARY_MAX_DAYS = 366
+
+# Listados serializados de /turnos, versionados por el hub de disponibilidad
+listing_cache = ResponseCache(ttl=Config.LISTING_CACHE_TTL)
+
+# Página y script de /chat/ui, comprimidos una sola vez al iniciar
+UI_PAGE, UI_SCRIPT, UI_SCRIPT_NAME = load_ui_assets()
 
 @chat_blueprint.route('/', methods=['POST'])
+@rate_limit('chat')
 def chat():
     """
     Procesa mensajes del chatbot usando procesamiento de lenguaje simple.
     
     Request Body (JSON):
         message (str): Mensaje del usuario
+        conversation_id (str, opcional): Id de la conversación; con él el bot
+            recuerda el diálogo y puede reservar (chatbot_logic.booking)
     
     Returns:
-        JSON: {'response': str} con la respuesta del bot
+        JSON: {'response': str} con la respuesta del bot (y el
+        conversation_id, si se envió)
     """
     try:
         data = request.get_json(force=True, silent=True) or {}
@@ -47,19 +67,64 @@ def chat():
         
         if not user_message:
             return jsonify({'error': 'El campo message es obligatorio'}), 400
+        try:
+            conversation_id = parse_conversation_id(data)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        logger.info("Mensaje recibido: %.50s...", user_message)
+        if conversation_id is not None:
+            response = booking_dialog.handle(conversation_id, user_message)
+            logger.info("Respuesta generada: %.50s...", response)
+            return jsonify({'response': response, 'conversation_id': conversation_id})
+        
+        # Con un día u horario ("¿tenés algo mañana a la tarde?") se
+        # responde con los turnos libres de ese rango, sin cache
+        live = booking_dialog.availability(user_message)
+        if live is not None:
+            return jsonify({'response': live})
         
-        logger.info(f"Mensaje recibido: {user_message[:50]}...")
         response = process_message(user_message)
-        logger.info(f"Respuesta generada: {response[:50]}...")
+        logger.info("Respuesta generada: %.50s...", response)
         
-        return jsonify({'response': response})
+        # Cuerpo precalculado: las respuestas frecuentes no se vuelven a serializar
+        return Response(chat_body(response), mimetype='application/json')
     
     except Exception as e:
-        logger.error(f"Error en endpoint /chat: {e}", exc_info=True)
+        logger.error("Error en endpoint /chat: %s", e, exc_info=True)
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
+
+@chat_blueprint.route('/batch-messages', methods=['POST'])
+@rate_limit('batch')
+def batch_messages():
+    """
+    Procesa un lote de mensajes del chatbot en una sola pasada.
+    
+    Request Body (JSON):
+        messages (list[str]): Mensajes del usuario (hasta CHAT_BATCH_MAX)
+    
+    Returns:
+        JSON: {'responses': list[str]} en el mismo orden que los mensajes
+    """
+    try:
+        data = request.get_json(force=True, silent=True) or {}
+        messages = parse_batch_messages(data, Config.CHAT_BATCH_MAX)
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        logger.info("Lote recibido: %d mensajes", len(messages))
+        return jsonify({'responses': process_messages(messages)})
+    
+    except Exception as e:
+        logger.error("Error en endpoint /batch-messages: %s", e, exc_info=True)
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 
 @chat_blueprint.route('/turnos', methods=['GET'])
+@rate_limit('turnos')
+@admission_control
 def turnos():
     """
     Devuelve lista de turnos disponibles.
@@ -69,46 +134,191 @@ def turnos():
     
     Returns:
         JSON: {'turnos': [lista de turnos con disponibilidad]}
+    
+    El cuerpo serializado se cachea (ver listing_cache) y se sirve con ETag:
+    un If-None-Match vigente recibe 304 sin tocar la BD. El header
+    X-Event-Id es el último evento de disponibilidad ya incluido en el
+    listado: abriendo /turnos/stream con ese last_event_id se reciben los
+    cambios posteriores sin perder ninguno.
     """
     try:
         date = request.args.get('date')
         
         # Validar formato de fecha si se proporciona
         if date:
-            if not re.match(r'^\d{4}-\d{2}-\d{2}$', date):
-                return jsonify({
-                    'error': 'Formato de fecha inválido. Use YYYY-MM-DD'
-                }), 400
+            try:
+                validate_date(date)
+            except ValidationError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        version = availability_hub.last_id
+        entry = listing_cache.get(date, version)
+        if entry is None:
+            annotated = _annotated_slots(date)
+            body = current_app.json.dumps({'turnos': annotated}).encode('utf-8')
+            entry = listing_cache.put(date, version, body)
+            logger.info("Listados %d turnos para fecha %s", len(annotated), date or 'todas')
         
-        am = AppointmentManager()
-        slots = am.list_available(date) if date else am.list_available()
+        resp = Response(entry.body, mimetype='application/json')
+        resp.set_etag(entry.etag)
+        resp.headers['Cache-Control'] = 'no-cache'
+        resp.headers['X-Event-Id'] = str(version)
+        return resp.make_conditional(request)
+        
+    except Exception as e:
+        logger.error("Error en endpoint /turnos: %s", e, exc_info=True)
+        return jsonify({'error': 'Error interno del servidor'}), 500
+
 
-        # Marcar los turnos que ya fueron reservados en la BD
-        booked = {a.slot_id: a for a in Appointment.query.all()}
-        annotated = []
+def _annotated_slots(date):
+    """Turnos disponibles, marcando los que ya fueron reservados en la BD."""
+    am = get_manager()
+    slots = am.list_available(date) if date else am.list_available()
+
+    booked = {a.slot_id: a for a in Appointment.query.all()}
+    annotated = []
+    
+    for s in slots:
+        slot_id = int(s.get('id'))
+        if slot_id in booked:
+            # Este turno está en BD (reservado)
+            a = booked[slot_id]
+            s['customer'] = a.customer
+            s['service'] = a.service or s.get('service')
+        else:
+            # Turno libre
+            s['customer'] = s.get('customer')
+        annotated.append(s)
+    return annotated
+
+
+@chat_blueprint.route('/turnos/resumen', methods=['GET'])
+@rate_limit('resumen')
+@admission_control
+def turnos_resumen():
+    """
+    Devuelve la cantidad de turnos libres y reservados por día.
+    
+    Pensado para calendarios: evita descargar todos los slots sólo para
+    contarlos.
+    
+    Query Parameters:
+        from (str, opcional): Primer día YYYY-MM-DD (default: hoy)
+        to (str, opcional): Último día YYYY-MM-DD (default: from + 29 días)
+    
+    Returns:
+        JSON: {'from': str, 'to': str, 'resumen': [{'fecha', 'libres', 'reservados', 'total'}]}
+    """
+    try:
+        try:
+            raw_from = request.args.get('from')
+            raw_to = request.args.get('to')
+            for value in (raw_from, raw_to):
+                if value:
+                    validate_date(value)
+            date_from = date_cls.fromisoformat(raw_from) if raw_from else date_cls.today()
+            date_to = (date_cls.fromisoformat(raw_to) if raw_to
+                       else date_from + timedelta(days=SUMMARY_DEFAULT_DAYS - 1))
+        except ValueError:
+            return jsonify({
+                'error': 'Formato de fecha inválido. Use YYYY-MM-DD'
+            }), 400
         
-        for s in slots:
-            slot_id = int(s.get('id'))
-            if slot_id in booked:
-                # Este turno está en BD (reservado)
-                a = booked[slot_id]
-                s['customer'] = a.customer
-                s['service'] = a.service or s.get('service')
-            else:
-                # Turno libre
-                s['customer'] = s.get('customer')
-            annotated.append(s)
+        if date_to < date_from:
+            return jsonify({'error': 'to no puede ser anterior a from'}), 400
+        
+        if (date_to - date_from).days + 1 > SUMMARY_MAX_DAYS:
+            return jsonify({
+                'error': f'El rango no puede exceder {SUMMARY_MAX_DAYS} días'
+            }), 400
         
-        logger.info(f"Listados {len(annotated)} turnos" + (f" para fecha {date}" if date else ""))
-        return jsonify({'turnos': annotated})
+        resumen = get_manager().summary_by_day(date_from.isoformat(), date_to.isoformat())
         
+        logger.info("Resumen de %s días entre %s y %s", len(resumen), date_from, date_to)
+        return jsonify({
+            'from': date_from.isoformat(),
+            'to': date_to.isoformat(),
+            'resumen': resumen,
+        })
+    
     except Exception as e:
-        logger.error(f"Error en endpoint /turnos: {e}", exc_info=True)
+        logger.error("Error en endpoint /turnos/resumen: %s", e, exc_info=True)
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 
+def _sse_event(event_id: int, event: str, data) -> str:
+    """Formatea un evento en el formato de texto de Server-Sent Events."""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@chat_blueprint.route('/turnos/stream', methods=['GET'])
+def turnos_stream():
+    """
+    Stream Server-Sent Events con los cambios de disponibilidad.
+    
+    Los eventos salen del hub en proceso (sin consultar la BD por
+    suscriptor). Cada cambio se envía como evento 'slot' con el slot y su
+    nuevo 'estado' ('libre' o 'reservado'); un evento 'reset' indica que el
+    cliente perdió eventos y debe recargar /chat/turnos. Se envían
+    comentarios de heartbeat cada SSE_HEARTBEAT_SECONDS.
+    
+    Query Parameters:
+        date (str, opcional): Fecha YYYY-MM-DD para filtrar los cambios
+        last_event_id (int, opcional): Alternativa al header Last-Event-ID
+    
+    Headers:
+        Last-Event-ID (opcional): Reanuda el stream desde ese evento
+    
+    Returns:
+        Response text/event-stream
+    """
+    date = request.args.get('date')
+    if date:
+        try:
+            validate_date(date)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    raw_last = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(raw_last) if raw_last else None
+    except ValueError:
+        last_event_id = None
+    
+    sub = availability_hub.subscribe(last_event_id)
+    heartbeat = Config.SSE_HEARTBEAT_SECONDS
+    logger.info("Stream SSE abierto (%s suscriptores)", availability_hub.subscriber_count())
+    
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            if sub.reset:
+                yield _sse_event(sub.last_id, 'reset', {})
+            else:
+                # Al reanudar, el id del cliente se mantiene hasta recibir el replay
+                yield _sse_event(last_event_id if sub.replay else sub.last_id, 'ready', {})
+            pending = iter(sub.replay)
+            while True:
+                ev = next(pending, None) or sub.get(heartbeat)
+                if ev is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if ev['event'] == 'slot' and date and not ev['data']['datetime'].startswith(date):
+                    continue
+                yield _sse_event(ev['id'], ev['event'], ev['data'])
+        finally:
+            availability_hub.unsubscribe(sub)
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+
 @chat_blueprint.route('/reservar', methods=['POST'])
+@rate_limit('reservar')
 @require_token
+@admission_control
 def reservar():
     """
     Reserva un turno específico para un cliente.
@@ -125,35 +335,15 @@ def reservar():
     """
     try:
         data = request.get_json(force=True, silent=True) or {}
-        slot_id = data.get('slot_id')
-        name = data.get('name')
-        service = data.get('service', 'General')
         
         # Validaciones
-        if not slot_id or not name:
-            return jsonify({
-                'error': 'Los campos slot_id y name son obligatorios'
-            }), 400
-
         try:
-            slot_id = int(slot_id)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'slot_id debe ser un número entero'}), 400
-        
-        if not isinstance(name, str) or len(name.strip()) == 0:
-            return jsonify({'error': 'name debe ser un string no vacío'}), 400
-        
-        if len(name) > 128:
-            return jsonify({'error': 'name no puede exceder 128 caracteres'}), 400
-        
-        if service not in ALLOWED_SERVICES:
-            return jsonify({
-                'error': f'Servicio inválido. Debe ser uno de: {", ".join(ALLOWED_SERVICES)}'
-            }), 400
+            slot_id, name, service = parse_reserva(data)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Intentar reservar
-        am = AppointmentManager()
-        ok = am.book(slot_id, name.strip(), service)
+        ok = get_manager().book(slot_id, name, service)
         
         if not ok:
             return jsonify({'ok': False, 'error': 'Turno no disponible o no existe'}), 200
@@ -162,29 +352,31 @@ def reservar():
         existing = Appointment.query.filter_by(slot_id=slot_id).first()
         if existing:
             # Actualizar existente
-            existing.customer = name.strip()
+            existing.customer = name
             existing.service = service
         else:
             # Crear nuevo
             existing = Appointment(
                 slot_id=slot_id,
-                customer=name.strip(),
+                customer=name,
                 service=service
             )
             db.session.add(existing)
         
         db.session.commit()
-        logger.info(f"✓ Reserva exitosa: slot={slot_id}, cliente={name}, servicio={service}")
+        logger.info("✓ Reserva exitosa: slot=%s, cliente=%s, servicio=%s", slot_id, name, service)
         return jsonify({'ok': True})
         
     except Exception as e:
-        logger.error(f"Error en endpoint /reservar: {e}", exc_info=True)
+        logger.error("Error en endpoint /reservar: %s", e, exc_info=True)
         db.session.rollback()
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 
 @chat_blueprint.route('/cancelar', methods=['POST'])
+@rate_limit('cancelar')
 @require_token
+@admission_control
 def cancelar():
     """
     Cancela una o más reservas.
@@ -200,98 +392,68 @@ def cancelar():
     """
     try:
         data = request.get_json(force=True, silent=True) or {}
-        am = AppointmentManager()
         
-        if 'slot_id' in data:
+        try:
+            field, value = parse_cancelacion(data)
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        am = get_manager()
+        
+        if field == 'slot_id':
             # Cancelar por ID
-            try:
-                slot_id = int(data['slot_id'])
-            except (ValueError, TypeError):
-                return jsonify({'error': 'slot_id debe ser un número entero'}), 400
-            
+            slot_id = value
             ok = am.cancel_by_slot(slot_id)
             deleted = Appointment.query.filter_by(slot_id=slot_id).delete()
             db.session.commit()
             
-            logger.info(f"Cancelación por ID: slot={slot_id}, exitosa={ok}, filas_bd={deleted}")
+            logger.info("Cancelación por ID: slot=%s, exitosa=%s, filas_bd=%s", slot_id, ok, deleted)
             return jsonify({'ok': ok, 'deleted_db_rows': deleted})
         
-        elif 'name' in data:
+        else:
             # Cancelar por nombre
-            name = data['name']
-            if not isinstance(name, str) or len(name.strip()) == 0:
-                return jsonify({'error': 'name debe ser un string no vacío'}), 400
-            
-            n = am.cancel_by_customer(name.strip())
-            deleted = Appointment.query.filter_by(customer=name.strip()).delete()
+            name = value
+            n = am.cancel_by_customer(name)
+            deleted = Appointment.query.filter_by(customer=name).delete()
             db.session.commit()
             
-            logger.info(f"Cancelación por nombre: cliente={name}, cancelados={n}, filas_bd={deleted}")
+            logger.info("Cancelación por nombre: cliente=%s, cancelados=%s, filas_bd=%s", name, n, deleted)
             return jsonify({'cancelados': n, 'deleted_db_rows': deleted})
-        
-        else:
-            return jsonify({
-                'error': 'Debe proveer slot_id o name para cancelar'
-            }), 400
     
     except Exception as e:
-        logger.error(f"Error en endpoint /cancelar: {e}", exc_info=True)
+        logger.error("Error en endpoint /cancelar: %s", e, exc_info=True)
         db.session.rollback()
         return jsonify({'error': 'Error interno del servidor'}), 500
 
 
+@chat_blueprint.route('/admin/reload', methods=['POST'])
+@rate_limit('admin')
+@require_token
+def admin_reload():
+    """
+    Vuelve a leer la base de conocimiento (Config.KNOWLEDGE_BASE_PATH).
+    
+    Requiere autenticación via header X-API-Token. La base nueva se arma
+    aparte y reemplaza a la actual de una vez; si el archivo no es válido
+    sigue la anterior.
+    
+    Returns:
+        JSON: {'ok': True, 'claves': int, 'ms': float} o
+        {'ok': False, 'error': str} con 422
+    """
+    payload, status = reload_knowledge_base()
+    return jsonify(payload), status
+
+
 @chat_blueprint.route('/ui', methods=['GET'])
 def ui():
     """Página web sencilla para listar y reservar turnos desde el navegador."""
-    html = '''
-    <!doctype html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <title>Turnos - Peluquería</title>
-        <style>body{font-family:Arial,Helvetica,sans-serif;margin:20px} table{border-collapse:collapse} td,th{border:1px solid #ddd;padding:6px}</style>
-    </head>
-    <body>
-        <h2>Turnos disponibles</h2>
-        <div>
-            Fecha (YYYY-MM-DD): <input id="date" />
-            <button onclick="load()">Filtrar</button>
-            <button onclick="load(true)">Mostrar todos</button>
-        </div>
-        <div id="list"></div>
-        <h3>Reservar</h3>
-        <div>
-            ID: <input id="slot_id" size="4" /> Nombre: <input id="name" /> Servicio: <input id="service" />
-            <button onclick="reserve()">Reservar</button>
-        </div>
-        <script>
-            async function load(all=false){
-                let date = document.getElementById('date').value;
-                let url = '/chat/turnos';
-                if(!all && date) url += '?date='+encodeURIComponent(date);
-                const res = await fetch(url);
-                const data = await res.json();
-                const turnos = data.turnos || [];
-                let html = '<table><tr><th>ID</th><th>Fecha</th><th>Servicio</th><th>Estado</th></tr>';
-                for(let t of turnos){
-                    html += `<tr><td>${t.id}</td><td>${t.datetime}</td><td>${t.service}</td><td>${t.customer?('Reservado por '+t.customer):'Libre'}</td></tr>`;
-                }
-                html += '</table>';
-                document.getElementById('list').innerHTML = html;
-            }
-            async function reserve(){
-                const slot_id = document.getElementById('slot_id').value;
-                const name = document.getElementById('name').value;
-                const service = document.getElementById('service').value;
-                const res = await fetch('/chat/reservar', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({slot_id:parseInt(slot_id), name, service})});
-                const data = await res.json();
-                alert('Resultado: '+JSON.stringify(data));
-                load();
-            }
-            // cargar al inicio
-            load();
-        </script>
-    </body>
-    </html>
-    '''
-    return render_template_string(html)
+    return UI_PAGE.response(f'public, max-age={Config.UI_CACHE_MAX_AGE}')
+
+
+@chat_blueprint.route('/ui/<filename>', methods=['GET'])
+def ui_script(filename):
+    """Script de /chat/ui, versionado por hash de contenido (cache inmutable)."""
+    if filename != UI_SCRIPT_NAME:
+        return jsonify({'error': 'Recurso no encontrado'}), 404
+    return UI_SCRIPT.response('public, max-age=31536000, immutable')
@@ -0,0 +1,53 @@
+// Turnos libres indexados por id; se actualizan con los eventos del stream
+let turnos = new Map();
+let source = null;
+function currentDate(all){
+    const date = document.getElementById('date').value;
+    return (!all && date) ? date : '';
+}
+function render(){
+    const rows = [...turnos.values()].sort((a, b) => a.datetime.localeCompare(b.datetime));
+    let html = '<table><tr><th>ID</th><th>Fecha</th><th>Servicio</th><th>Estado</th></tr>';
+    for(let t of rows){
+        html += `<tr><td>${t.id}</td><td>${t.datetime}</td><td>${t.service}</td><td>${t.customer?('Reservado por '+t.customer):'Libre'}</td></tr>`;
+    }
+    html += '</table>';
+    document.getElementById('list').innerHTML = html;
+}
+async function load(all=false){
+    const date = currentDate(all);
+    let url = '/chat/turnos';
+    if(date) url += '?date='+encodeURIComponent(date);
+    const res = await fetch(url);
+    const data = await res.json();
+    turnos = new Map((data.turnos || []).map(t => [t.id, t]));
+    render();
+    // El stream arranca desde el último evento incluido en el listado: los
+    // cambios entre el fetch y la suscripción llegan en el replay
+    subscribe(date, res.headers.get('X-Event-Id'));
+}
+function subscribe(date, lastEventId){
+    if(source) source.close();
+    const params = new URLSearchParams();
+    if(date) params.set('date', date);
+    if(lastEventId) params.set('last_event_id', lastEventId);
+    const query = params.toString();
+    source = new EventSource('/chat/turnos/stream' + (query ? '?'+query : ''));
+    source.addEventListener('slot', (e) => {
+        const slot = JSON.parse(e.data);
+        if(slot.estado === 'libre') turnos.set(slot.id, slot);
+        else turnos.delete(slot.id);
+        render();
+    });
+    source.addEventListener('reset', () => load(!date));
+}
+async function reserve(){
+    const slot_id = document.getElementById('slot_id').value;
+    const name = document.getElementById('name').value;
+    const service = document.getElementById('service').value;
+    const res = await fetch('/chat/reservar', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify({slot_id:parseInt(slot_id), name, service})});
+    const data = await res.json();
+    alert('Resultado: '+JSON.stringify(data));
+}
+// cargar al inicio; luego los cambios llegan por el stream
+load();
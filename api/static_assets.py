@@ -0,0 +1,85 @@
+"""
+Assets estáticos precompilados para la interfaz web.
+
+Los archivos se leen, se versionan por hash de contenido y se comprimen con
+gzip una sola vez al importar el módulo; cada request sólo elige la variante
+y responde 304 si el ETag del cliente coincide.
+"""
+import gzip
+import hashlib
+import os
+from typing import Optional, Tuple
+
+from flask import Response, request
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Placeholder en ui.html que se reemplaza por la URL versionada del script
+SCRIPT_URL_PLACEHOLDER = '__UI_SCRIPT_URL__'
+
+
+class StaticAsset:
+    """
+    Contenido estático en memoria con su variante gzip y ETag.
+
+    Attributes:
+        body: Contenido sin comprimir
+        gzip_body: Contenido comprimido con gzip (o None si no conviene)
+        etag: Hash del contenido (identifica la versión)
+        mimetype: Tipo MIME del contenido
+    """
+
+    def __init__(self, body: bytes, mimetype: str):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        self.gzip_body: Optional[bytes] = compressed if len(compressed) < len(body) else None
+
+    def response(self, cache_control: str) -> Response:
+        """
+        Construye la respuesta para el request actual.
+
+        Args:
+            cache_control: Valor del header Cache-Control
+
+        Returns:
+            Response con el contenido (gzip si el cliente lo acepta) o 304
+        """
+        if self.gzip_body is not None and 'gzip' in request.accept_encodings:
+            resp = Response(self.gzip_body, mimetype=self.mimetype)
+            resp.headers['Content-Encoding'] = 'gzip'
+            resp.set_etag(f'{self.etag}-gz')
+        else:
+            resp = Response(self.body, mimetype=self.mimetype)
+            resp.set_etag(self.etag)
+        if self.gzip_body is not None:
+            resp.vary.add('Accept-Encoding')
+        resp.headers['Cache-Control'] = cache_control
+        return resp.make_conditional(request)
+
+
+def load_ui_assets(url_prefix: str = '/chat/ui') -> Tuple[StaticAsset, StaticAsset, str]:
+    """
+    Carga la página y el script de /chat/ui.
+
+    El script se publica bajo un nombre con su hash (app.<hash>.js) para
+    poder cachearlo como inmutable; la página se genera una vez con esa URL.
+
+    Args:
+        url_prefix: Ruta donde se sirve la página
+
+    Returns:
+        (página, script, nombre de archivo del script)
+    """
+    with open(os.path.join(STATIC_DIR, 'ui.js'), 'rb') as f:
+        script = StaticAsset(f.read(), 'text/javascript')
+    script_name = f'app.{script.etag}.js'
+
+    with open(os.path.join(STATIC_DIR, 'ui.html'), 'rb') as f:
+        html = f.read().replace(
+            SCRIPT_URL_PLACEHOLDER.encode('ascii'),
+            f'{url_prefix}/{script_name}'.encode('ascii'),
+        )
+    page = StaticAsset(html, 'text/html')
+    return page, script, script_name
@@ -0,0 +1,147 @@
+"""
+Validación de parámetros de la API.
+
+Funciones puras compartidas por las vistas Flask (api.routes) y las vistas
+asíncronas (asgi.py), para que ambos modos respondan los mismos errores.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from common import ALLOWED_SERVICES
+
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Largo máximo de conversation_id en POST /chat/
+MAX_CONVERSATION_ID = 64
+
+
+class ValidationError(ValueError):
+    """Parámetro inválido; el mensaje se devuelve al cliente con status 400."""
+
+
+def validate_date(date: str) -> str:
+    """
+    Valida una fecha YYYY-MM-DD.
+
+    Raises:
+        ValidationError: Si el formato no es válido
+    """
+    if not DATE_RE.match(date):
+        raise ValidationError('Formato de fecha inválido. Use YYYY-MM-DD')
+    return date
+
+
+def parse_reserva(data: Dict[str, Any]) -> Tuple[int, str, str]:
+    """
+    Valida el cuerpo de /reservar.
+
+    Args:
+        data: JSON recibido
+
+    Returns:
+        (slot_id, name, service) con el nombre sin espacios extremos
+
+    Raises:
+        ValidationError: Si falta un campo o tiene un valor inválido
+    """
+    slot_id = data.get('slot_id')
+    name = data.get('name')
+    service = data.get('service', 'General')
+
+    if not slot_id or not name:
+        raise ValidationError('Los campos slot_id y name son obligatorios')
+
+    try:
+        slot_id = int(slot_id)
+    except (ValueError, TypeError):
+        raise ValidationError('slot_id debe ser un número entero')
+
+    if not isinstance(name, str) or len(name.strip()) == 0:
+        raise ValidationError('name debe ser un string no vacío')
+
+    if len(name) > 128:
+        raise ValidationError('name no puede exceder 128 caracteres')
+
+    if service not in ALLOWED_SERVICES:
+        raise ValidationError(
+            f'Servicio inválido. Debe ser uno de: {", ".join(ALLOWED_SERVICES)}'
+        )
+
+    return slot_id, name.strip(), service
+
+
+def parse_cancelacion(data: Dict[str, Any]) -> Tuple[str, Union[int, str]]:
+    """
+    Valida el cuerpo de /cancelar.
+
+    Args:
+        data: JSON recibido
+
+    Returns:
+        ('slot_id', int) o ('name', str)
+
+    Raises:
+        ValidationError: Si no hay criterio o tiene un valor inválido
+    """
+    if 'slot_id' in data:
+        try:
+            return 'slot_id', int(data['slot_id'])
+        except (ValueError, TypeError):
+            raise ValidationError('slot_id debe ser un número entero')
+
+    if 'name' in data:
+        name = data['name']
+        if not isinstance(name, str) or len(name.strip()) == 0:
+            raise ValidationError('name debe ser un string no vacío')
+        return 'name', name.strip()
+
+    raise ValidationError('Debe proveer slot_id o name para cancelar')
+
+
+def parse_batch_messages(data: Any, max_items: int) -> List[str]:
+    """
+    Valida el cuerpo de /batch-messages.
+
+    Args:
+        data: JSON recibido
+        max_items: Máximo de mensajes por request
+
+    Returns:
+        Lista de mensajes
+
+    Raises:
+        ValidationError: Si messages no es una lista de strings no vacíos
+            o supera el máximo
+    """
+    messages = data.get('messages') if isinstance(data, dict) else None
+    if not isinstance(messages, list) or not messages:
+        raise ValidationError('El campo messages debe ser una lista no vacía')
+    if len(messages) > max_items:
+        raise ValidationError(f'messages no puede tener más de {max_items} elementos')
+    if not all(isinstance(m, str) and m for m in messages):
+        raise ValidationError('Cada mensaje debe ser un string no vacío')
+    return messages
+
+
+def parse_conversation_id(data: Any) -> Optional[str]:
+    """
+    Valida el conversation_id opcional de /chat/.
+
+    Args:
+        data: JSON recibido
+
+    Returns:
+        El id, o None si no se envió
+
+    Raises:
+        ValidationError: Si no es un string no vacío de hasta MAX_CONVERSATION_ID caracteres
+    """
+    conversation_id = data.get('conversation_id') if isinstance(data, dict) else None
+    if conversation_id is None:
+        return None
+    if (not isinstance(conversation_id, str) or not conversation_id
+            or len(conversation_id) > MAX_CONVERSATION_ID):
+        raise ValidationError(
+            f'conversation_id debe ser un string de 1 a {MAX_CONVERSATION_ID} caracteres'
+        )
+    return conversation_id
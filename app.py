@@ -5,10 +5,13 @@ Este módulo crea y configura la aplicación Flask con:
 - API REST para gestión de turnos
 - Base de datos SQLAlchemy unificada
 - CORS para frontend
+- Métricas Prometheus en /metrics
 - Configuración centralizada
 """
 from flask import Flask
 from api import chat_blueprint, db
+from api.metrics import init_metrics
+from chatbot_logic.kb_watcher import start_watcher
 from common import Config, setup_logging
 
 try:
@@ -44,8 +47,15 @@ def create_app():
     db.init_app(app)
     
     # Asegurar que exista la carpeta instance y crear tablas
-    with app.app_context():
-        Config.ensure_instance_dir()
+    Config.ensure_instance_dir()
+    if Config.DB_AUTO_CREATE:
+        with app.app_context():
+            db.create_all()
+            logger.info("Base de datos inicializada")
+    
+    @app.cli.command('init-db')
+    def init_db():
+        """Crea las tablas de la base de datos."""
         db.create_all()
         logger.info("Base de datos inicializada")
 
@@ -53,6 +63,14 @@ def create_app():
     app.register_blueprint(chat_blueprint, url_prefix='/chat')
     logger.info("API REST registrada en /chat")
     
+    # Recargar la base de conocimiento cuando cambie su archivo
+    start_watcher()
+    
+    # Métricas por ruta y endpoint /metrics (Prometheus)
+    if Config.METRICS_ENABLED:
+        init_metrics(app)
+        logger.info("Métricas expuestas en /metrics")
+    
     return app
 
 
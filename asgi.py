@@ -0,0 +1,349 @@
+"""
+Aplicación ASGI (modo asíncrono) para ChatBot de turnos.
+
+Sirve los endpoints principales del blueprint `chat` como corutinas sobre
+AsyncAppointmentManager, con las mismas URLs y payloads que la API Flask:
+
+    POST /chat/           - Chatbot de procesamiento de lenguaje
+    POST /chat/batch-messages - Varios mensajes del chatbot en una request
+    GET  /chat/turnos     - Listar turnos disponibles
+    POST /chat/reservar   - Reservar un turno (requiere autenticación)
+    POST /chat/cancelar   - Cancelar una reserva (requiere autenticación)
+    POST /chat/admin/reload - Recargar la base de conocimiento (requiere autenticación)
+
+Mientras una request espera a la base de datos el event loop atiende otras,
+así que un proceso sostiene muchas más conexiones concurrentes que el modo
+de un hilo por request. El resto de los endpoints (ui, resumen, stream)
+sigue en la aplicación Flask (app.py).
+
+Uso:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    python asgi.py
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from sqlalchemy import delete, select
+
+from api.auth import check_token
+from api.cache import ResponseCache, chat_body
+from api.ratelimit import client_key, get_limiter, retry_after_header
+from api.models import Appointment
+from api.validation import (ValidationError, parse_batch_messages, parse_cancelacion, parse_conversation_id,
+                            parse_reserva, validate_date)
+from chatbot_logic import availability_hub, process_message, process_messages
+from chatbot_logic.async_appointments import AsyncAppointmentManager
+from chatbot_logic.booking import BookingDialog, sessions
+from chatbot_logic.dates import extract_when
+from chatbot_logic.kb_watcher import reload_knowledge_base, start_watcher
+from common import Config, setup_logging
+from services import ReservationService
+
+# Configurar logging
+logger = setup_logging(__name__)
+
+# (status, payload JSON, headers extra)
+Result = Tuple[int, Any, List[Tuple[bytes, bytes]]]
+
+
+class Request:
+    """Request HTTP mínima construida desde el scope ASGI."""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes):
+        self.method: str = scope['method']
+        self.path: str = scope['path']
+        self.args = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+        self.body = body
+
+    def get_json(self) -> Dict[str, Any]:
+        """Equivalente a request.get_json(force=True, silent=True) or {}."""
+        try:
+            data = json.loads(self.body) if self.body else None
+        except ValueError:
+            data = None
+        return data or {}
+
+
+class ChatASGIApp:
+    """
+    Aplicación ASGI con las vistas asíncronas del chat.
+
+    Args:
+        db_uri: URI de la base de datos (None = SQLite por defecto)
+        prefix: Prefijo de las rutas (igual que el url_prefix del blueprint)
+    """
+
+    def __init__(self, db_uri: Optional[str] = None, prefix: str = '/chat'):
+        self.am = AsyncAppointmentManager(db_uri)
+        # El diálogo de reserva es síncrono (ReservationService): corre en un hilo
+        self.booking = BookingDialog(sessions, ReservationService(db_uri), Config.BOOKING_OFFER_SLOTS)
+        self.listing_cache = ResponseCache(ttl=Config.LISTING_CACHE_TTL)
+        self._ready = False
+        self._init_lock = asyncio.Lock()
+        self._inflight = 0
+        # (método, ruta) -> (nombre en Config.RATE_LIMITS, vista, usa la BD)
+        self.routes: Dict[Tuple[str, str], Tuple[str, Callable[[Request], Awaitable[Result]], bool]] = {
+            ('POST', f'{prefix}/'): ('chat', self.chat, False),
+            ('POST', f'{prefix}/batch-messages'): ('batch', self.batch_messages, False),
+            ('GET', f'{prefix}/turnos'): ('turnos', self.turnos, True),
+            ('POST', f'{prefix}/reservar'): ('reservar', self.reservar, True),
+            ('POST', f'{prefix}/cancelar'): ('cancelar', self.cancelar, True),
+            ('POST', f'{prefix}/admin/reload'): ('admin', self.admin_reload, False),
+        }
+        self._paths = {path for _, path in self.routes}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        more = True
+        while more:
+            message = await receive()
+            body += message.get('body', b'')
+            more = message.get('more_body', False)
+        request = Request(scope, body)
+
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            status = 405 if request.path in self._paths else 404
+            await _send_json(send, status, {'error': 'Recurso no encontrado' if status == 404 else 'Método no permitido'})
+            return
+        name, handler, uses_db = route
+
+        # Límite de tasa por cliente (ver api.ratelimit)
+        limiter = get_limiter(name) if Config.RATE_LIMIT_ENABLED else None
+        if limiter is not None:
+            client = scope.get('client') or (None, None)
+            wait = limiter.check(client_key(request.headers.get('x-api-token'), client[0]))
+            if wait:
+                header = retry_after_header(wait)
+                await _send_json(send, 429, {
+                    'error': 'Demasiadas solicitudes',
+                    'message': 'Se superó el límite de solicitudes, reintente más tarde'
+                }, [(header[0].lower().encode('ascii'), header[1].encode('ascii'))])
+                return
+
+        # Control de admisión: el event loop es de un solo hilo, basta un contador
+        if uses_db and 0 < Config.DB_MAX_INFLIGHT <= self._inflight:
+            await _send_json(send, 503, {
+                'error': 'Servicio saturado',
+                'message': 'El servidor está ocupado, reintente en unos segundos'
+            }, [(b'retry-after', b'1')])
+            return
+
+        self._inflight += uses_db
+        try:
+            await self._ensure_ready()
+            status, payload, headers = await handler(request)
+        except Exception as e:
+            logger.error("Error en endpoint %s: %s", request.path, e, exc_info=True)
+            status, payload, headers = 500, {'error': 'Error interno del servidor'}, []
+        finally:
+            self._inflight -= uses_db
+        await _send_json(send, status, payload, headers)
+
+    async def _ensure_ready(self):
+        if self._ready:
+            return
+        async with self._init_lock:
+            if not self._ready:
+                await self.am.init()
+                self._ready = True
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self._ensure_ready()
+                start_watcher()
+                logger.info("API ASGI lista")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.am.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def chat(self, request: Request) -> Result:
+        """POST /chat/ - ver api.routes.chat."""
+        data = request.get_json()
+        user_message = data.get('message', '')
+        if not user_message:
+            return 400, {'error': 'El campo message es obligatorio'}, []
+        try:
+            conversation_id = parse_conversation_id(data)
+        except ValidationError as e:
+            return 400, {'error': str(e)}, []
+
+        logger.info("Mensaje recibido: %.50s...", user_message)
+        if conversation_id is not None:
+            response = await asyncio.to_thread(self.booking.handle, conversation_id, user_message)
+            return 200, {'response': response, 'conversation_id': conversation_id}, []
+        if extract_when(user_message) is not None:
+            live = await asyncio.to_thread(self.booking.availability, user_message)
+            if live is not None:
+                return 200, {'response': live}, []
+        # Fuera del event loop: la respuesta puede consultar la disponibilidad
+        # en la base (ver chatbot_logic.live) y el primer mensaje carga el
+        # clasificador
+        response = await asyncio.to_thread(process_message, user_message)
+        return 200, chat_body(response), []
+
+    async def batch_messages(self, request: Request) -> Result:
+        """POST /chat/batch-messages - ver api.routes.batch_messages."""
+        try:
+            messages = parse_batch_messages(request.get_json(), Config.CHAT_BATCH_MAX)
+        except ValidationError as e:
+            return 400, {'error': str(e)}, []
+
+        logger.info("Lote recibido: %d mensajes", len(messages))
+        return 200, {'responses': await asyncio.to_thread(process_messages, messages)}, []
+
+    async def turnos(self, request: Request) -> Result:
+        """GET /chat/turnos - ver api.routes.turnos."""
+        date = request.args.get('date')
+        if date:
+            try:
+                validate_date(date)
+            except ValidationError as e:
+                return 400, {'error': str(e)}, []
+
+        version = availability_hub.last_id
+        entry = self.listing_cache.get(date, version)
+        if entry is None:
+            slots = await self.am.list_available(date)
+            async with self.am.Session() as session:
+                booked = {a.slot_id: a for a in (await session.scalars(select(Appointment))).all()}
+            for s in slots:
+                a = booked.get(s['id'])
+                if a is not None:
+                    s['customer'] = a.customer
+                    s['service'] = a.service or s.get('service')
+            body = json.dumps({'turnos': slots}).encode('utf-8')
+            entry = self.listing_cache.put(date, version, body)
+            logger.info("Listados %d turnos para fecha %s", len(slots), date or 'todas')
+
+        etag = f'"{entry.etag}"'
+        headers = [(b'etag', etag.encode('ascii')), (b'cache-control', b'no-cache'),
+                   (b'x-event-id', str(version).encode('ascii'))]
+        if etag in request.headers.get('if-none-match', ''):
+            return 304, None, headers
+        return 200, entry.body, headers
+
+    async def reservar(self, request: Request) -> Result:
+        """POST /chat/reservar - ver api.routes.reservar."""
+        error = check_token(request.headers.get('x-api-token'))
+        if error is not None:
+            payload, status = error
+            return status, payload, []
+
+        try:
+            slot_id, name, service = parse_reserva(request.get_json())
+        except ValidationError as e:
+            return 400, {'error': str(e)}, []
+
+        if not await self.am.book(slot_id, name, service):
+            return 200, {'ok': False, 'error': 'Turno no disponible o no existe'}, []
+
+        async with self.am.Session() as session:
+            existing = await session.scalar(select(Appointment).where(Appointment.slot_id == slot_id))
+            if existing:
+                existing.customer = name
+                existing.service = service
+            else:
+                session.add(Appointment(slot_id=slot_id, customer=name, service=service))
+            await session.commit()
+
+        logger.info("✓ Reserva exitosa: slot=%s, cliente=%s, servicio=%s", slot_id, name, service)
+        return 200, {'ok': True}, []
+
+    async def cancelar(self, request: Request) -> Result:
+        """POST /chat/cancelar - ver api.routes.cancelar."""
+        error = check_token(request.headers.get('x-api-token'))
+        if error is not None:
+            payload, status = error
+            return status, payload, []
+
+        try:
+            field, value = parse_cancelacion(request.get_json())
+        except ValidationError as e:
+            return 400, {'error': str(e)}, []
+
+        if field == 'slot_id':
+            ok = await self.am.cancel_by_slot(value)
+            criteria = Appointment.slot_id == value
+        else:
+            n = await self.am.cancel_by_customer(value)
+            criteria = Appointment.customer == value
+
+        async with self.am.Session() as session:
+            deleted = (await session.execute(delete(Appointment).where(criteria))).rowcount
+            await session.commit()
+
+        if field == 'slot_id':
+            logger.info("Cancelación por ID: slot=%s, exitosa=%s, filas_bd=%s", value, ok, deleted)
+            return 200, {'ok': ok, 'deleted_db_rows': deleted}, []
+        logger.info("Cancelación por nombre: cliente=%s, cancelados=%s, filas_bd=%s", value, n, deleted)
+        return 200, {'cancelados': n, 'deleted_db_rows': deleted}, []
+
+    async def admin_reload(self, request: Request) -> Result:
+        """POST /chat/admin/reload - ver api.routes.admin_reload."""
+        error = check_token(request.headers.get('x-api-token'))
+        if error is not None:
+            payload, status = error
+            return status, payload, []
+
+        payload, status = await asyncio.to_thread(reload_knowledge_base)
+        return status, payload, []
+
+
+async def _send_json(send, status: int, payload: Any, headers: Optional[List[Tuple[bytes, bytes]]] = None):
+    """Envía una respuesta JSON (payload ya serializado si es bytes)."""
+    if payload is None:
+        body = b''
+    elif isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *(headers or []),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def create_asgi_app(db_uri: Optional[str] = None) -> ChatASGIApp:
+    """
+    Factory de la aplicación ASGI.
+
+    Args:
+        db_uri: URI de la base de datos (None = SQLite por defecto)
+
+    Returns:
+        ChatASGIApp lista para un servidor ASGI
+    """
+    return ChatASGIApp(db_uri)
+
+
+app = create_asgi_app()
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("El modo ASGI requiere uvicorn: pip install uvicorn aiosqlite")
+
+    logger.info(f"Iniciando API ASGI en {Config.FLASK_HOST}:{Config.FLASK_PORT}")
+    uvicorn.run(app, host=Config.FLASK_HOST, port=Config.FLASK_PORT, log_level=Config.LOG_LEVEL.lower())
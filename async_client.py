@@ -1,26 +1,59 @@
 """Cliente asyncio de ejemplo que abre múltiples conexiones concurrentes al servidor TCP.
 
-Usar para probar concurrencia y asincronía de I/O.
+Usar para probar concurrencia y asincronía de I/O. Pide la versión 2 del
+protocolo (PROTO 2): cada respuesta termina con una línea END y se lee
+exactamente una, sin esperar un timeout. Con un servidor que no la conoce
+lee hasta que dejan de llegar líneas por medio segundo.
 """
 import asyncio
 
+RESPONSE_END = b"END\n"
+
+
+async def read_response(reader: asyncio.StreamReader) -> list:
+    """Líneas de una respuesta de la versión 2 (sin la línea END)."""
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line or line == RESPONSE_END:
+            return lines
+        lines.append(line)
+
+
+async def read_until_quiet(reader: asyncio.StreamReader, timeout: float = 0.5) -> list:
+    """Líneas que llegan hasta `timeout` segundos de silencio (servidores sin PROTO 2)."""
+    lines = []
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=timeout)
+            if not line:
+                break
+            lines.append(line)
+    except asyncio.TimeoutError:
+        pass
+    return lines
+
+
+async def negotiate(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+    """Pide la versión 2 del protocolo; False si el servidor no la conoce."""
+    writer.write(b'PROTO 2\n')
+    await writer.drain()
+    if await reader.readline() != b'PROTO 2\n':
+        return False
+    return await read_response(reader) == []
+
 
 async def talk(host: str, port: int, message: str):
     reader, writer = await asyncio.open_connection(host, port)
     # recibir bienvenida
     data = await reader.readuntil(b"\n")
     print('Servidor:', data.decode().strip())
+    framed = await negotiate(reader, writer)
     writer.write((message + '\n').encode('utf-8'))
     await writer.drain()
-    # leer respuestas hasta timeout corto
-    try:
-        while True:
-            line = await asyncio.wait_for(reader.readline(), timeout=0.5)
-            if not line:
-                break
-            print('Respuesta:', line.decode().strip())
-    except asyncio.TimeoutError:
-        pass
+    lines = await read_response(reader) if framed else await read_until_quiet(reader)
+    for line in lines:
+        print('Respuesta:', line.decode().strip())
     writer.write(b'QUIT\n')
     await writer.drain()
     writer.close()
@@ -0,0 +1,7 @@
+"""
+Benchmarks de rendimiento del ChatBot de turnos.
+
+Cada módulo se ejecuta desde la raíz del proyecto:
+
+    python -m benchmarks.<nombre> --help
+"""
@@ -0,0 +1,147 @@
+"""
+Capacidad de conexiones concurrentes: API Flask (un hilo por conexión)
+contra la API ASGI (asgi.py, corutinas sobre un driver asíncrono).
+
+Levanta cada servidor en un subproceso, abre N conexiones keep-alive que
+piden GET /chat/turnos en loop durante unos segundos y reporta requests/s,
+latencias, errores, hilos y memoria del proceso servidor.
+
+El cache del listado se desactiva (LISTING_CACHE_TTL=0) para que cada
+request espere a la base de datos.
+
+Uso:
+    python -m benchmarks.bench_async_vs_threaded --concurrency 10 100 500 --duration 5
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'threaded': [
+        sys.executable, '-c',
+        'import sys; from app import create_app; '
+        'create_app().run(host="127.0.0.1", port=int(sys.argv[1]), threaded=True, debug=False)',
+    ],
+    'asgi': [
+        sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1',
+        '--log-level', 'warning', '--port',
+    ],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, LISTING_CACHE_TTL='0', LOG_LEVEL='WARNING', FLASK_DEBUG='False')
+    proc = subprocess.Popen(SERVERS[mode] + [str(port)], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'El servidor {mode} no respondió en el puerto {port}')
+
+
+def proc_stats(pid: int) -> Dict[str, int]:
+    """Hilos y memoria residente (KB) del proceso, leídos de /proc (Linux)."""
+    stats = {'threads': 0, 'rss_kb': 0}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('Threads:'):
+                    stats['threads'] = int(line.split()[1])
+                elif line.startswith('VmRSS:'):
+                    stats['rss_kb'] = int(line.split()[1])
+    except OSError:
+        pass
+    return stats
+
+
+async def client(port: int, stop_at: float, latencies: List[float], errors: List[int]):
+    request = (f'GET /chat/turnos HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n'
+               'Connection: keep-alive\r\n\r\n').encode('ascii')
+    writer: Optional[asyncio.StreamWriter] = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), 10)
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 10)
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b'connection: close' in head.lower():
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        errors.append(1)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_load(port: int, pid: int, concurrency: int, duration: float) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors: List[int] = []
+    stop_at = time.monotonic() + duration
+    tasks = [asyncio.create_task(client(port, stop_at, latencies, errors)) for _ in range(concurrency)]
+    peak = {'threads': 0, 'rss_kb': 0}
+    while not all(t.done() for t in tasks):
+        await asyncio.sleep(0.25)
+        current = proc_stats(pid)
+        peak = {k: max(peak[k], current[k]) for k in peak}
+    await asyncio.gather(*tasks)
+    latencies.sort()
+    return {
+        'rps': len(latencies) / duration,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        'errors': len(errors),
+        'threads': peak['threads'],
+        'rss_mb': peak['rss_kb'] / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--modes', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+
+    print(f"{'modo':<10}{'conex':>7}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'errores':>9}{'hilos':>7}{'RSS MB':>8}")
+    for mode in args.modes:
+        for concurrency in args.concurrency:
+            port = free_port()
+            proc = start_server(mode, port)
+            try:
+                r = asyncio.run(run_load(port, proc.pid, concurrency, args.duration))
+            finally:
+                proc.terminate()
+                proc.wait(timeout=10)
+            print(f"{mode:<10}{concurrency:>7}{r['rps']:>10.0f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+                  f"{r['errors']:>9}{r['threads']:>7}{r['rss_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Throughput de process_messages (lote) contra process_message (de a uno).
+
+Simula las ráfagas del gateway: mensajes del corpus de
+benchmarks.bench_normalize con variaciones (nombres, números de turno) para
+que no todos salgan del cache de respuestas. Antes de cada corrida se vacía
+el cache; con --warm se mide con el cache ya cargado.
+
+Con --http se mide además contra un servidor local: POST /chat/ por
+mensaje (ChatClient.chat) contra POST /chat/batch-messages
+(ChatClient.chat_many).
+
+Uso:
+    python -m benchmarks.bench_batch --batch-sizes 1 10 100 1000
+    python -m benchmarks.bench_batch --http asgi --messages 5000
+"""
+import argparse
+import os
+import random
+import time
+from typing import List
+
+from benchmarks.bench_async_vs_threaded import free_port, start_server
+from benchmarks.bench_normalize import CORPUS
+from chatbot_client import ChatClient
+from chatbot_logic.processor import process_message, process_messages, reply_cache
+
+NAMES = ['Ana', 'Juan', 'Sofi', 'Martín', 'Lucía', 'Pedro', 'Caro', 'Nico', 'Vale', 'Tomás',
+         'Julieta', 'Bruno', 'Mica', 'Facu', 'Agus', 'Flor']
+
+
+def burst(count: int, rng: random.Random) -> List[str]:
+    messages = []
+    for _ in range(count):
+        text = rng.choice(CORPUS)
+        if rng.random() < 0.7:
+            text = f'{text} soy {rng.choice(NAMES)} {rng.choice(NAMES)}'
+        messages.append(text)
+    return messages
+
+
+def rate(fn, messages: List[str], batch_size: int, warm: bool) -> float:
+    """Mensajes por segundo de fn(messages, batch_size)."""
+    if not warm:
+        reply_cache.clear()
+    start = time.perf_counter()
+    fn(messages, batch_size)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def one_by_one(messages: List[str], _batch_size: int) -> None:
+    for m in messages:
+        process_message(m)
+
+
+def batched(messages: List[str], batch_size: int) -> None:
+    for i in range(0, len(messages), batch_size):
+        process_messages(messages[i:i + batch_size])
+
+
+def bench_http(server: str, messages: List[str], batch_sizes: List[int]) -> None:
+    # Sin límite de tasa: se mide el procesamiento, no el 429
+    os.environ['RATE_LIMIT_ENABLED'] = 'False'
+    port = free_port()
+    proc = start_server(server, port)
+    try:
+        with ChatClient(f'http://127.0.0.1:{port}') as client:
+            start = time.perf_counter()
+            for m in messages:
+                client.chat(m)
+            single = len(messages) / (time.perf_counter() - start)
+            print(f"HTTP ({server})")
+            print(f"{'lote':>8}{'msg/s':>10}{'vs de a uno':>13}")
+            print(f"{'de a uno':>8}{single:>10.0f}{1.0:>12.2f}x")
+            for size in batch_sizes:
+                start = time.perf_counter()
+                for i in range(0, len(messages), size):
+                    client.chat_batch(messages[i:i + size])
+                batch = len(messages) / (time.perf_counter() - start)
+                print(f"{size:>8}{batch:>10.0f}{batch / single:>12.2f}x")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--messages', type=int, default=20000)
+    parser.add_argument('--warm', action='store_true', help='medir con el cache de respuestas cargado')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--http', choices=['asgi', 'threaded'], help='medir también por HTTP')
+    args = parser.parse_args()
+
+    messages = burst(args.messages, random.Random(args.seed))
+    process_messages(messages[:10])  # carga el modelo de intenciones fuera de la medición
+    print(f"{len(set(messages))} mensajes distintos de {len(messages)}; cache {'caliente' if args.warm else 'vacío'}")
+    single = rate(one_by_one, messages, 1, args.warm)
+    print(f"{'lote':>8}{'msg/s':>10}{'vs de a uno':>13}")
+    print(f"{'de a uno':>8}{single:>10.0f}{1.0:>12.2f}x")
+    for size in args.batch_sizes:
+        batch = rate(batched, messages, size, args.warm)
+        print(f"{size:>8}{batch:>10.0f}{batch / single:>12.2f}x")
+
+    if args.http:
+        bench_http(args.http, messages, args.batch_sizes)
+
+
+if __name__ == '__main__':
+    main()
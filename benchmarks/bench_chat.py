@@ -0,0 +1,201 @@
+"""
+Throughput, latencia y exactitud del procesador de mensajes, con línea base.
+
+Corre el corpus etiquetado de benchmarks.chat_corpus (miles de mensajes con
+tildes, errores de tipeo e intenciones mezcladas) por el procesador y mide:
+
+- exactitud de intención (analyze_message) en total y por intención
+- latencia por mensaje sin cache (p50/p99) y mensajes por segundo
+- mensajes por segundo de process_message con el cache de respuestas
+  (vacío al empezar) y de process_messages en lotes
+
+y compara con la línea base guardada (benchmarks/baseline_chat.json): si la
+exactitud baja más de --accuracy-tolerance o el throughput/latencia
+empeoran más de --speed-tolerance, termina con código 1. La velocidad
+depende de la máquina; --accuracy-only compara sólo la exactitud.
+
+Uso:
+    python -m benchmarks.bench_chat
+    python -m benchmarks.bench_chat --accuracy-only
+    python -m benchmarks.bench_chat --update-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.chat_corpus import build_corpus, corpus_fingerprint
+from chatbot_logic.live import live_availability
+from chatbot_logic.processor import (_get_classifier, analyze_message, process_message, process_messages,
+                                     reply_cache)
+from common import Config
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_chat.json')
+# Métricas de velocidad y si "más es mejor"
+SPEED_METRICS = {
+    'analyze_msgs_per_sec': True,
+    'p50_us': False,
+    'p99_us': False,
+    'cached_msgs_per_sec': True,
+    'batch_msgs_per_sec': True,
+}
+BATCH_SIZE = 100
+
+
+def setup() -> Dict[str, Any]:
+    """Configuración que cambia los resultados (se guarda con la línea base)."""
+    # Las plantillas con datos en vivo se completan sobre una base en memoria
+    from services import ReservationService
+    live_availability.service = ReservationService('sqlite:///:memory:')
+    live_availability.invalidate()
+    return {
+        'classifier': _get_classifier() is not None,
+        'intent_threshold': Config.INTENT_THRESHOLD,
+        'fuzzy_max_distance': Config.FUZZY_MAX_DISTANCE,
+    }
+
+
+def accuracy(corpus: List[Tuple[str, Optional[str]]]) -> Tuple[float, Dict[str, float], Counter]:
+    """Exactitud total, por intención y confusiones (esperada, detectada)."""
+    hits: Counter = Counter()
+    totals: Counter = Counter()
+    confusions: Counter = Counter()
+    for message, expected in corpus:
+        intent = analyze_message(message)[0]
+        totals[expected] += 1
+        if intent == expected:
+            hits[expected] += 1
+        else:
+            confusions[(expected, intent)] += 1
+    per_intent = {str(label): hits[label] / totals[label] for label in totals}
+    return sum(hits.values()) / len(corpus), per_intent, confusions
+
+
+def speed(messages: List[str]) -> Dict[str, float]:
+    """Una corrida de las métricas de velocidad."""
+    samples = []
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for message in messages:
+        t = perf_counter()
+        analyze_message(message)
+        samples.append(perf_counter() - t)
+    analyze_elapsed = perf_counter() - start
+    samples.sort()
+
+    reply_cache.clear()
+    start = perf_counter()
+    for message in messages:
+        process_message(message)
+    cached_elapsed = perf_counter() - start
+
+    reply_cache.clear()
+    start = perf_counter()
+    for i in range(0, len(messages), BATCH_SIZE):
+        process_messages(messages[i:i + BATCH_SIZE])
+    batch_elapsed = perf_counter() - start
+
+    return {
+        'analyze_msgs_per_sec': len(messages) / analyze_elapsed,
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p99_us': samples[int(len(samples) * 0.99)] * 1e6,
+        'cached_msgs_per_sec': len(messages) / cached_elapsed,
+        'batch_msgs_per_sec': len(messages) / batch_elapsed,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], accuracy_tolerance: float,
+            speed_tolerance: Optional[float]) -> List[str]:
+    """Regresiones respecto de la línea base (vacío si no hay)."""
+    problems = []
+    if result['accuracy'] < baseline['accuracy'] - accuracy_tolerance:
+        problems.append(f"exactitud {result['accuracy']:.2%} < base {baseline['accuracy']:.2%}")
+    for intent, value in baseline.get('per_intent', {}).items():
+        now = result['per_intent'].get(intent, 0.0)
+        if now < value - max(accuracy_tolerance, 0.05):
+            problems.append(f"exactitud de {intent}: {now:.1%} < base {value:.1%}")
+    if speed_tolerance is not None:
+        for metric, higher_is_better in SPEED_METRICS.items():
+            now, base = result[metric], baseline[metric]
+            worse = now < base * (1 - speed_tolerance) if higher_is_better else now > base * (1 + speed_tolerance)
+            if worse:
+                problems.append(f"{metric}: {now:,.1f} vs base {base:,.1f}")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=5000, help='Mensajes del corpus')
+    parser.add_argument('--seed', type=int, default=2026)
+    parser.add_argument('--repeat', type=int, default=5, help='Corridas de velocidad (se toma la mejor)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='Guardar este resultado como línea base')
+    parser.add_argument('--accuracy-only', action='store_true', help='No comparar velocidad (otra máquina)')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.005)
+    parser.add_argument('--speed-tolerance', type=float, default=0.3)
+    args = parser.parse_args()
+
+    config = setup()
+    corpus = build_corpus(args.size, args.seed)
+    messages = [message for message, _ in corpus]
+
+    total, per_intent, confusions = accuracy(corpus)
+    runs = [speed(messages) for _ in range(args.repeat)]
+    result: Dict[str, Any] = {
+        'corpus': {'size': args.size, 'seed': args.seed, 'fingerprint': corpus_fingerprint(corpus)},
+        'config': config,
+        'accuracy': round(total, 4),
+        'per_intent': {k: round(v, 4) for k, v in sorted(per_intent.items())},
+    }
+    # La mejor de las corridas: el ruido de la máquina sólo puede empeorar los tiempos
+    for metric, higher_is_better in SPEED_METRICS.items():
+        values = [run[metric] for run in runs]
+        result[metric] = round(max(values) if higher_is_better else min(values), 1)
+
+    print(f"corpus: {args.size} mensajes (semilla {args.seed}), clasificador "
+          f"{'activo' if config['classifier'] else 'inactivo'}")
+    print(f"exactitud: {total:.2%}")
+    for intent, value in sorted(per_intent.items(), key=lambda item: item[1])[:5]:
+        print(f"  {intent:<16}{value:>8.1%}")
+    print("confusiones más frecuentes (esperada -> detectada):")
+    for (expected, got), count in confusions.most_common(5):
+        print(f"  {str(expected):<16}-> {str(got):<16}{count:>5}")
+    for label, metric in (('analyze_message (sin cache)', 'analyze_msgs_per_sec'),
+                          ('process_message (con cache)', 'cached_msgs_per_sec'),
+                          (f'process_messages (lotes de {BATCH_SIZE})', 'batch_msgs_per_sec')):
+        print(f"{label:<34}{result[metric]:>10,.0f} msg/s")
+    print(f"latencia sin cache: p50 {result['p50_us']:.1f} us  p99 {result['p99_us']:.1f} us")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"línea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"sin línea base ({args.baseline}); guardarla con --update-baseline")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['corpus'] != result['corpus'] or baseline['config'] != config:
+        print("la línea base es de otro corpus o configuración: "
+              f"{baseline['corpus']} {baseline['config']}", file=sys.stderr)
+        return 2
+
+    problems = compare(result, baseline, args.accuracy_tolerance,
+                       None if args.accuracy_only else args.speed_tolerance)
+    if problems:
+        print("REGRESIÓN respecto de la línea base:", file=sys.stderr)
+        for problem in problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 1
+    print("sin regresiones respecto de la línea base")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
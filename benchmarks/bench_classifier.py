@@ -0,0 +1,58 @@
+"""
+Throughput del clasificador de intenciones en un solo núcleo.
+
+Mide el armado del modelo (desde el corpus y desde el cache en disco) y
+los mensajes por segundo clasificando de a uno (como process_message) y en
+lotes de distinto tamaño. Los mensajes salen del corpus de
+benchmarks.bench_normalize.
+
+Uso:
+    python -m benchmarks.bench_classifier --batch-sizes 1 64 1024 8192
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_normalize import CORPUS
+from chatbot_logic.classifier import IntentClassifier, corpus_fingerprint, load_classifier
+from chatbot_logic.intents import INTENTS
+from chatbot_logic.normalize import normalize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 64, 1024, 8192])
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.npz')
+        start = time.perf_counter()
+        classifier = load_classifier(INTENTS, path)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        IntentClassifier.load(path, corpus_fingerprint(INTENTS))
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"modelo: {len(classifier.intents)} intenciones, {classifier.matrix.shape[0]} ejemplos, "
+          f"{len(classifier.vocabulary)} n-gramas; armado {build_ms:.1f} ms, desde disco {load_ms:.1f} ms")
+
+    messages = [normalize(m) for m in CORPUS]
+    messages = (messages * (args.messages // len(messages) + 1))[:args.messages]
+
+    start = time.perf_counter()
+    for m in messages:
+        classifier.classify(m)
+    single = len(messages) / (time.perf_counter() - start)
+    print(f"{'lote':>6}{'msg/s':>12}")
+    print(f"{'suelto':>6}{single:>12.0f}")
+    for size in args.batch_sizes:
+        start = time.perf_counter()
+        for i in range(0, len(messages), size):
+            classifier.classify_many(messages[i:i + size])
+        rate = len(messages) / (time.perf_counter() - start)
+        print(f"{size:>6}{rate:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Throughput del cliente Python (chatbot_client) contra un servidor local.
+
+Compara, con N workers concurrentes durante unos segundos:
+
+    adhoc    una conexión nueva por request (como las llamadas sueltas)
+    pooled   ChatClient: pool de conexiones keep-alive + ETag en el listado
+    async    AsyncChatClient: mismo pool sobre asyncio
+
+para GET /chat/turnos y POST /chat/. El servidor corre en un subproceso
+(por defecto la API ASGI con uvicorn, que soporta keep-alive; el servidor
+de desarrollo de Flask cierra la conexión después de cada respuesta).
+
+Uso:
+    python -m benchmarks.bench_client --concurrency 1 8 --duration 3
+    python -m benchmarks.bench_client --server threaded
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import statistics
+import threading
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.bench_async_vs_threaded import free_port, start_server
+from chatbot_client import AsyncChatClient, ChatClient
+
+OPERATIONS = ('turnos', 'chat')
+
+
+def summarize(latencies: List[float], duration: float, connections: int) -> Dict[str, float]:
+    latencies.sort()
+    return {
+        'rps': len(latencies) / duration,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000 if latencies else 0.0,
+        'connections': connections,
+    }
+
+
+def run_threads(worker: Callable[[], None], concurrency: int, duration: float) -> List[float]:
+    latencies: List[float] = []
+    stop_at = time.monotonic() + duration
+
+    def loop():
+        local = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            worker()
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    threads = [threading.Thread(target=loop) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def bench_adhoc(port: int, op: str, concurrency: int, duration: float) -> Dict[str, float]:
+    opened = [0]
+    lock = threading.Lock()
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        try:
+            if op == 'turnos':
+                conn.request('GET', '/chat/turnos')
+            else:
+                conn.request('POST', '/chat/', body=json.dumps({'message': 'hola'}),
+                             headers={'Content-Type': 'application/json'})
+            conn.getresponse().read()
+        finally:
+            conn.close()
+        with lock:
+            opened[0] += 1
+
+    latencies = run_threads(worker, concurrency, duration)
+    return summarize(latencies, duration, opened[0])
+
+
+def bench_pooled(port: int, op: str, concurrency: int, duration: float) -> Dict[str, float]:
+    with ChatClient(f'http://127.0.0.1:{port}', pool_size=concurrency) as client:
+        worker = client.list_turnos if op == 'turnos' else (lambda: client.chat('hola'))
+        latencies = run_threads(worker, concurrency, duration)
+        return summarize(latencies, duration, client.pool.connections_opened)
+
+
+def bench_async(port: int, op: str, concurrency: int, duration: float) -> Dict[str, float]:
+    async def main():
+        latencies: List[float] = []
+        stop_at = time.monotonic() + duration
+        async with AsyncChatClient(f'http://127.0.0.1:{port}', pool_size=concurrency) as client:
+            async def loop():
+                while time.monotonic() < stop_at:
+                    start = time.perf_counter()
+                    if op == 'turnos':
+                        await client.list_turnos()
+                    else:
+                        await client.chat('hola')
+                    latencies.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(loop() for _ in range(concurrency)))
+            return summarize(latencies, duration, client.pool.connections_opened)
+
+    return asyncio.run(main())
+
+
+CLIENTS = {'adhoc': bench_adhoc, 'pooled': bench_pooled, 'async': bench_async}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=['asgi', 'threaded'], default='asgi')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--clients', nargs='+', choices=list(CLIENTS), default=list(CLIENTS))
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    args = parser.parse_args()
+
+    # Sin límite de tasa: se mide el cliente, no el 429
+    os.environ['RATE_LIMIT_ENABLED'] = 'False'
+    port = free_port()
+    proc = start_server(args.server, port)
+    try:
+        print(f"{'cliente':<9}{'op':<8}{'conc':>5}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'conexiones':>12}")
+        for op in args.operations:
+            for concurrency in args.concurrency:
+                for name in args.clients:
+                    r = CLIENTS[name](port, op, concurrency, args.duration)
+                    print(f"{name:<9}{op:<8}{concurrency:>5}{r['rps']:>10.0f}{r['p50_ms']:>9.2f}"
+                          f"{r['p99_ms']:>9.2f}{r['connections']:>12}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Costo de extraer fechas y horarios y de consultar los turnos del rango.
+
+- extract_when() por mensaje sobre el corpus de bench_normalize (la mayoría
+  sin fechas) y sobre mensajes que piden un día u horario; también contra
+  recorrer la misma expresión con finditer() en cada posición.
+- La consulta de turnos libres del rango en la base (rango sobre el índice
+  de datetime_str) contra traer todos los libres con list_available() y
+  filtrarlos en Python.
+
+Uso:
+    python -m benchmarks.bench_dates --rounds 20000 --days 365
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Callable, List
+
+from benchmarks.bench_normalize import CORPUS
+from chatbot_logic.appointments import SLOT_TIMES, AppointmentManager
+from chatbot_logic.dates import _PATTERN, _TABLE, extract_when
+
+DATED = [
+    '¿tenés algo mañana a la tarde?',
+    'el viernes a las 15',
+    'hay turnos el sábado?',
+    'quiero reservar para el lunes a la mañana',
+    'tenés lugar hoy después de las 14',
+    'algo para la semana que viene?',
+    'turnos para el 15/11',
+    'el 15 de diciembre a las 10 y media',
+    'entre las 10 y las 12 del jueves',
+    'esta noche hay algo?',
+]
+
+
+def scan_everywhere(text: str) -> list:
+    """La misma expresión probada en cada posición (sin filtrar por palabra)."""
+    return list(_PATTERN.finditer(' '.join(text.translate(_TABLE).split())))
+
+
+def per_message_us(fn: Callable[[str], object], messages: List[str], rounds: int) -> List[float]:
+    samples = []
+    for message in messages:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn(message)
+        samples.append((time.perf_counter() - start) / rounds * 1e6)
+    return samples
+
+
+def seed(am: AppointmentManager, days: int):
+    """Un año de turnos (6 por día), la mitad reservados."""
+    session = am.SessionLocal()
+    try:
+        session.query(am.TimeSlot).delete()
+        today = date.today()
+        session.add_all(
+            am.TimeSlot(datetime_str=f'{(today + timedelta(days=d)).isoformat()} {t}', service='General',
+                        customer='Cliente' if (d + i) % 2 else None)
+            for d in range(days) for i, t in enumerate(SLOT_TIMES)
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=365)
+    args = parser.parse_args()
+
+    today = date.today()
+    print(f"{'mensajes':<22}{'extract_when us':>18}{'finditer us':>14}")
+    for name, messages in (('sin fecha (corpus)', [m for m in CORPUS if extract_when(m) is None]),
+                           ('con fecha u hora', DATED)):
+        ours = per_message_us(lambda m: extract_when(m, today), messages, args.rounds)
+        scan = per_message_us(scan_everywhere, messages, args.rounds)
+        print(f"{name:<22}{statistics.median(ours):>11.2f} p50 {max(ours):>6.2f} max"
+              f"{statistics.median(scan):>9.2f} p50")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        am = AppointmentManager(db_uri=f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(am, args.days)
+        when = extract_when('el viernes a la tarde')
+        queries = 200
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            found = am.list_available_between(*when, limit=5)
+        ranged_ms = (time.perf_counter() - start) / queries * 1000
+
+        start = time.perf_counter()
+        for _ in range(queries):
+            slow = [s for s in am.list_available()
+                    if when.date_from <= s['datetime'][:10] <= when.date_to
+                    and when.time_from <= s['datetime'][11:] <= when.time_to][:5]
+        full_ms = (time.perf_counter() - start) / queries * 1000
+        assert [s['id'] for s in found] == [s['id'] for s in slow]
+        print(f"\n{args.days} días de turnos, '{when.date_from} {when.time_from}-{when.time_to}':")
+        print(f"  list_available_between (índice): {ranged_ms:7.3f} ms")
+        print(f"  list_available + filtro Python:  {full_ms:7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Latencia de la corrección de errores de tipeo según el tamaño del vocabulario.
+
+Compara el índice de borrados (chatbot_logic.fuzzy.FuzzyIndex) con
+recorrer todo el vocabulario calculando la distancia de edición. Las
+consultas son palabras del vocabulario con 1 o 2 errores al azar
+(sustitución, borrado, inserción o transposición); se reporta p50/p99 por
+consulta y el porcentaje corregido a la palabra original.
+
+Uso:
+    python -m benchmarks.bench_fuzzy --sizes 200 2000 20000
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List, Optional
+
+from benchmarks.bench_matcher import SYLLABLES
+from chatbot_logic.fuzzy import FuzzyIndex, allowed_distance, edit_distance
+from chatbot_logic.intents import INTENTS
+from chatbot_logic.normalize import normalize
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def base_vocabulary() -> List[str]:
+    return sorted({w for spec in INTENTS.values() for e in spec['examples'] for w in normalize(e).split()})
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word))
+    op = rng.choice('sdit')
+    if op == 's':
+        return word[:i] + rng.choice(LETTERS) + word[i + 1:]
+    if op == 'd':
+        return word[:i] + word[i + 1:]
+    if op == 'i':
+        return word[:i] + rng.choice(LETTERS) + word[i:]
+    if i + 1 < len(word):
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word
+
+
+def brute_force(vocabulary: List[str], word: str, max_distance: int) -> Optional[str]:
+    limit = allowed_distance(word, max_distance)
+    best, best_distance = None, limit + 1
+    for candidate in vocabulary:
+        distance = edit_distance(word, candidate, limit)
+        if distance < best_distance:
+            best, best_distance = candidate, distance
+    return best
+
+
+def percentiles(samples: List[float]):
+    samples.sort()
+    return statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 2000, 20000])
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'palabras':>9}{'armado ms':>11}{'índice p50/p99 us':>20}{'lineal p50/p99 us':>20}{'aciertos':>10}")
+    for size in args.sizes:
+        vocabulary = base_vocabulary()
+        seen = set(vocabulary)
+        while len(vocabulary) < size:
+            word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+            if word not in seen:
+                seen.add(word)
+                vocabulary.append(word)
+        start = time.perf_counter()
+        index = FuzzyIndex(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        originals = [rng.choice(vocabulary) for _ in range(args.queries)]
+        originals = [w for w in originals if len(w) >= 4]
+        queries = [typo(typo(w, rng), rng) if len(w) >= 8 and rng.random() < 0.5 else typo(w, rng)
+                   for w in originals]
+
+        indexed, hits = [], 0
+        for original, query in zip(originals, queries):
+            start = time.perf_counter()
+            fixed = index.lookup(query)
+            indexed.append(time.perf_counter() - start)
+            hits += fixed == original
+        linear = []
+        for query in queries[:max(50, args.queries * 200 // size)]:
+            start = time.perf_counter()
+            brute_force(vocabulary, query, index.max_distance)
+            linear.append(time.perf_counter() - start)
+
+        i50, i99 = percentiles(indexed)
+        l50, l99 = percentiles(linear)
+        print(f"{len(vocabulary):>9}{build_ms:>11.1f}{i50:>11.1f}/{i99:<8.1f}{l50:>11.1f}/{l99:<8.1f}"
+              f"{hits / len(queries):>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Costo de las respuestas con datos en vivo.
+
+Compara, por mensaje, POST /chat/-equivalente (process_message) con:
+- una respuesta fija ("hola"),
+- una plantilla completada con el resumen cacheado (LiveAvailability con
+  TTL, lo que usa el procesador),
+- la misma plantilla consultando la base en cada mensaje (TTL 0).
+
+La base es un SQLite temporal con `--days` días de turnos.
+
+Uso:
+    python -m benchmarks.bench_live --rounds 20000 --days 30
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_dates import seed
+from chatbot_logic.appointments import AppointmentManager
+from chatbot_logic.live import LiveAvailability, live_availability
+from chatbot_logic.processor import process_message
+from services import ReservationService
+
+
+def per_message_us(message: str, rounds: int) -> float:
+    process_message(message)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        process_message(message)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(AppointmentManager(db_uri=uri), args.days)
+        service = ReservationService(uri)
+        live_availability.service = service
+        live_availability.invalidate()
+
+        static = per_message_us('hola', args.rounds)
+        cached = per_message_us('turnos', args.rounds)
+        refreshes = live_availability.refreshes
+
+        uncached = LiveAvailability(service, ttl=0)
+        template = 'Hoy quedan {libres_hoy} turnos libres. El próximo es el {proximo_turno}.'
+        rounds = max(1, args.rounds // 100)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            uncached.render(template)
+        per_query = (time.perf_counter() - start) / rounds * 1e6
+
+    print(f"process_message, {args.days} días de turnos (us por mensaje):")
+    print(f"  respuesta fija:                  {static:9.2f}")
+    print(f"  plantilla, resumen cacheado:     {cached:9.2f}   (resúmenes calculados: {refreshes})")
+    print(f"  plantilla, consulta por mensaje: {per_query:9.2f}")
+    print(process_message('turnos'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Costo del logging por request en el hilo que atiende la request.
+
+Simula los dos registros INFO que hace POST /chat/ ("Mensaje recibido" y
+"Respuesta generada") y mide el tiempo que pasa el hilo llamador en
+logger.info() con cada configuración:
+
+    sync-text    StreamHandler directo (comportamiento anterior)
+    async-text   QueueHandler + QueueListener (Config.LOG_ASYNC)
+    async-json   idem con common.logconfig.JSONFormatter
+    async-sample idem con muestreo 1 de cada 10 (Config.LOG_SAMPLING)
+    fstring-off  f-string con el nivel en WARNING (formateo ansioso descartado)
+    lazy-off     formato % con el nivel en WARNING
+
+Con async el tiempo de escritura lo paga el hilo del listener; se reporta
+aparte como "drenado".
+
+Uso:
+    python -m benchmarks.bench_logging --requests 50000
+    python -m benchmarks.bench_logging --requests 5000 --write-latency-us 50
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+
+from common.logconfig import DATE_FORMAT, TEXT_FORMAT, JSONFormatter, SamplingFilter
+
+MESSAGE = 'Hola, quiero reservar un turno para mañana a las 10 para corte de pelo'
+RESPONSE = 'Podés reservar desde /chat/reservar indicando el slot_id, tu nombre y el servicio.'
+
+
+class SlowStream:
+    """Stream cuyas escrituras bloquean (como stdout hacia un pipe lento)."""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data):
+        time.sleep(self.latency)   # libera el GIL, igual que un write() bloqueante
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def build(mode: str, stream):
+    """Logger, listener (o None) y nivel efectivo para un modo."""
+    logger = logging.getLogger(f'bench.{mode}')
+    logger.handlers.clear()
+    logger.filters.clear()
+    logger.propagate = False
+    logger.setLevel(logging.WARNING if mode.endswith('-off') else logging.INFO)
+
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JSONFormatter() if mode == 'async-json'
+                        else logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT))
+    listener = None
+    if mode.startswith('async'):
+        q = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(q, output)
+        listener.start()
+        logger.addHandler(logging.handlers.QueueHandler(q))
+    else:
+        logger.addHandler(output)
+    if mode == 'async-sample':
+        logger.addFilter(SamplingFilter({'Mensaje recibido': 10, 'Respuesta generada': 10}))
+    return logger, listener
+
+
+def run(mode: str, requests: int, stream):
+    logger, listener = build(mode, stream)
+    start = time.perf_counter()
+    if mode == 'fstring-off':
+        for _ in range(requests):
+            logger.info(f"Mensaje recibido: {MESSAGE[:50]}...")
+            logger.info(f"Respuesta generada: {RESPONSE[:50]}...")
+    else:
+        for _ in range(requests):
+            logger.info("Mensaje recibido: %.50s...", MESSAGE)
+            logger.info("Respuesta generada: %.50s...", RESPONSE)
+    caller = time.perf_counter() - start
+    drain = 0.0
+    if listener is not None:
+        start = time.perf_counter()
+        listener.stop()
+        drain = time.perf_counter() - start
+    stream.flush()
+    return caller, drain
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=50000)
+    parser.add_argument('--output', help='Archivo de salida de los logs (por defecto uno temporal)')
+    parser.add_argument('--write-latency-us', type=float, default=0.0,
+                        help='Demora de cada escritura, para simular una consola o pipe lento')
+    parser.add_argument('--modes', nargs='+',
+                        default=['sync-text', 'async-text', 'async-json', 'async-sample', 'fstring-off', 'lazy-off'])
+    args = parser.parse_args()
+
+    print(f"{'modo':<14}{'us/request':>12}{'drenado s':>11}")
+    for mode in args.modes:
+        if args.output:
+            stream = open(args.output, 'a', encoding='utf-8')
+            path = None
+        else:
+            fd, path = tempfile.mkstemp(suffix='.log')
+            stream = os.fdopen(fd, 'w', encoding='utf-8')
+        target = SlowStream(stream, args.write_latency_us / 1e6) if args.write_latency_us else stream
+        try:
+            caller, drain = run(mode, args.requests, target)
+        finally:
+            stream.close()
+            if path:
+                os.unlink(path)
+        print(f"{mode:<14}{caller / args.requests * 1e6:>12.2f}{drain:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
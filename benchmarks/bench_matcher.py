@@ -0,0 +1,80 @@
+"""
+Costo por mensaje de la búsqueda de palabras clave según el tamaño de la
+base de conocimiento.
+
+Compara el recorrido lineal anterior (`key in msg` por cada entrada de
+RESPONSES) con el autómata de chatbot_logic.matcher. Las bases grandes se
+arman agregando a RESPONSES claves sintéticas de 1 a 3 palabras.
+
+Uso:
+    python -m benchmarks.bench_matcher --sizes 50 500 5000 20000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from chatbot_logic.matcher import KeywordMatcher
+from chatbot_logic.normalize import normalize
+from chatbot_logic.responses import RESPONSES
+
+SYLLABLES = ['ma', 'ri', 'so', 'te', 'lu', 'na', 'ca', 'pe', 'do', 'ra', 'ti', 'go', 'ven', 'tar', 'mos']
+
+MESSAGES = [
+    'Hola, buenas tardes',
+    'quiero reservar un turno para corte mañana',
+    '¿Cuál es el precio del tinte?',
+    'buenas noches, ¿atienden el sábado?',
+    'necesito cancelar mi reserva de barba',
+    'no sé bien qué preguntar la verdad',
+]
+
+
+def synthetic_kb(size: int, rng: random.Random) -> Dict[str, str]:
+    kb = dict(RESPONSES)
+    while len(kb) < size:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(1, 3))]
+        kb[' '.join(words)] = 'respuesta'
+    return kb
+
+
+def linear_match(entries, msg: str):
+    for key, value in entries:
+        if key in msg:
+            return value
+    return None
+
+
+def per_message_us(fn, messages: List[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for m in messages:
+            fn(m)
+    return (time.perf_counter() - start) / (rounds * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000, 20000])
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    messages = [normalize(m) for m in MESSAGES]
+    print(f"{'claves':>8}{'lineal us':>12}{'autómata us':>14}{'armado ms':>11}")
+    for size in args.sizes:
+        kb = synthetic_kb(size, rng)
+        entries = tuple(kb.items())
+        start = time.perf_counter()
+        matcher = KeywordMatcher(kb)
+        build_ms = (time.perf_counter() - start) * 1000
+        rounds = max(10, args.rounds * 50 // max(size, 50))
+        linear = per_message_us(lambda m: linear_match(entries, m), messages, rounds)
+        automaton = per_message_us(matcher.find, messages, args.rounds)
+        print(f"{len(kb):>8}{linear:>12.2f}{automaton:>14.2f}{build_ms:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
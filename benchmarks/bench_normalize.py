@@ -0,0 +1,93 @@
+"""
+Costo por mensaje de la normalización de texto.
+
+Compara la limpieza anterior del procesador (minúsculas + regex que
+conservaba las tildes) con chatbot_logic.normalize sobre un corpus de
+mensajes como los que llegan al chat: tildes, signos de apertura, emojis,
+mayúsculas, números y espacios de más. También cuenta cuántos mensajes
+encuentran una palabra clave con cada limpieza.
+
+Uso:
+    python -m benchmarks.bench_normalize --rounds 20000
+"""
+import argparse
+import re
+import time
+from typing import Callable, List
+
+from chatbot_logic.matcher import KeywordMatcher
+from chatbot_logic.normalize import normalize
+from chatbot_logic.responses import RESPONSES
+
+CORPUS = [
+    'Hola!',
+    'hola buenas tardes',
+    'Buenas, ¿cómo estás?',
+    '¿Cómo funciona esto?',
+    'Buenos días 😊',
+    'buenas noches!!',
+    'quiero reservar un turno para mañana',
+    'Quiero reservar turno p/ corte de pelo',
+    '¿Qué turnos tenés disponibles el viernes?',
+    'TURNOS',
+    'hay turno a las 15:30?',
+    'necesito cancelar mi turno del martes',
+    'quiero eliminar la reserva, gracias',
+    '¿Cuánto cuesta un corte + barba?',
+    'precio del tinte?',
+    '¿Dónde están ubicados?',
+    'Ubicación por favor',
+    'me pasás el teléfono?',
+    'Horario de atención',
+    '¿Qué servicios ofrecen?',
+    'peinado para un casamiento el sábado 12/10',
+    'ayuda',
+    '¿Qué eres?',
+    '¿quién eres vos?',
+    'mostrame el menú',
+    'opciones',
+    '¡Muchas gracias!',
+    'gracias 👍',
+    'Adiós',
+    'chau, nos vemos',
+    'tecnología que usan?',
+    'arquitectura del proyecto',
+    'contacto',
+    'no entiendo nada jaja',
+    'asdasd',
+    '   hola     ',
+]
+
+
+def old_clean_text(text: str) -> str:
+    """Limpieza anterior de chatbot_logic.processor (conserva tildes)."""
+    text = text.lower()
+    text = re.sub(r'[^a-záéíóúüñ\s]', '', text)
+    return text.strip()
+
+
+def per_message_us(fn: Callable[[str], str], messages: List[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for m in messages:
+            fn(m)
+    return (time.perf_counter() - start) / (rounds * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+
+    old_matcher = KeywordMatcher(RESPONSES)
+    new_matcher = KeywordMatcher({normalize(k): v for k, v in RESPONSES.items()})
+    print(f"{'limpieza':<12}{'us/msg':>9}{'con clave':>12}")
+    for name, fn, matcher in (('regex', old_clean_text, old_matcher),
+                              ('normalize', normalize, new_matcher)):
+        cost = per_message_us(fn, CORPUS, args.rounds)
+        matched = sum(matcher.find(fn(m)) is not None for m in CORPUS)
+        print(f"{name:<12}{cost:>9.2f}{matched:>8}/{len(CORPUS)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Comandos por segundo del servidor TCP según cuántos se encadenan por envío.
+
+Una conexión manda `--depth` comandos juntos en un solo send(), espera las
+`--depth` respuestas y repite durante unos segundos. Con profundidad 1 cada
+comando paga un ida y vuelta; con 10 o 100 el servidor tiene que ejecutar
+todas las líneas completas de cada recv (antes ejecutaba una por recv y el
+resto quedaba esperando más bytes: la conexión se trababa).
+
+Por defecto el comando es STATS (una línea, sin base de datos), para medir
+el armado de líneas y el ida y vuelta; `--command "LIST 1999-01-01"` suma
+una consulta por comando.
+
+Uso:
+    python -m benchmarks.bench_pipelining --depths 1 10 100
+"""
+import argparse
+import socket
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.bench_async_vs_threaded import free_port
+from benchmarks.bench_socket_servers import start_server, stop_server
+
+# Segundos sin respuesta antes de dar la conexión por trabada
+STALL_TIMEOUT = 2.0
+
+
+def run(port: int, command: str, depth: int, duration: float) -> Dict[str, float]:
+    payload = (command + '\n').encode('utf-8') * depth
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        sock.settimeout(STALL_TIMEOUT)
+        sock.recv(4096)  # bienvenida
+        done = 0
+        rounds = []
+        stop_at = time.perf_counter() + duration
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            sock.sendall(payload)
+            pending = depth
+            try:
+                while pending:
+                    pending -= sock.recv(65536).count(b'\n')
+            except socket.timeout:
+                return {'cmds_per_sec': done / duration, 'round_ms': 0.0, 'stalled': 1}
+            rounds.append(time.perf_counter() - start)
+            done += depth
+        sock.sendall(b'QUIT\n')
+    rounds.sort()
+    return {'cmds_per_sec': done / duration, 'round_ms': rounds[len(rounds) // 2] * 1000, 'stalled': 0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--backends', nargs='+', choices=['threaded', 'asyncio'], default=['threaded', 'asyncio'])
+    parser.add_argument('--command', default='STATS')
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'prof':>6}{'cmd/s':>12}{'ms por envío':>15}")
+    with tempfile.TemporaryDirectory() as db_dir:
+        for backend in args.backends:
+            port = free_port()
+            proc = start_server(backend, port, db_dir, max_clients=4)
+            try:
+                for depth in args.depths:
+                    r = run(port, args.command, depth, args.duration)
+                    if r['stalled']:
+                        print(f"{backend:<10}{depth:>6}{'trabada':>12}{'-':>15}")
+                    else:
+                        print(f"{backend:<10}{depth:>6}{r['cmds_per_sec']:>12,.0f}{r['round_ms']:>15.3f}")
+            finally:
+                stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Costo de recargar la base de conocimiento según su tamaño.
+
+Compara armar la base de cero (_KnowledgeBase(responses), lo que hacía cada
+recarga) con armarla a partir de la anterior, que reutiliza el autómata si
+las claves no cambiaron y actualiza el índice de tipeo sólo con las
+palabras nuevas o quitadas. Dos ediciones típicas del archivo: cambiar una
+respuesta y agregar una clave. Las bases grandes se arman con las claves
+sintéticas de bench_matcher.
+
+También mide cuánto tarda un mensaje mientras otro hilo recarga en bucle:
+las consultas no toman el lock de la recarga, sólo comparten el GIL con el
+hilo que arma la base nueva.
+
+Uso:
+    python -m benchmarks.bench_reload --sizes 1000 3000 10000
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from typing import Callable, Dict
+
+from benchmarks.bench_matcher import synthetic_kb
+from chatbot_logic.processor import _KnowledgeBase, analyze_message, reload_responses
+from chatbot_logic.responses import RESPONSES
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def edits(kb: Dict[str, str]):
+    reply = dict(kb)
+    reply['hola'] = '¡Hola! ¿Qué tal?'
+    key = dict(kb)
+    key['estacionamiento'] = 'Hay estacionamiento en la esquina'
+    return reply, key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 3000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'claves':>8}{'de cero ms':>12}{'respuesta ms':>14}{'clave nueva ms':>16}")
+    for size in args.sizes:
+        kb = synthetic_kb(size, rng)
+        base = _KnowledgeBase(kb)
+        reply, key = edits(kb)
+        full = best_ms(lambda: _KnowledgeBase(reply), args.repeat)
+        reply_ms = best_ms(lambda: _KnowledgeBase(reply, base), args.repeat)
+        key_ms = best_ms(lambda: _KnowledgeBase(key, base), args.repeat)
+        print(f"{size:>8}{full:>12.1f}{reply_ms:>14.1f}{key_ms:>16.1f}")
+
+    # Latencia de los mensajes mientras se recarga una base de 3000 claves
+    original = dict(RESPONSES)
+    kb = synthetic_kb(3000, rng)
+    variants = edits(kb)
+    reload_responses(kb)
+    stop = threading.Event()
+    reloads = 0
+
+    def reloader():
+        nonlocal reloads
+        while not stop.is_set():
+            reload_responses(variants[reloads % 2])
+            reloads += 1
+
+    def sample(seconds: float):
+        samples = []
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            analyze_message('quiero reservar un turno')
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+    quiet = sample(1.0)
+    thread = threading.Thread(target=reloader)
+    thread.start()
+    try:
+        busy = sample(2.0)
+    finally:
+        stop.set()
+        thread.join()
+        reload_responses(original)
+    print("\nanalyze_message con 3000 claves (us):")
+    print(f"  sin recargas:         p50 {quiet[0]:7.1f}  p99 {quiet[1]:7.1f}")
+    print(f"  recargando en bucle:  p50 {busy[0]:7.1f}  p99 {busy[1]:7.1f}  ({reloads} recargas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Memoria y costo del store de sesiones de conversación.
+
+Llena un SessionStore con `--sessions` conversaciones en medio de una
+reserva (servicio elegido y 5 turnos ofrecidos) y mide con tracemalloc los
+bytes por conversación, comparando con la misma información en un dict por
+sesión. Después abre otras tantas conversaciones nuevas: el store descarta
+las menos usadas y la memoria no crece.
+
+Uso:
+    python -m benchmarks.bench_sessions --sessions 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from chatbot_logic.sessions import SessionStore
+
+SERVICES = ('Corte', 'Barba', 'Tinte', 'Peinado', 'General')
+
+
+def offered_slots(i: int):
+    # Los strings de fecha los comparte la lista de turnos; cada sesión sólo
+    # guarda la tupla con referencias (id1, fecha1, id2, fecha2, ...)
+    return tuple(v for n in range(i % 50, i % 50 + 5) for v in (n, DATETIMES[n % len(DATETIMES)]))
+
+
+DATETIMES = [f'2026-03-{d:02d} {h:02d}:00' for d in range(1, 29) for h in range(9, 19)]
+
+
+def fill_store(store: SessionStore, start: int, count: int):
+    for i in range(start, start + count):
+        session = store.create(f'conv-{i:08d}')
+        session.state = 'slot'
+        session.intent = 'reservar'
+        session.service = SERVICES[i % len(SERVICES)]
+        session.offered = offered_slots(i)
+
+
+def fill_dicts(sessions: OrderedDict, start: int, count: int):
+    for i in range(start, start + count):
+        sessions[f'conv-{i:08d}'] = {
+            'state': 'slot', 'intent': 'reservar', 'service': SERVICES[i % len(SERVICES)],
+            'date': None, 'offered': offered_slots(i), 'slot_id': None, 'slot_time': None,
+            'touched': time.monotonic(),
+        }
+
+
+def measure(fill, container, count: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fill(container, 0, count)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.sessions
+
+    dict_bytes = measure(fill_dicts, OrderedDict(), n)
+
+    # Mismo store en las dos fases: al abrir n conversaciones más, las
+    # descartadas liberan lo que ocupaban
+    store = SessionStore(max_sessions=n, ttl=900)
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    fill_store(store, 0, n)
+    full = tracemalloc.get_traced_memory()[0] - base
+    fill_store(store, n, n)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    stats = store.stats()
+
+    print(f"{n} conversaciones en medio de una reserva")
+    print(f"  Session (__slots__): {full / 2**20:7.1f} MiB  {full / n:6.0f} B/conversación")
+    print(f"  dict por sesión:     {dict_bytes / 2**20:7.1f} MiB  {dict_bytes / n:6.0f} B/conversación")
+    print(f"  +{n} nuevas: activas {stats['active']}, descartadas por LRU {stats['evicted']}, "
+          f"memoria {after / 2**20:.1f} MiB")
+
+    # Tiempos sin tracemalloc
+    store = SessionStore(max_sessions=n, ttl=900)
+    fill_store(store, 0, n)
+    start = time.perf_counter()
+    fill_store(store, n, n)
+    create_us = (time.perf_counter() - start) / n * 1e6
+    ids = [f'conv-{i:08d}' for i in range(n, 2 * n)]
+    start = time.perf_counter()
+    for conversation_id in ids:
+        store.get(conversation_id)
+    get_us = (time.perf_counter() - start) / n * 1e6
+    print(f"  alta con descarte: {create_us:.2f} us   get: {get_us:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Latencia por comando vista por el cliente del servidor TCP: leer por
+silencio contra respuestas terminadas en END (PROTO 2).
+
+Usa las funciones del cliente de run_chatbot.py contra el servidor en un
+subproceso. Sin PROTO 2 el cliente no sabe cuándo termina una respuesta y
+espera 0,4 s sin datos (recv_until_quiet): ése es el piso de cada comando.
+Con PROTO 2 lee hasta la línea END.
+
+Uso:
+    python -m benchmarks.bench_socket_latency --count 1000
+"""
+import argparse
+import socket
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.bench_async_vs_threaded import free_port
+from benchmarks.bench_socket_servers import start_server, stop_server
+from run_chatbot import negotiate_protocol, recv_line, send_command
+
+COMMANDS = ['LIST', 'HELP', 'STATS']
+# Comandos por silencio: cada uno tarda 0,4 s como mínimo
+QUIET_COUNT = 9
+
+
+def run(port: int, framed: bool, count: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+        recv_line(sock)
+        if framed and not negotiate_protocol(sock):
+            raise RuntimeError('El servidor no aceptó PROTO 2')
+        for i in range(count):
+            start = time.perf_counter()
+            send_command(sock, COMMANDS[i % len(COMMANDS)], framed)
+            latencies.append(time.perf_counter() - start)
+        send_command(sock, 'QUIT', framed)
+    latencies.sort()
+    return {
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000, help='Comandos con PROTO 2')
+    parser.add_argument('--backends', nargs='+', choices=['threaded', 'asyncio'], default=['threaded', 'asyncio'])
+    args = parser.parse_args()
+
+    print(f"comandos: {', '.join(COMMANDS)} (en rueda)")
+    print(f"{'backend':<10}{'lectura':<18}{'comandos':>9}{'p50 ms':>10}{'p99 ms':>10}")
+    with tempfile.TemporaryDirectory() as db_dir:
+        for backend in args.backends:
+            port = free_port()
+            proc = start_server(backend, port, db_dir, max_clients=4)
+            try:
+                for label, framed, count in (('por silencio', False, QUIET_COUNT),
+                                             ('PROTO 2 (END)', True, args.count)):
+                    r = run(port, framed, count)
+                    print(f"{backend:<10}{label:<18}{count:>9}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}")
+            finally:
+                stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Conexiones concurrentes al servidor TCP: multihilo contra asyncio.
+
+Levanta `python -m socket_srv.server --backend ...` en un subproceso (con
+una base SQLite temporal), abre N conexiones que reciben la bienvenida y
+quedan ociosas, y con todas abiertas manda un comando que consulta la base
+(`LIST` de un día sin turnos) por una muestra de ellas, de a uno. Reporta cuánto
+tardó en aceptar a todos, la latencia del comando, conexiones fallidas y
+los hilos y la memoria del proceso servidor.
+
+El servidor multihilo atiende a lo sumo SOCKET_MAX_CLIENTS clientes (más
+SOCKET_MAX_QUEUED en espera) y al resto le responde "servidor ocupado"
+(columna ocupadas); las que esperan un hilo libre y no reciben la
+bienvenida en WELCOME_WAIT segundos se cuentan aparte. Por defecto se lo levanta con tantos hilos como
+conexiones, para comparar el costo de un hilo por cliente; --max-clients
+64 mide el rechazo rápido con el límite de producción.
+
+Sube el límite de descriptores abiertos (RLIMIT_NOFILE) al máximo permitido;
+10000 conexiones necesitan unos 10000 en el cliente y otros tantos en el
+servidor.
+
+Uso:
+    python -m benchmarks.bench_socket_servers --connections 1000 10000
+    python -m benchmarks.bench_socket_servers --backends threaded --max-clients 64
+"""
+import argparse
+import asyncio
+import os
+import resource
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.bench_async_vs_threaded import ROOT, free_port, proc_stats
+from socket_srv.protocol import WELCOME
+
+# Conexiones abriéndose a la vez (el resto espera su turno); por debajo del
+# backlog de listen() del servidor multihilo (128) para no medir reintentos de SYN
+CONNECT_CONCURRENCY = 100
+# Segundos para recibir la bienvenida; más tarde, la conexión quedó en espera
+WELCOME_WAIT = 5
+
+
+def raise_nofile_limit() -> int:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        soft = hard
+    return soft
+
+
+def start_server(backend: str, port: int, db_dir: str, max_clients: int) -> subprocess.Popen:
+    env = dict(os.environ, LOG_LEVEL='WARNING', DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'bench.db')}",
+               SOCKET_MAX_CLIENTS=str(max_clients))
+    proc = subprocess.Popen([sys.executable, '-m', 'socket_srv.server', '--backend', backend,
+                             '--host', '127.0.0.1', '--port', str(port)],
+                            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'El servidor {backend} no respondió en el puerto {port}')
+
+
+def stop_server(proc: subprocess.Popen):
+    # SIGINT y no SIGTERM: el servidor detiene su worker al recibir KeyboardInterrupt
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+async def connect(port: int, gate: asyncio.Semaphore, outcomes: Counter
+                  ) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+    async with gate:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), 30)
+        except (OSError, asyncio.TimeoutError):
+            outcomes['failed'] += 1
+            return None
+        try:
+            line = await asyncio.wait_for(reader.readline(), WELCOME_WAIT)
+        except asyncio.TimeoutError:
+            outcomes['queued'] += 1
+            writer.close()
+            return None
+        except OSError:
+            outcomes['failed'] += 1
+            return None
+        if line.decode('utf-8') != WELCOME:
+            outcomes['busy'] += 1
+            writer.close()
+            return None
+        return reader, writer
+
+
+async def command(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[float]:
+    start = time.perf_counter()
+    try:
+        writer.write(b'LIST 1999-01-01\n')
+        line = await asyncio.wait_for(reader.readline(), 30)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return time.perf_counter() - start if line else None
+
+
+async def run_load(port: int, pid: int, connections: int, sample: int) -> Dict[str, float]:
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    outcomes: Counter = Counter()
+    start = time.perf_counter()
+    opened = await asyncio.gather(*(connect(port, gate, outcomes) for _ in range(connections)))
+    accept_s = time.perf_counter() - start
+    clients = [c for c in opened if c is not None]
+
+    step = max(1, len(clients) // sample) if clients else 1
+    results = [await command(r, w) for r, w in clients[::step][:sample]]
+    stats = proc_stats(pid)
+    latencies: List[float] = sorted(r for r in results if r is not None)
+    for _, writer in clients:
+        writer.close()
+    return {
+        'open': len(clients),
+        'busy': outcomes['busy'],
+        'queued': outcomes['queued'],
+        'failed': outcomes['failed'],
+        'accept_s': accept_s,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+        'cmd_errors': len(results) - len(latencies),
+        'threads': stats['threads'],
+        'rss_mb': stats['rss_kb'] / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--backends', nargs='+', choices=['threaded', 'asyncio'], default=['threaded', 'asyncio'])
+    parser.add_argument('--sample', type=int, default=200, help='Conexiones que mandan un comando')
+    parser.add_argument('--max-clients', type=int, default=None,
+                        help='SOCKET_MAX_CLIENTS del multihilo (default: tantos como conexiones)')
+    args = parser.parse_args()
+
+    limit = raise_nofile_limit()
+    if max(args.connections) * 2 + 100 > limit:
+        print(f"aviso: RLIMIT_NOFILE es {limit}; cliente y servidor necesitan una fd por conexión",
+              file=sys.stderr)
+
+    print(f"{'backend':<10}{'conex':>7}{'abiertas':>10}{'ocupadas':>10}{'esperando':>11}{'fallidas':>10}{'accept s':>10}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'hilos':>7}{'RSS MB':>8}")
+    with tempfile.TemporaryDirectory() as db_dir:
+        for backend in args.backends:
+            for connections in args.connections:
+                port = free_port()
+                proc = start_server(backend, port, db_dir, args.max_clients or connections)
+                try:
+                    r = asyncio.run(run_load(port, proc.pid, connections, args.sample))
+                finally:
+                    stop_server(proc)
+                failed = r['failed'] + r['cmd_errors']
+                print(f"{backend:<10}{connections:>7}{r['open']:>10}{r['busy']:>10}{r['queued']:>11}{failed:>10}{r['accept_s']:>10.2f}"
+                      f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['threads']:>7}{r['rss_mb']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Envíos, segmentos TCP y latencia por LIST en el servidor TCP multihilo.
+
+Atiende una conexión por loopback con handle_client en un hilo de este
+proceso, sobre un socket que cuenta las llamadas a sendall y recv (cada
+una es al menos una syscall), y manda LIST de a uno esperando la
+respuesta completa. Los segmentos TCP salen del contador OutSegs de
+/proc/net/snmp (Linux, de todo el sistema: ambos extremos y los ACK).
+
+Compara con y sin TCP_NODELAY (SOCKET_NODELAY). Usa la base por defecto
+(Config.DATABASE_URI); LIST devuelve una línea por turno libre.
+
+Uso:
+    python -m benchmarks.bench_socket_writes --count 500
+"""
+import argparse
+import queue
+import socket
+import statistics
+import threading
+import time
+from typing import Dict, Optional
+
+from common import Config
+from services import ReservationService
+from socket_srv.server import handle_client
+
+
+class CountingSocket:
+    """Socket que cuenta sendall y recv."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self.sends = 0
+        self.recvs = 0
+
+    def sendall(self, data):
+        self.sends += 1
+        return self._sock.sendall(data)
+
+    def recv(self, size):
+        self.recvs += 1
+        return self._sock.recv(size)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._sock.close()
+
+
+def out_segments() -> Optional[int]:
+    try:
+        with open('/proc/net/snmp') as f:
+            rows = [line.split() for line in f if line.startswith('Tcp:')]
+    except OSError:
+        return None
+    return int(rows[1][rows[0].index('OutSegs')])
+
+
+def run(count: int, lines: int) -> Dict[str, float]:
+    listener = socket.create_server(('127.0.0.1', 0))
+    served: Dict[str, CountingSocket] = {}
+
+    def serve():
+        conn, addr = listener.accept()
+        served['conn'] = CountingSocket(conn)
+        handle_client(served['conn'], addr, queue.Queue(), idle_timeout=0)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    with socket.create_connection(listener.getsockname()) as sock:
+        sock.recv(4096)  # bienvenida
+        conn = served['conn']
+        sends, recvs, segments = conn.sends, conn.recvs, out_segments()
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter()
+            sock.sendall(b'LIST\n')
+            pending = lines
+            while pending > 0:
+                pending -= sock.recv(65536).count(b'\n')
+            latencies.append(time.perf_counter() - start)
+        end_segments = out_segments()
+        result = {
+            'sends': (conn.sends - sends) / count,
+            'recvs': (conn.recvs - recvs) / count,
+            'segments': (end_segments - segments) / count if segments is not None else float('nan'),
+            'p50_us': statistics.median(latencies) * 1e6,
+            'p99_us': sorted(latencies)[int(count * 0.99) - 1] * 1e6,
+        }
+        sock.sendall(b'QUIT\n')
+    thread.join(timeout=5)
+    listener.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=500, help='LIST por corrida')
+    args = parser.parse_args()
+
+    lines = max(1, len(ReservationService().list_available()))
+    print(f"LIST con {lines} líneas de respuesta, {args.count} veces")
+    print(f"{'TCP_NODELAY':<13}{'sendall':>9}{'recv':>7}{'segmentos':>11}{'p50 us':>10}{'p99 us':>10}")
+    for nodelay in (True, False):
+        Config.SOCKET_NODELAY = nodelay
+        r = run(args.count, lines)
+        print(f"{'sí' if nodelay else 'no':<13}{r['sends']:>9.1f}{r['recvs']:>7.1f}{r['segments']:>11.1f}"
+              f"{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
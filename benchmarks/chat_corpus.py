@@ -0,0 +1,190 @@
+"""
+Corpus etiquetado de mensajes de chat para medir el procesador.
+
+Genera en forma reproducible (semilla fija) miles de mensajes como los que
+llegan al chat, cada uno con la intención esperada (None: fuera de tema,
+debe caer en la respuesta por defecto). Las frases base son distintas de
+los ejemplos de chatbot_logic/intents.py, así la exactitud no mide sólo
+memoria del entrenamiento, y se combinan con:
+
+- saludos, muletillas y cierres delante o detrás ("hola, ¿cuánto sale?",
+  "... desde ya gracias"): la etiqueta es la de la consulta principal,
+  aunque el saludo o el agradecimiento sean otra intención
+- tildes y signos presentes, ausentes o de más, mayúsculas, emojis
+- letras repetidas ("holaaa") y errores de tipeo (letras cambiadas,
+  faltantes, duplicadas o vecinas en el teclado)
+
+Uso:
+    from benchmarks.chat_corpus import build_corpus
+    corpus = build_corpus(5000, seed=2026)   # [(mensaje, intención o None)]
+"""
+import hashlib
+import json
+import random
+from typing import List, Optional, Tuple
+
+__all__ = ['PHRASES', 'build_corpus', 'corpus_fingerprint']
+
+# Frases base por intención (None = fuera de tema)
+PHRASES = {
+    'saludo': [
+        'Hola', 'Hola, ¿qué tal?', 'Buenas tardes', 'Buen día', 'Buenas noches',
+        'Holaaa', 'Hola, ¿hay alguien ahí?', '¡Buenas!', 'Hola buen día', 'Saludos',
+    ],
+    'estado': [
+        '¿Cómo estás?', '¿Cómo andás?', '¿Qué tal estás?', '¿Cómo te va?',
+        '¿Todo bien?', '¿Cómo va todo?', '¿Y vos cómo estás?',
+    ],
+    'despedida': [
+        'Adiós', 'Chau', 'Chau, nos vemos', 'Hasta luego', 'Hasta mañana',
+        'Nos vemos', 'Bueno, me voy', 'Hasta la próxima',
+    ],
+    'ver_turnos': [
+        '¿Qué turnos tenés?', '¿Hay turnos libres?', 'Mostrame los turnos disponibles',
+        '¿Tenés lugar hoy?', '¿Hay lugar mañana?', '¿Qué horarios te quedan libres?',
+        '¿Tenés disponibilidad esta semana?', '¿Qué días tenés libres?',
+        '¿Te queda algún turno para el viernes?', 'Quiero ver los turnos',
+        '¿Quedan turnos para hoy?', 'Disponibilidad para el sábado',
+    ],
+    'reservar': [
+        'Quiero reservar un turno', 'Quiero sacar turno', 'Necesito un turno para corte',
+        'Me anotás para un corte?', 'Quisiera reservar para barba', 'Agendame un turno',
+        'Quiero pedir hora para un tinte', 'Me gustaría reservar un peinado',
+        'Reservame un turno para mañana', 'Quiero cortarme el pelo',
+        'Sacame un turno para el corte', '¿Puedo reservar?',
+    ],
+    'cancelar': [
+        'Quiero cancelar mi turno', 'Necesito cancelar la reserva', 'No voy a poder ir',
+        'Anulá mi turno por favor', 'Borrá mi reserva', 'Quiero dar de baja el turno',
+        'No puedo ir al turno del martes', 'Cancelá mi reserva',
+        'Tengo que cancelar', 'Eliminá mi turno',
+    ],
+    'servicios': [
+        '¿Qué servicios tienen?', '¿Qué hacen?', '¿Qué ofrecen?', '¿Hacen tintura?',
+        '¿Hacen barba?', '¿Qué tipo de cortes hacen?', 'Lista de servicios',
+        '¿Hacen peinados para fiestas?', '¿Qué servicios ofrecen?',
+    ],
+    'precios': [
+        '¿Cuánto cuesta un corte?', '¿Cuánto sale la barba?', '¿Cuánto cobran?',
+        '¿Qué precio tiene el tinte?', 'Precios', '¿Me pasás la lista de precios?',
+        '¿Cuál es el costo de un peinado?', '¿Es caro?', '¿Cuánto tengo que pagar?',
+        'Tarifas por favor',
+    ],
+    'horario': [
+        '¿A qué hora abren?', '¿A qué hora cierran?', '¿Hasta qué hora atienden?',
+        '¿Abren los sábados?', '¿Atienden los domingos?', 'Horarios de atención',
+        '¿Qué días abren?', '¿Cuándo atienden?', '¿Están abiertos ahora?',
+    ],
+    'ubicacion': [
+        '¿Dónde están?', '¿Dónde queda la peluquería?', '¿Cuál es la dirección?',
+        '¿Cómo llego?', '¿En qué calle están?', 'Mandame la ubicación',
+        '¿Están en el centro?', 'Ubicación',
+    ],
+    'contacto': [
+        '¿Tienen WhatsApp?', 'Pasame el número', '¿Cuál es el teléfono?',
+        '¿Cómo los contacto?', '¿Tienen Instagram?', '¿Puedo llamar?',
+        'Mail de contacto',
+    ],
+    'ayuda': [
+        'Ayuda', 'Necesito ayuda', '¿Qué puedo hacer?', 'Menú', 'Opciones',
+        'No sé qué hacer', '¿Cómo se usa esto?', '¿Qué podés hacer?', 'Ayudame',
+    ],
+    'bot': [
+        '¿Sos un bot?', '¿Quién sos?', '¿Sos una persona?', '¿Con quién hablo?',
+        '¿Sos humano?', '¿Qué sos?', '¿Estoy hablando con una máquina?',
+    ],
+    'agradecimiento': [
+        'Gracias', 'Muchas gracias', 'Mil gracias', 'Genial, gracias', 'Te agradezco',
+        'Perfecto, gracias', 'Buenísimo', 'Joya', 'Excelente, gracias por la ayuda',
+    ],
+    None: [
+        '¿Venden zapatillas?', '¿Cuál es la capital de Francia?', 'jajaja', 'asdfgh',
+        'El partido de ayer estuvo tremendo', '¿Me recomendás una película?',
+        'Mi gato se llama Michi', 'ok', '???', 'La verdad no sé',
+        '¿Llueve mañana?', 'Quiero comprar un auto',
+    ],
+}
+
+# Aperturas y cierres que se suman a una consulta ("hola, ¿cuánto sale?")
+PREFIXES = ['hola, ', 'buenas, ', 'hola buenas ', 'che, ', 'disculpá, ', 'una consulta: ', 'buen día! ']
+SUFFIXES = [' por favor', ' porfa', ' gracias', '!!', ' 😊', '??', ' 🙏', ' desde ya gracias']
+# Sin aperturas ni cierres: cambiarían la intención esperada
+NO_DECORATION = {'saludo', 'despedida', 'agradecimiento', None}
+
+# Letras vecinas en un teclado QWERTY (para errores de sustitución)
+NEIGHBORS = {
+    'a': 'sq', 'b': 'vn', 'c': 'xv', 'd': 'sf', 'e': 'wr', 'f': 'dg', 'g': 'fh', 'h': 'gj',
+    'i': 'uo', 'j': 'hk', 'k': 'jl', 'l': 'k', 'm': 'n', 'n': 'bm', 'o': 'ip', 'p': 'o',
+    'q': 'w', 'r': 'et', 's': 'ad', 't': 'ry', 'u': 'yi', 'v': 'cb', 'w': 'qe', 'x': 'zc',
+    'y': 'tu', 'z': 'x',
+}
+ACCENTS = str.maketrans('áéíóúÁÉÍÓÚ', 'aeiouAEIOU')
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Un error de tipeo en una palabra: letras cambiadas, faltante, duplicada o vecina."""
+    i = rng.randrange(1, len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    if kind == 2:
+        return word[:i] + word[i] + word[i:]
+    neighbors = NEIGHBORS.get(word[i].lower())
+    return word[:i] + rng.choice(neighbors) + word[i + 1:] if neighbors else word
+
+
+def vary(text: str, rng: random.Random) -> str:
+    """Variaciones de escritura de una frase."""
+    if rng.random() < 0.4:
+        text = text.translate(ACCENTS)
+    if rng.random() < 0.3:
+        text = text.replace('¿', '').replace('¡', '')
+    if rng.random() < 0.25:
+        words = text.split(' ')
+        candidates = [i for i, w in enumerate(words) if len(w) >= 5 and w.isalpha()]
+        if candidates:
+            i = rng.choice(candidates)
+            words[i] = typo(words[i], rng)
+            text = ' '.join(words)
+    r = rng.random()
+    if r < 0.1:
+        text = text.upper()
+    elif r < 0.5:
+        text = text.lower()
+    stem = text.rstrip('?!.')
+    if stem and rng.random() < 0.05:
+        text = stem + stem[-1] * 2  # "holaaa", "graciass"
+    return text
+
+
+def build_corpus(size: int = 5000, seed: int = 2026) -> List[Tuple[str, Optional[str]]]:
+    """
+    Mensajes etiquetados, siempre los mismos para la misma semilla.
+
+    Args:
+        size: Cantidad de mensajes
+        seed: Semilla del generador
+
+    Returns:
+        [(mensaje, intención esperada o None)]
+    """
+    rng = random.Random(seed)
+    labels = list(PHRASES)
+    corpus = []
+    for _ in range(size):
+        intent = rng.choice(labels)
+        text = rng.choice(PHRASES[intent])
+        if intent not in NO_DECORATION:
+            if rng.random() < 0.3:
+                text = rng.choice(PREFIXES) + text[0].lower() + text[1:]
+            if rng.random() < 0.25:
+                text += rng.choice(SUFFIXES)
+        corpus.append((vary(text, rng), intent))
+    return corpus
+
+
+def corpus_fingerprint(corpus: List[Tuple[str, Optional[str]]]) -> str:
+    """Hash del corpus (para no comparar contra una línea base de otro corpus)."""
+    return hashlib.sha256(json.dumps(corpus, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,26 @@
+"""
+Cliente Python de la API de turnos.
+
+- ChatClient: cliente síncrono (http.client) con pool de conexiones keep-alive
+- AsyncChatClient: cliente asíncrono (asyncio) con la misma API
+- ChatClientError: respuesta de error de la API (status, payload, retry_after)
+
+Ambos envían X-API-Token en reservar/cancelar, reutilizan el listado de
+turnos cuando el servidor responde 304 a su ETag y agrupan operaciones:
+chat_many manda los mensajes en lotes (POST /chat/batch-messages) y
+reservar_many reparte las reservas entre las conexiones del pool.
+Sólo usan la biblioteca estándar.
+
+Uso:
+    from chatbot_client import ChatClient
+
+    with ChatClient('http://127.0.0.1:5000', token='dev-token-123') as client:
+        print(client.chat('hola'))
+        turnos = client.list_turnos()
+"""
+
+from .base import ChatClientError
+from .sync import ChatClient, ConnectionPool
+from .aio import AsyncChatClient, AsyncConnectionPool
+
+__all__ = ['ChatClient', 'AsyncChatClient', 'ChatClientError', 'ConnectionPool', 'AsyncConnectionPool']
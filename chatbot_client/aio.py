@@ -0,0 +1,209 @@
+"""
+Cliente asíncrono de la API de turnos sobre streams de asyncio, con un pool
+de conexiones HTTP/1.1 keep-alive.
+"""
+import asyncio
+import ssl
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base import (
+    CHAT_BATCH_SIZE, STALE_CONNECTION_ERRORS, ListingCache, Response, build_path, check, chunked, encode_json,
+    parse_base_url,
+)
+
+
+class _Connection:
+    """Conexión HTTP/1.1 sobre un par reader/writer de asyncio."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+    async def exchange(self, head: bytes, body: bytes, method: str) -> Tuple[Response, bool]:
+        """Envía la request y lee la respuesta. Devuelve (respuesta, keep-alive)."""
+        self.writer.write(head + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('El servidor cerró la conexión')
+        version, status = status_line.split(None, 2)[:2]
+        status = int(status)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == b'HTTP/1.1' else connection == 'keep-alive'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            data = b''
+        elif 'content-length' in headers:
+            data = await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = await self._read_chunked()
+        else:
+            data = await self.reader.read()
+            keep_alive = False
+        return Response(status, headers, data), keep_alive
+
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';', 1)[0], 16)
+            if size == 0:
+                while (await self.reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass  # trailers
+                return b''.join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+
+class AsyncConnectionPool:
+    """
+    Pool de conexiones keep-alive para usar desde un event loop.
+
+    Attributes:
+        connections_opened: Conexiones TCP abiertas desde la creación del pool
+    """
+
+    def __init__(self, host: str, port: int, size: int = 10, timeout: float = 10.0, secure: bool = False):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ssl = ssl.create_default_context() if secure else None
+        self.host_header = host if port in (80, 443) else f'{host}:{port}'
+        self.connections_opened = 0
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Response:
+        """Envía una request por una conexión del pool (reintenta una vez si estaba cerrada)."""
+        body = body or b''
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host_header}', f'Content-Length: {len(body)}']
+        lines += [f'{k}: {v}' for k, v in (headers or {}).items()]
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        async with self._slots:
+            reused = bool(self._idle)
+            conn = self._idle.pop() if reused else await self._connect()
+            try:
+                try:
+                    response, keep_alive = await asyncio.wait_for(conn.exchange(head, body, method), self.timeout)
+                except STALE_CONNECTION_ERRORS + (asyncio.IncompleteReadError,):
+                    conn.close()
+                    if not reused:
+                        raise
+                    conn = await self._connect()
+                    response, keep_alive = await asyncio.wait_for(conn.exchange(head, body, method), self.timeout)
+            except BaseException:
+                conn.close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return response
+
+    async def close(self):
+        """Cierra las conexiones ociosas."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncChatClient:
+    """
+    Versión asíncrona de ChatClient (mismos métodos, como corutinas).
+
+    Uso:
+        async with AsyncChatClient('http://127.0.0.1:5000', token='...') as client:
+            respuestas = await client.chat_many(['hola', 'precio'])
+
+    Args:
+        base_url: URL del servidor (el prefijo /chat se agrega solo)
+        token: Token de API para reservar/cancelar
+        pool_size: Conexiones simultáneas máximas
+        timeout: Timeout de cada request (segundos)
+    """
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:5000', token: Optional[str] = None,
+                 pool_size: int = 10, timeout: float = 10.0):
+        target = parse_base_url(base_url)
+        self.prefix = target.prefix + '/chat'
+        self.token = token
+        self.pool = AsyncConnectionPool(target.host, target.port, pool_size, timeout, target.secure)
+        self.listing_cache = ListingCache()
+
+    async def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                       params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                       auth: bool = False) -> Response:
+        all_headers = {'Accept': 'application/json'}
+        if payload is not None:
+            all_headers['Content-Type'] = 'application/json'
+        if auth and self.token:
+            all_headers['X-API-Token'] = self.token
+        all_headers.update(headers or {})
+        return await self.pool.request(method, build_path(self.prefix, path, params),
+                                       encode_json(payload), all_headers)
+
+    async def chat(self, message: str, conversation_id: Optional[str] = None) -> str:
+        """Envía un mensaje al chatbot y devuelve su respuesta (conversation_id: ver POST /chat/)."""
+        payload = {'message': message}
+        if conversation_id is not None:
+            payload['conversation_id'] = conversation_id
+        return check(await self._request('POST', '/', payload))['response']
+
+    async def chat_batch(self, messages: Iterable[str]) -> List[str]:
+        """Respuestas de un lote de mensajes en una sola request (POST /batch-messages)."""
+        return check(await self._request('POST', '/batch-messages', {'messages': list(messages)}))['responses']
+
+    async def list_turnos(self, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lista los turnos con ETag (ver ChatClient.list_turnos)."""
+        response = await self._request('GET', '/turnos', params={'date': date},
+                                       headers=self.listing_cache.headers(date))
+        return self.listing_cache.resolve(date, response)
+
+    async def resumen(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Turnos libres/reservados por día."""
+        response = await self._request('GET', '/turnos/resumen', params={'from': date_from, 'to': date_to})
+        return check(response)['resumen']
+
+    async def reservar(self, slot_id: int, name: str, service: str = 'General') -> Dict[str, Any]:
+        """Reserva un turno."""
+        return check(await self._request('POST', '/reservar',
+                                         {'slot_id': slot_id, 'name': name, 'service': service}, auth=True))
+
+    async def cancelar(self, slot_id: Optional[int] = None, name: Optional[str] = None) -> Dict[str, Any]:
+        """Cancela por ID de turno o por nombre del cliente."""
+        payload = {'slot_id': slot_id} if slot_id is not None else {'name': name}
+        return check(await self._request('POST', '/cancelar', payload, auth=True))
+
+    async def chat_many(self, messages: Iterable[str], batch_size: int = CHAT_BATCH_SIZE) -> List[str]:
+        """Respuestas de varios mensajes, en el mismo orden (lotes concurrentes sobre el pool)."""
+        batches = await asyncio.gather(*(self.chat_batch(b) for b in chunked(list(messages), batch_size)))
+        return [reply for replies in batches for reply in replies]
+
+    async def reservar_many(self, reservas: Iterable[Tuple]) -> List[Dict[str, Any]]:
+        """Varias reservas concurrentes: tuplas (slot_id, name[, service])."""
+        return list(await asyncio.gather(*(self.reservar(*r) for r in reservas)))
+
+    async def close(self):
+        await self.pool.close()
+
+    async def __aenter__(self) -> 'AsyncChatClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
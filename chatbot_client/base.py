@@ -0,0 +1,129 @@
+"""
+Piezas compartidas por los clientes sync y async: errores, armado de
+requests y cache de ETags del listado.
+"""
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+# Errores de una conexión keep-alive que el servidor cerró mientras estaba
+# ociosa: la request no llegó a procesarse y se reintenta con otra conexión.
+STALE_CONNECTION_ERRORS = (ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+# Mensajes por request en chat_many (POST /chat/batch-messages); no debe
+# superar CHAT_BATCH_MAX del servidor
+CHAT_BATCH_SIZE = 500
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Parte una lista en bloques de a lo sumo `size` elementos."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class ChatClientError(Exception):
+    """
+    Respuesta de error de la API.
+
+    Attributes:
+        status: Código HTTP
+        payload: Cuerpo JSON de la respuesta (o {})
+        retry_after: Segundos sugeridos por Retry-After (429/503), o None
+    """
+
+    def __init__(self, status: int, payload: Dict[str, Any], retry_after: Optional[float] = None):
+        self.status = status
+        self.payload = payload
+        self.retry_after = retry_after
+        super().__init__(f"HTTP {status}: {payload.get('error') or payload.get('message') or 'error'}")
+
+
+class Response(NamedTuple):
+    """Respuesta HTTP ya leída."""
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+class Target(NamedTuple):
+    """Destino parseado de base_url."""
+    host: str
+    port: int
+    secure: bool
+    prefix: str
+
+
+def parse_base_url(base_url: str) -> Target:
+    """
+    Interpreta la URL base del servidor.
+
+    Args:
+        base_url: Ej. 'http://127.0.0.1:5000' o 'https://turnos.example.com/api'
+
+    Returns:
+        Target con host, puerto, si usa TLS y prefijo de ruta
+    """
+    parts = urlsplit(base_url)
+    if parts.scheme not in ('http', 'https'):
+        raise ValueError(f"Esquema no soportado: {base_url}")
+    secure = parts.scheme == 'https'
+    return Target(parts.hostname or '127.0.0.1', parts.port or (443 if secure else 80), secure,
+                  parts.path.rstrip('/'))
+
+
+def build_path(prefix: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Ruta con prefijo y query string (se omiten los parámetros None)."""
+    query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+    return f"{prefix}{path}?{query}" if query else f"{prefix}{path}"
+
+
+def encode_json(payload: Optional[Dict[str, Any]]) -> Optional[bytes]:
+    return json.dumps(payload).encode('utf-8') if payload is not None else None
+
+
+def check(response: Response, allowed: Tuple[int, ...] = (200,)) -> Any:
+    """
+    Devuelve el JSON de la respuesta o levanta ChatClientError.
+
+    Args:
+        response: Respuesta leída
+        allowed: Códigos considerados exitosos
+    """
+    if response.status in allowed:
+        return response.json()
+    try:
+        payload = response.json() or {}
+    except ValueError:
+        payload = {'error': response.body[:200].decode('utf-8', 'replace')}
+    retry_after = response.headers.get('retry-after')
+    raise ChatClientError(response.status, payload, float(retry_after) if retry_after else None)
+
+
+class ListingCache:
+    """
+    Último listado de /chat/turnos por fecha junto con su ETag.
+
+    El cliente lo envía en If-None-Match; si el servidor responde 304 se
+    reutiliza el listado guardado sin transferirlo de nuevo.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+        self.not_modified = 0
+
+    def headers(self, date: Optional[str]) -> Dict[str, str]:
+        entry = self._entries.get(date or '')
+        return {'If-None-Match': entry[0]} if entry else {}
+
+    def resolve(self, date: Optional[str], response: Response) -> List[Dict[str, Any]]:
+        key = date or ''
+        if response.status == 304 and key in self._entries:
+            self.not_modified += 1
+            return list(self._entries[key][1])
+        turnos = check(response)['turnos']
+        etag = response.headers.get('etag')
+        if etag:
+            self._entries[key] = (etag, turnos)
+        return list(turnos)
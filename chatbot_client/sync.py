@@ -0,0 +1,216 @@
+"""
+Cliente síncrono de la API de turnos sobre http.client con un pool de
+conexiones keep-alive.
+"""
+import http.client
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .base import (
+    CHAT_BATCH_SIZE, STALE_CONNECTION_ERRORS, ListingCache, Response, build_path, check, chunked, encode_json,
+    parse_base_url,
+)
+
+T = TypeVar('T')
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones HTTP/1.1 persistentes a un mismo host.
+
+    Como máximo `size` requests usan el pool a la vez; las conexiones
+    ociosas se reutilizan (la más reciente primero).
+
+    Attributes:
+        connections_opened: Conexiones TCP abiertas desde la creación del pool
+    """
+
+    def __init__(self, host: str, port: int, size: int = 4, timeout: float = 10.0, secure: bool = False):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.secure = secure
+        self.connections_opened = 0
+        self._idle: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _exchange(self, conn: http.client.HTTPConnection, method: str, path: str,
+                  body: Optional[bytes], headers: Dict[str, str]) -> Response:
+        if conn.sock is None:
+            with self._lock:
+                self.connections_opened += 1
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        data = resp.read()
+        return Response(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Envía una request por una conexión del pool.
+
+        Si una conexión reutilizada resulta cerrada por el servidor, la
+        request se reintenta una vez por una conexión nueva.
+        """
+        headers = headers or {}
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection()
+            reused = conn.sock is not None
+            try:
+                try:
+                    response = self._exchange(conn, method, path, body, headers)
+                except STALE_CONNECTION_ERRORS + (http.client.RemoteDisconnected,):
+                    conn.close()
+                    if not reused:
+                        raise
+                    response = self._exchange(conn, method, path, body, headers)
+            except BaseException:
+                conn.close()
+                raise
+            # Si el servidor pidió cerrar, http.client ya cerró el socket y la
+            # próxima request sobre esta conexión abre otro.
+            self._idle.put(conn)
+            return response
+
+    def close(self):
+        """Cierra las conexiones ociosas."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ChatClient:
+    """
+    Cliente de la API REST de turnos.
+
+    Mantiene conexiones keep-alive, envía X-API-Token en las operaciones
+    protegidas y reutiliza el listado de turnos cuando el servidor responde
+    304 a su ETag.
+
+    Uso:
+        with ChatClient('http://127.0.0.1:5000', token='dev-token-123') as client:
+            turnos = client.list_turnos('2026-03-02')
+            client.reservar(turnos[0]['id'], 'Ana', 'Corte')
+
+    Args:
+        base_url: URL del servidor (el prefijo /chat se agrega solo)
+        token: Token de API para reservar/cancelar
+        pool_size: Conexiones simultáneas máximas
+        timeout: Timeout de cada operación de socket (segundos)
+    """
+
+    def __init__(self, base_url: str = 'http://127.0.0.1:5000', token: Optional[str] = None,
+                 pool_size: int = 4, timeout: float = 10.0):
+        target = parse_base_url(base_url)
+        self.prefix = target.prefix + '/chat'
+        self.token = token
+        self.pool_size = pool_size
+        self.pool = ConnectionPool(target.host, target.port, pool_size, timeout, target.secure)
+        self.listing_cache = ListingCache()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                 params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                 auth: bool = False) -> Response:
+        all_headers = {'Accept': 'application/json'}
+        if payload is not None:
+            all_headers['Content-Type'] = 'application/json'
+        if auth and self.token:
+            all_headers['X-API-Token'] = self.token
+        all_headers.update(headers or {})
+        return self.pool.request(method, build_path(self.prefix, path, params), encode_json(payload), all_headers)
+
+    def chat(self, message: str, conversation_id: Optional[str] = None) -> str:
+        """Envía un mensaje al chatbot y devuelve su respuesta (conversation_id: ver POST /chat/)."""
+        payload = {'message': message}
+        if conversation_id is not None:
+            payload['conversation_id'] = conversation_id
+        return check(self._request('POST', '/', payload))['response']
+
+    def chat_batch(self, messages: Iterable[str]) -> List[str]:
+        """Respuestas de un lote de mensajes en una sola request (POST /batch-messages)."""
+        return check(self._request('POST', '/batch-messages', {'messages': list(messages)}))['responses']
+
+    def list_turnos(self, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Lista los turnos disponibles, reutilizando el último listado si el
+        servidor responde 304 a su ETag.
+
+        Args:
+            date: Fecha YYYY-MM-DD o None para todos
+        """
+        response = self._request('GET', '/turnos', params={'date': date},
+                                 headers=self.listing_cache.headers(date))
+        return self.listing_cache.resolve(date, response)
+
+    def resumen(self, date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Turnos libres/reservados por día (GET /chat/turnos/resumen)."""
+        return check(self._request('GET', '/turnos/resumen', params={'from': date_from, 'to': date_to}))['resumen']
+
+    def reservar(self, slot_id: int, name: str, service: str = 'General') -> Dict[str, Any]:
+        """
+        Reserva un turno.
+
+        Returns:
+            {'ok': True} o {'ok': False, 'error': ...} si el turno no está libre
+        """
+        return check(self._request('POST', '/reservar', {'slot_id': slot_id, 'name': name, 'service': service},
+                                   auth=True))
+
+    def cancelar(self, slot_id: Optional[int] = None, name: Optional[str] = None) -> Dict[str, Any]:
+        """Cancela por ID de turno o por nombre del cliente."""
+        payload = {'slot_id': slot_id} if slot_id is not None else {'name': name}
+        return check(self._request('POST', '/cancelar', payload, auth=True))
+
+    def _map(self, fn: Callable[..., T], items: Iterable[Tuple]) -> List[T]:
+        # Operaciones sin endpoint por lotes (o varios lotes): se reparten
+        # entre las conexiones del pool.
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='chat-client')
+        return list(self._executor.map(lambda args: fn(*args), items))
+
+    def chat_many(self, messages: Iterable[str], batch_size: int = CHAT_BATCH_SIZE) -> List[str]:
+        """
+        Respuestas de varios mensajes, en el mismo orden.
+
+        Los mensajes viajan en lotes de `batch_size` por POST /batch-messages;
+        si hay más de un lote, se reparten entre las conexiones del pool.
+        """
+        batches = chunked(list(messages), batch_size)
+        if len(batches) <= 1:
+            return self.chat_batch(batches[0]) if batches else []
+        return [reply for replies in self._map(self.chat_batch, ((b,) for b in batches)) for reply in replies]
+
+    def reservar_many(self, reservas: Iterable[Tuple]) -> List[Dict[str, Any]]:
+        """
+        Varias reservas en paralelo.
+
+        Args:
+            reservas: Tuplas (slot_id, name) o (slot_id, name, service)
+        """
+        return self._map(self.reservar, reservas)
+
+    def close(self):
+        """Cierra las conexiones y el executor de operaciones en lote."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def __enter__(self) -> 'ChatClient':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -3,8 +3,22 @@ Lógica del chatbot y gestión de turnos.
 
 Módulos:
 - processor: Procesamiento de mensajes del usuario mediante palabras clave
+- normalize: Normalización de mensajes y claves (sin tildes ni signos)
+- classifier: Clasificador de intenciones TF-IDF (requiere NumPy, se importa aparte)
+- intents: Corpus etiquetado de intenciones
+- fuzzy: Corrección de errores de tipeo con un índice de borrados
+- dates: Fechas y horarios mencionados en un mensaje (rango + franja horaria)
+- sessions: Estado de conversación acotado (LRU + expiración por inactividad)
+- booking: Diálogo de reserva por chat sobre ReservationService
 - appointments: Gestión de turnos (AppointmentManager)
-- responses: Base de conocimiento de respuestas predefinidas
+- responses: Base de conocimiento de respuestas predefinidas (responses.json)
+- kb_watcher: Recarga en caliente de la base de conocimiento
+- live: Datos en vivo (turnos libres) para las respuestas con plantilla
+- events: Hub en proceso de cambios de disponibilidad
+- async_appointments: Gestor de turnos asíncrono (requiere driver async, se importa aparte)
+
+Los exports se cargan al primer acceso (PEP 562), así el paquete no arrastra
+SQLAlchemy a los modos que sólo usan el procesador.
 
 Uso:
     from chatbot_logic import process_message, AppointmentManager, pretty_slot
@@ -14,13 +28,50 @@ Uso:
     slots = am.list_available()
 """
 
-from .processor import process_message
-from .appointments import AppointmentManager, pretty_slot
-from .responses import RESPONSES
+import importlib
+
+# Los exports se importan al primer uso: `import chatbot_logic.processor` o el
+# CLI por socket no cargan SQLAlchemy/Flask sólo por tocar el paquete.
+_EXPORTS = {
+    'process_message': '.processor',
+    'process_messages': '.processor',
+    'analyze_message': '.processor',
+    'normalize': '.normalize',
+    'extract_when': '.dates',
+    'When': '.dates',
+    'AppointmentManager': '.appointments',
+    'get_manager': '.appointments',
+    'pretty_slot': '.appointments',
+    'RESPONSES': '.responses',
+    'availability_hub': '.events',
+    'SessionStore': '.sessions',
+    'BookingDialog': '.booking',
+    'booking_dialog': '.booking',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'process_message',
+    'process_messages',
+    'analyze_message',
+    'normalize',
+    'extract_when',
+    'When',
     'AppointmentManager',
+    'get_manager',
     'pretty_slot',
-    'RESPONSES'
+    'RESPONSES',
+    'availability_hub',
+    'SessionStore',
+    'BookingDialog',
+    'booking_dialog',
 ]
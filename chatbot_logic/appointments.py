@@ -5,11 +5,26 @@ Refactorizado para usar base de datos en lugar de JSON,
 permitiendo que todas las interfaces compartan los mismos datos.
 """
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import date as date_cls, datetime, timedelta
 from typing import List, Optional, Dict, Any
-from flask import Flask
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
+
+from .events import publish_slot_change
+
+# Horarios generados por día cuando la base está vacía
+SLOT_TIMES = ["10:00", "11:00", "12:00", "14:00", "15:00", "16:00"]
+
+
+def default_db_uri() -> str:
+    """URI de la base SQLite por defecto (instance/appointments.db)."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    instance_dir = os.path.join(repo_root, 'instance')
+    os.makedirs(instance_dir, exist_ok=True)
+    db_path = os.path.join(instance_dir, 'appointments.db')
+    return f'sqlite:///{db_path}'
 
 
 class AppointmentManager:
@@ -41,14 +56,18 @@ class AppointmentManager:
         
         # Si no hay URI, usar SQLite por defecto
         if db_uri is None:
-            repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            instance_dir = os.path.join(repo_root, 'instance')
-            os.makedirs(instance_dir, exist_ok=True)
-            db_path = os.path.join(instance_dir, 'appointments.db')
-            db_uri = f'sqlite:///{db_path}'
+            db_uri = default_db_uri()
         
-        # Crear engine y sesión
-        self.engine = create_engine(db_uri)
+        # Crear engine y sesión. Una base SQLite en memoria existe sólo dentro
+        # de su conexión, así que se comparte una única conexión entre hilos.
+        if db_uri in ('sqlite://', 'sqlite:///:memory:'):
+            self.engine = create_engine(
+                db_uri,
+                connect_args={'check_same_thread': False},
+                poolclass=StaticPool,
+            )
+        else:
+            self.engine = create_engine(db_uri)
         self.SessionLocal = scoped_session(sessionmaker(bind=self.engine))
         
         # Inicializar DB si es necesario
@@ -59,17 +78,7 @@ class AppointmentManager:
 
     def _init_db(self):
         """Crea las tablas si no existen."""
-        from api.db import db
-        
-        # Crear una app Flask temporal para el contexto
-        app = Flask(__name__)
-        app.config['SQLALCHEMY_DATABASE_URI'] = str(self.engine.url)
-        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-        
-        db.init_app(app)
-        
-        with app.app_context():
-            db.create_all()
+        self.db.metadata.create_all(self.engine)
 
     def _ensure_slots(self):
         """Genera slots iniciales si la base está vacía."""
@@ -84,12 +93,11 @@ class AppointmentManager:
 
     def _generate_slots_to_db(self, session, days: int = 7):
         """Genera slots en la base de datos."""
-        times = ["10:00", "11:00", "12:00", "14:00", "15:00", "16:00"]
         today = datetime.now().date()
         
         for d in range(days):
             day = today + timedelta(days=d)
-            for t in times:
+            for t in SLOT_TIMES:
                 dt_str = f"{day.isoformat()} {t}"
                 slot = self.TimeSlot(
                     datetime_str=dt_str,
@@ -120,6 +128,84 @@ class AppointmentManager:
         finally:
             session.close()
 
+    def list_available_between(self, date_from: str, date_to: Optional[str] = None,
+                               time_from: str = '00:00', time_to: str = '23:59',
+                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Lista turnos disponibles en un rango de días y una franja horaria.
+
+        El rango de días es un rango sobre el índice de datetime_str (en
+        lugar del LIKE de list_available); la franja se filtra sobre las
+        filas de ese rango.
+
+        Args:
+            date_from: Primer día (YYYY-MM-DD, inclusive)
+            date_to: Último día (YYYY-MM-DD, inclusive) o None sin límite
+            time_from: Hora mínima (HH:MM, inclusive)
+            time_to: Hora máxima (HH:MM, inclusive)
+            limit: Máximo de turnos a devolver (los más próximos)
+
+        Returns:
+            Lista de diccionarios con información de slots disponibles
+        """
+        TimeSlot = self.TimeSlot
+        session = self.SessionLocal()
+        try:
+            query = session.query(TimeSlot).filter(
+                TimeSlot.datetime_str >= date_from,
+                TimeSlot.customer.is_(None),
+            )
+            if date_to is not None:
+                end = (date_cls.fromisoformat(date_to) + timedelta(days=1)).isoformat()
+                query = query.filter(TimeSlot.datetime_str < end)
+            if (time_from, time_to) != ('00:00', '23:59'):
+                query = query.filter(func.substr(TimeSlot.datetime_str, 12, 5).between(time_from, time_to))
+            query = query.order_by(TimeSlot.datetime_str)
+            if limit is not None:
+                query = query.limit(limit)
+            return [slot.to_dict() for slot in query.all()]
+        finally:
+            session.close()
+
+    def summary_by_day(self, date_from: str, date_to: str) -> List[Dict[str, Any]]:
+        """
+        Cuenta turnos libres y reservados por día.
+
+        La agregación se resuelve en la base con un GROUP BY sobre el rango
+        del índice de datetime_str, sin traer los slots a memoria.
+
+        Args:
+            date_from: Primer día del rango (YYYY-MM-DD, inclusive)
+            date_to: Último día del rango (YYYY-MM-DD, inclusive)
+
+        Returns:
+            Lista ordenada de {'fecha', 'libres', 'reservados', 'total'}.
+            Los días sin slots no aparecen.
+        """
+        end = (date_cls.fromisoformat(date_to) + timedelta(days=1)).isoformat()
+        day = func.substr(self.TimeSlot.datetime_str, 1, 10)
+        session = self.SessionLocal()
+        try:
+            rows = session.query(
+                day.label('fecha'),
+                func.count(self.TimeSlot.id),
+                func.count(self.TimeSlot.customer),
+            ).filter(
+                self.TimeSlot.datetime_str >= date_from,
+                self.TimeSlot.datetime_str < end,
+            ).group_by(day).order_by(day).all()
+            return [
+                {
+                    'fecha': fecha,
+                    'libres': total - reservados,
+                    'reservados': reservados,
+                    'total': total,
+                }
+                for fecha, total, reservados in rows
+            ]
+        finally:
+            session.close()
+
     def list_bookings(self) -> List[Dict[str, Any]]:
         """Lista todos los turnos reservados."""
         session = self.SessionLocal()
@@ -173,7 +259,9 @@ class AppointmentManager:
             
             slot.customer = customer_name
             slot.service = service
+            changed = slot.to_dict()
             session.commit()
+            publish_slot_change(changed)
             return True
         except Exception:
             session.rollback()
@@ -200,7 +288,9 @@ class AppointmentManager:
             
             slot.customer = None
             slot.service = "General"
+            changed = slot.to_dict()
             session.commit()
+            publish_slot_change(changed)
             return True
         except Exception:
             session.rollback()
@@ -225,13 +315,17 @@ class AppointmentManager:
                 .all()
             
             count = 0
+            changed = []
             for slot in slots:
                 slot.customer = None
                 slot.service = "General"
+                changed.append(slot.to_dict())
                 count += 1
             
             if count > 0:
                 session.commit()
+                for item in changed:
+                    publish_slot_change(item)
             
             return count
         except Exception:
@@ -241,6 +335,54 @@ class AppointmentManager:
             session.close()
 
 
+_managers: Dict[Optional[str], AppointmentManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_manager(db_uri: Optional[str] = None) -> AppointmentManager:
+    """
+    Devuelve un AppointmentManager compartido para la URI dada.
+
+    Construir un gestor crea un engine y verifica el esquema, así que los
+    caminos calientes (endpoints HTTP) reutilizan una única instancia por URI
+    en lugar de pagar ese costo en cada request.
+
+    Args:
+        db_uri: URI de la base de datos (None = SQLite por defecto)
+
+    Returns:
+        Instancia compartida de AppointmentManager
+    """
+    am = _managers.get(db_uri)
+    if am is None:
+        with _managers_lock:
+            am = _managers.get(db_uri)
+            if am is None:
+                am = AppointmentManager(db_uri=db_uri)
+                _managers[db_uri] = am
+    return am
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Estado del pool de conexiones de cada gestor compartido (get_manager).
+
+    Returns:
+        {url sin contraseña: {'size', 'checked_out', 'overflow'}}; los pools
+        que no exponen esos valores (ej. StaticPool) quedan vacíos
+    """
+    stats = {}
+    for am in list(_managers.values()):
+        pool = am.engine.pool
+        values = {}
+        for stat, attr in (('size', 'size'), ('checked_out', 'checkedout'), ('overflow', 'overflow')):
+            fn = getattr(pool, attr, None)
+            if callable(fn):
+                values[stat] = fn()
+        stats[am.engine.url.render_as_string(hide_password=True)] = values
+    return stats
+
+
 def pretty_slot(slot: Dict[str, Any]) -> str:
     """
     Formatea un slot para mostrar en texto.
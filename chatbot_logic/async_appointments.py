@@ -0,0 +1,183 @@
+"""
+Gestor de turnos asíncrono sobre SQLAlchemy asyncio.
+
+Misma semántica que AppointmentManager, pero cada operación es una corutina
+que no bloquea el event loop mientras espera a la base de datos. Lo usa el
+modo de servicio ASGI (asgi.py).
+
+Requiere un driver asíncrono: aiosqlite para SQLite o asyncpg para
+PostgreSQL.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.pool import StaticPool
+
+from .appointments import SLOT_TIMES, default_db_uri
+from .events import publish_slot_change
+
+# Driver asíncrono a usar para cada dialecto
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+}
+
+
+def to_async_uri(db_uri: str) -> str:
+    """
+    Convierte una URI de SQLAlchemy a su variante con driver asíncrono.
+
+    Args:
+        db_uri: URI síncrona (ej. sqlite:///x.db, postgresql://...)
+
+    Returns:
+        URI con el driver asíncrono (ej. sqlite+aiosqlite:///x.db)
+
+    Raises:
+        ValueError: Si el dialecto no tiene driver asíncrono configurado
+    """
+    scheme, sep, rest = db_uri.partition('://')
+    dialect = scheme.split('+', 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Sin driver asíncrono para el dialecto '{dialect}'")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+class AsyncAppointmentManager:
+    """
+    Gestor de turnos con API asíncrona.
+
+    Llamar a init() (una vez) antes de usarlo para crear las tablas y los
+    slots iniciales.
+    """
+
+    def __init__(self, db_uri: Optional[str] = None):
+        """
+        Crea el engine asíncrono (sin conectarse todavía).
+
+        Args:
+            db_uri: URI de la base de datos. Si es None, usa sqlite por defecto.
+        """
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from api.models import TimeSlot
+        from api.db import db
+
+        self.TimeSlot = TimeSlot
+        self.db = db
+
+        if db_uri is None:
+            db_uri = default_db_uri()
+
+        if db_uri in ('sqlite://', 'sqlite:///:memory:'):
+            self.engine = create_async_engine(to_async_uri(db_uri), poolclass=StaticPool)
+        else:
+            self.engine = create_async_engine(to_async_uri(db_uri))
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def init(self):
+        """Crea las tablas si no existen y genera slots si la base está vacía."""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(self.db.metadata.create_all)
+
+        async with self.Session() as session:
+            count = await session.scalar(select(func.count(self.TimeSlot.id)))
+            if count == 0:
+                today = datetime.now().date()
+                for d in range(7):
+                    day = today + timedelta(days=d)
+                    for t in SLOT_TIMES:
+                        session.add(self.TimeSlot(
+                            datetime_str=f"{day.isoformat()} {t}",
+                            service="General",
+                            customer=None
+                        ))
+                await session.commit()
+
+    async def dispose(self):
+        """Cierra las conexiones del pool."""
+        await self.engine.dispose()
+
+    async def list_available(self, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Lista turnos disponibles.
+
+        Args:
+            date: Fecha en formato YYYY-MM-DD para filtrar, o None para todos
+
+        Returns:
+            Lista de diccionarios con información de slots disponibles
+        """
+        query = select(self.TimeSlot).where(self.TimeSlot.customer.is_(None))
+        if date:
+            query = query.where(self.TimeSlot.datetime_str.like(f'{date}%'))
+        query = query.order_by(self.TimeSlot.datetime_str)
+
+        async with self.Session() as session:
+            slots = (await session.scalars(query)).all()
+            return [slot.to_dict() for slot in slots]
+
+    async def book(self, slot_id: int, customer_name: str, service: str = "General") -> bool:
+        """
+        Reserva un turno si está libre.
+
+        La condición de disponibilidad va en el mismo UPDATE, así dos
+        reservas concurrentes del mismo slot no pueden ganar ambas.
+
+        Returns:
+            True si se reservó exitosamente, False en caso contrario
+        """
+        async with self.Session() as session:
+            result = await session.execute(
+                update(self.TimeSlot)
+                .where(self.TimeSlot.id == slot_id, self.TimeSlot.customer.is_(None))
+                .values(customer=customer_name, service=service)
+            )
+            if result.rowcount != 1:
+                await session.rollback()
+                return False
+            await session.commit()
+            slot = await session.get(self.TimeSlot, slot_id)
+            publish_slot_change(slot.to_dict())
+            return True
+
+    async def cancel_by_slot(self, slot_id: int) -> bool:
+        """
+        Cancela una reserva por ID de slot.
+
+        Returns:
+            True si se canceló exitosamente, False en caso contrario
+        """
+        async with self.Session() as session:
+            slot = await session.get(self.TimeSlot, slot_id)
+            if not slot or slot.customer is None:
+                return False
+            slot.customer = None
+            slot.service = "General"
+            changed = slot.to_dict()
+            await session.commit()
+            publish_slot_change(changed)
+            return True
+
+    async def cancel_by_customer(self, customer_name: str) -> int:
+        """
+        Cancela todas las reservas a nombre de un cliente.
+
+        Returns:
+            Cantidad de turnos cancelados
+        """
+        async with self.Session() as session:
+            slots = (await session.scalars(
+                select(self.TimeSlot).where(self.TimeSlot.customer.ilike(f'%{customer_name}%'))
+            )).all()
+            changed = []
+            for slot in slots:
+                slot.customer = None
+                slot.service = "General"
+                changed.append(slot.to_dict())
+            if changed:
+                await session.commit()
+                for item in changed:
+                    publish_slot_change(item)
+            return len(changed)
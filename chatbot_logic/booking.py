@@ -0,0 +1,319 @@
+"""
+Diálogo de reserva dentro del chat.
+
+Con un conversation_id el chat recuerda en qué paso está cada conversación
+(chatbot_logic.sessions) y reserva directamente con ReservationService:
+
+    usuario: quiero reservar un turno
+    bot:     ¿Qué servicio querés? ...
+    usuario: corte
+    bot:     Estos son los próximos turnos para Corte: 1) ... 2) ...
+    usuario: 2
+    bot:     ¿A nombre de quién hago la reserva?
+    usuario: Ana
+    bot:     ¡Listo! Reservé tu turno de Corte el 2026-03-02 11:00 a nombre de Ana.
+
+Sólo se crea sesión cuando empieza una reserva: el resto de los mensajes se
+responden como siempre (process_message) sin ocupar memoria. "salir" o
+"cancelar" abandonan el diálogo en cualquier paso.
+
+Si el mensaje pide un día u horario ("¿tenés algo mañana a la tarde?", "el
+viernes a las 15"), la respuesta sale de la consulta de turnos libres en ese
+rango (chatbot_logic.dates) en lugar del texto fijo, con o sin
+conversation_id; en una reserva el rango filtra los turnos ofrecidos.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from common import ALLOWED_SERVICES, Config, setup_logging
+from services import ReservationService
+
+from .dates import When, extract_when
+from .normalize import normalize
+from .processor import analyze_message, process_message
+from .sessions import Session, SessionStore
+
+__all__ = ['BookingDialog', 'booking_dialog', 'sessions']
+
+logger = setup_logging(__name__)
+
+# Intención del corpus que abre el diálogo
+BOOKING_INTENT = 'reservar'
+# Intenciones que, con una fecha u horario, se responden con los turnos libres
+# (None: sin intención clara, ej. "¿tenés algo mañana a la tarde?")
+AVAILABILITY_INTENTS = frozenset({'ver_turnos', BOOKING_INTENT, None})
+# Palabras que abandonan el diálogo en cualquier paso
+ABORT_WORDS = frozenset({'salir', 'cancelar', 'olvidalo', 'dejalo', 'basta'})
+# Servicio por palabra normalizada ("corte" -> "Corte")
+SERVICES = {normalize(s): s for s in ALLOWED_SERVICES}
+SERVICE_LIST = ', '.join(ALLOWED_SERVICES[:-1]) + f' y {ALLOWED_SERVICES[-1]}'
+# Elección de un turno ofrecido: el número solo o con "la", "opción",
+# "por favor"... ("¿y a las 3?" no es la opción 3 sino otro horario)
+OPTION_RE = re.compile(
+    r'^\W*(?:(?:la|el)\s+)?(?:(?:opci[oó]n|n[uú]mero|nro\.?)\s*)?(\d{1,2})\W*(?:por\s+favor|porfa)?\W*$',
+    re.IGNORECASE)
+MAX_NAME_LENGTH = 128
+
+ASK_SERVICE = f"¿Qué servicio querés? Ofrecemos {SERVICE_LIST}."
+ASK_NAME = "¿A nombre de quién hago la reserva?"
+ABORTED = "Listo, no hice ninguna reserva. ¿Te ayudo con algo más?"
+NO_SLOTS = "No quedan turnos disponibles 😕. Probá de nuevo más tarde."
+ASK_DATE = "Decime otro día u horario (o \"salir\")."
+PAST_DATE = "Esa fecha ya pasó 😕."
+
+sessions = SessionStore(Config.SESSION_MAX, Config.SESSION_TTL)
+
+
+def extract_service(text: str) -> Optional[str]:
+    """
+    Servicio mencionado en un mensaje normalizado.
+
+    Args:
+        text: Mensaje normalizado
+
+    Returns:
+        Nombre del servicio (como en ALLOWED_SERVICES) o None
+    """
+    for word in text.split():
+        service = SERVICES.get(word)
+        if service is not None:
+            return service
+    return None
+
+
+def describe(when: When, today: Optional[str] = None) -> str:
+    """
+    Rango pedido en palabras, para las respuestas.
+
+    Args:
+        when: Rango de extract_when()
+        today: Día actual (YYYY-MM-DD, por defecto hoy)
+
+    Returns:
+        Ej. " el 2026-03-06 entre las 13:00 y las 19:59" (vacío si no acota nada)
+    """
+    if when.date_to is None:
+        days = '' if when.date_from == (today or date.today().isoformat()) else f' desde el {when.date_from}'
+    elif when.date_from == when.date_to:
+        days = f' el {when.date_from}'
+    else:
+        days = f' del {when.date_from} al {when.date_to}'
+    if (when.time_from, when.time_to) == ('00:00', '23:59'):
+        hours = ''
+    elif when.time_from == when.time_to:
+        hours = f' a las {when.time_from}'
+    elif when.time_to == '23:59':
+        hours = f' desde las {when.time_from}'
+    elif when.time_from == '00:00':
+        hours = f' hasta las {when.time_to}'
+    else:
+        hours = f' entre las {when.time_from} y las {when.time_to}'
+    return days + hours
+
+
+def has_passed(when: When, now: Optional[datetime] = None) -> bool:
+    """
+    Si el rango pedido terminó antes de ahora (ej. "el 2026-01-05", "hoy a las 10").
+
+    Args:
+        when: Rango de extract_when()
+        now: Momento actual (por defecto datetime.now())
+
+    Returns:
+        True si no queda ningún momento del rango en el futuro
+    """
+    if when.date_to is None:
+        return False
+    now = now or datetime.now()
+    today = now.date().isoformat()
+    return when.date_to < today or (when.date_to == today and when.time_to < now.strftime('%H:%M'))
+
+
+class BookingDialog:
+    """
+    Máquina de estados de la reserva por chat.
+
+    Args:
+        store: Sesiones por conversación
+        service: Servicio de reservas (por defecto el de la BD compartida)
+        offer_slots: Turnos a ofrecer por vez
+    """
+
+    def __init__(self, store: SessionStore, service: Optional[ReservationService] = None,
+                 offer_slots: int = 5):
+        self.store = store
+        self.service = service or ReservationService()
+        self.offer_slots = offer_slots
+
+    def availability(self, message: str) -> Optional[str]:
+        """
+        Turnos libres para el día u horario que pide un mensaje.
+
+        Args:
+            message: Mensaje del usuario
+
+        Returns:
+            Respuesta con los turnos del rango pedido, o None si el mensaje
+            no pide un día u horario (o es de otra intención, como
+            "¿a qué hora abren el sábado?"): se responde con process_message
+        """
+        when = extract_when(message)
+        if when is None:
+            return None
+        intent, _ = analyze_message(message)
+        if intent not in AVAILABILITY_INTENTS:
+            return None
+        return self._availability_reply(when)
+
+    def _upcoming(self, date_from: str, date_to: Optional[str] = None,
+                  time_from: str = '00:00', time_to: str = '23:59') -> List[Dict[str, Any]]:
+        """
+        Próximos turnos libres del rango, sin los de días anteriores ni los
+        de hoy que ya pasaron.
+
+        La franja horaria de list_available_between vale para cada día, así
+        que la hora actual sólo acota el día de hoy (como en chatbot_logic.live).
+        """
+        now = datetime.now()
+        today = now.date()
+        day = today.isoformat()
+        if date_to is not None and date_to < day:
+            return []  # rango pasado: sus turnos libres ya no se pueden tomar
+        if date_from > day:
+            return self.service.list_available_between(date_from, date_to, time_from, time_to,
+                                                       limit=self.offer_slots)
+        slots = self.service.list_available_between(day, day, max(time_from, now.strftime('%H:%M')), time_to,
+                                                    limit=self.offer_slots)
+        if len(slots) < self.offer_slots and date_to != day:
+            tomorrow = (today + timedelta(days=1)).isoformat()
+            slots += self.service.list_available_between(tomorrow, date_to, time_from, time_to,
+                                                         limit=self.offer_slots - len(slots))
+        return slots
+
+    def _find_slots(self, when: When) -> Tuple[List[Dict[str, Any]], bool]:
+        """Turnos libres del rango; si a esa hora no hay, los de esos días (False)."""
+        slots = self._upcoming(*when)
+        if slots or (when.time_from, when.time_to) == ('00:00', '23:59'):
+            return slots, True
+        return self._upcoming(when.date_from, when.date_to), False
+
+    def _availability_reply(self, when: When) -> str:
+        if has_passed(when):
+            return f"{PAST_DATE} ¿Probamos otro día?"
+        slots, exact = self._find_slots(when)
+        if not slots:
+            return f"No tengo turnos libres{describe(when)} 😕. ¿Probamos otro día?"
+        listing = '\n'.join(f"• {slot['datetime']}" for slot in slots)
+        if exact:
+            return f"Tengo estos turnos libres{describe(when)}:\n{listing}"
+        return f"No tengo turnos libres{describe(when)}, pero sí estos:\n{listing}"
+
+    def handle(self, conversation_id: str, message: str) -> str:
+        """
+        Responde un mensaje dentro de una conversación.
+
+        Args:
+            conversation_id: Id de la conversación
+            message: Mensaje del usuario
+
+        Returns:
+            Respuesta del bot
+        """
+        session = self.store.get(conversation_id)
+        if session is None or session.state is None:
+            intent, reply = analyze_message(message)
+            when = extract_when(message)
+            if intent != BOOKING_INTENT:
+                if when is not None and intent in AVAILABILITY_INTENTS:
+                    return self._availability_reply(when)
+                return reply
+            session = self.store.create(conversation_id)
+            session.intent = intent
+            session.date = when
+            session.service = extract_service(normalize(message))
+            if session.service is None:
+                session.state = 'service'
+                return ASK_SERVICE
+            return self._offer(conversation_id, session)
+
+        text = normalize(message)
+        if text in ABORT_WORDS:
+            self.store.discard(conversation_id)
+            return ABORTED
+
+        if session.state == 'service':
+            session.service = extract_service(text)
+            session.date = extract_when(message) or session.date
+            if session.service is None:
+                return f"No conozco ese servicio. {ASK_SERVICE}"
+            return self._offer(conversation_id, session)
+
+        if session.state == 'date':
+            when = extract_when(message)
+            if when is None:
+                return ASK_DATE
+            session.date = when
+            return self._offer(conversation_id, session)
+
+        if session.state == 'slot':
+            match = OPTION_RE.match(message)
+            option = int(match.group(1)) if match else 0
+            count = len(session.offered) // 2
+            if not 1 <= option <= count:
+                # "¿y el jueves?": se ofrecen los turnos del nuevo rango
+                when = extract_when(message)
+                if when is not None:
+                    session.date = when
+                    return self._offer(conversation_id, session)
+                return f"Respondé con un número del 1 al {count} (o \"salir\")."
+            session.slot_id, session.slot_time = session.offered[2 * option - 2:2 * option]
+            session.state = 'name'
+            return ASK_NAME
+
+        if session.state == 'name':
+            name = message.strip()
+            if not name or len(name) > MAX_NAME_LENGTH:
+                return ASK_NAME
+            if not self.service.book(session.slot_id, name, session.service):
+                return "Ese turno ya no está disponible. " + self._offer(conversation_id, session)
+            reply = (f"¡Listo! Reservé tu turno de {session.service} el {session.slot_time} "
+                     f"a nombre de {name}.")
+            logger.info("Reserva por chat: turno %s (%s)", session.slot_id, session.service)
+            self.store.discard(conversation_id)
+            return reply
+
+        # Estado desconocido (no debería pasar): se empieza de nuevo
+        self.store.discard(conversation_id)
+        return process_message(message)
+
+    def _offer(self, conversation_id: str, session: Session) -> str:
+        """Lista los próximos turnos libres (del rango pedido) y pasa a esperar la elección."""
+        when = session.date
+        if when is None:
+            slots = self._upcoming(date.today().isoformat())
+            exact = True
+        elif has_passed(when):
+            session.state = 'date'
+            return f"{PAST_DATE} {ASK_DATE}"
+        else:
+            slots, exact = self._find_slots(when)
+        if not slots:
+            if when is None:
+                self.store.discard(conversation_id)
+                return NO_SLOTS
+            session.state = 'date'
+            return f"No tengo turnos libres{describe(when)} 😕. {ASK_DATE}"
+        session.offered = tuple(value for slot in slots for value in (int(slot['id']), slot['datetime']))
+        session.state = 'slot'
+        options = '\n'.join(f"{i}) {slot['datetime']}" for i, slot in enumerate(slots, 1))
+        if when is None:
+            intro = f"Estos son los próximos turnos para {session.service}"
+        elif exact:
+            intro = f"Estos son los turnos para {session.service}{describe(when)}"
+        else:
+            intro = f"No tengo turnos libres{describe(when)}, pero para {session.service} hay estos"
+        return f"{intro}:\n{options}\nRespondé con el número de opción."
+
+
+booking_dialog = BookingDialog(sessions, offer_slots=Config.BOOKING_OFFER_SLOTS)
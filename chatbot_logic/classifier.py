@@ -0,0 +1,291 @@
+"""
+Clasificador de intenciones con TF-IDF de n-gramas de caracteres.
+
+Cada frase de ejemplo del corpus (chatbot_logic.intents) se convierte en un
+vector TF-IDF de n-gramas de caracteres (2 a 4, con los bordes de palabra
+marcados por espacios), normalizado a norma 1. Un mensaje se vectoriza igual
+y su similitud coseno contra todos los ejemplos es un producto de matrices;
+el puntaje de cada intención es el del ejemplo más parecido.
+
+Los n-gramas de caracteres toleran variantes que la búsqueda por palabra
+clave no encuentra ("cuanto sale", "cuanto cobran", "me anotas").
+
+El modelo armado se guarda en disco (Config.INTENT_MODEL_PATH) junto con una
+huella del corpus; si el corpus no cambió, el siguiente arranque lo carga en
+lugar de recalcularlo.
+
+Requiere NumPy (opcional): sin NumPy load_classifier() devuelve None y el
+procesador usa sólo las palabras clave.
+"""
+import hashlib
+import json
+import math
+import os
+from collections import Counter
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from common import Config, setup_logging
+
+from .normalize import normalize
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+logger = setup_logging(__name__)
+
+NGRAM_SIZES = (2, 3, 4)
+# Cambiar si cambia la forma de vectorizar: invalida los modelos en disco
+MODEL_VERSION = 1
+# Mensajes por bloque en classify_many (acota la matriz densa en memoria)
+BATCH_CHUNK = 512
+# Por debajo de este tamaño de lote conviene sumar filas mensaje por mensaje
+# (classify) en lugar de armar la matriz densa
+DENSE_MIN_BATCH = 16
+
+
+def _ngrams(text: str) -> List[str]:
+    padded = f' {text} '
+    return [padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)]
+
+
+def corpus_fingerprint(corpus: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Huella del corpus y de los parámetros del modelo.
+
+    Args:
+        corpus: Dict intención -> {'examples': [...], ...}
+
+    Returns:
+        sha256 en hexadecimal
+    """
+    payload = json.dumps({'version': MODEL_VERSION, 'ngrams': NGRAM_SIZES,
+                          'examples': {k: v['examples'] for k, v in corpus.items()}},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IntentClassifier:
+    """
+    Modelo TF-IDF ya armado.
+
+    Args:
+        intents: Nombre de cada intención, en el orden de la matriz
+        vocabulary: n-grama -> columna
+        idf: Peso IDF por columna
+        matrix: Vectores de los ejemplos (una fila por ejemplo, norma 1),
+            agrupados por intención
+        starts: Fila donde empiezan los ejemplos de cada intención
+    """
+
+    def __init__(self, intents: Sequence[str], vocabulary: Dict[str, int],
+                 idf: 'np.ndarray', matrix: 'np.ndarray', starts: 'np.ndarray'):
+        self.intents = list(intents)
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.starts = starts
+        self.matrix = matrix
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, value: 'np.ndarray') -> None:
+        self._matrix = value
+        # Una fila por n-grama: un mensaje suelto sólo suma las filas de sus n-gramas
+        self._by_gram = np.ascontiguousarray(value.T)
+
+    @classmethod
+    def build(cls, corpus: Dict[str, Dict[str, Any]]) -> 'IntentClassifier':
+        """
+        Arma el modelo a partir del corpus etiquetado.
+
+        Args:
+            corpus: Dict intención -> {'examples': [...], ...}
+
+        Returns:
+            IntentClassifier listo para clasificar
+        """
+        intents, starts, documents = [], [], []
+        for intent, spec in corpus.items():
+            examples = [e for e in (normalize(x) for x in spec['examples']) if e]
+            if not examples:
+                continue
+            intents.append(intent)
+            starts.append(len(documents))
+            documents.extend(examples)
+
+        df: Counter = Counter()
+        for text in documents:
+            df.update(set(_ngrams(text)))
+        grams = sorted(df)
+        vocabulary = {gram: col for col, gram in enumerate(grams)}
+        n_docs = len(documents)
+        idf = np.array([math.log((1 + n_docs) / (1 + df[g])) + 1 for g in grams], dtype=np.float32)
+
+        classifier = cls(intents, vocabulary, idf, np.zeros((0, len(vocabulary)), dtype=np.float32),
+                         np.array(starts, dtype=np.intp))
+        classifier.matrix = classifier._vectorize(documents)
+        return classifier
+
+    def _vectorize(self, texts: Sequence[str]) -> 'np.ndarray':
+        """Matriz TF-IDF (una fila por texto, norma 1)."""
+        width = len(self.vocabulary)
+        # Todos los n-gramas del lote en una lista: la búsqueda en el
+        # vocabulario y el conteo quedan en C (map + np.unique)
+        grams: List[str] = []
+        lengths = []
+        for text in texts:
+            text_grams = _ngrams(text)
+            grams.extend(text_grams)
+            lengths.append(len(text_grams))
+        out = np.zeros((len(texts), width), dtype=np.float32)
+        cols = np.fromiter(map(self.vocabulary.get, grams, repeat(-1)), dtype=np.int64, count=len(grams))
+        # Una celda por aparición de n-grama conocido: fila * ancho + columna
+        cells = np.repeat(np.arange(len(texts), dtype=np.int64) * width, lengths) + cols
+        cells = cells[cols >= 0]
+        if cells.size:
+            cells, counts = np.unique(cells, return_counts=True)
+            # TF sublineal: 1 + log(tf)
+            out.flat[cells] = (1.0 + np.log(counts.astype(np.float32))) * self.idf[cells % width]
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+    def scores(self, texts: Sequence[str]) -> 'np.ndarray':
+        """
+        Similitud de cada mensaje contra cada intención.
+
+        Args:
+            texts: Mensajes ya normalizados
+
+        Returns:
+            Matriz (mensajes x intenciones) con el coseno del mejor ejemplo
+        """
+        similarity = self._vectorize(texts) @ self.matrix.T
+        return np.maximum.reduceat(similarity, self.starts, axis=1)
+
+    def classify_many(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """
+        Clasifica un lote de mensajes.
+
+        Args:
+            texts: Mensajes ya normalizados
+
+        Returns:
+            [(intención, confianza)] en el mismo orden; la confianza es el
+            coseno contra el ejemplo más parecido (0 a 1)
+        """
+        if len(texts) < DENSE_MIN_BATCH:
+            return [self.classify(t) for t in texts]
+        results: List[Tuple[str, float]] = []
+        intents = self.intents
+        for start in range(0, len(texts), BATCH_CHUNK):
+            scores = self.scores(texts[start:start + BATCH_CHUNK])
+            best = scores.argmax(axis=1)
+            confidence = scores[np.arange(len(best)), best]
+            results.extend(zip([intents[i] for i in best.tolist()], confidence.tolist()))
+        return results
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """
+        Clasifica un mensaje.
+
+        Args:
+            text: Mensaje ya normalizado
+
+        Returns:
+            (intención, confianza)
+        """
+        counts = Counter(col for col in map(self.vocabulary.get, _ngrams(text)) if col is not None)
+        if not counts:
+            return self.intents[0], 0.0
+        cols = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self.idf[cols]
+        weights /= np.sqrt(weights @ weights)
+        scores = np.maximum.reduceat(weights @ self._by_gram[cols], self.starts)
+        best = int(scores.argmax())
+        return self.intents[best], float(scores[best])
+
+    def save(self, path: str, fingerprint: str) -> None:
+        """
+        Guarda el modelo en un .npz (escritura atómica).
+
+        Args:
+            path: Ruta del archivo
+            fingerprint: Huella del corpus con el que se armó
+        """
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fh:
+            np.savez(fh, fingerprint=np.array(fingerprint), intents=np.array(self.intents),
+                     vocabulary=np.array(vocabulary), idf=self.idf, matrix=self.matrix,
+                     starts=self.starts)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str) -> Optional['IntentClassifier']:
+        """
+        Carga un modelo guardado con save().
+
+        Args:
+            path: Ruta del archivo
+            fingerprint: Huella esperada del corpus
+
+        Returns:
+            El modelo, o None si no existe, no se puede leer o es de otro corpus
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['fingerprint']) != fingerprint:
+                    return None
+                vocabulary = {gram: col for col, gram in enumerate(data['vocabulary'].tolist())}
+                return cls(data['intents'].tolist(), vocabulary, data['idf'],
+                           data['matrix'], data['starts'])
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def load_classifier(corpus: Optional[Dict[str, Dict[str, Any]]] = None,
+                    cache_path: Optional[str] = None) -> Optional[IntentClassifier]:
+    """
+    Devuelve el clasificador, leyéndolo del cache en disco si está vigente.
+
+    Args:
+        corpus: Corpus etiquetado (por defecto chatbot_logic.intents.INTENTS)
+        cache_path: Archivo .npz del modelo (por defecto Config.INTENT_MODEL_PATH;
+            cadena vacía para no usar disco)
+
+    Returns:
+        IntentClassifier, o None si NumPy no está instalado
+    """
+    if np is None:
+        logger.warning("NumPy no está instalado: clasificador de intenciones deshabilitado")
+        return None
+    if corpus is None:
+        from .intents import INTENTS
+        corpus = INTENTS
+    if cache_path is None:
+        cache_path = Config.INTENT_MODEL_PATH
+
+    fingerprint = corpus_fingerprint(corpus)
+    if cache_path:
+        classifier = IntentClassifier.load(cache_path, fingerprint)
+        if classifier is not None:
+            logger.debug("Modelo de intenciones cargado de %s", cache_path)
+            return classifier
+
+    classifier = IntentClassifier.build(corpus)
+    logger.info("Modelo de intenciones armado: %d intenciones, %d n-gramas",
+                len(classifier.intents), len(classifier.vocabulary))
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            classifier.save(cache_path, fingerprint)
+        except OSError as e:
+            logger.warning("No se pudo guardar el modelo de intenciones: %s", e)
+    return classifier
+
@@ -0,0 +1,247 @@
+"""
+Fechas y horarios mencionados en un mensaje en castellano.
+
+Reconoce días relativos ("hoy", "mañana", "pasado mañana", "esta semana",
+"el finde"), días de la semana ("el viernes", "el próximo lunes"), fechas
+("el 15", "15/3", "15 de marzo", "2026-03-15"), franjas ("a la tarde",
+"esta noche", "al mediodía") y horas ("a las 15", "15:30 hs", "a las 3 de
+la tarde", "después de las 14", "entre las 10 y las 12") y los resume en un
+rango de fechas y una ventana horaria (When) que va directo a la consulta
+de turnos libres (AppointmentManager.list_available_between):
+
+    "¿tenés algo mañana a la tarde?" -> When('2026-03-03', '2026-03-03', '13:00', '19:59')
+    "el viernes a las 15"            -> When('2026-03-06', '2026-03-06', '15:00', '15:00')
+
+Todo el reconocimiento es una sola expresión regular compilada al importar
+y probada sólo donde empieza un número o una palabra que puede abrir una
+mención, sobre el mensaje normalizado (sin tildes, con dígitos): unos pocos
+microsegundos por mensaje.
+"""
+import re
+from datetime import date, timedelta
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from .normalize import translation_table
+
+__all__ = ['When', 'extract_when']
+
+# Como normalize(), pero conservando lo que hace falta para fechas y horas
+_TABLE = translation_table('0123456789:/-')
+
+WEEKDAYS = {'lunes': 0, 'martes': 1, 'miercoles': 2, 'jueves': 3, 'viernes': 4, 'sabado': 5, 'domingo': 6}
+MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+}
+# Ventana horaria de cada franja del día
+DAYPARTS = {
+    'mañana': ('08:00', '12:59'),
+    'mediodia': ('12:00', '14:59'),
+    'tarde': ('13:00', '19:59'),
+    'noche': ('20:00', '23:59'),
+}
+# Sin "de la mañana" ni "am", las horas de 1 a 7 son de la tarde ("a las 3" -> 15:00)
+PM_BEFORE = 8
+# Ventana horaria de un día completo
+_FULL_DAY = ('00:00', '23:59')
+
+_PATTERN = re.compile(r"""
+    (?:
+        (?P<iso>(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2}))
+      | (?P<dm>(?P<dm_d>\d{1,2})/(?P<dm_m>\d{1,2})(?:/(?P<dm_y>\d{4}|\d{2}))?)
+      | (?P<dmonth>(?P<dmonth_d>\d{1,2})\s(?:de\s)?(?P<dmonth_m>%(months)s))
+      | (?P<dom>el\s(?P<dom_d>\d{1,2})(?![/-]|\s?(?::|hs?\b|horas\b|de\sla\b|y\s(?:media|cuarto)\b)
+            |\s(?:de\s)?(?:%(months)s)\b))
+      | (?P<time>
+            (?:(?P<tmod>a\spartir\sde\slas?|despues\sde\slas?|desde\slas?|antes\sde\slas?|hasta\slas?
+                |entre\slas?|y\slas?|a\slas?|tipo|las?)\s)?
+            (?P<hour>\d{1,2})(?::(?P<minute>\d{2})|\sy\s(?P<frac>media|cuarto))?
+            (?:\s?(?P<suffix>hs|h|horas|am|pm)\b)?
+            (?:\sde\sla\s(?P<tpart>mañana|tarde|noche))?
+        )
+      | (?P<tonight>esta\s(?P<tonight_part>mañana|tarde|noche))
+      | (?P<daypart>(?:a|por|en|de)\sla\s(?P<part_la>mañana|tarde|noche)
+            |(?:a|por|de)\s(?P<part>tarde|noche)|(?:al\s)?(?P<noon>mediodia))
+      | (?P<rel>pasado\smañana|hoy|mañana)
+      | (?P<weekday>(?:(?P<wd_next>proximo|otro)\s)?(?P<wd>%(weekdays)s)s?(?P<wd_after>\sque\sviene|\sproximo)?)
+      | (?P<weekend>fin\sde\ssemana|finde)
+      | (?P<week>esta\ssemana|(?:la\s)?semana\sque\sviene|(?:la\s)?proxima\ssemana)
+    )(?!\w)
+""" % {'months': '|'.join(MONTHS), 'weekdays': '|'.join(WEEKDAYS)}, re.VERBOSE)
+# Palabras con las que puede empezar una mención (además de los números).
+# Probar la expresión sólo en esas palabras es mucho más barato que
+# finditer(), que la intenta en cada posición del mensaje.
+_START_WORDS = frozenset({
+    'el', 'a', 'despues', 'desde', 'antes', 'hasta', 'entre', 'y', 'tipo', 'la', 'las',
+    'esta', 'por', 'en', 'de', 'al', 'mediodia', 'pasado', 'hoy', 'mañana', 'proximo',
+    'proxima', 'otro', 'fin', 'finde', 'semana',
+}) | frozenset(WEEKDAYS) | frozenset(f'{day}s' for day in WEEKDAYS)
+
+
+class When(NamedTuple):
+    """
+    Rango de fechas y ventana horaria pedidos en un mensaje.
+
+    Attributes:
+        date_from: Primer día (YYYY-MM-DD)
+        date_to: Último día inclusive (YYYY-MM-DD) o None si no hay límite
+        time_from: Hora mínima (HH:MM)
+        time_to: Hora máxima inclusive (HH:MM)
+    """
+    date_from: str
+    date_to: Optional[str]
+    time_from: str = '00:00'
+    time_to: str = '23:59'
+
+
+def _resolve_date(year: Optional[int], month: Optional[int], day: int, today: date) -> Optional[date]:
+    """Fecha con los campos faltantes completados hacia adelante (la próxima que exista)."""
+    try:
+        if year is not None:
+            return date(year, month, day)
+        if month is not None:
+            found = date(today.year, month, day)
+            return found if found >= today else date(today.year + 1, month, day)
+        if day >= today.day:
+            return date(today.year, today.month, day)
+        month = today.month % 12 + 1
+        return date(today.year + (month == 1), month, day)
+    except ValueError:
+        return None
+
+
+def _date_range(m: 're.Match', kind: str, today: date) -> Optional[Tuple[date, date]]:
+    """Rango de días de una mención de fecha."""
+    if kind == 'rel':
+        text = m['rel']
+        offset = 0 if text == 'hoy' else 2 if text.startswith('pasado') else 1
+        day = today + timedelta(days=offset)
+        return day, day
+    if kind == 'tonight':
+        return today, today
+    if kind == 'weekday':
+        ahead = (WEEKDAYS[m['wd']] - today.weekday()) % 7
+        if ahead == 0 and (m['wd_next'] or m['wd_after']):
+            ahead = 7
+        day = today + timedelta(days=ahead)
+        return day, day
+    if kind == 'weekend':
+        if today.weekday() == 6:
+            return today, today
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+        return saturday, saturday + timedelta(days=1)
+    if kind == 'week':
+        monday = today - timedelta(days=today.weekday())
+        if m['week'] != 'esta semana':
+            monday += timedelta(days=7)
+            return monday, monday + timedelta(days=6)
+        return today, monday + timedelta(days=6)
+
+    if kind == 'iso':
+        day = _resolve_date(int(m['iso_y']), int(m['iso_m']), int(m['iso_d']), today)
+    elif kind == 'dm':
+        year = m['dm_y']
+        if year is not None:
+            year = int(year) + (2000 if len(year) == 2 else 0)
+        day = _resolve_date(year, int(m['dm_m']), int(m['dm_d']), today)
+    elif kind == 'dmonth':
+        day = _resolve_date(None, MONTHS[m['dmonth_m']], int(m['dmonth_d']), today)
+    else:
+        day = _resolve_date(None, None, int(m['dom_d']), today)
+    return (day, day) if day is not None else None
+
+
+def _clock(m: 're.Match') -> Optional[str]:
+    """HH:MM de una mención de hora, o None si no es una hora válida."""
+    hour = int(m['hour'])
+    frac = m['frac']
+    minute = 30 if frac == 'media' else 15 if frac == 'cuarto' else int(m['minute'] or 0)
+    suffix, part = m['suffix'], m['tpart']
+    if hour < 12 and (suffix == 'pm' or part in ('tarde', 'noche')):
+        hour += 12
+    elif suffix != 'am' and part != 'mañana' and 1 <= hour < PM_BEFORE:
+        hour += 12
+    if hour > 23 or minute > 59:
+        return None
+    return f'{hour:02d}:{minute:02d}'
+
+
+def _mentions(text: str) -> Iterator['re.Match']:
+    """Menciones de fecha u hora de un texto ya normalizado, en orden."""
+    match = _PATTERN.match
+    pos = end = 0
+    for word in text.split(' '):
+        if pos >= end and (word in _START_WORDS or word[:1].isdigit()):
+            m = match(text, pos)
+            if m is not None:
+                end = m.end()
+                yield m
+        pos += len(word) + 1
+
+
+def extract_when(text: str, today: Optional[date] = None) -> Optional[When]:
+    """
+    Fecha y horario pedidos en un mensaje.
+
+    Args:
+        text: Mensaje del usuario (sin normalizar)
+        today: Día de referencia para "hoy", "mañana", "el viernes"...
+            (por defecto date.today())
+
+    Returns:
+        When con el rango pedido, o None si el mensaje no menciona fechas
+        ni horarios. Sin fecha el rango empieza hoy y no tiene fin; sin
+        horario la ventana es el día completo. Varias fechas ("el viernes
+        o el sábado") se unen en un solo rango.
+    """
+    text = ' '.join(text.translate(_TABLE).split())
+    if today is None:
+        today = date.today()
+    first: Optional[date] = None
+    last: Optional[date] = None
+    time_from: Optional[str] = None
+    time_to: Optional[str] = None
+    part: Optional[str] = None
+    between = False
+
+    for m in _mentions(text):
+        kind = m.lastgroup
+        if kind == 'time':
+            tmod = m['tmod']
+            if not (tmod or m['minute'] or m['frac'] or m['suffix'] or m['tpart'] or between):
+                continue  # un número suelto ("la opción 2") no es una hora
+            clock = _clock(m)
+            if clock is None:
+                continue
+            modifier = tmod.split(' ', 1)[0] if tmod else ''
+            if modifier in ('despues', 'desde') or tmod and tmod.startswith('a partir'):
+                time_from = clock
+            elif modifier in ('antes', 'hasta'):
+                time_to = clock
+            elif modifier == 'entre':
+                time_from, between = clock, True
+            elif between:
+                time_to, between = clock, False
+            else:
+                time_from = time_to = clock
+            continue
+        if kind == 'daypart':
+            part = m['part_la'] or m['part'] or 'mediodia'
+            continue
+        if kind == 'tonight':
+            part = m['tonight_part']
+        span = _date_range(m, kind, today)
+        if span is not None:
+            first = span[0] if first is None else min(first, span[0])
+            last = span[1] if last is None else max(last, span[1])
+
+    if first is None and time_from is None and time_to is None and part is None:
+        return None
+    if time_from is None and time_to is None and part is not None:
+        time_from, time_to = DAYPARTS[part]
+    return When(
+        date_from=(first or today).isoformat(),
+        date_to=last.isoformat() if last is not None else None,
+        time_from=time_from or _FULL_DAY[0],
+        time_to=time_to or _FULL_DAY[1],
+    )
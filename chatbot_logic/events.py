@@ -0,0 +1,150 @@
+"""
+Hub en proceso de cambios de disponibilidad.
+
+AppointmentManager publica aquí cada reserva y cancelación; los suscriptores
+(por ejemplo el stream SSE de la API) reciben los cambios sin consultar la
+base de datos. Un backlog acotado permite reanudar un stream desde el último
+evento visto (Last-Event-ID).
+"""
+import queue
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+
+class Subscription:
+    """
+    Suscripción a un AvailabilityHub.
+
+    Attributes:
+        replay: Eventos del backlog posteriores al Last-Event-ID pedido
+        reset: True si el cliente perdió eventos y debe recargar el listado
+        last_id: Id del último evento publicado al momento de suscribirse
+    """
+
+    def __init__(self, queue_size: int):
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.replay: List[Dict[str, Any]] = []
+        self.reset = False
+        self.last_id = 0
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Espera el próximo evento.
+
+        Args:
+            timeout: Segundos a esperar antes de devolver None
+
+        Returns:
+            Evento o None si venció el timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _push(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Suscriptor lento: se descartan sus eventos pendientes y se le
+            # indica que recargue, en lugar de bloquear al publicador.
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            self._queue.put_nowait({'id': event['id'], 'event': 'reset', 'data': {}})
+
+
+class AvailabilityHub:
+    """
+    Fan-out de eventos de disponibilidad a todos los suscriptores del proceso.
+
+    Cada evento es un diccionario {'id': int, 'event': str, 'data': dict}
+    con ids crecientes.
+    """
+
+    def __init__(self, backlog: int = 1000, queue_size: int = 256):
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._backlog: Deque[Dict[str, Any]] = deque(maxlen=backlog)
+        self._subscribers: Set[Subscription] = set()
+        self._queue_size = queue_size
+
+    @property
+    def last_id(self) -> int:
+        """Id del último evento publicado."""
+        return self._last_id
+
+    def publish(self, event: str, data: Dict[str, Any]) -> int:
+        """
+        Publica un evento a todos los suscriptores.
+
+        Args:
+            event: Tipo de evento (ej. 'slot')
+            data: Contenido del evento
+
+        Returns:
+            Id asignado al evento
+        """
+        with self._lock:
+            self._last_id += 1
+            item = {'id': self._last_id, 'event': event, 'data': data}
+            self._backlog.append(item)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub._push(item)
+        return item['id']
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Registra un suscriptor nuevo.
+
+        Args:
+            last_event_id: Último id recibido por el cliente, para reanudar
+
+        Returns:
+            Subscription con los eventos a reenviar en replay, o con reset
+            si el cliente perdió eventos o su id es de otro proceso
+        """
+        sub = Subscription(self._queue_size)
+        with self._lock:
+            if last_event_id is not None and last_event_id > self._last_id:
+                # Los ids vuelven a 1 en cada proceso: un id mayor al último es
+                # de antes de un reinicio y su listado puede estar desactualizado
+                sub.reset = True
+            elif last_event_id is not None and last_event_id < self._last_id:
+                oldest = self._backlog[0]['id'] if self._backlog else self._last_id + 1
+                if last_event_id < oldest - 1:
+                    sub.reset = True
+                else:
+                    sub.replay = [e for e in self._backlog if e['id'] > last_event_id]
+            sub.last_id = self._last_id
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        """Elimina un suscriptor."""
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self) -> int:
+        """Cantidad de suscriptores activos."""
+        return len(self._subscribers)
+
+
+# Hub compartido por el proceso
+availability_hub = AvailabilityHub()
+
+
+def publish_slot_change(slot: Dict[str, Any]) -> int:
+    """
+    Publica el nuevo estado de un slot tras una reserva o cancelación.
+
+    Args:
+        slot: Slot en formato to_dict()
+
+    Returns:
+        Id del evento
+    """
+    data = dict(slot)
+    data['estado'] = 'libre' if slot.get('customer') is None else 'reservado'
+    return availability_hub.publish('slot', data)
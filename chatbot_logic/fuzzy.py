@@ -0,0 +1,227 @@
+"""
+Corrección de errores de tipeo con un índice de borrados (estilo SymSpell).
+
+Para cada palabra del vocabulario se precalculan todas las variantes con
+hasta `max_distance` letras borradas. Una palabra desconocida genera sus
+propios borrados y los candidatos son las palabras del vocabulario que
+comparten alguno; sólo esos pocos candidatos se comparan con distancia de
+edición (Damerau-Levenshtein restringida: inserción, borrado, sustitución y
+transposición de letras vecinas). El costo de una búsqueda depende de
+cuántas palabras parecidas hay, no del tamaño del vocabulario.
+
+La distancia permitida depende del largo de la palabra para no "corregir"
+palabras cortas que simplemente no están en el vocabulario:
+
+    hasta 3 letras  -> sin corrección
+    4 a 7 letras    -> 1 ("turmo" -> "turno", "resevar" -> "reservar")
+    8 o más         -> 2 ("cancelsr" -> "cancelar")
+"""
+from typing import Dict, Iterable, List, Optional, Set
+
+__all__ = ['FuzzyIndex', 'edit_distance']
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distancia de Damerau-Levenshtein restringida, cortando al superar `limit`.
+
+    Args:
+        a: Primera palabra
+        b: Segunda palabra
+        limit: Distancia máxima de interés
+
+    Returns:
+        La distancia, o limit + 1 si es mayor que limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev_prev: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev_prev[j - 2] + 1)
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        prev_prev, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _delete_levels(word: str, distance: int) -> List[Set[str]]:
+    """Variantes con exactamente 1, 2, ... `distance` letras borradas."""
+    levels = []
+    current = {word}
+    for _ in range(distance):
+        current = {v[:i] + v[i + 1:] for v in current if len(v) > 1 for i in range(len(v))}
+        levels.append(current)
+    return levels
+
+
+def allowed_distance(word: str, max_distance: int) -> int:
+    """Distancia de edición permitida para una palabra según su largo."""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 7:
+        return min(1, max_distance)
+    return min(2, max_distance)
+
+
+class FuzzyIndex:
+    """
+    Índice de borrados sobre un vocabulario.
+
+    Args:
+        words: Palabras del vocabulario (las repetidas cuentan como más
+            frecuentes y ganan los empates)
+        max_distance: Distancia de edición máxima (0 desactiva la corrección)
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = 2):
+        self.max_distance = max_distance
+        self.frequency: Dict[str, int] = {}
+        for word in words:
+            self.frequency[word] = self.frequency.get(word, 0) + 1
+        self._index: Dict[str, List[str]] = {}
+        index = self._index
+        for word in self.frequency:
+            for variant in self._variants(word):
+                bucket = index.get(variant)
+                if bucket is None:
+                    index[variant] = [word]
+                else:
+                    bucket.append(word)
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    def _variants(self, word: str) -> Set[str]:
+        # borrados de una palabra del vocabulario que van al índice
+        return set().union(*_delete_levels(word, allowed_distance(word, self.max_distance)))
+
+    def rebuilt(self, words: Iterable[str]) -> 'FuzzyIndex':
+        """
+        Índice para un vocabulario nuevo, reutilizando el actual.
+
+        Sólo se calculan los borrados de las palabras agregadas o quitadas;
+        el resto de los buckets se comparte con este índice (los que cambian
+        se copian antes de tocarlos), así que este índice sigue intacto para
+        quien lo esté consultando. Si cambió más de la mitad del vocabulario
+        se arma uno nuevo desde cero.
+
+        Args:
+            words: Palabras del nuevo vocabulario (como en el constructor)
+
+        Returns:
+            Un FuzzyIndex nuevo, equivalente a FuzzyIndex(words, max_distance)
+        """
+        frequency: Dict[str, int] = {}
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+        old = self.frequency
+        added = [word for word in frequency if word not in old]
+        removed = [word for word in old if word not in frequency]
+        if len(added) + len(removed) > len(frequency) // 2:
+            return FuzzyIndex([w for w, n in frequency.items() for _ in range(n)], self.max_distance)
+
+        new = FuzzyIndex((), self.max_distance)
+        new.frequency = frequency
+        if not added and not removed:
+            new._index = self._index  # nadie lo modifica: se comparte
+            return new
+        index = new._index = dict(self._index)
+        copied: Set[str] = set()
+        for word in removed:
+            for variant in self._variants(word):
+                bucket = index[variant]
+                if len(bucket) == 1:
+                    del index[variant]
+                    continue
+                if variant not in copied:
+                    bucket = index[variant] = list(bucket)
+                    copied.add(variant)
+                bucket.remove(word)
+        for word in added:
+            for variant in self._variants(word):
+                bucket = index.get(variant)
+                if bucket is None:
+                    index[variant] = [word]
+                    copied.add(variant)
+                    continue
+                if variant not in copied:
+                    bucket = index[variant] = list(bucket)
+                    copied.add(variant)
+                bucket.append(word)
+        return new
+
+    def lookup(self, word: str) -> Optional[str]:
+        """
+        Palabra del vocabulario más cercana.
+
+        Args:
+            word: Palabra normalizada
+
+        Returns:
+            La misma palabra si está en el vocabulario, la corrección más
+            cercana (a igual distancia, la más frecuente) o None
+        """
+        if word in self.frequency:
+            return word
+        limit = allowed_distance(word, self.max_distance)
+        if not limit:
+            return None
+        # Nivel por nivel: si hay candidatos a distancia 1 no hace falta
+        # generar ni comparar los borrados de nivel 2.
+        index, frequency = self._index, self.frequency
+        candidates = set(index.get(word, ()))
+        variants = {word}
+        for level in range(1, limit + 1):
+            variants = {v[:i] + v[i + 1:] for v in variants if len(v) > 1 for i in range(len(v))}
+            for variant in variants:
+                if variant in frequency:
+                    candidates.add(variant)
+                bucket = index.get(variant)
+                if bucket is not None:
+                    candidates.update(bucket)
+
+            best = None
+            best_key = None
+            for candidate in candidates:
+                distance = edit_distance(word, candidate, level)
+                if distance > level:
+                    continue
+                key = (distance, -frequency[candidate], candidate)
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+            if best is not None:
+                return best
+        return None
+
+    def correct(self, text: str) -> str:
+        """
+        Corrige palabra por palabra un mensaje normalizado.
+
+        Args:
+            text: Mensaje normalizado (palabras separadas por un espacio)
+
+        Returns:
+            El mensaje con las palabras desconocidas reemplazadas por su
+            corrección (las que no tienen corrección quedan igual)
+        """
+        frequency = self.frequency
+        words = text.split(' ')
+        changed = False
+        for i, word in enumerate(words):
+            if word in frequency:
+                continue
+            fixed = self.lookup(word)
+            if fixed is not None:
+                words[i] = fixed
+                changed = True
+        return ' '.join(words) if changed else text
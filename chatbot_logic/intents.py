@@ -0,0 +1,159 @@
+"""
+Corpus etiquetado de intenciones para el clasificador (chatbot_logic.classifier).
+
+Cada intención tiene:
+- reply: clave de RESPONSES con la que se responde (None: la intención no
+  tiene respuesta propia y el mensaje sigue por las palabras clave)
+- keys: claves de RESPONSES que pertenecen a la intención; si el mensaje
+  contiene una de ellas se usa su respuesta, que es más específica
+  ("buenas noches" dentro de un saludo)
+- examples: frases de ejemplo (se normalizan al armar el modelo)
+"""
+
+INTENTS = {
+    'saludo': {
+        'reply': 'hola',
+        'keys': ['hola', 'buenas', 'buenos dias', 'buenas noches'],
+        'examples': [
+            'hola', 'hola que tal', 'buenas', 'buenas tardes', 'buen dia',
+            'buenos dias', 'buenas noches', 'holis', 'hola buenas', 'hey hola',
+            'saludos', 'hola hay alguien', 'que tal', 'holaa buen dia',
+        ],
+    },
+    'estado': {
+        'reply': 'como estas',
+        'keys': ['como estas'],
+        'examples': [
+            'como estas', 'como andas', 'que tal estas', 'como te va',
+            'todo bien', 'como va todo', 'como estas vos', 'que onda como andas',
+        ],
+    },
+    'despedida': {
+        'reply': 'adios',
+        'keys': ['adios', 'chau'],
+        'examples': [
+            'adios', 'chau', 'chau nos vemos', 'hasta luego', 'hasta mañana',
+            'nos vemos', 'me voy', 'bueno chau', 'hasta la proxima', 'saludos chau',
+        ],
+    },
+    'ver_turnos': {
+        'reply': 'disponibles',
+        'keys': ['turnos', 'disponibles'],
+        'examples': [
+            'turnos disponibles', 'que turnos hay', 'que turnos tenes',
+            'hay turnos libres', 'mostrame los turnos', 'ver disponibilidad',
+            'tenes lugar hoy', 'hay lugar mañana', 'que horarios quedan libres',
+            'hay disponibilidad esta semana', 'listar turnos', 'que dias tenes libres',
+            'tenes algo para el viernes', 'quedan turnos para hoy',
+        ],
+    },
+    'reservar': {
+        'reply': 'reservar',
+        'keys': ['reservar', 'quiero reservar', 'turno', 'corte', 'barba', 'tinte', 'peinado'],
+        'examples': [
+            'quiero reservar', 'quiero reservar un turno', 'reservar turno',
+            'quiero sacar un turno', 'me anotas para un corte', 'necesito un turno',
+            'quiero pedir hora', 'agendame un turno', 'quisiera reservar para corte',
+            'me gustaria reservar', 'sacar turno para barba', 'quiero un turno para tinte',
+            'reservame un peinado', 'puedo reservar', 'anotame para mañana',
+            'quiero cortarme el pelo',
+        ],
+    },
+    'cancelar': {
+        'reply': 'cancelar',
+        'keys': ['cancelar', 'eliminar'],
+        'examples': [
+            'cancelar', 'quiero cancelar mi turno', 'cancelar reserva',
+            'no voy a poder ir', 'anular mi turno', 'borrar mi reserva',
+            'eliminar turno', 'necesito cancelar', 'dar de baja el turno',
+            'no puedo ir al turno', 'cancela mi reserva por favor', 'quiero anular la reserva',
+        ],
+    },
+    'servicios': {
+        'reply': 'servicios',
+        'keys': ['servicios'],
+        'examples': [
+            'que servicios tienen', 'servicios', 'que hacen', 'que ofrecen',
+            'hacen tintura', 'hacen barba', 'que tipo de cortes hacen',
+            'que trabajos hacen', 'lista de servicios', 'hacen peinados para fiestas',
+        ],
+    },
+    'precios': {
+        'reply': 'precio',
+        'keys': ['precio', 'cuanto cuesta'],
+        'examples': [
+            'precio', 'precios', 'cuanto cuesta', 'cuanto sale un corte',
+            'cuanto cobran', 'que valor tiene', 'tarifas', 'lista de precios',
+            'cuanto esta la barba', 'cual es el costo', 'cuanto sale el tinte',
+            'es caro', 'cuanto tengo que pagar',
+        ],
+    },
+    'horario': {
+        'reply': 'horario',
+        'keys': ['horario'],
+        'examples': [
+            'horario', 'horarios de atencion', 'a que hora abren', 'a que hora cierran',
+            'hasta que hora atienden', 'abren los sabados', 'atienden los domingos',
+            'que dias abren', 'cuando atienden', 'estan abiertos ahora',
+        ],
+    },
+    'ubicacion': {
+        'reply': 'ubicacion',
+        'keys': ['ubicacion', 'donde'],
+        'examples': [
+            'donde estan', 'ubicacion', 'direccion', 'donde queda', 'como llego',
+            'en que calle estan', 'donde los encuentro', 'cual es la direccion',
+            'mandame la ubicacion', 'estan en el centro',
+        ],
+    },
+    'contacto': {
+        'reply': 'contacto',
+        'keys': ['contacto', 'telefono'],
+        'examples': [
+            'contacto', 'telefono', 'numero de telefono', 'como los contacto',
+            'tienen whatsapp', 'pasame el numero', 'mail de contacto',
+            'puedo llamar', 'tienen instagram',
+        ],
+    },
+    'ayuda': {
+        'reply': 'ayuda',
+        'keys': ['ayuda', 'menu', 'opciones'],
+        'examples': [
+            'ayuda', 'necesito ayuda', 'que puedo hacer', 'menu', 'opciones',
+            'no se que hacer', 'como se usa', 'que podes hacer', 'ayudame',
+            'comandos', 'mostrame las opciones',
+        ],
+    },
+    'bot': {
+        'reply': 'que eres',
+        'keys': ['que eres', 'quien eres', 'proyecto', 'arquitectura', 'tecnologia', 'como funciona'],
+        'examples': [
+            'que eres', 'quien eres', 'sos un bot', 'sos una persona', 'sos humano',
+            'con quien hablo', 'sos un robot', 'quien sos', 'que sos',
+            'como funcionas', 'estoy hablando con una maquina',
+        ],
+    },
+    'agradecimiento': {
+        'reply': 'gracias',
+        'keys': ['gracias', 'muchas gracias'],
+        'examples': [
+            'gracias', 'muchas gracias', 'mil gracias', 'genial gracias',
+            'te agradezco', 'perfecto gracias', 'buenisimo', 'joya gracias',
+            'excelente', 'gracias por la ayuda',
+        ],
+    },
+    # Frases ajenas a la peluquería. Sin ellas el clasificador elige la
+    # intención más parecida aunque no tenga nada que ver ("me gusta la
+    # pizza" comparte n-gramas con "me gustaria reservar") y abre una reserva.
+    'fuera_de_tema': {
+        'reply': None,
+        'examples': [
+            'me gusta', 'me gusta la pizza', 'me gusta el futbol', 'me gusta mucho',
+            'me encanta la musica', 'me gustan los perros', 'quiero una pizza',
+            'tengo hambre', 'estoy aburrido', 'que lindo dia', 'hoy llueve mucho',
+            'como esta el clima', 'mi perro se llama toby', 'contame un chiste',
+            'quien gano el partido', 'necesito un plomero', 'vendo auto usado',
+            'cual es la capital de francia',
+        ],
+    },
+}
@@ -0,0 +1,142 @@
+"""
+Recarga automática de la base de conocimiento al cambiar su archivo.
+
+Un hilo de fondo revisa cada Config.KB_WATCH_INTERVAL segundos la fecha de
+modificación y el tamaño del archivo (un stat, sin dependencias extra) y,
+si cambiaron, llama a reload_responses(): la base nueva se arma aparte y
+reemplaza a la actual de una vez. Si el archivo quedó inválido (ej. se
+guardó a medio editar) se registra el error y sigue la base anterior hasta
+el próximo cambio.
+
+Cada proceso (API Flask, ASGI, CLI) vigila el archivo por su cuenta, así que
+editar el JSON alcanza para actualizar todos los workers.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from common import Config, setup_logging
+
+from .processor import reload_responses
+
+__all__ = ['KnowledgeBaseWatcher', 'reload_knowledge_base', 'start_watcher']
+
+logger = setup_logging(__name__)
+
+# (st_mtime_ns, st_size) del archivo, o None si no existe
+_Signature = Optional[Tuple[int, int]]
+
+
+def _signature(path: str) -> _Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class KnowledgeBaseWatcher:
+    """
+    Vigila el archivo de la base de conocimiento y la recarga al cambiar.
+
+    Args:
+        path: Archivo a vigilar (por defecto Config.KNOWLEDGE_BASE_PATH)
+        interval: Segundos entre revisiones (por defecto Config.KB_WATCH_INTERVAL)
+        reload: Función que recarga la base (por defecto reload_responses)
+    """
+
+    def __init__(self, path: Optional[str] = None, interval: Optional[float] = None,
+                 reload: Callable[[], int] = reload_responses):
+        self.path = path or Config.KNOWLEDGE_BASE_PATH
+        self.interval = Config.KB_WATCH_INTERVAL if interval is None else interval
+        self._reload = reload
+        self._signature = _signature(self.path)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """
+        Revisa el archivo una vez y recarga la base si cambió.
+
+        Returns:
+            True si se cargó una base nueva
+        """
+        signature = _signature(self.path)
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        start = time.perf_counter()
+        try:
+            count = self._reload()
+        except (OSError, ValueError) as e:
+            logger.error(f"Base de conocimiento inválida en {self.path}, se mantiene la anterior: {e}")
+            return False
+        logger.info(f"Base de conocimiento recargada: {count} claves en "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Error al recargar la base de conocimiento")
+
+    def start(self) -> 'KnowledgeBaseWatcher':
+        """Arranca el hilo de fondo (daemon); llamarlo de nuevo no hace nada."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='kb-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo y espera a que termine."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def reload_knowledge_base() -> Tuple[Dict[str, Any], int]:
+    """
+    Recarga la base ahora mismo (POST /chat/admin/reload).
+
+    Independiente de Flask para que también la use la aplicación ASGI. Sólo
+    recarga el proceso que atiende la request; los demás workers la toman
+    con su vigilante.
+
+    Returns:
+        (payload JSON, status HTTP): {'ok': True, 'claves', 'ms'} o, si el
+        archivo no es válido, {'ok': False, 'error'} con 422
+    """
+    start = time.perf_counter()
+    try:
+        count = reload_responses()
+    except (OSError, ValueError) as e:
+        logger.error(f"Recarga de la base de conocimiento rechazada: {e}")
+        return {'ok': False, 'error': f'Base de conocimiento inválida: {e}'}, 422
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(f"Base de conocimiento recargada a pedido: {count} claves en {elapsed:.1f} ms")
+    return {'ok': True, 'claves': count, 'ms': round(elapsed, 2)}, 200
+
+
+_watcher: Optional[KnowledgeBaseWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def start_watcher() -> Optional[KnowledgeBaseWatcher]:
+    """
+    Arranca (una sola vez por proceso) el vigilante de la base de conocimiento.
+
+    Returns:
+        El vigilante en marcha, o None si Config.KB_WATCH_INTERVAL es 0
+    """
+    global _watcher
+    if Config.KB_WATCH_INTERVAL <= 0:
+        return None
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = KnowledgeBaseWatcher().start()
+            logger.info(f"Vigilando {_watcher.path} cada {_watcher.interval:g} s")
+    return _watcher
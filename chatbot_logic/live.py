@@ -0,0 +1,187 @@
+"""
+Valores en vivo para las respuestas con plantilla.
+
+Una respuesta de la base de conocimiento puede incluir campos entre llaves
+que se completan con la disponibilidad actual:
+
+    "Hoy quedan {libres_hoy} turnos libres ({horarios_hoy}). El próximo es el {proximo_turno}."
+
+Campos (PLACEHOLDERS):
+    libres_hoy     turnos libres que quedan hoy (a partir de ahora)
+    horarios_hoy   sus horarios ("14:00, 15:00 y 16:00" o "ninguno")
+    libres_semana  turnos libres de hoy a 6 días
+    proximo_turno  fecha y hora del próximo turno libre ("2026-03-03 10:00")
+
+Los valores salen de un resumen cacheado, no de una consulta por mensaje:
+se recalcula (dos o tres consultas) cuando vence Config.LIVE_SUMMARY_TTL,
+cuando cambia el día o cuando este proceso reserva o cancela (versión del
+hub de disponibilidad, como el listado de /chat/turnos). El cache de
+respuestas del procesador guarda la plantilla y se completa al responder,
+así que completar una respuesta cuesta un format_map() sobre el resumen
+vigente.
+
+Los turnos libres no tienen servicio asignado (se elige al reservar), así
+que el próximo turno libre es el mismo para todos los servicios.
+"""
+import string
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional
+
+from common import Config, setup_logging
+
+from .events import availability_hub
+
+if TYPE_CHECKING:
+    from services import ReservationService
+
+__all__ = ['PLACEHOLDERS', 'LiveAvailability', 'live_availability', 'template_fields']
+
+logger = setup_logging(__name__)
+
+PLACEHOLDERS = frozenset({'libres_hoy', 'horarios_hoy', 'libres_semana', 'proximo_turno'})
+# Valores cuando no se pudo consultar la base (y no hay un resumen anterior)
+FALLBACK = {
+    'libres_hoy': 'algunos',
+    'horarios_hoy': 'consultá con LIST o /chat/turnos',
+    'libres_semana': 'varios',
+    'proximo_turno': 'a confirmar',
+}
+# Días del resumen de libres_semana (hoy incluido)
+WEEK_DAYS = 7
+
+_formatter = string.Formatter()
+
+
+def template_fields(reply: str) -> frozenset:
+    """
+    Campos de una respuesta con plantilla.
+
+    Args:
+        reply: Texto de la respuesta
+
+    Returns:
+        Nombres de los campos ({campo}); vacío si no es plantilla
+
+    Raises:
+        ValueError: Si las llaves están mal formadas (las literales van
+            dobles: "{{" y "}}")
+    """
+    if '{' not in reply and '}' not in reply:
+        return frozenset()
+    return frozenset(field for _, field, _, _ in _formatter.parse(reply) if field is not None)
+
+
+def join_times(times) -> str:
+    """"14:00, 15:00 y 16:00" ("ninguno" si no hay)."""
+    if not times:
+        return 'ninguno'
+    if len(times) == 1:
+        return times[0]
+    return f"{', '.join(times[:-1])} y {times[-1]}"
+
+
+class _Snapshot(NamedTuple):
+    values: Dict[str, str]
+    version: int
+    expires: float
+
+
+class LiveAvailability:
+    """
+    Resumen de disponibilidad cacheado con TTL para completar plantillas.
+
+    Args:
+        service: Servicio de turnos a consultar (por defecto ReservationService()
+            sobre la base por defecto, creado al primer uso)
+        ttl: Segundos que vale un resumen (por defecto Config.LIVE_SUMMARY_TTL)
+
+    Attributes:
+        refreshes: Resúmenes calculados (consultas a la base)
+    """
+
+    def __init__(self, service: Optional['ReservationService'] = None, ttl: Optional[float] = None):
+        self.service = service
+        self.ttl = Config.LIVE_SUMMARY_TTL if ttl is None else ttl
+        self.refreshes = 0
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+
+    def values(self) -> Dict[str, str]:
+        """Valores vigentes de los campos (recalcula el resumen si venció)."""
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot.version == availability_hub.last_id
+                and snapshot.expires > time.time()):
+            return snapshot.values
+        with self._lock:
+            snapshot = self._snapshot
+            version = availability_hub.last_id
+            now = time.time()
+            if snapshot is None or snapshot.version != version or snapshot.expires <= now:
+                snapshot = self._snapshot = self._refresh(version, now)
+            return snapshot.values
+
+    def render(self, reply: str) -> str:
+        """
+        Completa una respuesta con plantilla.
+
+        Args:
+            reply: Texto de la respuesta (las que no tienen llaves se
+                devuelven tal cual, sin consultar nada)
+
+        Returns:
+            La respuesta con los campos completados; si la plantilla no es
+            válida, el texto sin cambios
+        """
+        if '{' not in reply:
+            return reply
+        try:
+            return reply.format_map(self.values())
+        except (KeyError, ValueError, IndexError, AttributeError):
+            logger.warning("Plantilla inválida en la base de conocimiento: %.60s", reply)
+            return reply
+
+    def invalidate(self):
+        """Descarta el resumen (el próximo mensaje con plantilla lo recalcula)."""
+        self._snapshot = None
+
+    def _refresh(self, version: int, now: float) -> _Snapshot:
+        current = datetime.fromtimestamp(now)
+        today = current.date()
+        # Un resumen no sobrevive al cambio de día
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        expires = min(now + self.ttl, midnight)
+        try:
+            values = self._query(today, current.strftime('%H:%M'))
+        except Exception as e:
+            logger.error(f"No se pudo calcular la disponibilidad para las respuestas: {e}")
+            previous = self._snapshot
+            values = previous.values if previous is not None else FALLBACK
+        self.refreshes += 1
+        return _Snapshot(values, version, expires)
+
+    def _query(self, today: date, now: str) -> Dict[str, str]:
+        if self.service is None:
+            from services import ReservationService
+            self.service = ReservationService()
+        service = self.service
+        day = today.isoformat()
+        today_slots = [s['datetime'] for s in service.list_available_between(day, day, time_from=now)]
+        week = service.summary_by_day(day, (today + timedelta(days=WEEK_DAYS - 1)).isoformat())
+        if today_slots:
+            upcoming = today_slots[0]
+        else:
+            tomorrow = (today + timedelta(days=1)).isoformat()
+            following = service.list_available_between(tomorrow, limit=1)
+            upcoming = following[0]['datetime'] if following else None
+        return {
+            'libres_hoy': str(len(today_slots)),
+            'horarios_hoy': join_times([slot[11:] for slot in today_slots]),
+            'libres_semana': str(sum(d['libres'] for d in week if d['fecha'] > day) + len(today_slots)),
+            'proximo_turno': upcoming or 'a confirmar',
+        }
+
+
+# Resumen compartido por el procesador (process_message y compañía)
+live_availability = LiveAvailability()
@@ -0,0 +1,89 @@
+"""
+Cache LRU acotado y thread-safe.
+
+Lo usan el procesador (respuestas por mensaje normalizado) y la API (cuerpos
+JSON ya serializados). Cada entrada se guarda junto con la generación del
+cache: clear() la incrementa, así un valor calculado antes de invalidar no
+puede volver a guardarse después.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Cache LRU con contadores de aciertos.
+
+    Las lecturas no toman lock; las escrituras sí, para acotar el tamaño.
+
+    Attributes:
+        max_entries: Tamaño máximo (0 = cache desactivado)
+        hits: Lecturas servidas desde el cache
+        misses: Lecturas que no estaban en el cache
+        generation: Se incrementa en cada clear()
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Busca una entrada y la marca como usada.
+
+        Args:
+            key: Clave de la entrada
+
+        Returns:
+            El valor guardado o None
+        """
+        # Sin lock: cada operación de OrderedDict es atómica con el GIL
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass  # otro hilo la descartó entre get() y move_to_end()
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """
+        Guarda un valor, descartando el menos usado si el cache está lleno.
+
+        Args:
+            key: Clave de la entrada
+            value: Valor a guardar
+            generation: Generación leída antes de calcular el valor; si el
+                cache se invalidó mientras tanto, el valor no se guarda
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Descarta todas las entradas e invalida los cálculos en curso."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_ratio(self) -> float:
+        """Proporción de lecturas servidas desde el cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,127 @@
+"""
+Búsqueda de palabras clave en una sola pasada (autómata de Aho-Corasick).
+
+El autómata se arma una vez a partir de las claves y encuentra todas las
+apariciones en un mensaje recorriéndolo una sola vez, así el costo por
+mensaje depende del largo del mensaje y no de la cantidad de claves.
+
+Política de prioridad (determinística, independiente del orden del dict
+salvo como último desempate):
+1. gana la clave más larga (la más específica: "buenas noches" > "buenas",
+   "quiero reservar" > "reservar")
+2. a igual largo, la que aparece primero en el mensaje
+3. a igual largo y posición, la que está antes en la lista de claves
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Autómata de Aho-Corasick sobre un conjunto de claves.
+
+    Args:
+        keywords: Claves a buscar (se ignoran las vacías y las repetidas)
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        seen = set()
+        for key in keywords:
+            if key and key not in seen:
+                seen.add(key)
+                self.keywords.append(key)
+
+        # Trie: transiciones por estado y clave que termina en cada estado
+        self._goto: List[Dict[str, int]] = [{}]
+        terminal: List[int] = [-1]
+        for index, key in enumerate(self.keywords):
+            state = 0
+            for ch in key:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    terminal.append(-1)
+                state = nxt
+            terminal[state] = index
+
+        # Enlaces de fallo (BFS) y, por estado, la mejor clave que termina ahí:
+        # la propia si es terminal (la más larga), si no la del enlace de fallo.
+        n = len(self._goto)
+        self._fail = [0] * n
+        self._emit = list(terminal)
+        # Estado terminal más cercano en la cadena de fallos (para find_all)
+        self._dict_link = [-1] * n
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                f = self._fail[state]
+                while ch not in self._goto[f] and f:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                fail = self._fail[nxt]
+                self._dict_link[nxt] = fail if terminal[fail] >= 0 else self._dict_link[fail]
+                if self._emit[nxt] < 0:
+                    self._emit[nxt] = self._emit[fail]
+                queue.append(nxt)
+        self._terminal = terminal
+        self._lengths = [len(k) for k in self.keywords]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find(self, text: str) -> Optional[str]:
+        """
+        Mejor clave presente en el texto según la política de prioridad.
+
+        Args:
+            text: Mensaje ya normalizado
+
+        Returns:
+            La clave ganadora o None si no aparece ninguna
+        """
+        goto, fail, emit, lengths = self._goto, self._fail, self._emit, self._lengths
+        state = 0
+        best = -1
+        best_len = 0
+        for ch in text:
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            k = emit[state]
+            # Estricto: a igual largo gana la que empezó antes
+            if k >= 0 and lengths[k] > best_len:
+                best, best_len = k, lengths[k]
+        return self.keywords[best] if best >= 0 else None
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Todas las apariciones de claves en el texto.
+
+        Args:
+            text: Mensaje ya normalizado
+
+        Returns:
+            [(posición de inicio, clave)] en orden de posición final
+        """
+        goto, fail = self._goto, self._fail
+        hits = []
+        state = 0
+        for pos, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            s = state if self._terminal[state] >= 0 else self._dict_link[state]
+            while s > 0:
+                key = self.keywords[self._terminal[s]]
+                hits.append((pos - len(key) + 1, key))
+                s = self._dict_link[s]
+        return hits
@@ -0,0 +1,101 @@
+"""
+Normalización de texto para la búsqueda de palabras clave.
+
+Un mensaje y una clave de RESPONSES se comparan en forma normalizada:
+
+- minúsculas (casefold: "ß" -> "ss")
+- sin tildes ni diéresis: "cómo estás" -> "como estas", "pingüino" -> "pinguino"
+- la "ñ" se conserva ("año" no es "ano")
+- signos, dígitos, emojis y cualquier otro símbolo pasan a ser separadores
+- espacios colapsados y sin espacios al principio o al final
+
+Todo se resuelve con una tabla de traducción por code point: se calcula una
+vez a partir de la descomposición Unicode (NFKD) de cada carácter y después
+cada mensaje se normaliza con un str.translate() más un split/join. Sólo
+los mensajes con caracteres fuera de la tabla (emojis, otros alfabetos)
+pasan por una segunda tabla que los resuelve y los recuerda.
+"""
+import unicodedata
+from typing import Dict
+
+__all__ = ['normalize', 'translation_table']
+
+_KEEP = frozenset('abcdefghijklmnopqrstuvwxyzñ')
+
+# Rangos que se precalculan al importar: ASCII, Latin-1, Latin Extended-A/B
+# y puntuación general (comillas tipográficas, guiones, puntos suspensivos).
+_PRECOMPUTED = (range(0x0000, 0x0250), range(0x2000, 0x2070))
+# Tope de entradas que la tabla agrega sola (texto arbitrario de usuarios)
+_MAX_LAZY_ENTRIES = 4096
+
+
+def _map_char(ch: str) -> str:
+    """Forma normalizada de un carácter."""
+    folded = ch.casefold()
+    if folded == 'ñ':
+        return folded
+    out = []
+    for c in unicodedata.normalize('NFKD', folded):
+        if c in _KEEP:
+            out.append(c)
+        elif not unicodedata.combining(c):
+            out.append(' ')
+    return ''.join(out) or ' '
+
+
+class _TranslationTable(Dict[int, str]):
+    """
+    Tabla code point -> reemplazo que resuelve los caracteres nuevos la
+    primera vez que aparecen (hasta _MAX_LAZY_ENTRIES).
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        value = _map_char(chr(codepoint))
+        if len(self) < _PRECOMPUTED_SIZE + _MAX_LAZY_ENTRIES:
+            self[codepoint] = value
+        return value
+
+
+# dict común para el camino rápido: un dict con __missing__ es más lento en
+# translate() aunque la clave exista.
+_TABLE: Dict[int, str] = {cp: _map_char(chr(cp)) for block in _PRECOMPUTED for cp in block}
+_PRECOMPUTED_SIZE = len(_TABLE)
+_EXTENDED_TABLE = _TranslationTable(_TABLE)
+
+
+def normalize(text: str) -> str:
+    """
+    Normaliza un mensaje o una palabra clave.
+
+    Args:
+        text: Texto libre
+
+    Returns:
+        Texto en minúsculas, sin tildes ni signos y con espacios simples
+    """
+    text = text.translate(_TABLE)
+    if not text.isascii():
+        # "ñ" o caracteres que no estaban en la tabla; lo ya normalizado
+        # se traduce a sí mismo
+        text = text.translate(_EXTENDED_TABLE)
+    return ' '.join(text.split())
+
+
+def translation_table(keep: str = '') -> Dict[int, str]:
+    """
+    Tabla precalculada de normalize() que además conserva algunos caracteres.
+
+    Para extractores que necesitan, por ejemplo, los dígitos ("a las 15").
+    Sólo cubre los rangos precalculados: los caracteres de fuera (emojis)
+    quedan sin traducir.
+
+    Args:
+        keep: Caracteres que se conservan tal cual
+
+    Returns:
+        Tabla para str.translate()
+    """
+    table = dict(_TABLE)
+    for ch in keep:
+        table[ord(ch)] = ch
+    return table
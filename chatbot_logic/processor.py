@@ -1,16 +1,251 @@
-from .responses import RESPONSES
-import re
+from .responses import RESPONSES, load_responses
+from .lru import LRUCache
+from .fuzzy import FuzzyIndex
+from .intents import INTENTS
+from .live import live_availability
+from .matcher import KeywordMatcher
+from .normalize import normalize
+from common import Config
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-def _clean_text(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r'[^a-záéíóúüñ\s]', '', text)
-    return text.strip()
+if TYPE_CHECKING:
+    from .classifier import IntentClassifier
 
-def process_message(message: str) -> str:
-    msg = _clean_text(message)
-    # búsqueda simple por palabras clave
-    for key, value in RESPONSES.items():
-        if key in msg:
-            return value
+DEFAULT_REPLY = "No entendí eso 🤔, ¿podés decirlo de otra forma?"
+
+# Respuestas por mensaje normalizado: pocas frases ("hola", "turnos",
+# "precio") concentran casi todo el tráfico. Las respuestas con datos en
+# vivo se guardan como plantilla y se completan al responder (ver live).
+reply_cache = LRUCache(Config.REPLY_CACHE_SIZE)
+
+
+# Palabras de los ejemplos de intenciones (no cambian al recargar la base)
+_INTENT_VOCABULARY = [word for spec in INTENTS.values() for example in spec['examples']
+                      for word in normalize(example).split()]
+_KEY_INTENTS = {normalize(key): intent for intent, spec in INTENTS.items() for key in spec.get('keys', ())}
+
+
+class _KnowledgeBase:
+    """Respuestas y autómata de búsqueda armados juntos a partir de RESPONSES.
+
+    Las claves se normalizan igual que los mensajes ("Adiós" y "adios" son
+    la misma clave); si dos claves coinciden al normalizar gana la primera.
+    Las intenciones del corpus cuya clave de respuesta no está en la base
+    quedan afuera (se responde por palabra clave). El índice de errores de
+    tipeo cubre las palabras de las claves y de los ejemplos de intenciones.
+
+    Con `previous` (la base que se reemplaza) se reutiliza lo que no cambió:
+    el autómata si las claves son las mismas y los buckets del índice de
+    tipeo de las palabras que siguen estando. Las partes compartidas no se
+    modifican nunca, así que la base anterior sigue siendo válida para los
+    mensajes que la estén usando.
+    """
+
+    __slots__ = ('responses', 'matcher', 'intent_replies', 'key_intents', 'speller')
+
+    def __init__(self, responses: Dict[str, str], previous: Optional['_KnowledgeBase'] = None):
+        self.responses: Dict[str, str] = {}
+        for key, reply in responses.items():
+            self.responses.setdefault(normalize(key), reply)
+        # El autómata sólo depende de las claves: si cambiaron nada más las
+        # respuestas se reutiliza el de la base anterior
+        if previous is not None and previous.matcher.keywords == list(self.responses):
+            self.matcher = previous.matcher
+        else:
+            self.matcher = KeywordMatcher(self.responses)
+        self.intent_replies = {intent: normalize(spec['reply']) for intent, spec in INTENTS.items()
+                               if spec['reply'] and normalize(spec['reply']) in self.responses}
+        self.key_intents = _KEY_INTENTS
+        vocabulary = [word for key in self.responses for word in key.split()]
+        vocabulary += _INTENT_VOCABULARY
+        if previous is not None and previous.speller.max_distance == Config.FUZZY_MAX_DISTANCE:
+            self.speller = previous.speller.rebuilt(vocabulary)
+        else:
+            self.speller = FuzzyIndex(vocabulary, Config.FUZZY_MAX_DISTANCE)
+
+
+# Snapshot inmutable que usa process_message; reload_responses() arma el
+# nuevo aparte y lo reemplaza de una vez (una asignación), así un mensaje
+# en curso usa la base vieja o la nueva, nunca una a medio armar.
+_kb = _KnowledgeBase(RESPONSES)
+_reload_lock = threading.Lock()
+# Recargas aplicadas y rechazadas (archivo ilegible o inválido)
+reload_stats = {'ok': 0, 'error': 0}
+
+# El modelo de intenciones se carga con el primer mensaje (NumPy y el .npz
+# no entran en el arranque de los modos que no procesan mensajes).
+_classifier: Optional['IntentClassifier'] = None
+_classifier_loaded = False
+
+
+def _get_classifier() -> Optional['IntentClassifier']:
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _reload_lock:
+            if not _classifier_loaded:
+                if Config.INTENT_ENABLED:
+                    from .classifier import load_classifier
+                    _classifier = load_classifier()
+                _classifier_loaded = True
+    return _classifier
+
+
+# (intención o None, respuesta)
+_Resolution = Tuple[Optional[str], str]
+
+
+def _intent_reply(kb: _KnowledgeBase, key: Optional[str],
+                  prediction: Optional[Tuple[str, float]]) -> Optional[_Resolution]:
+    # intención con confianza suficiente (y respuesta en la base) o None
+    if prediction is None:
+        return None
+    intent, confidence = prediction
+    reply_key = kb.intent_replies.get(intent)
+    if confidence < Config.INTENT_THRESHOLD or reply_key is None:
+        return None
+    # una clave de la misma intención es más específica ("buenas noches")
+    if key is not None and kb.key_intents.get(key) == intent:
+        return intent, kb.responses[key]
+    return intent, kb.responses[reply_key]
+
+
+def _resolve(kb: _KnowledgeBase, msg: str, key: Optional[str],
+             prediction: Optional[Tuple[str, float]]) -> _Resolution:
+    resolved = _intent_reply(kb, key, prediction)
+    if resolved is not None:
+        return resolved
+    # Sin intención clara: se corrigen los errores de tipeo ("resevar",
+    # "turmo") y se vuelve a intentar; los mensajes sin palabras
+    # desconocidas no llegan a consultar el índice.
+    fixed = kb.speller.correct(msg)
+    if fixed != msg:
+        fixed_key = kb.matcher.find(fixed)
+        classifier = _get_classifier() if prediction is not None else None
+        resolved = _intent_reply(kb, fixed_key, classifier.classify(fixed) if classifier is not None else None)
+        if resolved is not None:
+            return resolved
+        if fixed_key is not None and (key is None or len(fixed_key) > len(key)):
+            key = fixed_key
+    if key is not None:
+        return kb.key_intents.get(key), kb.responses[key]
     # respuesta por defecto
-    return "No entendí eso 🤔, ¿podés decirlo de otra forma?"
+    return None, DEFAULT_REPLY
+
+
+def _analyze(msg: str) -> _Resolution:
+    # una sola pasada por el mensaje; gana la clave más larga (ver matcher)
+    kb = _kb
+    classifier = _get_classifier()
+    prediction = classifier.classify(msg) if classifier is not None and msg else None
+    return _resolve(kb, msg, kb.matcher.find(msg), prediction)
+
+
+def _match(msg: str) -> str:
+    return _analyze(msg)[1]
+
+
+def analyze_message(message: str) -> Tuple[Optional[str], str]:
+    """
+    Intención detectada y respuesta de un mensaje (sin pasar por el cache).
+
+    Args:
+        message: Mensaje del usuario
+
+    Returns:
+        (intención del corpus o None, respuesta)
+    """
+    intent, reply = _analyze(normalize(message))
+    return intent, live_availability.render(reply)
+
+
+def process_message(message: str) -> str:
+    msg = normalize(message)
+    reply = reply_cache.get(msg)
+    if reply is None:
+        generation = reply_cache.generation
+        reply = _match(msg)
+        reply_cache.put(msg, reply, generation)
+    return live_availability.render(reply)
+
+
+def process_messages(messages: Iterable[str]) -> List[str]:
+    """
+    Responde un lote de mensajes en una sola pasada.
+
+    Los mensajes se normalizan juntos, los repetidos se resuelven una vez,
+    los que están en el cache no se vuelven a clasificar y el resto se
+    clasifica en una sola llamada vectorizada (classify_many).
+
+    Args:
+        messages: Mensajes del usuario
+
+    Returns:
+        Respuestas en el mismo orden que los mensajes
+    """
+    texts = [normalize(m) for m in messages]
+    replies: Dict[str, str] = {}
+    pending: List[str] = []
+    get = reply_cache.get
+    for text in dict.fromkeys(texts):
+        reply = get(text)
+        if reply is None:
+            pending.append(text)
+        else:
+            replies[text] = reply
+
+    if pending:
+        generation = reply_cache.generation
+        kb = _kb
+        classifier = _get_classifier()
+        predictions = (classifier.classify_many(pending) if classifier is not None
+                       else [None] * len(pending))
+        find = kb.matcher.find
+        for text, prediction in zip(pending, predictions):
+            reply = replies[text] = _resolve(kb, text, find(text), prediction if text else None)[1]
+            reply_cache.put(text, reply, generation)
+    render = live_availability.render
+    rendered = {text: render(reply) for text, reply in replies.items()}
+    return [rendered[t] for t in texts]
+
+
+def knowledge_base_size() -> int:
+    """Cantidad de palabras clave (normalizadas) de la base en uso."""
+    return len(_kb.responses)
+
+
+def reload_responses(responses: Optional[Dict[str, str]] = None) -> int:
+    """
+    Recarga la base de conocimiento e invalida el cache de respuestas.
+
+    La base nueva se arma completa antes de reemplazar a la actual; si el
+    archivo no se puede leer o no es válido se lanza la excepción y sigue
+    la base anterior.
+
+    Args:
+        responses: Nuevo dict palabra clave -> respuesta. Si es None se
+            vuelve a leer el archivo de la base (Config.KNOWLEDGE_BASE_PATH).
+
+    Returns:
+        Cantidad de palabras clave cargadas
+
+    Raises:
+        OSError, ValueError: Si responses es None y el archivo no se puede
+            leer o no es válido (ver load_responses)
+    """
+    global _kb
+    if responses is None:
+        try:
+            responses = load_responses()
+        except (OSError, ValueError):
+            reload_stats['error'] += 1
+            raise
+    with _reload_lock:
+        kb = _KnowledgeBase(responses, _kb)
+        # Mantener la identidad de RESPONSES para quien ya lo importó
+        RESPONSES.clear()
+        RESPONSES.update(responses)
+        _kb = kb
+        reply_cache.clear()
+        reload_stats['ok'] += 1
+    return len(responses)
@@ -1,52 +1,53 @@
-RESPONSES = {
-    # Saludos
-    "hola": "¡Hola! 😊 ¿En qué puedo ayudarte?",
-    "buenas": "¡Buenas! ¿Qué necesitás?",
-    "como estas": "Estoy bien, gracias. ¿Y vos?",
-    "adios": "¡Hasta luego! 👋",
-    "chau": "¡Chau! Que estés bien.",
-    "buenos dias": "¡Buenos días! ¿Cómo estás?",
-    "buenas noches": "¡Buenas noches! Espero tengas un buen descanso.",
-    
-    # Turnos y disponibilidad
-    "turnos": "Tengo turnos disponibles en varios horarios.",
-    "disponibles": "¿Querés ver los turnos disponibles? Puedo mostrarte los de hoy o los próximos días.",
-    "turno": "Puedo ayudarte a reservar un turno.",
-    "reservar": "¡Claro! ¿Qué servicio querés? Ofrecemos Corte, Barba, Tinte, Peinado y General.",
-    "quiero reservar": "Excelente. Dime qué servicio necesitás y buscaré un turno para vos.",
-    
-    # Servicios
-    "corte": "¡Perfecto! Tenemos turnos disponibles para corte. ¿Qué horario te conviene?",
-    "barba": "Nuestro servicio de barba es completo y de calidad. ¿Cuándo te gustaría venir?",
-    "tinte": "Hacemos tintes de excelente calidad. ¿Qué día te vendría bien?",
-    "peinado": "¡Claro! Puedo reservarte un turno para peinado. ¿Qué día preferís?",
-    "servicios": "Ofrecemos: Corte, Barba, Tinte, Peinado y servicios Generales.",
-    
-    # Cancelar
-    "cancelar": "Entiendo que querés cancelar. ¿Cuál es tu nombre para buscar tu reserva?",
-    "eliminar": "¿Necesitás eliminar una reserva? Dame tu nombre o número de turno.",
-    
-    # Información del proyecto
-    "que eres": "Soy un chatbot para gestión de turnos de peluquería. Puedo ayudarte a reservar, ver disponibilidad o cancelar turnos.",
-    "quien eres": "Soy un asistente virtual para la peluquería. Estoy aquí para ayudarte.",
-    "proyecto": "Este es un sistema de gestión de turnos hecho en Python. Tiene API REST, servidor Socket y CLI interactivo.",
-    "arquitectura": "Usamos una arquitectura modular con API REST (Flask), servidor TCP (Sockets), BD SQLAlchemy, y worker asincrónico.",
-    "tecnologia": "Stack tecnológico: Python, Flask, SQLAlchemy, Socket TCP, Docker, Threading, Multiprocessing.",
-    "como funciona": "Funciono procesando tu mensaje, identificando tu intención (reservar, cancelar, etc) y ejecutando la acción correspondiente.",
-    
-    # Preguntas comunes
-    "horario": "Tenemos turnos disponibles en diversos horarios. ¿Qué día querés?",
-    "precio": "Los precios varían según el servicio. Por favor consulta directamente con nosotros.",
-    "cuanto cuesta": "Consulta nuestros precios directamente con el personal de la peluquería.",
-    "ubicacion": "Estamos en el corazón de la ciudad. Consulta con nosotros para la dirección exacta.",
-    "donde": "¿Necesitás nuestra ubicación? Por favor preguntá al personal de la peluquería.",
-    "telefono": "Puedes contactarnos por este sistema o directamente en la peluquería.",
-    "contacto": "Puedo tomar tu reserva aquí o puedes visitarnos directamente.",
-    
-    # Ayuda y default
-    "ayuda": "Puedo ayudarte a: VER turnos disponibles, RESERVAR un turno, CANCELAR una reserva, o consultar sobre SERVICIOS.",
-    "menu": "¿Qué querés hacer? - Opción 1: Ver turnos | Opción 2: Reservar | Opción 3: Cancelar | Opción 5: Más opciones",
-    "opciones": "Puedo: VER DISPONIBLES, RESERVAR, CANCELAR, o informarte sobre nuestros SERVICIOS.",
-    "gracias": "¡De nada! ¿Hay algo más en lo que pueda ayudarte?",
-    "muchas gracias": "Es un placer.",
-}
+"""
+Base de conocimiento de respuestas predefinidas.
+
+Las respuestas (palabra clave -> respuesta) viven en un archivo JSON
+(Config.KNOWLEDGE_BASE_PATH, por defecto chatbot_logic/responses.json) para
+poder editarlas sin tocar código: el procesador las vuelve a leer con
+reload_responses() y el vigilante de kb_watcher lo hace solo al cambiar el
+archivo.
+
+Una respuesta puede ser una plantilla con datos en vivo ("Hoy quedan
+{libres_hoy} turnos libres"); los campos válidos son los de
+chatbot_logic.live.PLACEHOLDERS y las llaves literales van dobles.
+"""
+import json
+from typing import Dict, Optional
+
+from common import Config
+
+from .live import PLACEHOLDERS, template_fields
+
+__all__ = ['RESPONSES', 'load_responses']
+
+
+def load_responses(path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Lee la base de conocimiento.
+
+    Args:
+        path: Archivo JSON con un objeto {"palabra clave": "respuesta"}
+            (por defecto Config.KNOWLEDGE_BASE_PATH)
+
+    Returns:
+        Dict palabra clave -> respuesta, en el orden del archivo
+
+    Raises:
+        OSError: Si el archivo no se puede leer
+        ValueError: Si no es JSON válido, no es un objeto de textos o
+            una plantilla usa campos desconocidos
+    """
+    with open(path or Config.KNOWLEDGE_BASE_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError('La base de conocimiento debe ser un objeto JSON')
+    for key, reply in data.items():
+        if not isinstance(reply, str) or not key.strip():
+            raise ValueError(f'Entrada inválida en la base de conocimiento: {key!r}')
+        unknown = template_fields(reply) - PLACEHOLDERS
+        if unknown:
+            raise ValueError(f'Campos desconocidos en la respuesta de {key!r}: {", ".join(sorted(unknown))}')
+    return data
+
+
+RESPONSES = load_responses()
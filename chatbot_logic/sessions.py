@@ -0,0 +1,151 @@
+"""
+Estado de conversación del chatbot, acotado en cantidad y en tiempo.
+
+Cada conversación (conversation_id) tiene una Session con el estado del
+diálogo. Las sesiones usan __slots__ y sólo guardan valores chicos, así el
+costo por conversación es fijo; el store descarta:
+
+- las que pasaron `ttl` segundos sin actividad (expiradas)
+- la menos usada cuando se llega a `max_sessions` (LRU)
+
+Con eso la memoria queda acotada por max_sessions sin importar cuántas
+conversaciones se abran.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+__all__ = ['Session', 'SessionStore']
+
+
+class Session:
+    """
+    Estado del diálogo de una conversación.
+
+    Attributes:
+        state: Paso del diálogo (ej. 'service', 'date', 'slot', 'name') o None
+        intent: Intención que abrió el diálogo
+        service: Servicio elegido
+        date: Rango de días y horario pedido (chatbot_logic.dates.When) o None
+        offered: Turnos ofrecidos en el orden mostrado, aplanados en una sola
+            tupla (id1, fecha1, id2, fecha2, ...) para no guardar una tupla por turno
+        slot_id: Turno elegido
+        slot_time: Fecha y hora del turno elegido
+        touched: time.monotonic() de la última actividad
+    """
+
+    __slots__ = ('state', 'intent', 'service', 'date', 'offered', 'slot_id', 'slot_time', 'touched')
+
+    def __init__(self, now: float):
+        self.state: Optional[str] = None
+        self.intent: Optional[str] = None
+        self.service: Optional[str] = None
+        self.date: Optional[Tuple[str, ...]] = None
+        self.offered: Tuple[Union[int, str], ...] = ()
+        self.slot_id: Optional[int] = None
+        self.slot_time: Optional[str] = None
+        self.touched = now
+
+
+class SessionStore:
+    """
+    Sesiones por conversation_id con expiración por inactividad y LRU.
+
+    Attributes:
+        max_sessions: Máximo de sesiones vivas
+        ttl: Segundos sin actividad tras los que una sesión expira
+        created: Sesiones creadas
+        expired: Sesiones descartadas por inactividad
+        evicted: Sesiones descartadas por falta de lugar (LRU)
+    """
+
+    def __init__(self, max_sessions: int = 100000, ttl: float = 900.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        # Orden de última actividad: la primera es la menos usada y, como el
+        # TTL cuenta desde la última actividad, también la primera en expirar.
+        self._sessions: 'OrderedDict[str, Session]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, conversation_id: str) -> Optional[Session]:
+        """
+        Sesión activa de una conversación, marcándola como usada.
+
+        Args:
+            conversation_id: Id de la conversación
+
+        Returns:
+            La sesión o None si no existe o expiró
+        """
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(conversation_id)
+            if session is None:
+                return None
+            if now - session.touched > self.ttl:
+                del self._sessions[conversation_id]
+                self.expired += 1
+                return None
+            session.touched = now
+            self._sessions.move_to_end(conversation_id)
+            return session
+
+    def create(self, conversation_id: str) -> Session:
+        """
+        Crea (o reinicia) la sesión de una conversación.
+
+        Descarta primero las expiradas y, si sigue lleno, la menos usada.
+
+        Args:
+            conversation_id: Id de la conversación
+
+        Returns:
+            Sesión nueva
+        """
+        now = time.monotonic()
+        session = Session(now)
+        with self._lock:
+            self._sweep(now)
+            self._sessions.pop(conversation_id, None)
+            while self._sessions and len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+            self._sessions[conversation_id] = session
+            self.created += 1
+        return session
+
+    def discard(self, conversation_id: str) -> None:
+        """Termina la sesión de una conversación (si existe)."""
+        with self._lock:
+            self._sessions.pop(conversation_id, None)
+
+    def clear(self) -> None:
+        """Descarta todas las sesiones."""
+        with self._lock:
+            self._sessions.clear()
+
+    def _sweep(self, now: float) -> None:
+        # Desde la menos usada: corta en la primera que sigue vigente
+        sessions = self._sessions
+        while sessions:
+            conversation_id, session = next(iter(sessions.items()))
+            if now - session.touched <= self.ttl:
+                break
+            del sessions[conversation_id]
+            self.expired += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Sesiones activas y contadores de creación y descarte."""
+        return {
+            'active': len(self._sessions),
+            'created': self.created,
+            'expired': self.expired,
+            'evicted': self.evicted,
+        }
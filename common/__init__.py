@@ -1,7 +1,8 @@
 """
 Módulo común con configuración y utilidades compartidas.
 """
+from .catalog import ALLOWED_SERVICES
 from .config import Config
 from .logconfig import setup_logging
 
-__all__ = ['Config', 'setup_logging']
+__all__ = ['ALLOWED_SERVICES', 'Config', 'setup_logging']
@@ -0,0 +1,10 @@
+"""
+Catálogo de la peluquería compartido por la API y el chatbot.
+
+No depende de Flask ni de la base de datos: lo importan tanto la
+validación de la API (api.validation) como el diálogo de reserva del chat
+(chatbot_logic.booking).
+"""
+
+# Servicios que se pueden reservar
+ALLOWED_SERVICES = ['Corte', 'Barba', 'Tinte', 'Peinado', 'General']
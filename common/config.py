@@ -6,11 +6,21 @@ con valores por defecto sensatos para desarrollo.
 """
 import os
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+# Cargar .env sólo si existe (evita importar dotenv y buscar el archivo
+# en cada arranque de los clientes)
+_ENV_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+if os.path.exists(_ENV_FILE):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_FILE)
+    except ImportError:
+        pass
+
+
+def _rate_limit(route: str, default: str):
+    """Lee RATE_LIMIT_<RUTA>="tokens_por_segundo,ráfaga" como (float, float)."""
+    rate, _, burst = os.getenv(f'RATE_LIMIT_{route.upper()}', default).partition(',')
+    return float(rate), float(burst or rate)
 
 
 class Config:
@@ -26,6 +36,8 @@ class Config:
         'DATABASE_URL',
         f'sqlite:///{_DEFAULT_DB_PATH}'
     )
+    # Crear las tablas al arrancar la API (en producción: False y `flask init-db`)
+    DB_AUTO_CREATE = os.getenv('DB_AUTO_CREATE', 'True').lower() == 'true'
     
     # Flask API
     FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
@@ -36,16 +48,99 @@ class Config:
     # Socket Server
     SOCKET_HOST = os.getenv('SOCKET_HOST', '0.0.0.0')
     SOCKET_PORT = int(os.getenv('SOCKET_PORT', 5001))
+    # threaded: un hilo por cliente; asyncio: socket_srv/async_server.py, con
+    # SOCKET_EXECUTOR_WORKERS hilos para los comandos que consultan la base
+    SOCKET_BACKEND = os.getenv('SOCKET_BACKEND', 'threaded')
+    SOCKET_EXECUTOR_WORKERS = int(os.getenv('SOCKET_EXECUTOR_WORKERS', '8'))
+    # Servidor multihilo: clientes atendidos a la vez (hilos), conexiones
+    # esperando un hilo libre (el resto recibe "servidor ocupado") y segundos
+    # sin actividad / para completar una línea o un envío (0 = sin límite)
+    SOCKET_MAX_CLIENTS = int(os.getenv('SOCKET_MAX_CLIENTS', '64'))
+    SOCKET_MAX_QUEUED = int(os.getenv('SOCKET_MAX_QUEUED', '64'))
+    SOCKET_IDLE_TIMEOUT = float(os.getenv('SOCKET_IDLE_TIMEOUT', '300'))
+    SOCKET_READ_TIMEOUT = float(os.getenv('SOCKET_READ_TIMEOUT', '10'))
+    # Bytes máximos de un comando (una línea); más largo cierra la conexión
+    SOCKET_MAX_LINE = int(os.getenv('SOCKET_MAX_LINE', '4096'))
+    # TCP_NODELAY en las conexiones (cada respuesta sale en un solo envío)
+    SOCKET_NODELAY = os.getenv('SOCKET_NODELAY', 'True').lower() == 'true'
     
     # Worker
     WORKER_SLEEP_TIME = float(os.getenv('WORKER_SLEEP_TIME', '0.1'))
     
+    # Respuestas del chatbot cacheadas por mensaje normalizado (0 = sin cache)
+    REPLY_CACHE_SIZE = int(os.getenv('REPLY_CACHE_SIZE', '1024'))
+    
+    # Base de conocimiento (JSON palabra clave -> respuesta) y cada cuántos
+    # segundos se revisa si cambió para recargarla (0 = sin vigilar)
+    KNOWLEDGE_BASE_PATH = os.getenv(
+        'KNOWLEDGE_BASE_PATH',
+        os.path.join(_BASE_DIR, 'chatbot_logic', 'responses.json')
+    )
+    KB_WATCH_INTERVAL = float(os.getenv('KB_WATCH_INTERVAL', '2'))
+    
+    # Respuestas con datos en vivo ({libres_hoy}, {proximo_turno}...): segundos
+    # que vale el resumen de disponibilidad con que se completan
+    LIVE_SUMMARY_TTL = float(os.getenv('LIVE_SUMMARY_TTL', '5'))
+    
+    # Clasificador de intenciones (requiere NumPy): por debajo del umbral de
+    # confianza se responde por palabras clave
+    INTENT_ENABLED = os.getenv('INTENT_ENABLED', 'True').lower() == 'true'
+    INTENT_THRESHOLD = float(os.getenv('INTENT_THRESHOLD', '0.5'))
+    # Modelo armado en disco ('' = armarlo en cada arranque)
+    INTENT_MODEL_PATH = os.getenv('INTENT_MODEL_PATH', os.path.join(_INSTANCE_DIR, 'intent_model.npz'))
+    
+    # Corrección de errores de tipeo: distancia de edición máxima (0 = sin corrección)
+    FUZZY_MAX_DISTANCE = int(os.getenv('FUZZY_MAX_DISTANCE', '2'))
+    
+    # Máximo de mensajes por request en POST /chat/batch-messages
+    CHAT_BATCH_MAX = int(os.getenv('CHAT_BATCH_MAX', '1000'))
+    
+    # Reserva por chat (POST /chat/ con conversation_id): máximo de
+    # conversaciones en curso, segundos de inactividad hasta que expiran y
+    # turnos ofrecidos por vez
+    SESSION_MAX = int(os.getenv('SESSION_MAX', '100000'))
+    SESSION_TTL = float(os.getenv('SESSION_TTL', '900'))
+    BOOKING_OFFER_SLOTS = int(os.getenv('BOOKING_OFFER_SLOTS', '5'))
+    
+    # Métricas (GET /metrics)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    # Escritura en un hilo de fondo (QueueHandler + QueueListener)
+    LOG_ASYNC = os.getenv('LOG_ASYNC', 'True').lower() == 'true'
+    # 'text' o 'json' (una línea JSON por registro)
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+    # Muestreo de mensajes de alto volumen: "fragmento=N,..." (1 de cada N)
+    LOG_SAMPLING = os.getenv('LOG_SAMPLING', '')
     
     # Autenticación (API Token)
     API_TOKEN = os.getenv('API_TOKEN', 'dev-token-123')
     
+    # Cache del listado /chat/turnos (segundos) y de la página /chat/ui
+    LISTING_CACHE_TTL = float(os.getenv('LISTING_CACHE_TTL', '2'))
+    UI_CACHE_MAX_AGE = int(os.getenv('UI_CACHE_MAX_AGE', '300'))
+    
+    # Server-Sent Events (/chat/turnos/stream)
+    SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+    
+    # Limitación de tasa por cliente (token de API o IP), por ruta
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true'
+    RATE_LIMITS = {
+        'chat': _rate_limit('chat', '20,40'),
+        'batch': _rate_limit('batch', '5,10'),
+        'turnos': _rate_limit('turnos', '20,40'),
+        'resumen': _rate_limit('resumen', '10,20'),
+        'reservar': _rate_limit('reservar', '2,10'),
+        'cancelar': _rate_limit('cancelar', '2,10'),
+        'admin': _rate_limit('admin', '1,5'),
+    }
+    
+    # Control de admisión: requests simultáneas contra la BD (0 = sin límite)
+    # y cuánto esperar un lugar antes de responder 503
+    DB_MAX_INFLIGHT = int(os.getenv('DB_MAX_INFLIGHT', '15'))
+    DB_ADMISSION_WAIT = float(os.getenv('DB_ADMISSION_WAIT', '0.05'))
+    
     # SQLAlchemy
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
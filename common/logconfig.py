@@ -3,52 +3,192 @@ Configuración centralizada de logging.
 
 Proporciona una función para crear loggers consistentes
 en todos los módulos del proyecto.
+
+Con Config.LOG_ASYNC los loggers sólo encolan el registro y un hilo de
+fondo (QueueListener) hace el formateo y la escritura a stdout, así el hilo
+que atiende la request no espera al I/O de la consola. Además:
+- Config.LOG_FORMAT='json': una línea JSON por registro
+- Config.LOG_SAMPLING: deja pasar 1 de cada N registros de los mensajes de
+  alto volumen (ej. "Mensaje recibido=10,listó=10")
 """
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from typing import Dict, Optional
+
 from .config import Config
 
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class JSONFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': self.formatTime(record, DATE_FORMAT),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar 1 de cada N registros de los mensajes configurados.
+
+    La regla se busca en la plantilla del mensaje (record.msg, antes de
+    aplicar los argumentos), así que los llamados deben usar formato lazy
+    `%s` y no f-strings. Hay un contador por regla (no por mensaje), de
+    modo que la memoria no crece con los mensajes distintos. WARNING y
+    superiores nunca se descartan.
+
+    Args:
+        rules: {fragmento de la plantilla: N}
+    """
+
+    def __init__(self, rules: Dict[str, int]):
+        super().__init__()
+        self.rules = {fragment: n for fragment, n in rules.items() if n > 1}
+        self._counters: Dict[str, itertools.count] = {fragment: itertools.count() for fragment in self.rules}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rules:
+            return True
+        template = record.msg if isinstance(record.msg, str) else str(record.msg)
+        for fragment, n in self.rules.items():
+            if fragment in template:
+                # next() de itertools.count es atómico: no hace falta lock
+                return next(self._counters[fragment]) % n == 0
+        return True
+
+
+def parse_sampling(spec: str) -> Dict[str, int]:
+    """
+    Interpreta Config.LOG_SAMPLING.
+
+    Args:
+        spec: "fragmento=N,fragmento=N" (entradas inválidas se ignoran)
+
+    Returns:
+        {fragmento: N}
+    """
+    rules = {}
+    for item in spec.split(','):
+        fragment, sep, n = item.rpartition('=')
+        if sep and fragment.strip() and n.strip().isdigit():
+            rules[fragment.strip()] = int(n)
+    return rules
+
+
+def _make_formatter() -> logging.Formatter:
+    if Config.LOG_FORMAT.lower() == 'json':
+        return JSONFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+
+_listener_lock = threading.Lock()
+_log_queue: Optional[queue.SimpleQueue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _queue_handler() -> logging.Handler:
+    """QueueHandler compartido; arranca el listener en la primera llamada."""
+    global _log_queue, _listener
+    with _listener_lock:
+        if _listener is None:
+            _log_queue = queue.SimpleQueue()
+            output = logging.StreamHandler(sys.stdout)
+            output.setFormatter(_make_formatter())
+            _listener = logging.handlers.QueueListener(_log_queue, output, respect_handler_level=True)
+            _listener.start()
+        return logging.handlers.QueueHandler(_log_queue)
+
+
+def stop_logging():
+    """Vacía la cola y detiene el hilo de escritura (se llama al salir)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _restart_after_fork():
+    # El hilo del listener no sobrevive a fork(): el proceso hijo (ej. el
+    # worker del servidor socket) arranca el suyo sobre una cola nueva.
+    global _listener_lock, _log_queue, _listener
+    _listener_lock = threading.Lock()
+    if _listener is None:
+        return
+    handlers = _listener.handlers
+    _log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    for logger in list(logging.Logger.manager.loggerDict.values()):
+        for handler in getattr(logger, 'handlers', []):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                handler.queue = _log_queue
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
 
 def setup_logging(name: str, level: str = None) -> logging.Logger:
     """
     Crea y configura un logger con formato estándar.
-    
+
     Args:
         name: Nombre del logger (usualmente __name__)
         level: Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             Si es None, usa el valor de Config.LOG_LEVEL
-    
+
     Returns:
         Logger configurado
-    
+
     Example:
         >>> logger = setup_logging(__name__)
-        >>> logger.info("Mensaje de información")
+        >>> logger.info("Mensaje recibido: %s", texto)   # formato lazy
     """
     logger = logging.getLogger(name)
-    
+
     # Determinar nivel
     if level is None:
         level = Config.LOG_LEVEL
-    
+
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     logger.setLevel(numeric_level)
-    
+
     # Evitar duplicar handlers si ya está configurado
     if logger.handlers:
         return logger
-    
-    # Console handler
-    handler = logging.StreamHandler(sys.stdout)
+
+    if Config.LOG_ASYNC:
+        # Sólo encola; el listener formatea y escribe en otro hilo
+        handler = _queue_handler()
+    else:
+        # Console handler
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_make_formatter())
     handler.setLevel(numeric_level)
-    
-    # Formato: timestamp - nombre - nivel - mensaje
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
     logger.addHandler(handler)
-    
+
+    sampling = parse_sampling(Config.LOG_SAMPLING)
+    if sampling:
+        logger.addFilter(SamplingFilter(sampling))
+
     return logger
@@ -0,0 +1,97 @@
+"""
+Perfil de arranque: tiempo de import por módulo y de cada fase de
+inicialización.
+
+Lo usa `run_chatbot.py --profile-startup`: relanza el modo pedido en un
+subproceso con `python -X importtime`, que sólo importa e inicializa (sin
+abrir el menú ni el servidor), y reporta las fases y los módulos más caros.
+"""
+import json
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Paquetes pesados que los clientes no deberían cargar
+HEAVY_PACKAGES = ('flask', 'sqlalchemy', 'flask_sqlalchemy', 'numpy')
+
+# Prefijo de la línea con las fases que imprime el subproceso
+PHASES_PREFIX = 'STARTUP_PHASES '
+
+
+class PhaseTimer:
+    """Acumula la duración de las fases de arranque."""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def emit(self):
+        """Imprime las fases en una línea para el proceso que perfila."""
+        print(PHASES_PREFIX + json.dumps(self.phases), flush=True)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Interpreta la salida de `python -X importtime`.
+
+    Args:
+        stderr: Salida de error del proceso
+
+    Returns:
+        [(módulo, microsegundos propios, microsegundos acumulados)]
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # encabezado
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+
+def profile_startup(argv: List[str], top: int = 15) -> int:
+    """
+    Ejecuta `argv` con -X importtime e imprime el reporte de arranque.
+
+    Args:
+        argv: Argumentos del script a perfilar (sin el intérprete)
+        top: Cantidad de módulos a listar
+
+    Returns:
+        Código de salida del subproceso
+    """
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', *argv],
+                          capture_output=True, text=True)
+    total = time.perf_counter() - start
+
+    phases: List[Tuple[str, float]] = []
+    for line in proc.stdout.splitlines():
+        if line.startswith(PHASES_PREFIX):
+            phases = json.loads(line[len(PHASES_PREFIX):])
+    modules = parse_importtime(proc.stderr)
+    loaded: Dict[str, int] = {name: cumulative for name, _, cumulative in modules}
+
+    print(f"Proceso completo: {total * 1000:.1f} ms (incluye arranque del intérprete)")
+    for name, seconds in phases:
+        print(f"  fase {name:<20}{seconds * 1000:>10.1f} ms")
+    print(f"Módulos importados: {len(modules)}")
+    heavy = [p for p in HEAVY_PACKAGES if p in loaded]
+    print(f"Paquetes pesados cargados: {', '.join(heavy) if heavy else 'ninguno'}")
+    print(f"\n{'módulo':<50}{'propio ms':>10}{'acum. ms':>10}")
+    for name, own, cumulative in sorted(modules, key=lambda m: m[1], reverse=True)[:top]:
+        print(f"{name:<50}{own / 1000:>10.1f}{cumulative / 1000:>10.1f}")
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:], file=sys.stderr)
+    return proc.returncode
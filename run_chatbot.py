@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 """Chatbot CLI y runner multi-modo para gestionar turnos de peluquería.
 
-Permite ejecutar en modo CLI local, servidor de sockets (multihilo) o cliente asyncio demo.
+Permite ejecutar en modo CLI local, servidor de sockets (multihilo o asyncio) o cliente asyncio demo.
 """
 import argparse
 import socket
+import sys
 from typing import Optional
-from chatbot_logic.appointments import AppointmentManager, pretty_slot
-from chatbot_logic.processor import process_message
+
+# Los módulos de cada modo se importan dentro de su función: socket-cli sólo
+# necesita la biblioteca estándar y no debe pagar el import de SQLAlchemy/Flask.
 
 
 def input_int(prompt: str) -> int:
@@ -32,8 +34,18 @@ def safe_input(prompt: str) -> str | None:
         return None
 
 
+# Versión 2 del protocolo del servidor socket: cada respuesta termina con
+# esta línea (ver socket_srv/protocol.py; no se importa para no cargar la
+# base de datos en el cliente)
+RESPONSE_END = b"END\n"
+
+
 def recv_until_quiet(sock: socket.socket, timeout: float = 0.4) -> str:
-    """Lee respuesta del socket hasta que no lleguen más bytes por un tiempo corto."""
+    """Lee respuesta del socket hasta que no lleguen más bytes por un tiempo corto.
+
+    Para servidores sin la versión 2 del protocolo, que no marcan el fin de
+    una respuesta: cada comando tarda al menos `timeout`.
+    """
     chunks: list[bytes] = []
     previous_timeout = sock.gettimeout()
     sock.settimeout(timeout)
@@ -51,14 +63,58 @@ def recv_until_quiet(sock: socket.socket, timeout: float = 0.4) -> str:
     return b"".join(chunks).decode("utf-8", errors="replace")
 
 
-def send_command(sock: socket.socket, command: str) -> str:
-    """Envía un comando al servidor TCP y devuelve la respuesta completa."""
+def recv_line(sock: socket.socket) -> str:
+    """Lee una línea (la bienvenida) sin esperar más de lo necesario."""
+    data = bytearray()
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("utf-8", errors="replace")
+
+
+def recv_response(sock: socket.socket) -> str:
+    """Lee exactamente una respuesta de la versión 2: hasta la línea END (que no se devuelve)."""
+    data = bytearray()
+    while not (data.endswith(b"\n" + RESPONSE_END) or data == RESPONSE_END):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    if data.endswith(RESPONSE_END):
+        del data[-len(RESPONSE_END):]
+    return data.decode("utf-8", errors="replace")
+
+
+def negotiate_protocol(sock: socket.socket) -> bool:
+    """Pide la versión 2 del protocolo; False si el servidor no la conoce."""
+    sock.sendall(b"PROTO 2\n")
+    first = recv_line(sock)
+    if first != "PROTO 2\n":
+        return False  # servidor anterior: respondió "Comando no reconocido."
+    return recv_response(sock) == ""
+
+
+def send_command(sock: socket.socket, command: str, framed: bool = False) -> str:
+    """Envía un comando al servidor TCP y devuelve la respuesta completa.
+
+    Args:
+        sock: Conexión con el servidor
+        command: Comando (una línea)
+        framed: La conexión negoció la versión 2 (respuestas terminadas en END)
+    """
     sock.sendall((command.strip() + "\n").encode("utf-8"))
-    return recv_until_quiet(sock)
+    return recv_response(sock) if framed else recv_until_quiet(sock)
 
 
 def cli_mode():
+    from chatbot_logic.appointments import AppointmentManager, pretty_slot
+    from chatbot_logic.processor import process_message
+    from chatbot_logic.kb_watcher import start_watcher
+
     am = AppointmentManager()
+    start_watcher()
     print("Bienvenido al ChatBot de Turnos - Peluquería\n")
 
     while True:
@@ -158,9 +214,10 @@ def socket_cli_mode(host: str, port: int):
     print(f"Conectando al servidor socket en {host}:{port}...")
     try:
         with socket.create_connection((host, port), timeout=5) as sock:
-            welcome = recv_until_quiet(sock)
+            welcome = recv_line(sock)
             if welcome:
                 print(welcome.strip())
+            framed = negotiate_protocol(sock)
 
             while True:
                 print("\nElige una opción (SOCKET):")
@@ -172,7 +229,7 @@ def socket_cli_mode(host: str, port: int):
                 raw = safe_input("> ")
                 if raw is None:
                     print("\nEntrada cerrada. Saliendo.")
-                    send_command(sock, "QUIT")
+                    send_command(sock, "QUIT", framed)
                     break
 
                 choice = raw.strip()
@@ -180,7 +237,7 @@ def socket_cli_mode(host: str, port: int):
                     date_raw = safe_input("Filtrar por fecha (YYYY-MM-DD) o Enter para todos: ")
                     date = date_raw.strip() if date_raw else ""
                     cmd = f"LIST {date}" if date else "LIST"
-                    response = send_command(sock, cmd)
+                    response = send_command(sock, cmd, framed)
                     print(response.strip() if response else "(sin respuesta)")
 
                 elif choice == "2":
@@ -193,7 +250,7 @@ def socket_cli_mode(host: str, port: int):
                     if not slot_id.isdigit() or not name:
                         print("Datos inválidos. Requiere ID numérico y nombre.")
                         continue
-                    response = send_command(sock, f"BOOK {slot_id}|{name}|{service}")
+                    response = send_command(sock, f"BOOK {slot_id}|{name}|{service}", framed)
                     print(response.strip() if response else "(sin respuesta)")
 
                 elif choice == "3":
@@ -205,7 +262,7 @@ def socket_cli_mode(host: str, port: int):
                         if not slot_id.isdigit():
                             print("ID inválido.")
                             continue
-                        response = send_command(sock, f"CANCEL_ID {slot_id}")
+                        response = send_command(sock, f"CANCEL_ID {slot_id}", framed)
                         print(response.strip() if response else "(sin respuesta)")
                     elif sub == "2":
                         name_raw = safe_input("Nombre del cliente: ")
@@ -213,17 +270,17 @@ def socket_cli_mode(host: str, port: int):
                         if not name:
                             print("Nombre inválido.")
                             continue
-                        response = send_command(sock, f"CANCEL_NAME {name}")
+                        response = send_command(sock, f"CANCEL_NAME {name}", framed)
                         print(response.strip() if response else "(sin respuesta)")
                     else:
                         print("Opción inválida.")
 
                 elif choice == "4":
-                    response = send_command(sock, "HELP")
+                    response = send_command(sock, "HELP", framed)
                     print(response.strip() if response else "(sin respuesta)")
 
                 elif choice == "5" or choice.lower() in ("q", "quit", "salir"):
-                    bye = send_command(sock, "QUIT")
+                    bye = send_command(sock, "QUIT", framed)
                     print(bye.strip() if bye else "Adiós")
                     break
 
@@ -234,6 +291,34 @@ def socket_cli_mode(host: str, port: int):
         print("Asegurate de ejecutar: python -m socket_srv.server")
 
 
+def prepare_mode(mode: str):
+    """Importa e inicializa lo que usa cada modo, sin abrir menú ni servidor.
+
+    Lo ejecuta --profile-startup en un subproceso para medir el arranque.
+    """
+    from common.startup import PhaseTimer
+
+    timer = PhaseTimer()
+    if mode == 'cli':
+        with timer.phase('import'):
+            from chatbot_logic.appointments import AppointmentManager
+            from chatbot_logic.processor import process_message
+        with timer.phase('init db'):
+            AppointmentManager()
+        with timer.phase('primer mensaje'):
+            process_message('hola')
+    elif mode == 'socket-cli':
+        with timer.phase('import'):
+            pass  # sólo biblioteca estándar, ya importada
+    elif mode == 'server':
+        with timer.phase('import'):
+            import socket_srv.server  # noqa: F401
+    elif mode == 'async-client':
+        with timer.phase('import'):
+            import async_client  # noqa: F401
+    timer.emit()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run ChatBot in different modes')
     parser.add_argument('--mode', choices=['cli', 'socket-cli', 'server', 'async-client'], default='socket-cli',
@@ -242,17 +327,31 @@ def main():
                         help='Host del servidor socket (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=5001,
                         help='Puerto del servidor socket (default: 5001)')
+    parser.add_argument('--backend', choices=['threaded', 'asyncio'], default=None,
+                        help='Servidor de --mode server: threaded (un hilo por cliente) o asyncio '
+                             '(default: SOCKET_BACKEND)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Reporta el tiempo de import por módulo y de inicialización del modo, y sale')
+    parser.add_argument('--startup-only', action='store_true', help=argparse.SUPPRESS)
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from common.startup import profile_startup
+        sys.exit(profile_startup([__file__, '--mode', args.mode, '--startup-only']))
+    if args.startup_only:
+        prepare_mode(args.mode)
+        return
+
     if args.mode == 'cli':
         cli_mode()
     elif args.mode == 'socket-cli':
         socket_cli_mode(args.host, args.port)
     elif args.mode == 'server':
         # lanzar servidor de sockets
-        import sys
         # Limpiar sys.argv para que el servidor use sus propios argumentos
         sys.argv = [sys.argv[0], '--host', args.host, '--port', str(args.port)]
+        if args.backend:
+            sys.argv += ['--backend', args.backend]
         from socket_srv.server import main as server_main
         server_main()
     elif args.mode == 'async-client':
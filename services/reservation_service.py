@@ -1,40 +1,49 @@
 from typing import List, Dict, Any, Optional
 
-from chatbot_logic.appointments import AppointmentManager, pretty_slot
+from chatbot_logic.appointments import AppointmentManager, get_manager, pretty_slot
 
 
 class ReservationService:
     """Capa de servicio que envuelve AppointmentManager.
 
     Provee una API estable para listar, reservar y cancelar turnos usando
-    persistencia SQLAlchemy a través de AppointmentManager.
+    persistencia SQLAlchemy a través de AppointmentManager. El gestor es el
+    compartido por URI (get_manager): crear uno por operación abría un
+    engine y verificaba el esquema en cada llamada.
     """
 
     def __init__(self, db_uri: Optional[str] = None):
         self.db_uri = db_uri
 
+    @property
+    def manager(self) -> AppointmentManager:
+        return get_manager(self.db_uri)
+
     def list_available(self, date: Optional[str] = None) -> List[Dict[str, Any]]:
-        am = AppointmentManager(db_uri=self.db_uri)
-        return am.list_available(date)
+        return self.manager.list_available(date)
+
+    def list_available_between(self, date_from: str, date_to: Optional[str] = None,
+                               time_from: str = '00:00', time_to: str = '23:59',
+                               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.manager.list_available_between(date_from, date_to, time_from, time_to, limit)
+
+    def summary_by_day(self, date_from: str, date_to: str) -> List[Dict[str, Any]]:
+        return self.manager.summary_by_day(date_from, date_to)
 
     def list_bookings(self) -> List[Dict[str, Any]]:
-        am = AppointmentManager(db_uri=self.db_uri)
-        return am.list_bookings()
+        return self.manager.list_bookings()
 
     def pretty(self, slot: Dict[str, Any]) -> str:
         return pretty_slot(slot)
 
     def book(self, slot_id: int, name: str, service: str = 'General') -> bool:
-        am = AppointmentManager(db_uri=self.db_uri)
-        return am.book(slot_id, name, service)
+        return self.manager.book(slot_id, name, service)
 
     def cancel_by_slot(self, slot_id: int) -> bool:
-        am = AppointmentManager(db_uri=self.db_uri)
-        return am.cancel_by_slot(slot_id)
+        return self.manager.cancel_by_slot(slot_id)
 
     def cancel_by_customer(self, name: str) -> int:
-        am = AppointmentManager(db_uri=self.db_uri)
-        return am.cancel_by_customer(name)
+        return self.manager.cancel_by_customer(name)
 
 
 __all__ = ['ReservationService']
@@ -1,9 +1,10 @@
 """
-Servidor TCP multihilo para gestión de turnos.
+Servidor TCP para gestión de turnos.
 
 Proporciona una interfaz de socket TCP alternativa al API REST:
-- Protocolo simple basado en texto
-- Maneja múltiples clientes concurrentes mediante threading
+- Protocolo simple basado en texto (protocol.py)
+- Maneja múltiples clientes concurrentes mediante threading (server.py)
+  o con asyncio (async_server.py, SOCKET_BACKEND=asyncio)
 - Encola operaciones de escritura en un worker process
 
 Comandos soportados:
@@ -11,6 +12,8 @@ Comandos soportados:
     BOOK id|name|service   - Reserva un turno
     CANCEL_ID id           - Cancela por ID
     CANCEL_NAME nombre     - Cancela por nombre
+    STATS                  - Conexiones activas, en espera y rechazadas
+    PROTO 2                - Respuestas terminadas en una línea END
     QUIT                   - Cierra conexión
 
 Uso:
@@ -19,6 +22,7 @@ Uso:
     import multiprocessing
     task_queue = multiprocessing.Queue()
     start_server('0.0.0.0', 5001, task_queue)
+    start_async_server('0.0.0.0', 5001, task_queue)   # backend asyncio
 """
 
 from common import Config
@@ -32,8 +36,13 @@ def start_server(*args, **kwargs):
     return _start_server(*args, **kwargs)
 
 
+def start_async_server(*args, **kwargs):
+    from .async_server import start_async_server as _start_async_server
+    return _start_async_server(*args, **kwargs)
+
+
 def handle_client(*args, **kwargs):
     from .server import handle_client as _handle_client
     return _handle_client(*args, **kwargs)
 
-__all__ = ['start_server', 'handle_client', 'HOST', 'PORT']
+__all__ = ['start_server', 'start_async_server', 'handle_client', 'HOST', 'PORT']
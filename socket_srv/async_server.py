@@ -0,0 +1,162 @@
+"""
+Servidor TCP asíncrono (asyncio) para gestión de turnos.
+
+Habla el mismo protocolo de texto que el servidor multihilo
+(socket_srv.protocol), pero cada conexión es una corrutina de
+asyncio.start_server en lugar de un hilo del sistema: miles de clientes
+ociosos cuestan unos pocos KB cada uno, no un hilo con su pila. Los
+comandos que consultan la base (LIST, BOOK) corren en un ThreadPoolExecutor
+acotado (SOCKET_EXECUTOR_WORKERS hilos) mientras el loop sigue atendiendo
+al resto; las cancelaciones se encolan al worker como en el multihilo.
+
+Uso:
+    python -m socket_srv.server --backend asyncio
+    python run_chatbot.py --mode server --backend asyncio
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from common import Config, setup_logging
+from services import ReservationService
+
+from .protocol import (DB_COMMANDS, INVALID_UTF8_REPLY, LINE_TOO_LONG_REPLY, WELCOME, Session, command_name,
+                       handle_command)
+from .server import set_nodelay
+
+__all__ = ['AsyncSocketServer', 'start_async_server']
+
+logger = setup_logging(__name__)
+
+# Conexiones pendientes de accept(); el default de asyncio (100) descarta
+# SYN en ráfagas de miles de conexiones y los clientes reintentan al segundo
+BACKLOG = 1024
+
+
+class AsyncSocketServer:
+    """
+    Servidor de turnos sobre asyncio.
+
+    Args:
+        task_queue: Cola para encolar las cancelaciones al worker
+        db_uri: URI de la base (None = la de Config)
+        max_workers: Hilos para los comandos que usan la base
+            (por defecto Config.SOCKET_EXECUTOR_WORKERS)
+
+    Attributes:
+        connections: Conexiones abiertas en este momento
+    """
+
+    def __init__(self, task_queue: multiprocessing.Queue, db_uri: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        self.task_queue = task_queue
+        self.svc = ReservationService(db_uri)
+        self.max_workers = max_workers or Config.SOCKET_EXECUTOR_WORKERS
+        self.connections = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        """Puerto en el que escucha (útil al iniciar con el puerto 0)."""
+        return self._server.sockets[0].getsockname()[1]
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores para el comando STATS."""
+        return {'activas': self.connections}
+
+    async def start(self, host: str, port: int):
+        """Abre el socket de escucha y empieza a aceptar conexiones."""
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='socket-db')
+        # limit: readline() falla con ValueError si una línea supera SOCKET_MAX_LINE
+        self._server = await asyncio.start_server(self.handle_connection, host, port, backlog=BACKLOG,
+                                                  limit=Config.SOCKET_MAX_LINE + 1)
+        logger.info(f"✓ Servidor TCP (asyncio) escuchando en {host}:{self.port} "
+                    f"({self.max_workers} hilos para la base)")
+
+    async def close(self):
+        """Deja de aceptar conexiones y libera los hilos de la base."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        logger.info("Servidor cerrado")
+
+    async def serve_forever(self, host: str, port: int):
+        """start() y atender hasta que se cancele la tarea."""
+        await self.start(host, port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende a un cliente: un comando por línea hasta QUIT o que cierre."""
+        peer = writer.get_extra_info('peername') or ('?', 0)
+        client_id = f"{peer[0]}:{peer[1]}"
+        logger.info("Cliente conectado: %s", client_id)
+        self.connections += 1
+        loop = asyncio.get_running_loop()
+        session = Session()
+        # asyncio activa TCP_NODELAY; SOCKET_NODELAY=False lo desactiva
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            set_nodelay(sock, Config.SOCKET_NODELAY)
+        try:
+            writer.write(WELCOME.encode('utf-8'))
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    logger.warning("Cerrando %s: línea demasiado larga", client_id)
+                    writer.write(''.join(session.frame([LINE_TOO_LONG_REPLY])).encode('utf-8'))
+                    break
+                if not line:
+                    break
+                try:
+                    cmd = line.decode('utf-8').strip()
+                except UnicodeDecodeError:
+                    logger.warning("%s envió una línea que no es UTF-8", client_id)
+                    writer.write(''.join(session.frame([INVALID_UTF8_REPLY])).encode('utf-8'))
+                    continue
+                if not cmd:
+                    continue
+                if command_name(cmd) in DB_COMMANDS:
+                    replies, close = await loop.run_in_executor(
+                        self._executor, handle_command, cmd, self.svc, self.task_queue, client_id)
+                else:
+                    replies, close = handle_command(cmd, self.svc, self.task_queue, client_id, self.stats, session)
+                writer.write(''.join(session.frame(replies)).encode('utf-8'))
+                await writer.drain()
+                if close:
+                    break
+        except Exception as e:
+            logger.error("Error manejando cliente %s: %s", client_id, e)
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        logger.info("Cliente desconectado: %s", client_id)
+
+
+def start_async_server(host: str, port: int, task_queue: multiprocessing.Queue, max_days: int = 7,
+                       max_workers: Optional[int] = None):
+    """
+    Inicia el servidor asíncrono y atiende hasta una interrupción.
+
+    Misma firma que socket_srv.server.start_server.
+
+    Args:
+        host: Dirección IP para vincular el servidor
+        port: Puerto para escuchar
+        task_queue: Cola para encolar tareas al worker
+        max_days: Días a futuro para operaciones
+        max_workers: Hilos para los comandos que usan la base
+    """
+    server = AsyncSocketServer(task_queue, max_workers=max_workers)
+    asyncio.run(server.serve_forever(host, port))
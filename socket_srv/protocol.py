@@ -0,0 +1,257 @@
+"""
+Protocolo de texto del servidor de turnos, común a los dos servidores.
+
+Cada comando es una línea; handle_command() lo ejecuta y devuelve las
+líneas de respuesta, sin escribir en el socket: el servidor multihilo
+(server.py) y el asíncrono (async_server.py) sólo difieren en cómo leen y
+escriben. LIST y BOOK consultan la base (bloqueantes); el resto no.
+
+LineReader arma las líneas a partir de lo que llega por el socket: un
+cliente puede mandar varios comandos en un mismo paquete (pipelining) y
+se ejecutan todos, en orden, sin esperar más bytes. Una línea de más de
+SOCKET_MAX_LINE bytes cierra la conexión.
+
+Versiones del protocolo (Session): la 1, con la que arranca toda conexión,
+no marca el fin de una respuesta y los clientes esperan a que deje de
+llegar texto. Con "PROTO 2" el cliente pide la 2: cada respuesta termina
+con la línea END_LINE ("END"), así un cliente lee exactamente una
+respuesta sin esperar un timeout. Los clientes que no mandan PROTO siguen
+recibiendo lo mismo que antes.
+"""
+import multiprocessing
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common import Config, setup_logging
+from services import ReservationService
+
+__all__ = ['WELCOME', 'HELP_TEXT', 'DB_COMMANDS', 'END_LINE', 'PROTOCOL_VERSIONS', 'LINE_TOO_LONG_REPLY',
+           'INVALID_UTF8_REPLY', 'LineReader', 'LineTooLong', 'Session', 'command_name', 'handle_command']
+
+logger = setup_logging(__name__)
+
+WELCOME = "Bienvenido al servidor de turnos\n"
+LINE_TOO_LONG_REPLY = "Línea demasiado larga.\n"
+INVALID_UTF8_REPLY = "Comando con caracteres inválidos (se espera UTF-8).\n"
+# Fin de cada respuesta en la versión 2 del protocolo
+END_LINE = "END\n"
+PROTOCOL_VERSIONS = (1, 2)
+
+HELP_TEXT = """\
+╔════════════════════════════════════════════════════════════╗
+║         SERVIDOR DE TURNOS - COMANDOS DISPONIBLES         ║
+╚════════════════════════════════════════════════════════════╝
+
+📋 LIST [fecha]
+   Lista turnos disponibles.
+   Ejemplo: LIST
+            LIST 2026-03-01
+
+📝 BOOK id|nombre|servicio
+   Reserva un turno en tiempo real.
+   Responde con ✓ si fue exitosa, ✗ si ya está reservado.
+   Ejemplo: BOOK 1|Juan Pérez|Corte
+
+❌ CANCEL_ID id
+   Cancela una reserva por ID de slot.
+   Ejemplo: CANCEL_ID 5
+
+❌ CANCEL_NAME nombre
+   Cancela todas las reservas de un cliente.
+   Ejemplo: CANCEL_NAME Juan Pérez
+
+📊 STATS
+   Conexiones activas, en espera y rechazadas del servidor.
+
+🔧 PROTO 2
+   Cada respuesta termina con una línea END (para clientes).
+   PROTO 1 vuelve a respuestas sin terminador.
+
+❓ HELP o ?
+   Muestra esta ayuda.
+
+🚪 QUIT o EXIT
+   Cierra la conexión.
+
+════════════════════════════════════════════════════════════════
+"""
+
+# Comandos que consultan la base de datos (el servidor asíncrono los corre en un hilo)
+DB_COMMANDS = frozenset({'LIST', 'BOOK'})
+
+
+class LineTooLong(ValueError):
+    """Una línea supera el máximo permitido."""
+
+
+class LineReader:
+    """
+    Separa en líneas los bytes recibidos.
+
+    Acumula en un bytearray (agregar al final no copia lo ya recibido) y en
+    cada feed() devuelve todas las líneas completas. Los bytes de una línea
+    a medias, incluida una secuencia UTF-8 partida entre dos recv, quedan
+    para el próximo feed(): "\\n" nunca aparece dentro de un carácter
+    multibyte, así que cada línea completa se decodifica entera.
+
+    Args:
+        max_line: Bytes máximos por línea, sin el salto
+            (por defecto Config.SOCKET_MAX_LINE)
+    """
+
+    def __init__(self, max_line: Optional[int] = None):
+        self.max_line = max_line or Config.SOCKET_MAX_LINE
+        self._buf = bytearray()
+
+    @property
+    def pending(self) -> bool:
+        """Hay una línea empezada sin terminar."""
+        return bool(self._buf)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Agrega bytes recibidos.
+
+        Args:
+            data: Bytes leídos del socket
+
+        Returns:
+            Las líneas completas, sin el salto de línea
+
+        Raises:
+            LineTooLong: Si una línea (completa o no) supera max_line
+        """
+        buf = self._buf
+        buf += data
+        lines = []
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end < 0:
+                break
+            if end - start > self.max_line:
+                raise LineTooLong(end - start)
+            lines.append(bytes(buf[start:end]))
+            start = end + 1
+        if start:
+            del buf[:start]
+        if len(buf) > self.max_line:
+            raise LineTooLong(len(buf))
+        return lines
+
+
+class Session:
+    """
+    Estado del protocolo de una conexión.
+
+    Attributes:
+        version: Versión negociada con PROTO (1 hasta que el cliente pida otra)
+    """
+
+    __slots__ = ('version',)
+
+    def __init__(self):
+        self.version = 1
+
+    def frame(self, replies: List[str]) -> List[str]:
+        """Las líneas de una respuesta, con END_LINE al final en la versión 2."""
+        if self.version >= 2:
+            return replies + [END_LINE]
+        return replies
+
+
+def command_name(cmd: str) -> str:
+    """Nombre del comando en mayúsculas ("list 2026-03-01" -> "LIST")."""
+    return cmd.split(None, 1)[0].upper() if cmd.strip() else ''
+
+
+def handle_command(cmd: str, svc: ReservationService, task_queue: multiprocessing.Queue, client_id: str,
+                   stats: Optional[Callable[[], Dict[str, int]]] = None,
+                   session: Optional[Session] = None) -> Tuple[List[str], bool]:
+    """
+    Ejecuta un comando del protocolo.
+
+    Args:
+        cmd: Línea recibida, sin el salto de línea (no vacía)
+        svc: Servicio de turnos
+        task_queue: Cola para encolar las cancelaciones al worker
+        client_id: "host:puerto" del cliente (para el log)
+        stats: Contadores del servidor para STATS
+        session: Estado de la conexión; PROTO cambia su versión
+
+    Returns:
+        (líneas de respuesta, cada una terminada en "\\n" y sin END_LINE,
+        que agrega session.frame(); True si hay que cerrar la conexión)
+    """
+    logger.debug("Comando recibido de %s: %s", client_id, cmd)
+    parts = cmd.split()
+    name = parts[0].upper()
+
+    if name == 'LIST':
+        date = parts[1] if len(parts) > 1 else None
+        slots = svc.list_available(date)
+        logger.info("%s listó %d turnos", client_id, len(slots))
+        if not slots:
+            return ["No hay turnos disponibles.\n"], False
+        return [svc.pretty(s) + "\n" for s in slots], False
+
+    if name == 'BOOK':
+        rest = cmd[len('BOOK'):].strip()
+        try:
+            slot_id_s, customer, service = rest.split('|', 2)
+            slot_id = int(slot_id_s)
+        except ValueError as e:
+            logger.warning("%s envió comando BOOK inválido: %s", client_id, e)
+            return [f"Formato inválido BOOK. Use: BOOK id|name|service. Error: {e}\n"], False
+        # Validar y reservar directamente (no encolar)
+        if svc.book(slot_id, customer.strip(), service.strip()):
+            logger.info("%s reservó exitosamente: slot=%s, name=%s", client_id, slot_id, customer)
+            return [f"✓ Reserva exitosa: slot {slot_id} para {customer.strip()}\n"], False
+        logger.warning("%s intentó reservar slot ocupado: %s", client_id, slot_id)
+        return [f"✗ No se pudo reservar. El turno {slot_id} ya está reservado o no existe.\n"], False
+
+    if name == 'CANCEL_ID':
+        try:
+            slot_id = int(parts[1])
+        except (IndexError, ValueError) as e:
+            logger.warning("%s envió comando CANCEL_ID inválido: %s", client_id, e)
+            return [f"Formato inválido CANCEL_ID. Use: CANCEL_ID id. Error: {e}\n"], False
+        task_queue.put({'action': 'cancel_id', 'slot_id': slot_id})
+        logger.info("%s encoló cancelación por ID: %s", client_id, slot_id)
+        return ["Cancelación encolada por ID.\n"], False
+
+    if name == 'CANCEL_NAME':
+        customer = cmd[len('CANCEL_NAME'):].strip()
+        if not customer:
+            logger.warning("%s envió comando CANCEL_NAME inválido: Nombre vacío", client_id)
+            return ["Formato inválido CANCEL_NAME. Use: CANCEL_NAME nombre. Error: Nombre vacío\n"], False
+        task_queue.put({'action': 'cancel_name', 'name': customer})
+        logger.info("%s encoló cancelación por nombre: %s", client_id, customer)
+        return ["Cancelación encolada por nombre.\n"], False
+
+    if name == 'STATS':
+        if stats is None:
+            return ["Estadísticas no disponibles.\n"], False
+        return [' '.join(f'{key}={value}' for key, value in stats().items()) + '\n'], False
+
+    if name == 'PROTO':
+        try:
+            version = int(parts[1])
+        except (IndexError, ValueError):
+            version = None
+        if session is None or version not in PROTOCOL_VERSIONS:
+            logger.warning("%s pidió una versión de protocolo no soportada: %s", client_id, cmd)
+            return [f"Versión de protocolo no soportada. Use: PROTO {' o '.join(map(str, PROTOCOL_VERSIONS))}\n"], False
+        session.version = version
+        logger.debug("%s usa el protocolo %d", client_id, version)
+        return [f"PROTO {version}\n"], False
+
+    if name in ('HELP', '?'):
+        logger.info("%s solicitó ayuda", client_id)
+        return [HELP_TEXT], False
+
+    if name in ('QUIT', 'EXIT'):
+        logger.info("%s finalizó conexión", client_id)
+        return ["Adiós\n"], True
+
+    logger.warning("%s envió comando desconocido: %s", client_id, cmd)
+    return ["Comando no reconocido.\n"], False
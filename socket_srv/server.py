@@ -3,161 +3,264 @@ Servidor TCP multihilo para gestión de turnos.
 
 Proporciona una interfaz TCP alternativa al API REST con:
 - Protocolo simple basado en texto
-- Múltiples clientes concurrentes via threading
+- Múltiples clientes concurrentes via threading: un pool de
+  SOCKET_MAX_CLIENTS hilos, SOCKET_MAX_QUEUED conexiones en espera y
+  "servidor ocupado" para el resto
+- Timeouts por conexión: inactividad (SOCKET_IDLE_TIMEOUT) y para
+  completar una línea o un envío (SOCKET_READ_TIMEOUT)
 - IPC con worker process para operaciones de escritura
 """
 import socket
 import threading
 import argparse
 import multiprocessing
-from typing import Tuple
+import queue
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
 from common import Config, setup_logging
 from services import ReservationService
 
+from .protocol import (INVALID_UTF8_REPLY, LINE_TOO_LONG_REPLY, WELCOME, LineReader, LineTooLong, Session,
+                       handle_command)
+
 # Configurar logging
 logger = setup_logging(__name__)
 
+BUSY_REPLY = "Servidor ocupado, intentá de nuevo en unos segundos.\n"
+TIMEOUT_REPLY = "Conexión cerrada por inactividad.\n"
+# Bytes por recv: alcanza para decenas de comandos encadenados en una lectura
+RECV_SIZE = 16384
+# Caracteres de respuesta acumulados a partir de los cuales se envía sin
+# esperar al resto de los comandos encadenados
+FLUSH_SIZE = 65536
+
+
+def set_nodelay(conn: socket.socket, enabled: bool):
+    """
+    Activa o desactiva TCP_NODELAY (algoritmo de Nagle).
+
+    Cada respuesta sale en un solo envío, así que no hay ráfagas de
+    segmentos chicos que Nagle tenga que juntar; con Nagle activo, el último
+    segmento de una respuesta grande espera el ACK (retrasado) del cliente.
+    En sockets que no son TCP no hace nada.
+    """
+    try:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(enabled))
+    except OSError:
+        pass
+
+
+def _send_notice(conn: socket.socket, text: str):
+    """Aviso antes de cerrar; si el cliente no lo recibe, no importa."""
+    try:
+        conn.settimeout(0.5)
+        conn.sendall(text.encode('utf-8'))
+    except OSError:
+        pass
+
 
-def handle_client(conn: socket.socket, addr: Tuple[str, int], task_queue: multiprocessing.Queue, max_days: int = 3):
+def handle_client(conn: socket.socket, addr: Tuple[str, int], task_queue: multiprocessing.Queue, max_days: int = 3,
+                  idle_timeout: Optional[float] = None, read_timeout: Optional[float] = None,
+                  stats: Optional[Callable[[], Dict[str, int]]] = None, max_line: Optional[int] = None,
+                  nodelay: Optional[bool] = None):
     """
     Maneja la conexión de un cliente TCP.
+
+    Ejecuta todos los comandos completos de cada recv, en orden (un cliente
+    puede mandar varios sin esperar las respuestas), y envía sus respuestas
+    juntas con un solo sendall.
     
     Args:
         conn: Socket de conexión del cliente
         addr: Dirección del cliente (host, port)
         task_queue: Cola para encolar tareas de escritura
         max_days: Días a futuro para listar turnos
+        idle_timeout: Segundos sin recibir nada antes de cerrar
+            (por defecto Config.SOCKET_IDLE_TIMEOUT; 0 = sin límite)
+        read_timeout: Segundos para completar una línea ya empezada, y para
+            cada envío (por defecto Config.SOCKET_READ_TIMEOUT; 0 = sin límite)
+        stats: Contadores del servidor para el comando STATS
+        max_line: Bytes máximos por comando (por defecto Config.SOCKET_MAX_LINE)
+        nodelay: TCP_NODELAY en la conexión (por defecto Config.SOCKET_NODELAY)
     """
+    idle_timeout = Config.SOCKET_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+    read_timeout = Config.SOCKET_READ_TIMEOUT if read_timeout is None else read_timeout
     client_id = f"{addr[0]}:{addr[1]}"
-    logger.info(f"Cliente conectado: {client_id}")
+    logger.info("Cliente conectado: %s", client_id)
     
     svc = ReservationService()
+    reader = LineReader(max_line)
+    session = Session()
     with conn:
-        conn.sendall("Bienvenido al servidor de turnos\n".encode('utf-8'))
-        buf = b""
-        while True:
+        set_nodelay(conn, Config.SOCKET_NODELAY if nodelay is None else nodelay)
+        conn.settimeout(read_timeout or None)
+        # Plazo de la línea en curso: un cliente que manda un byte cada
+        # tanto (slowloris) no renueva el plazo con cada recv
+        line_deadline = None
+        try:
+            conn.sendall(WELCOME.encode('utf-8'))
+        except OSError as e:
+            logger.warning("No se pudo saludar a %s: %s", client_id, e)
+            return
+        close = False
+        while not close:
             try:
-                data = conn.recv(1024)
+                if not reader.pending:
+                    line_deadline = None
+                    conn.settimeout(idle_timeout or None)
+                elif read_timeout:
+                    if line_deadline is None:
+                        line_deadline = time.monotonic() + read_timeout
+                    conn.settimeout(max(line_deadline - time.monotonic(), 0.001))
+                data = conn.recv(RECV_SIZE)
                 if not data:
                     break
-                buf += data
-                if b"\n" not in buf:
-                    continue
-                line, _, buf = buf.partition(b"\n")
-                cmd = line.decode('utf-8').strip()
-                if not cmd:
+                lines = reader.feed(data)
+                if not lines:
                     continue
-                
-                logger.debug(f"Comando recibido de {client_id}: {cmd}")
-                parts = cmd.split()
-                
-                if parts[0].upper() == 'LIST':
-                    date = parts[1] if len(parts) > 1 else None
-                    slots = svc.list_available(date)
-                    if not slots:
-                        conn.sendall("No hay turnos disponibles.\n".encode('utf-8'))
-                    else:
-                        for s in slots:
-                            conn.sendall((svc.pretty(s) + "\n").encode('utf-8'))
-                    logger.info(f"{client_id} listó {len(slots)} turnos")
-
-                elif parts[0].upper() == 'BOOK':
-                    rest = cmd[len('BOOK'):].strip()
-                    try:
-                        slot_id_s, name, service = rest.split('|', 2)
-                        slot_id = int(slot_id_s)
-                        
-                        # Validar y reservar directamente (no encolar)
-                        ok = svc.book(slot_id, name.strip(), service.strip())
-                        
-                        if ok:
-                            conn.sendall(f"✓ Reserva exitosa: slot {slot_id} para {name.strip()}\n".encode('utf-8'))
-                            logger.info(f"{client_id} reservó exitosamente: slot={slot_id}, name={name}")
-                        else:
-                            conn.sendall(f"✗ No se pudo reservar. El turno {slot_id} ya está reservado o no existe.\n".encode('utf-8'))
-                            logger.warning(f"{client_id} intentó reservar slot ocupado: {slot_id}")
-                    except ValueError as e:
-                        error_msg = f"Formato inválido BOOK. Use: BOOK id|name|service. Error: {e}\n"
-                        conn.sendall(error_msg.encode('utf-8'))
-                        logger.warning(f"{client_id} envió comando BOOK inválido: {e}")
-
-                elif parts[0].upper() == 'CANCEL_ID':
+                # La línea a medias que quede empieza su propio plazo
+                line_deadline = None
+                conn.settimeout(read_timeout or None)
+                # Las respuestas de todos los comandos de este recv salen en un
+                # solo envío (no uno por línea de LIST ni por comando)
+                out: List[str] = []
+                size = 0
+                for line in lines:
                     try:
-                        slot_id = int(parts[1])
-                        task_queue.put({'action': 'cancel_id', 'slot_id': slot_id})
-                        conn.sendall("Cancelación encolada por ID.\n".encode('utf-8'))
-                        logger.info(f"{client_id} encoló cancelación por ID: {slot_id}")
-                    except (IndexError, ValueError) as e:
-                        error_msg = f"Formato inválido CANCEL_ID. Use: CANCEL_ID id. Error: {e}\n"
-                        conn.sendall(error_msg.encode('utf-8'))
-                        logger.warning(f"{client_id} envió comando CANCEL_ID inválido: {e}")
-
-                elif parts[0].upper() == 'CANCEL_NAME':
-                    try:
-                        name = cmd[len('CANCEL_NAME'):].strip()
-                        if not name:
-                            raise ValueError("Nombre vacío")
-                        task_queue.put({'action': 'cancel_name', 'name': name})
-                        conn.sendall("Cancelación encolada por nombre.\n".encode('utf-8'))
-                        logger.info(f"{client_id} encoló cancelación por nombre: {name}")
-                    except ValueError as e:
-                        error_msg = f"Formato inválido CANCEL_NAME. Use: CANCEL_NAME nombre. Error: {e}\n"
-                        conn.sendall(error_msg.encode('utf-8'))
-                        logger.warning(f"{client_id} envió comando CANCEL_NAME inválido: {e}")
-
-                elif parts[0].upper() in ('HELP', '?'):
-                    help_text = """\
-╔════════════════════════════════════════════════════════════╗
-║         SERVIDOR DE TURNOS - COMANDOS DISPONIBLES         ║
-╚════════════════════════════════════════════════════════════╝
-
-📋 LIST [fecha]
-   Lista turnos disponibles.
-   Ejemplo: LIST
-            LIST 2026-03-01
-
-📝 BOOK id|nombre|servicio
-   Reserva un turno en tiempo real.
-   Responde con ✓ si fue exitosa, ✗ si ya está reservado.
-   Ejemplo: BOOK 1|Juan Pérez|Corte
-
-❌ CANCEL_ID id
-   Cancela una reserva por ID de slot.
-   Ejemplo: CANCEL_ID 5
-
-❌ CANCEL_NAME nombre
-   Cancela todas las reservas de un cliente.
-   Ejemplo: CANCEL_NAME Juan Pérez
-
-❓ HELP o ?
-   Muestra esta ayuda.
-
-🚪 QUIT o EXIT
-   Cierra la conexión.
-
-════════════════════════════════════════════════════════════════
-"""
-                    conn.sendall(help_text.encode('utf-8'))
-                    logger.info(f"{client_id} solicitó ayuda")
+                        cmd = line.decode('utf-8').strip()
+                    except UnicodeDecodeError:
+                        logger.warning("%s envió una línea que no es UTF-8", client_id)
+                        out.extend(session.frame([INVALID_UTF8_REPLY]))
+                        continue
+                    if not cmd:
+                        continue
+                    replies, close = handle_command(cmd, svc, task_queue, client_id, stats, session)
+                    replies = session.frame(replies)
+                    out.extend(replies)
+                    size += sum(map(len, replies))
+                    if close:
+                        break
+                    if size >= FLUSH_SIZE:
+                        conn.sendall(''.join(out).encode('utf-8'))
+                        out, size = [], 0
+                if out:
+                    conn.sendall(''.join(out).encode('utf-8'))
 
-                elif parts[0].upper() in ('QUIT', 'EXIT'):
-                    conn.sendall("Adiós\n".encode('utf-8'))
-                    logger.info(f"{client_id} finalizó conexión")
-                    break
-
-                else:
-                    conn.sendall("Comando no reconocido.\n".encode('utf-8'))
-                    logger.warning(f"{client_id} envió comando desconocido: {cmd}")
-                    
+            except LineTooLong as e:
+                logger.warning("Cerrando %s: línea de %s bytes", client_id, e)
+                _send_notice(conn, ''.join(session.frame([LINE_TOO_LONG_REPLY])))
+                break
+            except socket.timeout:
+                reason = 'línea incompleta' if reader.pending else 'inactividad'
+                logger.info("Cerrando %s por %s", client_id, reason)
+                _send_notice(conn, ''.join(session.frame([TIMEOUT_REPLY])))
+                break
             except Exception as e:
-                logger.error(f"Error manejando cliente {client_id}: {e}")
+                logger.error("Error manejando cliente %s: %s", client_id, e)
                 break
     
-    logger.info(f"Cliente desconectado: {client_id}")
+    logger.info("Cliente desconectado: %s", client_id)
 
 
-def start_server(host: str, port: int, task_queue: multiprocessing.Queue, max_days: int = 7):
+class ClientPool:
+    """
+    Hilos fijos que atienden las conexiones, con una espera acotada.
+
+    Hay a lo sumo max_clients clientes atendidos a la vez (uno por hilo) y
+    max_queued esperando un hilo libre; el resto recibe BUSY_REPLY y se
+    cierra enseguida, sin crear hilos ni consultar la base.
+
+    Args:
+        handler: Función que atiende una conexión (conn, addr)
+        max_clients: Hilos (clientes atendidos a la vez)
+        max_queued: Conexiones aceptadas esperando un hilo
+
+    Attributes:
+        rejected: Conexiones rechazadas por estar lleno
+        served: Conexiones atendidas hasta el final
+    """
+
+    def __init__(self, handler: Callable[[socket.socket, Tuple[str, int]], None], max_clients: int,
+                 max_queued: int):
+        self.handler = handler
+        self.max_clients = max_clients
+        self.max_queued = max_queued
+        self.active = 0
+        self.rejected = 0
+        self.served = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._threads = [threading.Thread(target=self._run, daemon=True, name=f"Client-{i}")
+                         for i in range(max_clients)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, conn: socket.socket, addr: Tuple[str, int]) -> bool:
+        """
+        Encola una conexión aceptada.
+
+        Returns:
+            False si estaba lleno (la conexión ya se respondió y cerró)
+        """
+        with self._lock:
+            full = self._pending >= self.max_clients + self.max_queued
+            if full:
+                self.rejected += 1
+            else:
+                self._pending += 1
+        if full:
+            logger.warning("Servidor ocupado, rechazando %s:%s", addr[0], addr[1])
+            _send_notice(conn, BUSY_REPLY)
+            conn.close()
+            return False
+        self._queue.put((conn, addr))
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores: activas, en_espera, rechazadas, atendidas, max_clientes."""
+        with self._lock:
+            return {
+                'activas': self.active,
+                'en_espera': self._pending - self.active,
+                'rechazadas': self.rejected,
+                'atendidas': self.served,
+                'max_clientes': self.max_clients,
+            }
+
+    def shutdown(self):
+        """Cierra las conexiones en espera y detiene los hilos al quedar libres."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].close()
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            with self._lock:
+                self.active += 1
+            try:
+                self.handler(*item)
+            except Exception as e:
+                logger.error("Error atendiendo conexión: %s", e)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self._pending -= 1
+                    self.served += 1
+
+
+def start_server(host: str, port: int, task_queue: multiprocessing.Queue, max_days: int = 7,
+                 max_clients: Optional[int] = None, max_queued: Optional[int] = None):
     """
     Inicia el servidor TCP y escucha conexiones entrantes.
     
@@ -166,32 +269,34 @@ def start_server(host: str, port: int, task_queue: multiprocessing.Queue, max_da
         port: Puerto para escuchar
         task_queue: Cola para encolar tareas al worker
         max_days: Días a futuro para operaciones
+        max_clients: Clientes atendidos a la vez (por defecto Config.SOCKET_MAX_CLIENTS)
+        max_queued: Conexiones esperando un hilo libre (por defecto Config.SOCKET_MAX_QUEUED)
     """
     srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     srv.bind((host, port))
     srv.listen()
     srv.settimeout(0.5)  # Timeout de 0.5s para responder rápido
-    logger.info(f"✓ Servidor TCP escuchando en {host}:{port}")
+    pool = ClientPool(
+        lambda conn, addr: handle_client(conn, addr, task_queue, max_days, stats=pool.stats),
+        max_clients or Config.SOCKET_MAX_CLIENTS,
+        Config.SOCKET_MAX_QUEUED if max_queued is None else max_queued,
+    )
+    logger.info(f"✓ Servidor TCP escuchando en {host}:{port} "
+                f"({pool.max_clients} clientes a la vez, {pool.max_queued} en espera)")
     
     try:
         while True:
             try:
                 conn, addr = srv.accept()
-                # Lanzar un hilo por cada cliente
-                t = threading.Thread(
-                    target=handle_client,
-                    args=(conn, addr, task_queue, max_days),
-                    daemon=True,
-                    name=f"Client-{addr[0]}:{addr[1]}"
-                )
-                t.start()
+                pool.submit(conn, addr)
             except socket.timeout:
                 # Timeout normal, continuar
                 continue
     finally:
         srv.close()
-        logger.info("Servidor cerrado")
+        pool.shutdown()
+        logger.info(f"Servidor cerrado ({pool.stats()})")
 
 
 def main():
@@ -217,6 +322,12 @@ def main():
         default=7,
         help='Días a futuro para generar slots'
     )
+    parser.add_argument(
+        '--backend',
+        choices=['threaded', 'asyncio'],
+        default=Config.SOCKET_BACKEND,
+        help='threaded: un hilo por cliente; asyncio: un loop con hilos sólo para la base'
+    )
     args = parser.parse_args()
 
     logger.info("=" * 50)
@@ -225,6 +336,7 @@ def main():
     logger.info(f"Host: {args.host}")
     logger.info(f"Port: {args.port}")
     logger.info(f"Max days: {args.max_days}")
+    logger.info(f"Backend: {args.backend}")
     logger.info("=" * 50)
 
     # Crear cola de tareas para IPC
@@ -243,7 +355,11 @@ def main():
     logger.info(f"✓ Worker iniciado (PID: {worker_process.pid})")
 
     try:
-        start_server(args.host, args.port, task_queue, max_days=args.max_days)
+        if args.backend == 'asyncio':
+            from .async_server import start_async_server
+            start_async_server(args.host, args.port, task_queue, max_days=args.max_days)
+        else:
+            start_server(args.host, args.port, task_queue, max_days=args.max_days)
     except KeyboardInterrupt:
         logger.info("\n⚠️  Interrupción recibida")
     except Exception as e:
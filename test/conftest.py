@@ -0,0 +1,43 @@
+"""
+Fixtures compartidas por los tests.
+"""
+import pytest
+from app import create_app
+from api import db
+from api.ratelimit import limiters
+from common import Config
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Cada test arranca con los buckets de tasa llenos."""
+    for limiter in limiters.values():
+        limiter.reset()
+
+
+@pytest.fixture
+def app():
+    """Fixture para crear la aplicación Flask en modo test."""
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """Fixture para el cliente de test de Flask."""
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers():
+    """Headers con token de autenticación."""
+    return {
+        'X-API-Token': Config.API_TOKEN,
+        'Content-Type': 'application/json'
+    }
@@ -0,0 +1,154 @@
+"""
+Tests del modo de servicio asíncrono (asgi.py).
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+from asgi import ChatASGIApp  # noqa: E402
+from common import Config  # noqa: E402
+
+
+def call(app, method, path, payload=None, headers=None, query=b''):
+    """Ejecuta una request contra la app ASGI y devuelve (status, headers, body)."""
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query,
+        'headers': [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, content = messages
+    response_headers = {k.decode(): v.decode() for k, v in start['headers']}
+    data = json.loads(content['body']) if content['body'] else None
+    return start['status'], response_headers, data
+
+
+@pytest.fixture
+def asgi_app():
+    return ChatASGIApp(db_uri='sqlite:///:memory:')
+
+
+@pytest.fixture
+def auth():
+    return {'X-API-Token': Config.API_TOKEN}
+
+
+def test_asgi_chat(asgi_app):
+    status, _, data = call(asgi_app, 'POST', '/chat/', {'message': 'hola'})
+    assert status == 200
+    assert 'Hola' in data['response']
+    
+    status, _, data = call(asgi_app, 'POST', '/chat/', {'message': ''})
+    assert status == 400
+
+
+def test_asgi_batch_messages(asgi_app):
+    status, _, data = call(asgi_app, 'POST', '/chat/batch-messages', {'messages': ['hola', 'xyzabc123']})
+    assert status == 200
+    assert len(data['responses']) == 2 and 'Hola' in data['responses'][0]
+
+    status, _, data = call(asgi_app, 'POST', '/chat/batch-messages', {'messages': []})
+    assert status == 400
+
+
+def test_asgi_chat_does_not_block_loop(asgi_app, monkeypatch):
+    """Mientras se arma una respuesta lenta el event loop sigue atendiendo."""
+    import asgi
+    monkeypatch.setattr(asgi, 'process_message', lambda message: time.sleep(0.3) or 'ok')
+    scope = {'type': 'http', 'method': 'POST', 'path': '/chat/', 'query_string': b'', 'headers': []}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'{"message": "hola"}', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def scenario():
+        request = asyncio.create_task(asgi_app(scope, receive, send))
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+        lag = time.perf_counter() - start
+        await request
+        return lag
+
+    assert asyncio.run(scenario()) < 0.2
+    assert json.loads(messages[-1]['body']) == {'response': 'ok'}
+
+
+def test_asgi_chat_conversation(asgi_app):
+    """Con conversation_id el diálogo de reserva sigue entre requests."""
+    payload = {'message': 'quiero reservar un corte', 'conversation_id': 'asgi-1'}
+    status, _, data = call(asgi_app, 'POST', '/chat/', payload)
+    assert status == 200
+    assert data['conversation_id'] == 'asgi-1'
+    assert data['response'].startswith('Estos son los próximos turnos para Corte')
+
+    status, _, data = call(asgi_app, 'POST', '/chat/', {'message': 'salir', 'conversation_id': 'asgi-1'})
+    assert status == 200 and data['response'].startswith('Listo, no hice')
+
+    status, _, data = call(asgi_app, 'POST', '/chat/', {'message': 'hola', 'conversation_id': 5})
+    assert status == 400
+
+
+def test_asgi_turnos_and_etag(asgi_app):
+    status, headers, data = call(asgi_app, 'GET', '/chat/turnos')
+    assert status == 200
+    assert len(data['turnos']) > 0
+    assert headers['x-event-id'].isdigit()
+    
+    status, _, _ = call(asgi_app, 'GET', '/chat/turnos', headers={'If-None-Match': headers['etag']})
+    assert status == 304
+    
+    status, _, _ = call(asgi_app, 'GET', '/chat/turnos', query=b'date=01-03-2026')
+    assert status == 400
+
+
+def test_asgi_reservar_and_cancelar(asgi_app, auth):
+    _, _, data = call(asgi_app, 'GET', '/chat/turnos')
+    slot_id = data['turnos'][0]['id']
+    
+    status, _, _ = call(asgi_app, 'POST', '/chat/reservar', {'slot_id': slot_id, 'name': 'Juan'})
+    assert status == 401
+    
+    status, _, data = call(asgi_app, 'POST', '/chat/reservar',
+                           {'slot_id': slot_id, 'name': 'Juan', 'service': 'Corte'}, auth)
+    assert (status, data) == (200, {'ok': True})
+    
+    _, _, data = call(asgi_app, 'POST', '/chat/reservar',
+                      {'slot_id': slot_id, 'name': 'Ana', 'service': 'Corte'}, auth)
+    assert data['ok'] is False
+    
+    status, _, data = call(asgi_app, 'POST', '/chat/cancelar', {'slot_id': slot_id}, auth)
+    assert (status, data) == (200, {'ok': True, 'deleted_db_rows': 1})
+
+
+def test_asgi_unknown_route(asgi_app):
+    assert call(asgi_app, 'GET', '/chat/nada')[0] == 404
+    assert call(asgi_app, 'GET', '/chat/reservar')[0] == 405
+
+
+def test_asgi_admin_reload(asgi_app, auth):
+    from chatbot_logic.processor import knowledge_base_size
+    status, _, _ = call(asgi_app, 'POST', '/chat/admin/reload')
+    assert status == 401
+
+    status, _, data = call(asgi_app, 'POST', '/chat/admin/reload', headers=auth)
+    assert status == 200
+    assert data['ok'] is True and data['claves'] >= knowledge_base_size()
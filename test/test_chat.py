@@ -11,34 +11,6 @@ from chatbot_logic import process_message, AppointmentManager
 from common import Config
 
 
-@pytest.fixture
-def app():
-    """Fixture para crear la aplicación Flask en modo test."""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-    
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Fixture para el cliente de test de Flask."""
-    return app.test_client()
-
-
-@pytest.fixture
-def auth_headers():
-    """Headers con token de autenticación."""
-    return {
-        'X-API-Token': Config.API_TOKEN,
-        'Content-Type': 'application/json'
-    }
-
-
 # ========== Tests de API REST ==========
 
 def test_chat_route(client):
@@ -60,6 +32,26 @@ def test_chat_route_empty_message(client):
     assert 'error' in data
 
 
+def test_batch_messages_route(client):
+    """El lote responde en orden, igual que un mensaje por vez."""
+    messages = ['Hola', 'xyzabc123', '¿Cuánto cuesta?', 'hola']
+    res = client.post('/chat/batch-messages', json={'messages': messages})
+    assert res.status_code == 200
+    assert res.get_json()['responses'] == [process_message(m) for m in messages]
+
+
+def test_batch_messages_validation(client, monkeypatch):
+    """Lista vacía, elementos inválidos o lotes demasiado grandes dan 400."""
+    for payload in ({}, {'messages': []}, {'messages': ['hola', '']}, {'messages': 'hola'}, ['hola']):
+        res = client.post('/chat/batch-messages', json=payload)
+        assert res.status_code == 400
+        assert 'error' in res.get_json()
+
+    monkeypatch.setattr(Config, 'CHAT_BATCH_MAX', 2)
+    res = client.post('/chat/batch-messages', json={'messages': ['a', 'b', 'c']})
+    assert res.status_code == 400
+
+
 def test_turnos_route(client, app):
     """Test del endpoint de listar turnos."""
     with app.app_context():
@@ -101,6 +93,54 @@ def test_turnos_route_invalid_date_format(client):
     assert 'error' in data
 
 
+def test_turnos_route_etag(client):
+    """Un If-None-Match vigente recibe 304 desde el listado cacheado."""
+    res = client.get('/chat/turnos')
+    assert res.status_code == 200
+    etag = res.headers['ETag']
+    
+    res = client.get('/chat/turnos', headers={'If-None-Match': etag})
+    assert res.status_code == 304
+
+
+def test_turnos_resumen_route(client, monkeypatch):
+    """Test del endpoint de resumen por día: libres y reservados de cada día del rango."""
+    am = AppointmentManager(db_uri='sqlite:///:memory:')
+    session = am.SessionLocal()
+    session.add_all([
+        TimeSlot(datetime_str='2030-01-01 10:00', service='General', customer=None),
+        TimeSlot(datetime_str='2030-01-01 11:00', service='General', customer=None),
+        TimeSlot(datetime_str='2030-01-01 12:00', service='General', customer=None),
+        TimeSlot(datetime_str='2030-01-03 10:00', service='General', customer=None),
+        TimeSlot(datetime_str='2030-01-03 11:00', service='General', customer=None),
+        TimeSlot(datetime_str='2030-01-04 10:00', service='General', customer=None),
+    ])
+    session.commit()
+    session.close()
+    booked = [s['id'] for s in am.list_available('2030-01-01')[:1] + am.list_available('2030-01-03')]
+    for slot_id in booked:
+        assert am.book(slot_id, 'Ana', 'Corte')
+    monkeypatch.setattr('api.routes.get_manager', lambda: am)
+
+    res = client.get('/chat/turnos/resumen?from=2030-01-01&to=2030-01-03')
+    assert res.status_code == 200
+    
+    data = res.get_json()
+    assert data['from'] == '2030-01-01'
+    assert data['to'] == '2030-01-03'
+    assert data['resumen'] == [
+        {'fecha': '2030-01-01', 'libres': 2, 'reservados': 1, 'total': 3},
+        {'fecha': '2030-01-03', 'libres': 0, 'reservados': 2, 'total': 2},
+    ]
+
+
+def test_turnos_resumen_invalid_range(client):
+    """Test de validación de fechas y rango del resumen."""
+    assert client.get('/chat/turnos/resumen?from=01-03-2026').status_code == 400
+    assert client.get('/chat/turnos/resumen?from=2026-03-10&to=2026-03-01').status_code == 400
+    assert client.get('/chat/turnos/resumen?from=2026-01-01&to=2028-01-01').status_code == 400
+
+
 def test_reservar_without_auth(client):
     """Test que verifica que reservar requiere autenticación."""
     res = client.post('/chat/reservar', json={
@@ -195,6 +235,24 @@ def test_cancelar_by_customer_name(client, app, auth_headers):
     assert data.get('cancelados', 0) == 2
 
 
+def test_ui_static_assets(client):
+    """La UI se sirve precomprimida, con ETag y el script versionado."""
+    res = client.get('/chat/ui')
+    assert res.status_code == 200
+    assert res.mimetype == 'text/html'
+    assert 'max-age' in res.headers['Cache-Control']
+    assert client.get('/chat/ui', headers={'If-None-Match': res.headers['ETag']}).status_code == 304
+    
+    html = res.get_data(as_text=True)
+    script_url = html.split('<script src="')[1].split('"')[0]
+    script = client.get(script_url, headers={'Accept-Encoding': 'gzip'})
+    assert script.status_code == 200
+    assert script.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in script.headers['Cache-Control']
+    
+    assert client.get('/chat/ui/app.0000.js').status_code == 404
+
+
 # ========== Tests de Procesamiento NLP ==========
 
 def test_process_message_greeting():
@@ -209,6 +267,40 @@ def test_process_message_unknown():
     assert "entend" in response.lower() or "otra forma" in response.lower()
 
 
+def test_process_messages_matches_single():
+    """process_messages devuelve lo mismo que process_message, en orden."""
+    from chatbot_logic import process_messages
+    messages = ['Hola!!', 'buenas noches', 'xyzabc123', '  hola ', 'quiero cancelar mi turno', 'Hola!!']
+    assert process_messages(messages) == [process_message(m) for m in messages]
+    assert process_messages([]) == []
+
+
+def test_process_message_reply_cache():
+    """Los mensajes que normalizan igual se sirven desde el cache."""
+    from chatbot_logic.processor import reply_cache
+    reply_cache.clear()
+    hits = reply_cache.hits
+    
+    first = process_message("Hola!!")
+    assert process_message("  hola ") == first
+    assert reply_cache.hits == hits + 1
+
+
+def test_reload_responses_invalidates_cache():
+    """Recargar la base de conocimiento descarta las respuestas cacheadas."""
+    from chatbot_logic.processor import reload_responses
+    from chatbot_logic.responses import RESPONSES
+    original = dict(RESPONSES)
+    process_message("hola")
+    try:
+        assert reload_responses({'hola': 'Saludos recargados'}) == 1
+        assert process_message("hola") == 'Saludos recargados'
+    finally:
+        reload_responses()
+    assert RESPONSES == original
+    assert process_message("hola") == original['hola']
+
+
 # ========== Tests de AppointmentManager ==========
 
 def test_appointment_manager_initialization():
@@ -278,6 +370,18 @@ def test_cancel_by_customer():
         assert count == 2
 
 
+def test_summary_by_day():
+    """Test de conteo de libres/reservados por día."""
+    am = AppointmentManager(db_uri='sqlite:///:memory:')
+    slots = am.list_available()
+    day = slots[0]['datetime'][:10]
+    am.book(slots[0]['id'], 'Test User', 'Corte')
+    
+    resumen = am.summary_by_day(day, day)
+    assert resumen == [{'fecha': day, 'libres': 5, 'reservados': 1, 'total': 6}]
+    assert am.summary_by_day('2000-01-01', '2000-01-31') == []
+
+
 def test_list_bookings():
     """Test de listar reservas activas."""
     am = AppointmentManager(db_uri='sqlite:///:memory:')
@@ -0,0 +1,85 @@
+"""
+Tests del clasificador de intenciones (chatbot_logic.classifier).
+"""
+import pytest
+
+pytest.importorskip('numpy')
+
+from chatbot_logic import process_message
+from chatbot_logic.classifier import IntentClassifier, corpus_fingerprint, load_classifier
+from chatbot_logic.intents import INTENTS
+from chatbot_logic.normalize import normalize
+from chatbot_logic.booking import BookingDialog
+from chatbot_logic.processor import DEFAULT_REPLY, analyze_message
+from chatbot_logic.sessions import SessionStore
+from chatbot_logic.responses import RESPONSES
+from common import Config
+from services import ReservationService
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    return load_classifier(cache_path='')
+
+
+def test_classifies_paraphrases(classifier):
+    """Frases que no están literalmente en RESPONSES caen en su intención."""
+    cases = {
+        '¿Cuánto sale un corte de pelo?': 'precios',
+        'me anotás para el jueves?': 'reservar',
+        'dónde queda el local': 'ubicacion',
+        'hasta qué hora atienden hoy': 'horario',
+        'no voy a poder ir mañana': 'cancelar',
+    }
+    for message, intent in cases.items():
+        assert classifier.classify(normalize(message))[0] == intent
+
+
+def test_off_topic_is_not_booking():
+    """Frases ajenas ("me gusta la pizza") no se toman como reserva ni abren sesión."""
+    messages = ['me gusta la pizza', 'Me gusta', 'me gusta el helado', 'quiero una hamburguesa']
+    for message in messages:
+        assert analyze_message(message) == (None, DEFAULT_REPLY), message
+    dialog = BookingDialog(SessionStore(max_sessions=10, ttl=60), ReservationService('sqlite:///:memory:'))
+    assert dialog.handle('c1', 'me gusta la pizza') == DEFAULT_REPLY
+    assert len(dialog.store) == 0
+    assert analyze_message('me gustaria reservar')[0] == 'reservar'
+
+
+def test_batch_matches_single(classifier):
+    """classify_many devuelve lo mismo que classify, en orden."""
+    messages = [normalize(m) for m in ['hola', 'cuanto cobran', 'xyzabc', '', 'gracias totales'] * 300]
+    batch = classifier.classify_many(messages)
+    assert len(batch) == len(messages)
+    for message, (intent, confidence) in zip(messages[:5], batch[:5]):
+        single_intent, single_confidence = classifier.classify(message)
+        assert intent == single_intent
+        assert confidence == pytest.approx(single_confidence, abs=1e-5)
+
+
+def test_model_disk_cache(tmp_path):
+    """El modelo se guarda en disco y se recarga mientras el corpus no cambie."""
+    path = str(tmp_path / 'model.npz')
+    built = load_classifier(INTENTS, path)
+    loaded = IntentClassifier.load(path, corpus_fingerprint(INTENTS))
+    assert loaded is not None
+    assert loaded.intents == built.intents
+    assert loaded.classify('cuanto cuesta') == pytest.approx(built.classify('cuanto cuesta'))
+
+    changed = dict(INTENTS, extra={'reply': 'hola', 'examples': ['frase nueva']})
+    assert IntentClassifier.load(path, corpus_fingerprint(changed)) is None
+
+
+def test_process_message_uses_intents():
+    """Con confianza suficiente responde por intención; si no, por palabra clave."""
+    assert process_message('¿Cuánto sale un corte de pelo?') == RESPONSES['precio']
+    # una clave de la misma intención sigue teniendo su respuesta propia
+    assert process_message('buenas noches') == RESPONSES['buenas noches']
+    assert process_message('xyzabc123') == DEFAULT_REPLY
+
+
+def test_threshold_falls_back_to_keywords(monkeypatch):
+    """Con el umbral al máximo sólo quedan las palabras clave."""
+    from chatbot_logic.processor import _match
+    monkeypatch.setattr(Config, 'INTENT_THRESHOLD', 1.1)
+    assert _match(normalize('¿Cuánto sale un corte de pelo?')) == RESPONSES['corte']
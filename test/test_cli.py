@@ -0,0 +1,35 @@
+"""
+Tests del menú de `run_chatbot.py --mode cli` con la entrada por tubería.
+
+Sólo usa opciones que no reservan ni cancelan (listar, chatear, salir),
+porque el modo CLI trabaja sobre la base por defecto de instance/.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_cli(stdin: str, tmp_path) -> subprocess.CompletedProcess:
+    env = dict(os.environ, INTENT_MODEL_PATH=str(tmp_path / 'intent_model.npz'))
+    return subprocess.run(
+        [sys.executable, 'run_chatbot.py', '--mode', 'cli'],
+        cwd=ROOT, input=stdin, capture_output=True, text=True, timeout=60, env=env,
+    )
+
+
+def test_cli_menu_runs_options_and_exits(tmp_path):
+    """Listar reservas, chatear y salir con la opción 6."""
+    proc = _run_cli('4\n5\nhola\n6\n', tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    assert 'Bienvenido al ChatBot de Turnos' in proc.stdout
+    assert 'Bot: ' in proc.stdout
+    assert 'Hasta luego' in proc.stdout
+
+
+def test_cli_exits_on_closed_stdin(tmp_path):
+    """Sin más entrada el menú termina en lugar de fallar."""
+    proc = _run_cli('', tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    assert 'Entrada cerrada' in proc.stdout
@@ -0,0 +1,124 @@
+"""
+Tests del cliente Python (chatbot_client) contra un servidor local.
+"""
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+from app import create_app
+from chatbot_client import AsyncChatClient, ChatClient, ChatClientError
+from common import Config
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    """Levanta la API Flask en un hilo y devuelve su URL.
+
+    El servidor de Werkzeug cierra la conexión después de cada respuesta:
+    el cliente tiene que reconectar sin que se note.
+    """
+    rate_limit_enabled = Config.RATE_LIMIT_ENABLED
+    Config.RATE_LIMIT_ENABLED = False
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    Config.RATE_LIMIT_ENABLED = rate_limit_enabled
+
+
+@pytest.fixture(scope='module')
+def asgi_url():
+    """Levanta la API ASGI con uvicorn (soporta keep-alive) y devuelve su URL."""
+    uvicorn = pytest.importorskip('uvicorn')
+    pytest.importorskip('aiosqlite')
+    pytest.importorskip('greenlet')
+    from asgi import ChatASGIApp
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(ChatASGIApp('sqlite://'), host='127.0.0.1', port=port,
+                                           log_level='warning', lifespan='on'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    yield f'http://127.0.0.1:{port}'
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+def test_client_reconnects_when_server_closes(server_url):
+    """Con un servidor que cierra cada respuesta, el cliente reconecta solo."""
+    with ChatClient(server_url) as client:
+        for _ in range(3):
+            assert 'Hola' in client.chat('hola')
+        assert client.pool.connections_opened == 3
+
+
+def test_client_reuses_connection(asgi_url):
+    """Con keep-alive, varias requests secuenciales usan una sola conexión."""
+    with ChatClient(asgi_url) as client:
+        for _ in range(5):
+            assert 'Hola' in client.chat('hola')
+        assert client.list_turnos() == client.list_turnos()
+        assert client.listing_cache.not_modified == 1
+        assert client.pool.connections_opened == 1
+
+
+def test_client_listing_etag(server_url):
+    """El segundo listado se resuelve con 304 y devuelve los mismos turnos."""
+    with ChatClient(server_url) as client:
+        first = client.list_turnos()
+        second = client.list_turnos()
+        assert first == second
+        assert client.listing_cache.not_modified == 1
+
+
+def test_client_token_and_errors(asgi_url):
+    """reservar envía el token; sin token la API responde 401."""
+    with ChatClient(asgi_url) as anonymous:
+        with pytest.raises(ChatClientError) as exc:
+            anonymous.reservar(1, 'Ana')
+        assert exc.value.status == 401
+
+    with ChatClient(asgi_url, token=Config.API_TOKEN) as client:
+        slot_id = client.list_turnos()[0]['id']
+        assert client.reservar(slot_id, 'Cliente SDK', 'Corte')['ok'] is True
+        assert client.cancelar(slot_id=slot_id)['ok'] is True
+        with pytest.raises(ChatClientError) as exc:
+            client.reservar(slot_id, '', 'Corte')
+        assert exc.value.status == 400
+
+
+def test_client_chat_many_keeps_order(asgi_url):
+    """chat_many manda lotes, los reparte entre conexiones y respeta el orden."""
+    messages = ['hola', 'xyzabc', 'cancelar', 'hola', 'gracias']
+    with ChatClient(asgi_url, pool_size=2) as client:
+        replies = client.chat_many(messages, batch_size=2)
+        assert replies == [client.chat(m) for m in messages]
+        assert client.chat_many(messages) == replies
+        assert client.chat_many([]) == []
+        assert client.pool.connections_opened <= 2
+
+
+def test_async_client(asgi_url):
+    """El cliente asíncrono reutiliza conexiones y resuelve 304."""
+    async def scenario():
+        async with AsyncChatClient(asgi_url, pool_size=3) as client:
+            replies = await client.chat_many(['hola'] * 9)
+            first = await client.list_turnos()
+            second = await client.list_turnos()
+            return client, replies, first, second
+
+    client, replies, first, second = asyncio.run(scenario())
+    assert len(replies) == 9 and all('Hola' in r for r in replies)
+    assert first == second
+    assert client.listing_cache.not_modified == 1
+    assert client.pool.connections_opened <= 3
@@ -0,0 +1,87 @@
+"""
+Tests de la extracción de fechas y horarios (chatbot_logic.dates) y de las
+respuestas con los turnos libres del rango pedido.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from chatbot_logic import process_message
+from chatbot_logic.appointments import AppointmentManager
+from chatbot_logic.booking import BookingDialog, booking_dialog
+from chatbot_logic.dates import When, extract_when
+from chatbot_logic.sessions import SessionStore
+from services import ReservationService
+
+MONDAY = date(2026, 3, 2)
+MEMORY_DB = 'sqlite:///:memory:'
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('¿Tenés algo mañana a la tarde?', When('2026-03-03', '2026-03-03', '13:00', '19:59')),
+    ('el viernes a las 15', When('2026-03-06', '2026-03-06', '15:00', '15:00')),
+    ('hoy después de las 14', When('2026-03-02', '2026-03-02', '14:00', '23:59')),
+    ('pasado mañana a la mañana', When('2026-03-04', '2026-03-04', '08:00', '12:59')),
+    ('el próximo lunes', When('2026-03-09', '2026-03-09')),
+    ('el lunes', When('2026-03-02', '2026-03-02')),
+    ('la semana que viene', When('2026-03-09', '2026-03-15')),
+    ('el finde', When('2026-03-07', '2026-03-08')),
+    ('el viernes o el sábado', When('2026-03-06', '2026-03-07')),
+    ('turnos para el 15/11', When('2026-11-15', '2026-11-15')),
+    ('el 1', When('2026-04-01', '2026-04-01')),
+    ('el 20 de febrero', When('2027-02-20', '2027-02-20')),
+    ('2026-03-20 16:00', When('2026-03-20', '2026-03-20', '16:00', '16:00')),
+    ('a las 3 de la tarde', When('2026-03-02', None, '15:00', '15:00')),
+    ('a las 10 y media', When('2026-03-02', None, '10:30', '10:30')),
+    ('entre las 10 y las 12', When('2026-03-02', None, '10:00', '12:00')),
+    ('esta noche', When('2026-03-02', '2026-03-02', '20:00', '23:59')),
+])
+def test_extract_when(message, expected):
+    """Días relativos, días de la semana, fechas, franjas y horas."""
+    assert extract_when(message, MONDAY) == expected
+
+
+@pytest.mark.parametrize('message', ['hola', 'la opción 2', 'quiero reservar', 'a las 25', 'el 31/2'])
+def test_extract_when_without_mentions(message):
+    """Sin fechas ni horas válidas no hay rango."""
+    assert extract_when(message, MONDAY) is None
+
+
+def test_list_available_between():
+    """El rango de días y la franja filtran los turnos libres en la base."""
+    am = AppointmentManager(db_uri=MEMORY_DB)
+    day = (date.today() + timedelta(days=1)).isoformat()
+    afternoon = am.list_available_between(day, day, '13:00', '19:59')
+    assert [s['datetime'][11:] for s in afternoon] == ['14:00', '15:00', '16:00']
+
+    am.book(afternoon[1]['id'], 'Ana', 'Corte')
+    assert [s['datetime'] for s in am.list_available_between(day, day, '15:00', '15:00')] == []
+    at_ten = am.list_available_between(day, None, '10:00', '10:00', limit=2)
+    assert [s['datetime'][11:] for s in at_ten] == ['10:00', '10:00'] and at_ten[0]['datetime'].startswith(day)
+
+
+def test_chat_route_answers_with_live_slots(client, monkeypatch):
+    """POST /chat/ con un día y franja responde con los turnos de ese rango."""
+    monkeypatch.setattr(booking_dialog, 'service', ReservationService(MEMORY_DB))
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    reply = client.post('/chat/', json={'message': '¿Tenés algo mañana a la tarde?'}).get_json()['response']
+    assert reply.startswith(f'Tengo estos turnos libres el {tomorrow} entre las 13:00 y las 19:59')
+    assert f'{tomorrow} 14:00' in reply and f'{tomorrow} 10:00' not in reply
+
+    # Otras intenciones con fecha siguen con su respuesta
+    reply = client.post('/chat/', json={'message': '¿A qué hora abren el sábado?'}).get_json()['response']
+    assert reply == process_message('¿A qué hora abren el sábado?')
+
+
+def test_dialog_offers_slots_in_requested_range():
+    """La franja pedida filtra los turnos ofrecidos; sin turnos a esa hora, los del día."""
+    dialog = BookingDialog(SessionStore(), ReservationService(MEMORY_DB))
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+
+    reply = dialog.handle('d1', 'quiero reservar un corte para mañana a la tarde')
+    assert f'1) {tomorrow} 14:00' in reply and '4)' not in reply
+
+    reply = dialog.handle('d1', 'mejor mañana a las 9')
+    assert reply.startswith(f'No tengo turnos libres el {tomorrow} a las 09:00')
+    assert f'1) {tomorrow} 10:00' in reply
@@ -0,0 +1,103 @@
+"""
+Tests del hub de cambios de disponibilidad y del stream SSE.
+"""
+from chatbot_logic import AppointmentManager, availability_hub
+from chatbot_logic.events import AvailabilityHub
+
+
+def test_hub_fanout():
+    """Cada suscriptor recibe los eventos publicados."""
+    hub = AvailabilityHub()
+    a, b = hub.subscribe(), hub.subscribe()
+    event_id = hub.publish('slot', {'id': 1})
+    
+    assert a.get(0.1)['id'] == event_id
+    assert b.get(0.1)['data'] == {'id': 1}
+    assert a.get(0.01) is None
+
+
+def test_hub_resume_and_reset():
+    """Last-Event-ID reenvía el backlog o pide reset si se perdieron eventos."""
+    hub = AvailabilityHub(backlog=2)
+    ids = [hub.publish('slot', {'id': i}) for i in range(3)]
+    
+    resumed = hub.subscribe(last_event_id=ids[1])
+    assert [e['id'] for e in resumed.replay] == [ids[2]]
+    assert not resumed.reset
+    
+    assert hub.subscribe(last_event_id=0).reset
+
+
+def test_hub_reset_after_restart():
+    """Un Last-Event-ID de un proceso anterior (mayor al último) pide reset."""
+    hub = AvailabilityHub()
+    assert hub.subscribe(last_event_id=57).reset
+    hub.publish('slot', {'id': 1})
+    assert hub.subscribe(last_event_id=57).reset
+    assert not hub.subscribe(last_event_id=hub.last_id).reset
+
+
+def test_hub_slow_subscriber_gets_reset():
+    """Un suscriptor con la cola llena recibe reset en lugar de bloquear."""
+    hub = AvailabilityHub(queue_size=2)
+    sub = hub.subscribe()
+    for i in range(5):
+        hub.publish('slot', {'id': i})
+    
+    assert sub.get(0.1)['event'] == 'reset'
+
+
+def test_manager_publishes_changes():
+    """book y cancel publican el nuevo estado del slot."""
+    am = AppointmentManager(db_uri='sqlite:///:memory:')
+    slot_id = am.list_available()[0]['id']
+    sub = availability_hub.subscribe()
+    try:
+        am.book(slot_id, 'Test User', 'Corte')
+        am.cancel_by_slot(slot_id)
+        
+        booked, freed = sub.get(1), sub.get(1)
+        assert booked['data']['estado'] == 'reservado'
+        assert booked['data']['customer'] == 'Test User'
+        assert freed['data']['estado'] == 'libre'
+    finally:
+        availability_hub.unsubscribe(sub)
+
+
+def test_turnos_stream_replays_from_last_event_id(client):
+    """El stream SSE reenvía los eventos posteriores al Last-Event-ID."""
+    last = availability_hub.publish('slot', {'id': 7, 'datetime': '2026-03-01 10:00', 'estado': 'libre'})
+    availability_hub.publish('slot', {'id': 8, 'datetime': '2026-03-01 11:00', 'estado': 'reservado'})
+    
+    res = client.get('/chat/turnos/stream?date=2026-03-01',
+                     headers={'Last-Event-ID': str(last)}, buffered=False)
+    assert res.status_code == 200
+    assert res.mimetype == 'text/event-stream'
+    
+    chunks = iter(res.response)
+    assert next(chunks).startswith(b'retry:')
+    assert b'event: ready' in next(chunks)
+    event = next(chunks).decode('utf-8')
+    assert f'id: {last + 1}' in event
+    assert '"reservado"' in event
+    res.close()
+
+
+def test_turnos_listing_event_id_resumes_stream(client):
+    """X-Event-Id de /turnos es el punto de partida del stream: no se pierde el cambio intermedio."""
+    res = client.get('/chat/turnos')
+    listed = int(res.headers['X-Event-Id'])
+    assert listed == availability_hub.last_id
+    missed = availability_hub.publish('slot', {'id': 9, 'datetime': '2026-03-02 10:00', 'estado': 'reservado'})
+
+    res = client.get(f'/chat/turnos/stream?last_event_id={listed}', buffered=False)
+    chunks = iter(res.response)
+    next(chunks)  # retry
+    assert b'event: ready' in next(chunks)
+    assert f'id: {missed}'.encode() in next(chunks)
+    res.close()
+
+
+def test_turnos_stream_invalid_date(client):
+    """Validación de fecha del stream."""
+    assert client.get('/chat/turnos/stream?date=marzo').status_code == 400
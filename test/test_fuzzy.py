@@ -0,0 +1,53 @@
+"""
+Tests de la corrección de errores de tipeo (chatbot_logic.fuzzy).
+"""
+from chatbot_logic import process_message
+from chatbot_logic.fuzzy import FuzzyIndex, edit_distance
+from chatbot_logic.processor import DEFAULT_REPLY, reload_responses
+from chatbot_logic.responses import RESPONSES
+
+
+def test_edit_distance():
+    """Inserción, borrado, sustitución y transposición cuestan 1."""
+    assert edit_distance('turno', 'turno', 2) == 0
+    assert edit_distance('turmo', 'turno', 2) == 1
+    assert edit_distance('hloa', 'hola', 2) == 1
+    assert edit_distance('resevar', 'reservar', 2) == 1
+    assert edit_distance('cancelsr', 'cancelar', 2) == 1
+    assert edit_distance('abcdef', 'xyz', 2) == 3
+
+
+def test_lookup_respects_length_limits():
+    """Las palabras cortas no se corrigen; las largas admiten distancia 2."""
+    index = FuzzyIndex(['turno', 'reservar', 'cancelar', 'sol', 'ubicacion'])
+    assert index.lookup('turno') == 'turno'
+    assert index.lookup('turmo') == 'turno'
+    assert index.lookup('resevar') == 'reservar'
+    assert index.lookup('ubicasio') == 'ubicacion'
+    assert index.lookup('sal') is None
+    assert index.lookup('perro') is None
+    assert FuzzyIndex(['turno'], max_distance=0).lookup('turmo') is None
+
+
+def test_lookup_prefers_frequent_words():
+    """A igual distancia gana la palabra más frecuente del vocabulario."""
+    index = FuzzyIndex(['corte', 'corre', 'corte'])
+    assert index.lookup('corle') == 'corte'
+
+
+def test_process_message_tolerates_typos():
+    """Los errores de tipeo ya no caen en la respuesta por defecto."""
+    assert process_message('resevar') == RESPONSES['reservar']
+    assert process_message('cancelsr') == RESPONSES['cancelar']
+    assert process_message('turmo') == RESPONSES['turno']
+    assert process_message('xyzabc123') == DEFAULT_REPLY
+
+
+def test_index_rebuilt_on_reload():
+    """reload_responses arma el índice con las claves nuevas."""
+    original = dict(RESPONSES)
+    try:
+        reload_responses({'estacionamiento': 'Hay estacionamiento en la esquina'})
+        assert process_message('estasionamento') == 'Hay estacionamiento en la esquina'
+    finally:
+        reload_responses(original)
@@ -0,0 +1,154 @@
+"""
+Tests de la base de conocimiento en archivo y su recarga en caliente
+(chatbot_logic.responses, processor.reload_responses y kb_watcher).
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from chatbot_logic import analyze_message, process_message
+from chatbot_logic.fuzzy import FuzzyIndex
+from chatbot_logic.kb_watcher import KnowledgeBaseWatcher
+from chatbot_logic.processor import reload_responses
+from chatbot_logic.responses import RESPONSES, load_responses
+from common import Config
+
+
+@pytest.fixture
+def kb_file(tmp_path, monkeypatch):
+    """Copia de la base en un archivo temporal; al terminar se restaura la original."""
+    original = dict(RESPONSES)
+    path = tmp_path / 'responses.json'
+    path.write_text(json.dumps(original, ensure_ascii=False), encoding='utf-8')
+    monkeypatch.setattr(Config, 'KNOWLEDGE_BASE_PATH', str(path))
+    yield path
+    reload_responses(original)
+
+
+def write_kb(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_responses_loaded_from_file():
+    """RESPONSES es el contenido de chatbot_logic/responses.json."""
+    assert RESPONSES == load_responses()
+    assert RESPONSES['hola'] == process_message('hola')
+
+
+@pytest.mark.parametrize('content', ['{"hola": ', '["hola"]', '{"hola": 1}', '{" ": "vacía"}'])
+def test_invalid_file_keeps_previous_kb(kb_file, content):
+    """Un archivo inválido no reemplaza la base en uso."""
+    kb_file.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError):
+        reload_responses()
+    assert process_message('hola') == RESPONSES['hola']
+
+
+def test_watcher_reloads_on_change(kb_file):
+    """El vigilante recarga al cambiar el archivo y sólo entonces."""
+    watcher = KnowledgeBaseWatcher(interval=0)
+    assert watcher.check() is False
+
+    write_kb(kb_file, {**RESPONSES, 'hola': 'Hola desde el archivo'}, mtime_ns=10**18)
+    assert watcher.check() is True
+    assert process_message('hola') == 'Hola desde el archivo'
+    assert watcher.check() is False
+
+    # A medio guardar: se registra el error y sigue la base anterior
+    kb_file.write_text('{"hola": "cortado', encoding='utf-8')
+    assert watcher.check() is False
+    assert process_message('hola') == 'Hola desde el archivo'
+
+
+def test_watcher_thread(kb_file):
+    """El hilo de fondo toma el cambio sin que nadie lo pida."""
+    reloaded = threading.Event()
+
+    def reload():
+        count = reload_responses()
+        reloaded.set()
+        return count
+
+    watcher = KnowledgeBaseWatcher(interval=0.01, reload=reload).start()
+    try:
+        write_kb(kb_file, {'horario': 'Abrimos de 9 a 20'}, mtime_ns=10**18)
+        assert reloaded.wait(5)
+    finally:
+        watcher.stop()
+    assert process_message('¿Qué horario tienen?') == 'Abrimos de 9 a 20'
+
+
+def test_admin_reload_endpoint(client, auth_headers, kb_file):
+    """POST /chat/admin/reload requiere token y vuelve a leer el archivo."""
+    write_kb(kb_file, {**RESPONSES, 'precio': 'Corte: $1000'})
+    assert client.post('/chat/admin/reload').status_code == 401
+    assert process_message('precio') != 'Corte: $1000'
+
+    response = client.post('/chat/admin/reload', headers=auth_headers)
+    data = response.get_json()
+    assert response.status_code == 200 and data['ok'] is True
+    assert data['claves'] == len(RESPONSES)
+    assert process_message('precio') == 'Corte: $1000'
+
+    kb_file.write_text('no es json', encoding='utf-8')
+    response = client.post('/chat/admin/reload', headers=auth_headers)
+    assert response.status_code == 422 and response.get_json()['ok'] is False
+    assert process_message('precio') == 'Corte: $1000'
+
+
+@pytest.mark.parametrize('removed, added', [
+    ([], []),
+    (['turno', 'cancelar'], []),
+    ([], ['estacionamiento', 'tarjeta', 'turnero']),
+    (['reservar'], ['reservas', 'reserbar']),
+])
+def test_fuzzy_rebuilt_matches_full_build(removed, added):
+    """La actualización incremental del índice equivale a armarlo de cero."""
+    words = ['hola', 'turno', 'turnos', 'reservar', 'cancelar', 'precio', 'turno', 'peinado']
+    index = FuzzyIndex(words)
+    snapshot = {variant: list(bucket) for variant, bucket in index._index.items()}
+
+    new_words = [w for w in words if w not in removed] + added
+    rebuilt = index.rebuilt(new_words)
+    full = FuzzyIndex(new_words)
+    assert rebuilt.frequency == full.frequency
+    assert {k: sorted(v) for k, v in rebuilt._index.items()} == {k: sorted(v) for k, v in full._index.items()}
+    # El índice anterior no se modificó
+    assert index._index == snapshot
+    for word in ('turmo', 'resevar', 'cancelsr', 'estacionamento'):
+        assert rebuilt.lookup(word) == full.lookup(word)
+
+
+def test_readers_during_reload_see_old_or_new():
+    """Mientras se recarga, cada mensaje se responde con la base vieja o la nueva."""
+    original = dict(RESPONSES)
+    variants = [original, {**original, 'hola': 'Hola (v2)', 'estacionamiento': 'En la esquina'}]
+    allowed = {original['hola'], 'Hola (v2)'}
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                for reply in (process_message('hola'), analyze_message('¡Hola!')[1]):
+                    if reply not in allowed:
+                        errors.append(reply)
+            except Exception as e:  # pragma: no cover - sólo si la base queda a medias
+                errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    try:
+        for i in range(20):
+            reload_responses(variants[i % 2])
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        reload_responses(original)
+    assert errors == []
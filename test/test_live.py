@@ -0,0 +1,104 @@
+"""
+Tests de las respuestas con datos en vivo (chatbot_logic.live).
+"""
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from chatbot_logic import process_message, process_messages
+from chatbot_logic.live import LiveAvailability, live_availability, template_fields
+from chatbot_logic.processor import reload_responses, reply_cache
+from chatbot_logic.responses import RESPONSES, load_responses
+from services import ReservationService
+
+MEMORY_DB = 'sqlite:///:memory:'
+
+
+@pytest.fixture
+def live(monkeypatch):
+    """El resumen compartido sobre la base en memoria."""
+    monkeypatch.setattr(live_availability, 'service', ReservationService(MEMORY_DB))
+    live_availability.invalidate()
+    yield live_availability
+    live_availability.invalidate()
+
+
+def test_template_fields():
+    assert template_fields('Hola') == frozenset()
+    assert template_fields('Quedan {libres_hoy} ({horarios_hoy})') == {'libres_hoy', 'horarios_hoy'}
+    assert template_fields('Llaves {{literales}}') == frozenset()
+    with pytest.raises(ValueError):
+        template_fields('Quedan {libres_hoy')
+
+
+@pytest.mark.parametrize('reply', ['Quedan {libres} turnos', 'Quedan {libres_hoy turnos'])
+def test_load_rejects_invalid_templates(tmp_path, reply):
+    """Un campo desconocido o llaves sin cerrar invalidan el archivo."""
+    path = tmp_path / 'responses.json'
+    path.write_text(json.dumps({'turnos': reply}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_responses(str(path))
+
+
+def test_values_from_database():
+    """Los campos salen de los turnos libres de hoy y de la semana."""
+    service = ReservationService(MEMORY_DB)
+    values = LiveAvailability(service, ttl=60).values()
+    now = datetime.now()
+    today = now.date().isoformat()
+    left = [s['datetime'][11:] for s in service.list_available_between(today, today, now.strftime('%H:%M'))]
+    assert values['libres_hoy'] == str(len(left))
+    week = service.list_available_between(today, (now.date() + timedelta(days=6)).isoformat())
+    assert int(values['libres_semana']) == len([s for s in week if s['datetime'][11:] >= now.strftime('%H:%M')
+                                                or s['datetime'][:10] > today])
+    tomorrow = service.list_available_between((date.today() + timedelta(days=1)).isoformat(), limit=1)
+    assert values['proximo_turno'] == (f'{today} {left[0]}' if left else tomorrow[0]['datetime'])
+
+
+def test_summary_cached_until_change():
+    """Un resumen por TTL; reservar en este proceso lo invalida."""
+    service = ReservationService(MEMORY_DB)
+    live = LiveAvailability(service, ttl=60)
+    template = 'Próximo: {proximo_turno}'
+    first = live.render(template)
+    for _ in range(1000):
+        assert live.render(template) == first
+    assert live.refreshes == 1
+
+    upcoming = first.split(': ')[1]
+    slot = next(s for s in service.list_available() if s['datetime'] == upcoming)
+    assert service.book(slot['id'], 'Ana', 'Corte')
+    try:
+        assert live.render(template) != first
+        assert live.refreshes == 2
+    finally:
+        service.cancel_by_slot(slot['id'])
+
+
+def test_database_error_uses_fallback():
+    class Broken:
+        def list_available_between(self, *args, **kwargs):
+            raise RuntimeError('sin conexión')
+
+    reply = LiveAvailability(Broken(), ttl=60).render('Próximo: {proximo_turno}')
+    assert reply == 'Próximo: a confirmar'
+
+
+def test_chat_replies_with_live_values(live):
+    """El cache guarda la plantilla y cada respuesta se completa con el resumen vigente."""
+    reply_cache.clear()
+    reply = process_message('¿Qué turnos hay?')
+    assert '{' not in reply and live.values()['proximo_turno'] in reply
+    assert '{proximo_turno}' in reply_cache.get('que turnos hay')
+    assert process_messages(['turnos', '¿Qué turnos hay?'])[1] == reply
+
+
+def test_templates_after_reload(live):
+    """Las plantillas nuevas se completan igual al recargar la base."""
+    original = dict(RESPONSES)
+    try:
+        reload_responses({**original, 'hola': 'Hola! Hoy quedan {libres_hoy} turnos.'})
+        assert process_message('hola') == f"Hola! Hoy quedan {live.values()['libres_hoy']} turnos."
+    finally:
+        reload_responses(original)
@@ -0,0 +1,86 @@
+"""
+Tests de la configuración de logging (cola, JSON y muestreo).
+"""
+import json
+import logging
+import logging.handlers
+
+from common import Config, logconfig
+from common.logconfig import JSONFormatter, SamplingFilter, parse_sampling, setup_logging
+
+
+def _record(msg, *args, level=logging.INFO):
+    return logging.LogRecord('api.routes', level, __file__, 1, msg, args, None)
+
+
+def test_parse_sampling():
+    """Entradas "fragmento=N" separadas por coma; las inválidas se ignoran."""
+    assert parse_sampling('Mensaje recibido=10, listó=5,roto,x=y') == {'Mensaje recibido': 10, 'listó': 5}
+    assert parse_sampling('') == {}
+
+
+def test_sampling_filter_keeps_one_of_n():
+    """Deja pasar 1 de cada N por plantilla; WARNING nunca se descarta."""
+    f = SamplingFilter({'Mensaje recibido': 3})
+    kept = [f.filter(_record("Mensaje recibido: %s", i)) for i in range(6)]
+    assert kept == [True, False, False, True, False, False]
+    assert f.filter(_record("Otro mensaje %s", 1))
+    assert f.filter(_record("Mensaje recibido: %s", 1, level=logging.WARNING))
+
+
+def test_sampling_filter_one_counter_per_rule():
+    """Los contadores son por regla: mil mensajes distintos no crean mil contadores."""
+    f = SamplingFilter({'Cliente conectado': 10})
+    kept = sum(f.filter(_record(f"Cliente conectado: 127.0.0.1:{port}")) for port in range(1000))
+    assert kept == 100
+    assert list(f._counters) == ['Cliente conectado']
+
+
+def test_socket_server_logs_lazy_templates():
+    """Los logs por conexión usan plantillas `%s`, que el muestreo agrupa."""
+    import queue
+    import socket
+    import threading
+
+    from socket_srv import server
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    server.logger.addHandler(handler)
+    try:
+        server_side, client_side = socket.socketpair()
+        thread = threading.Thread(target=server.handle_client, args=(server_side, ('test', 0), queue.Queue()))
+        thread.start()
+        with client_side:
+            client_side.sendall(b'QUIT\n')
+            while client_side.recv(4096):
+                pass
+        thread.join(timeout=5)
+    finally:
+        server.logger.removeHandler(handler)
+    templates = {r.msg for r in records}
+    assert {'Cliente conectado: %s', 'Cliente desconectado: %s'} <= templates
+
+
+def test_json_formatter():
+    """Una línea JSON con el mensaje ya formateado."""
+    line = JSONFormatter().format(_record("%s listó %d turnos", 'cli', 4))
+    entry = json.loads(line)
+    assert entry['message'] == 'cli listó 4 turnos'
+    assert entry['logger'] == 'api.routes'
+    assert entry['level'] == 'INFO'
+
+
+def test_async_logging_uses_queue(monkeypatch):
+    """Con LOG_ASYNC el logger sólo tiene un QueueHandler hacia el listener."""
+    monkeypatch.setattr(Config, 'LOG_ASYNC', True)
+    monkeypatch.setattr(Config, 'LOG_SAMPLING', 'ruido=2')
+    logger = setup_logging('test.async_logging')
+    try:
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+        assert logconfig._listener is not None
+        assert any(isinstance(f, SamplingFilter) for f in logger.filters)
+    finally:
+        logger.handlers.clear()
+        logger.filters.clear()
@@ -0,0 +1,41 @@
+"""
+Tests del buscador de palabras clave (Aho-Corasick).
+"""
+import random
+
+from chatbot_logic.matcher import KeywordMatcher
+from chatbot_logic.processor import _match
+from chatbot_logic.responses import RESPONSES
+
+
+def test_longest_match_wins():
+    """La clave más específica gana sin importar el orden del dict."""
+    matcher = KeywordMatcher(['buenas', 'turno', 'reservar', 'buenas noches', 'quiero reservar'])
+    assert matcher.find('buenas noches') == 'buenas noches'
+    assert matcher.find('hola quiero reservar un turno') == 'quiero reservar'
+    assert matcher.find('nada que ver') is None
+
+
+def test_tie_breaks_by_position():
+    """A igual largo gana la que aparece primero en el mensaje."""
+    matcher = KeywordMatcher(['tinte', 'corte'])
+    assert matcher.find('corte y tinte') == 'corte'
+    assert matcher.find('tinte y corte') == 'tinte'
+
+
+def test_find_all_matches_brute_force():
+    """find_all encuentra lo mismo que una búsqueda por fuerza bruta."""
+    rng = random.Random(7)
+    alphabet = 'abc '
+    keywords = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)}
+    matcher = KeywordMatcher(keywords)
+    for _ in range(50):
+        text = ''.join(rng.choice(alphabet) for _ in range(30))
+        expected = sorted((i, k) for k in matcher.keywords for i in range(len(text)) if text.startswith(k, i))
+        assert sorted(matcher.find_all(text)) == expected
+
+
+def test_processor_uses_specific_keywords():
+    """process_message ya no queda tapado por claves más cortas."""
+    assert _match('buenas noches') == RESPONSES['buenas noches']
+    assert _match('quiero reservar') == RESPONSES['quiero reservar']
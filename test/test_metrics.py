@@ -0,0 +1,57 @@
+"""
+Tests de las métricas por ruta y del endpoint /metrics.
+"""
+import threading
+
+from api.metrics import MetricsRegistry
+
+
+def test_registry_histogram_buckets():
+    """Cada observación cae en su bucket y los buckets son acumulativos."""
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.5):
+        registry.request_started()
+        registry.observe('/r', 'GET', 200, seconds)
+
+    text = registry.render()
+    assert 'chatbot_http_request_duration_seconds_bucket{route="/r",method="GET",le="0.01"} 1' in text
+    assert 'chatbot_http_request_duration_seconds_bucket{route="/r",method="GET",le="0.1"} 2' in text
+    assert 'chatbot_http_request_duration_seconds_bucket{route="/r",method="GET",le="+Inf"} 3' in text
+    assert 'chatbot_http_request_duration_seconds_count{route="/r",method="GET"} 3' in text
+    assert 'chatbot_http_requests_total{route="/r",method="GET",status="200"} 3' in text
+    assert 'chatbot_http_requests_in_flight 0' in text
+
+
+def test_registry_retires_dead_thread_shards():
+    """Los shards de hilos terminados se pliegan sin perder conteos."""
+    registry = MetricsRegistry(buckets=(1.0,), max_shards=2)
+
+    def work():
+        registry.request_started()
+        registry.observe('/r', 'POST', 201, 0.1)
+
+    for _ in range(5):
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+
+    assert len(registry._shards) <= 2
+    assert 'chatbot_http_requests_total{route="/r",method="POST",status="201"} 5' in registry.render()
+    assert registry._shards == []
+
+
+def test_metrics_endpoint(client):
+    """GET /metrics expone latencias por ruta y métricas de pool y cache."""
+    client.get('/chat/turnos')
+    client.get('/chat/no-existe')
+
+    resp = client.get('/metrics')
+    assert resp.status_code == 200
+    assert resp.content_type.startswith('text/plain; version=0.0.4')
+    text = resp.get_data(as_text=True)
+    assert 'chatbot_http_request_duration_seconds_bucket{route="/chat/turnos",method="GET",le="+Inf"}' in text
+    assert 'chatbot_http_requests_total{route="/chat/turnos",method="GET",status="200"}' in text
+    assert 'route="unmatched",method="GET",status="404"' in text
+    assert '# TYPE chatbot_cache_hit_ratio gauge' in text
+    assert '# TYPE chatbot_db_pool_checked_out gauge' in text
+    assert 'chatbot_sse_subscribers ' in text
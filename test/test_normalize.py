@@ -0,0 +1,39 @@
+"""
+Tests de la normalización de mensajes (chatbot_logic.normalize).
+"""
+from chatbot_logic import process_message
+from chatbot_logic.normalize import normalize
+from chatbot_logic.processor import reload_responses
+from chatbot_logic.responses import RESPONSES
+
+
+def test_normalize_strips_accents_and_punctuation():
+    """Tildes, signos, emojis y espacios de más no cambian el mensaje."""
+    assert normalize('¿Cómo estás?') == 'como estas'
+    assert normalize('ADIÓS!!') == 'adios'
+    assert normalize('  hola,¿qué   tal?  ') == 'hola que tal'
+    assert normalize('Buenos días 😊') == 'buenos dias'
+    assert normalize('“turnos”…para el 12/10') == 'turnos para el'
+    assert normalize('pingüino straße') == 'pinguino strasse'
+
+
+def test_normalize_keeps_enie():
+    """La ñ es una letra aparte: "año" no es "ano"."""
+    assert normalize('Año MAÑANA') == 'año mañana'
+
+
+def test_accented_messages_match_keys():
+    """Mensajes con tildes encuentran las claves escritas sin tildes."""
+    assert process_message('¿Cómo estás?') == RESPONSES['como estas']
+    assert process_message('Adiós') == RESPONSES['adios']
+    assert process_message('¿Cuánto cuesta?') == RESPONSES['cuanto cuesta']
+
+
+def test_keys_are_normalized_at_build_time():
+    """Una clave escrita con tildes matchea mensajes escritos sin ellas."""
+    original = dict(RESPONSES)
+    try:
+        reload_responses({'Peluquería': 'Somos una peluquería'})
+        assert process_message('la peluqueria abre?') == 'Somos una peluquería'
+    finally:
+        reload_responses(original)
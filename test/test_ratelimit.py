@@ -0,0 +1,103 @@
+"""
+Tests de limitación de tasa y control de admisión.
+"""
+import threading
+
+from api import ratelimit
+from api.ratelimit import AdmissionController, RateLimiter, TokenBucket, client_key, get_limiter
+
+
+def test_token_bucket_refill():
+    """El bucket admite la ráfaga y luego se recarga a la tasa configurada."""
+    bucket = TokenBucket(rate=2, capacity=2)
+    now = bucket.updated
+    assert bucket.acquire(now) == 0
+    assert bucket.acquire(now) == 0
+    assert bucket.acquire(now) == 0.5
+    assert bucket.acquire(now + 0.5) == 0
+
+
+def test_rate_limiter_per_client_and_prune():
+    """Cada cliente tiene su propio bucket; los inactivos se descartan."""
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    assert limiter.check('a') == 0
+    assert limiter.check('a') > 0
+    assert limiter.check('b') == 0
+    assert limiter.rejected == 1
+    
+    limiter._buckets['b'].tokens = 1
+    limiter.check('c')
+    assert 'b' not in limiter._buckets
+
+
+def test_rate_limiter_bounded_with_active_clients():
+    """Con todos los buckets en uso se descartan los más antiguos."""
+    limiter = RateLimiter(rate=0.001, burst=1, max_keys=100)
+    for i in range(1000):
+        limiter.check(f'ip:{i}')
+        assert len(limiter._buckets) <= 100
+    assert 'ip:999' in limiter._buckets
+    assert 'ip:0' not in limiter._buckets
+
+
+def test_rate_limiter_prune_under_concurrent_checks():
+    """Descartar buckets mientras otros hilos agregan claves no falla."""
+    limiter = RateLimiter(rate=0.001, burst=1, max_keys=20000)
+    errors = []
+
+    def flood(worker):
+        try:
+            for i in range(30000):
+                limiter.check(f'ip:{worker}.{i}')
+        except Exception as e:  # noqa: BLE001 - se reporta en el assert
+            errors.append(e)
+
+    threads = [threading.Thread(target=flood, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(limiter._buckets) <= 20000
+
+
+def test_client_key_per_address_with_token():
+    """El token compartido no junta a todos los clientes en un bucket."""
+    token = ratelimit.Config.API_TOKEN
+    assert client_key(token, '10.0.0.1') != client_key(token, '10.0.0.2')
+    assert client_key(token, '10.0.0.1') != client_key(None, '10.0.0.1')
+    assert client_key('otro', '10.0.0.1') == client_key(None, '10.0.0.1')
+
+
+def test_admission_controller():
+    """Sin lugares libres try_enter rechaza de inmediato."""
+    admission = AdmissionController(max_inflight=1)
+    assert admission.try_enter()
+    assert not admission.try_enter()
+    admission.leave()
+    assert admission.try_enter()
+    assert admission.rejected == 1
+
+
+def test_route_rate_limited(client):
+    """Un cliente que agota su bucket recibe 429 con Retry-After."""
+    limiter = get_limiter('turnos')
+    limiter._buckets.clear()
+    limiter.burst, limiter.rate = 1, 0.5
+    try:
+        assert client.get('/chat/turnos').status_code == 200
+        res = client.get('/chat/turnos')
+        assert res.status_code == 429
+        assert res.headers['Retry-After'] == '2'
+    finally:
+        limiter.rate, limiter.burst = ratelimit.Config.RATE_LIMITS['turnos']
+
+
+def test_route_shed_when_db_saturated(client, monkeypatch):
+    """Con la BD saturada las rutas responden 503 sin encolar."""
+    monkeypatch.setattr(ratelimit, 'db_admission', AdmissionController(max_inflight=1))
+    ratelimit.db_admission.try_enter()
+    
+    res = client.get('/chat/turnos/resumen')
+    assert res.status_code == 503
+    assert res.headers['Retry-After'] == '1'
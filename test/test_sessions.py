@@ -0,0 +1,143 @@
+"""
+Tests del store de sesiones y del diálogo de reserva por chat.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from chatbot_logic import process_message
+from api import TimeSlot
+from chatbot_logic.booking import (ABORTED, ASK_DATE, ASK_NAME, ASK_SERVICE, PAST_DATE, BookingDialog, booking_dialog,
+                                  sessions)
+from chatbot_logic.sessions import SessionStore
+from services import ReservationService
+
+MEMORY_DB = 'sqlite:///:memory:'
+
+
+@pytest.fixture
+def dialog():
+    """Diálogo con un store propio sobre una BD en memoria."""
+    return BookingDialog(SessionStore(max_sessions=10, ttl=60), ReservationService(MEMORY_DB))
+
+
+def test_store_lru_eviction():
+    """Lleno, el store descarta la conversación usada hace más tiempo."""
+    store = SessionStore(max_sessions=2, ttl=60)
+    store.create('a')
+    store.create('b')
+    assert store.get('a') is not None   # 'b' pasa a ser la menos usada
+    store.create('c')
+
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+    assert store.stats() == {'active': 2, 'created': 3, 'expired': 0, 'evicted': 1}
+
+
+def test_store_ttl_expiration(monkeypatch):
+    """Las sesiones inactivas expiran al leerlas o al crear otras."""
+    now = [1000.0]
+    monkeypatch.setattr('chatbot_logic.sessions.time.monotonic', lambda: now[0])
+    store = SessionStore(max_sessions=10, ttl=5)
+    store.create('a')
+    store.create('b')
+    now[0] += 3
+    assert store.get('b') is not None
+    now[0] += 3
+
+    assert store.get('a') is None       # expira al leerla
+    store.create('c')                   # 'b' sigue vigente
+    assert len(store) == 2
+    now[0] += 6
+    store.create('d')                   # barre 'b' y 'c'
+    assert len(store) == 1
+    assert store.stats()['expired'] == 3
+    assert store.stats()['evicted'] == 0
+
+
+def test_dialog_books_slot(dialog):
+    """Servicio, turno y nombre: la reserva queda hecha y la sesión termina."""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    first = next(s for s in dialog.service.list_available() if s['datetime'] >= now)
+
+    assert dialog.handle('c1', 'Quiero reservar un turno') == ASK_SERVICE
+    reply = dialog.handle('c1', 'corte')
+    assert f"1) {first['datetime']}" in reply
+    # No se ofrecen turnos de hoy que ya pasaron
+    assert all(value >= now for value in dialog.store.get('c1').offered[1::2])
+    assert dialog.handle('c1', 'la 1 por favor') == ASK_NAME
+    reply = dialog.handle('c1', 'Ana')
+
+    assert 'Ana' in reply and first['datetime'] in reply
+    assert dialog.store.get('c1') is None
+    booked = dialog.service.manager.find_slot(first['id'])
+    assert (booked['customer'], booked['service']) == ('Ana', 'Corte')
+
+
+def test_dialog_service_in_first_message_and_abort(dialog):
+    """El servicio del primer mensaje se usa directo; "salir" abandona."""
+    reply = dialog.handle('c2', 'quiero un turno para barba')
+    assert reply.startswith('Estos son los próximos turnos para Barba')
+    assert 'Respondé con un número' in dialog.handle('c2', 'cualquiera')
+    assert dialog.handle('c2', 'Salir') == ABORTED
+    assert dialog.store.get('c2') is None
+
+
+def test_dialog_time_follow_up_is_not_an_option(dialog):
+    """"¿y a las 3?" busca ese horario en lugar de elegir la opción 3."""
+    dialog.handle('c4', 'quiero reservar un corte')
+    reply = dialog.handle('c4', '¿y a las 3?')
+    assert reply.startswith('Estos son los turnos para Corte a las 15:00')
+    session = dialog.store.get('c4')
+    assert session.state == 'slot'
+    assert all(value.endswith(' 15:00') for value in session.offered[1::2])
+    assert dialog.handle('c4', 'Opción 1') == ASK_NAME
+
+
+def test_dialog_past_date_is_not_offered(dialog):
+    """Un día que ya pasó se contesta como tal aunque queden turnos libres en la base."""
+    past = (date.today() - timedelta(days=30)).isoformat()
+    manager = dialog.service.manager
+    session = manager.SessionLocal()
+    slot = TimeSlot(datetime_str=f'{past} 10:00', service='General', customer=None)
+    session.add(slot)
+    session.commit()
+    try:
+        assert dialog._upcoming(past, past) == []
+        assert dialog.handle('c5', f'¿hay turnos el {past}?') == f"{PAST_DATE} ¿Probamos otro día?"
+
+        reply = dialog.handle('c6', f'quiero reservar un corte el {past}')
+        assert reply == f"{PAST_DATE} {ASK_DATE}"
+        assert dialog.store.get('c6').state == 'date'
+    finally:
+        session.delete(slot)
+        session.commit()
+        session.close()
+
+
+def test_dialog_without_booking_intent_keeps_no_state(dialog):
+    """Fuera de una reserva responde como process_message y no crea sesión."""
+    assert dialog.handle('c3', 'hola') == process_message('hola')
+    assert len(dialog.store) == 0
+
+
+def test_chat_route_with_conversation_id(client, monkeypatch):
+    """POST /chat/ con conversation_id sigue el diálogo entre requests."""
+    monkeypatch.setattr(booking_dialog, 'service', ReservationService(MEMORY_DB))
+    sessions.clear()
+
+    def say(message):
+        res = client.post('/chat/', json={'message': message, 'conversation_id': 'web-1'})
+        assert res.status_code == 200
+        assert res.get_json()['conversation_id'] == 'web-1'
+        return res.get_json()['response']
+
+    assert say('quiero reservar') == ASK_SERVICE
+    assert say('Peinado').startswith('Estos son los próximos turnos para Peinado')
+    assert say('2') == ASK_NAME
+    assert say('Juan').startswith('¡Listo!')
+    assert 'web-1' not in sessions._sessions
+
+    res = client.post('/chat/', json={'message': 'hola', 'conversation_id': 'x' * 65})
+    assert res.status_code == 400
+    assert 'error' in res.get_json()
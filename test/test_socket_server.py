@@ -0,0 +1,397 @@
+"""
+Tests de los servidores TCP (protocolo de texto, socket_srv).
+"""
+import asyncio
+import queue
+import socket
+import threading
+import time
+
+import pytest
+
+from common import Config
+from services import ReservationService
+from socket_srv.async_server import AsyncSocketServer
+from socket_srv.protocol import (END_LINE, HELP_TEXT, INVALID_UTF8_REPLY, LINE_TOO_LONG_REPLY, WELCOME, LineReader,
+                                 LineTooLong)
+from socket_srv.server import BUSY_REPLY, TIMEOUT_REPLY, ClientPool, handle_client
+
+
+@pytest.fixture
+def db_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'socket.db'}"
+
+
+async def _open(server):
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    assert (await reader.readline()).decode('utf-8') == WELCOME
+    return reader, writer
+
+
+async def _command(reader, writer, cmd, lines=1):
+    writer.write(f'{cmd}\n'.encode('utf-8'))
+    return [(await reader.readline()).decode('utf-8') for _ in range(lines)]
+
+
+def test_async_server_commands(db_uri):
+    """El servidor asyncio responde el mismo protocolo que el multihilo."""
+    tasks = queue.Queue()
+    slots = ReservationService(db_uri).list_available()
+    assert slots
+
+    async def scenario():
+        server = AsyncSocketServer(tasks, db_uri=db_uri, max_workers=2)
+        await server.start('127.0.0.1', 0)
+        try:
+            reader, writer = await _open(server)
+            listing = await _command(reader, writer, 'LIST', len(slots))
+            assert listing[0].startswith(f"[{slots[0]['id']}]")
+            slot_id = slots[0]['id']
+            ok, = await _command(reader, writer, f'BOOK {slot_id}|Ana|Corte')
+            assert ok == f'✓ Reserva exitosa: slot {slot_id} para Ana\n'
+            taken, = await _command(reader, writer, f'BOOK {slot_id}|Beto|Barba')
+            assert taken.startswith('✗')
+            queued, = await _command(reader, writer, f'CANCEL_ID {slot_id}')
+            assert queued == 'Cancelación encolada por ID.\n'
+            unknown, = await _command(reader, writer, 'BAILAR')
+            assert unknown == 'Comando no reconocido.\n'
+            help_text = await _command(reader, writer, 'help', HELP_TEXT.count('\n'))
+            assert ''.join(help_text) == HELP_TEXT
+            # Comandos en un mismo paquete
+            writer.write(b'CANCEL_NAME Ana\nQUIT\n')
+            assert await reader.read() == 'Cancelación encolada por nombre.\nAdiós\n'.encode('utf-8')
+            writer.close()
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+    assert tasks.get_nowait() == {'action': 'cancel_id', 'slot_id': slots[0]['id']}
+    assert tasks.get_nowait() == {'action': 'cancel_name', 'name': 'Ana'}
+
+
+def test_async_server_idle_connections_without_threads(db_uri):
+    """Cientos de clientes ociosos no crean hilos; la base usa un pool acotado."""
+    threads_before = threading.active_count()
+
+    async def scenario():
+        server = AsyncSocketServer(queue.Queue(), db_uri=db_uri, max_workers=2)
+        await server.start('127.0.0.1', 0)
+        try:
+            clients = await asyncio.gather(*(_open(server) for _ in range(300)))
+            await asyncio.sleep(0.05)
+            assert server.connections == 300
+            replies = await asyncio.gather(*(_command(r, w, 'LIST 1999-01-01') for r, w in clients[:20]))
+            assert all(reply == ['No hay turnos disponibles.\n'] for reply in replies)
+            assert threading.active_count() <= threads_before + 2
+            for _, writer in clients:
+                writer.close()
+            for _ in range(50):
+                if server.connections == 0:
+                    break
+                await asyncio.sleep(0.02)
+            assert server.connections == 0
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_threaded_handle_client_uses_protocol():
+    """El servidor multihilo sigue respondiendo igual tras compartir el protocolo."""
+    server_side, client_side = socket.socketpair()
+    tasks = queue.Queue()
+    thread = threading.Thread(target=handle_client, args=(server_side, ('test', 0), tasks))
+    thread.start()
+    with client_side:
+        client_side.settimeout(5)
+        reader = client_side.makefile('r', encoding='utf-8')
+        assert reader.readline() == WELCOME
+        client_side.sendall(b'BOOK sin-formato\n')
+        assert reader.readline().startswith('Formato inválido BOOK')
+        client_side.sendall(b'CANCEL_ID 7\n')
+        assert reader.readline() == 'Cancelación encolada por ID.\n'
+        client_side.sendall(b'QUIT\n')
+        assert reader.readline() == 'Adiós\n'
+        assert reader.readline() == ''
+    thread.join(timeout=5)
+    assert tasks.get_nowait() == {'action': 'cancel_id', 'slot_id': 7}
+
+
+def _serve(**kwargs):
+    """handle_client sobre un socketpair en un hilo; devuelve (socket cliente, lector, hilo)."""
+    server_side, client_side = socket.socketpair()
+    thread = threading.Thread(target=handle_client, args=(server_side, ('test', 0), queue.Queue()), kwargs=kwargs)
+    thread.start()
+    client_side.settimeout(5)
+    reader = client_side.makefile('r', encoding='utf-8')
+    assert reader.readline() == WELCOME
+    return client_side, reader, thread
+
+
+def test_idle_timeout_closes_connection():
+    client_side, reader, thread = _serve(idle_timeout=0.2)
+    with client_side:
+        start = time.monotonic()
+        assert reader.readline() == TIMEOUT_REPLY
+        assert reader.readline() == ''
+        assert time.monotonic() - start < 2
+    thread.join(timeout=5)
+
+
+def test_read_timeout_stops_slow_lines():
+    """Un cliente que manda una línea de a un byte no renueva el plazo."""
+    client_side, reader, thread = _serve(idle_timeout=30, read_timeout=0.3)
+    with client_side:
+        start = time.monotonic()
+        try:
+            for byte in b'LIST':
+                client_side.sendall(bytes([byte]))
+                time.sleep(0.1)
+        except OSError:
+            pass  # el servidor ya cortó (máquina cargada)
+        assert reader.readline() == TIMEOUT_REPLY
+        assert time.monotonic() - start < 1.5
+    thread.join(timeout=5)
+
+
+def test_client_pool_rejects_when_full():
+    """Con 1 cliente atendido y 1 en espera, el tercero recibe "ocupado" al instante."""
+    release = threading.Event()
+    handled = []
+
+    def handler(conn, addr):
+        with conn:
+            conn.sendall(WELCOME.encode('utf-8'))
+            release.wait(5)
+        handled.append(addr)
+
+    pool = ClientPool(handler, max_clients=1, max_queued=1)
+    pairs = [socket.socketpair() for _ in range(3)]
+    try:
+        assert pool.submit(pairs[0][0], ('a', 1))
+        assert pool.submit(pairs[1][0], ('b', 2))
+        start = time.monotonic()
+        assert not pool.submit(pairs[2][0], ('c', 3))
+        assert time.monotonic() - start < 0.5
+        rejected = pairs[2][1].makefile('r', encoding='utf-8')
+        assert rejected.readline() == BUSY_REPLY
+        assert rejected.readline() == ''
+        pairs[0][1].recv(100)
+        assert pool.stats() == {'activas': 1, 'en_espera': 1, 'rechazadas': 1, 'atendidas': 0, 'max_clientes': 1}
+        release.set()
+        for _ in range(100):
+            if pool.stats()['atendidas'] == 2:
+                break
+            time.sleep(0.02)
+        assert sorted(handled) == [('a', 1), ('b', 2)]
+        assert pool.stats()['activas'] == pool.stats()['en_espera'] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+        for a, b in pairs:
+            a.close()
+            b.close()
+
+
+def test_stats_command():
+    client_side, reader, thread = _serve(stats=lambda: {'activas': 3, 'en_espera': 0, 'rechazadas': 7})
+    with client_side:
+        client_side.sendall(b'STATS\n')
+        assert reader.readline() == 'activas=3 en_espera=0 rechazadas=7\n'
+        client_side.sendall(b'QUIT\n')
+        assert reader.readline() == 'Adiós\n'
+    thread.join(timeout=5)
+
+
+def test_line_reader_drains_all_lines():
+    reader = LineReader(max_line=64)
+    assert reader.feed(b'LIST\nHELP\r\nST') == [b'LIST', b'HELP\r']
+    assert reader.pending
+    assert reader.feed(b'ATS\n\n') == [b'STATS', b'']
+    assert not reader.pending
+
+
+def test_line_reader_keeps_split_utf8():
+    """Un carácter multibyte partido entre dos recv se decodifica entero."""
+    data = 'CANCEL_NAME José\n'.encode('utf-8')
+    cut = data.index(b'\xc3') + 1
+    reader = LineReader()
+    assert reader.feed(data[:cut]) == []
+    assert [line.decode('utf-8') for line in reader.feed(data[cut:])] == ['CANCEL_NAME José']
+
+
+def test_line_reader_max_line():
+    reader = LineReader(max_line=8)
+    assert reader.feed(b'12345678\n') == [b'12345678']
+    with pytest.raises(LineTooLong):
+        reader.feed(b'123456789')
+    with pytest.raises(LineTooLong):
+        LineReader(max_line=8).feed(b'OK\n123456789\n')
+
+
+def test_threaded_pipelined_commands():
+    """Comandos encadenados en un solo envío se responden todos, en orden."""
+    client_side, reader, thread = _serve()
+    with client_side:
+        client_side.sendall(b'CANCEL_ID 1\nCANCEL_ID 2\n\xff\xfe\nBAILAR\nQUIT\n')
+        assert [reader.readline() for _ in range(5)] == [
+            'Cancelación encolada por ID.\n', 'Cancelación encolada por ID.\n', INVALID_UTF8_REPLY,
+            'Comando no reconocido.\n', 'Adiós\n',
+        ]
+    thread.join(timeout=5)
+
+
+def test_threaded_line_too_long():
+    client_side, reader, thread = _serve(max_line=16)
+    with client_side:
+        client_side.sendall(b'CANCEL_NAME ' + b'x' * 32)
+        assert reader.readline() == LINE_TOO_LONG_REPLY
+        assert reader.readline() == ''
+    thread.join(timeout=5)
+
+
+def test_async_line_too_long(db_uri, monkeypatch):
+    monkeypatch.setattr(Config, 'SOCKET_MAX_LINE', 16)
+
+    async def scenario():
+        server = AsyncSocketServer(queue.Queue(), db_uri=db_uri)
+        await server.start('127.0.0.1', 0)
+        try:
+            reader, writer = await _open(server)
+            writer.write(b'\xff\nCANCEL_NAME ' + b'x' * 64 + b'\n')
+            assert await reader.read() == (INVALID_UTF8_REPLY + LINE_TOO_LONG_REPLY).encode('utf-8')
+            writer.close()
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+class _CountingSocket:
+    """Socket que cuenta los sendall (un envío por llamada)."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self.sends = []
+
+    def sendall(self, data):
+        self.sends.append(data)
+        return self._sock.sendall(data)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._sock.close()
+
+
+def test_threaded_replies_sent_once_per_read():
+    """Las respuestas de los comandos de un mismo recv salen en un solo sendall."""
+    server_side, client_side = socket.socketpair()
+    counting = _CountingSocket(server_side)
+    thread = threading.Thread(target=handle_client, args=(counting, ('test', 0), queue.Queue()),
+                              kwargs={'stats': lambda: {'activas': 1}})
+    thread.start()
+    with client_side:
+        client_side.settimeout(5)
+        reader = client_side.makefile('r', encoding='utf-8')
+        assert reader.readline() == WELCOME
+        client_side.sendall(b'CANCEL_ID 1\nSTATS\nHELP\nQUIT\n')
+        assert reader.read() == 'Cancelación encolada por ID.\nactivas=1\n' + HELP_TEXT + 'Adiós\n'
+    thread.join(timeout=5)
+    assert len(counting.sends) == 2  # bienvenida + las cuatro respuestas
+
+
+def test_proto2_ends_every_response():
+    client_side, reader, thread = _serve(stats=lambda: {'activas': 1})
+    with client_side:
+        client_side.sendall(b'PROTO 2\nSTATS\nBAILAR\n\xff\n')
+        assert [reader.readline() for _ in range(8)] == [
+            'PROTO 2\n', END_LINE, 'activas=1\n', END_LINE, 'Comando no reconocido.\n', END_LINE,
+            INVALID_UTF8_REPLY, END_LINE,
+        ]
+        client_side.sendall(b'PROTO 9\n')
+        assert reader.readline().startswith('Versión de protocolo no soportada')
+        assert reader.readline() == END_LINE
+        client_side.sendall(b'PROTO 1\nBAILAR\nQUIT\n')
+        assert reader.read() == 'PROTO 1\nComando no reconocido.\nAdiós\n'
+    thread.join(timeout=5)
+
+
+def test_proto2_frames_idle_timeout():
+    """El aviso de cierre por inactividad también termina en END."""
+    client_side, reader, thread = _serve(idle_timeout=0.3)
+    with client_side:
+        client_side.sendall(b'PROTO 2\n')
+        assert [reader.readline() for _ in range(2)] == ['PROTO 2\n', END_LINE]
+        assert reader.readline() == TIMEOUT_REPLY
+        assert reader.readline() == END_LINE
+        assert reader.readline() == ''
+    thread.join(timeout=5)
+
+
+def test_async_proto2_list(db_uri):
+    slots = ReservationService(db_uri).list_available()
+
+    async def scenario():
+        server = AsyncSocketServer(queue.Queue(), db_uri=db_uri)
+        await server.start('127.0.0.1', 0)
+        try:
+            reader, writer = await _open(server)
+            assert await _command(reader, writer, 'PROTO 2', 2) == ['PROTO 2\n', END_LINE]
+            listing = await _command(reader, writer, 'LIST', len(slots) + 1)
+            assert listing[-1] == END_LINE and len(listing[:-1]) == len(slots)
+            writer.write(b'QUIT\n')
+            assert await reader.read() == ('Adiós\n' + END_LINE).encode('utf-8')
+            writer.close()
+        finally:
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_cli_client_reads_one_framed_response():
+    """run_chatbot negocia PROTO 2 y no espera el timeout de silencio."""
+    import run_chatbot
+
+    server_side, client_side = socket.socketpair()
+    thread = threading.Thread(target=handle_client, args=(server_side, ('test', 0), queue.Queue()))
+    thread.start()
+    with client_side:
+        client_side.settimeout(5)
+        assert run_chatbot.recv_line(client_side) == WELCOME
+        assert run_chatbot.negotiate_protocol(client_side)
+        start = time.monotonic()
+        assert run_chatbot.send_command(client_side, 'HELP', framed=True) == HELP_TEXT
+        assert run_chatbot.send_command(client_side, 'CANCEL_ID 3', framed=True) == 'Cancelación encolada por ID.\n'
+        assert time.monotonic() - start < 0.2
+        assert run_chatbot.send_command(client_side, 'QUIT', framed=True) == 'Adiós\n'
+    thread.join(timeout=5)
+
+
+def test_cli_client_falls_back_without_proto2():
+    """Contra un servidor que no conoce PROTO, el cliente sigue con la lectura por silencio."""
+    import run_chatbot
+
+    server_side, client_side = socket.socketpair()
+
+    def old_server():
+        with server_side:
+            server_side.sendall(WELCOME.encode('utf-8'))
+            server_side.recv(100)
+            server_side.sendall(b'Comando no reconocido.\n')
+            server_side.recv(100)
+            server_side.sendall('Cancelación encolada por ID.\n'.encode('utf-8'))
+            server_side.recv(100)
+
+    thread = threading.Thread(target=old_server)
+    thread.start()
+    with client_side:
+        client_side.settimeout(5)
+        assert run_chatbot.recv_line(client_side) == WELCOME
+        assert not run_chatbot.negotiate_protocol(client_side)
+        assert run_chatbot.send_command(client_side, 'CANCEL_ID 3') == 'Cancelación encolada por ID.\n'
+    thread.join(timeout=5)
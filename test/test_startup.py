@@ -0,0 +1,60 @@
+"""
+Tests de tiempo de arranque de cada modo (import + inicialización).
+
+Cada modo corre en un subproceso limpio con `run_chatbot.py --startup-only`.
+Los presupuestos son holgados para no fallar en máquinas lentas; lo que
+importa es detectar que un modo liviano empiece a cargar Flask/SQLAlchemy.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Segundos de reloj por modo, incluido el arranque del intérprete
+BUDGETS = {
+    'socket-cli': 1.0,
+    'async-client': 1.5,
+    'server': 4.0,
+    'cli': 5.0,
+}
+
+
+def _run(*args):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return proc, time.perf_counter() - start
+
+
+def test_socket_cli_does_not_import_heavy_packages():
+    """El cliente por socket no carga Flask ni SQLAlchemy."""
+    proc, _ = _run('-c', 'import json, sys, run_chatbot; print(json.dumps(sorted(sys.modules)))')
+    modules = set(json.loads(proc.stdout))
+    assert not {'flask', 'sqlalchemy', 'flask_sqlalchemy'} & modules
+
+
+def test_processor_import_is_light():
+    """Importar el procesador no arrastra el gestor de turnos."""
+    proc, _ = _run('-c', 'import json, sys, chatbot_logic.processor; print(json.dumps(sorted(sys.modules)))')
+    modules = set(json.loads(proc.stdout))
+    assert 'sqlalchemy' not in modules
+    assert 'chatbot_logic.appointments' not in modules
+
+
+@pytest.mark.parametrize('mode', sorted(BUDGETS))
+def test_startup_budget(mode):
+    """Cada modo arranca dentro de su presupuesto."""
+    proc, elapsed = _run('run_chatbot.py', '--mode', mode, '--startup-only')
+    assert 'STARTUP_PHASES' in proc.stdout
+    assert elapsed < BUDGETS[mode], f"{mode} tardó {elapsed:.2f}s (presupuesto {BUDGETS[mode]}s)"
+
+
+def test_api_startup_budget():
+    """La API Flask se crea dentro de su presupuesto."""
+    _, elapsed = _run('-c', 'from app import create_app; create_app()')
+    assert elapsed < 5.0
@@ -4,8 +4,11 @@
 import socket
 import time
 
+RESPONSE_END = b"END\n"
+
+
 def recv_until_quiet(sock, timeout=0.5):
-    """Lee respuesta del socket hasta que no lleguen más bytes."""
+    """Lee respuesta del socket hasta que no lleguen más bytes (servidores sin PROTO 2)."""
     chunks = []
     previous_timeout = sock.gettimeout()
     sock.settimeout(timeout)
@@ -22,12 +25,38 @@ def recv_until_quiet(sock, timeout=0.5):
         sock.settimeout(previous_timeout)
     return b"".join(chunks).decode("utf-8", errors="replace")
 
+def recv_response(sock):
+    """Lee exactamente una respuesta del protocolo 2: hasta la línea END."""
+    data = bytearray()
+    while not (data.endswith(b"\n" + RESPONSE_END) or data == RESPONSE_END):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    if data.endswith(RESPONSE_END):
+        del data[-len(RESPONSE_END):]
+    return data.decode("utf-8", errors="replace")
+
+def recv_line(sock):
+    """Lee una línea (bienvenida y confirmación de PROTO)."""
+    data = bytearray()
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("utf-8", errors="replace")
+
+framed = False
+
 def send_cmd(sock, cmd, desc=""):
     """Envía comando y recibe respuesta."""
     print(f"\n>>> {cmd} {' (' + desc + ')' if desc else ''}")
+    start = time.perf_counter()
     sock.sendall((cmd.strip() + "\n").encode("utf-8"))
-    resp = recv_until_quiet(sock)
+    resp = recv_response(sock) if framed else recv_until_quiet(sock)
     print(f"<<< {resp.strip()}")
+    print(f"    ({(time.perf_counter() - start) * 1000:.1f} ms)")
     return resp
 
 try:
@@ -39,40 +68,40 @@ try:
     print("✓ Conectado al servidor\n")
     
     # Cargar bienvenida
-    welcome = recv_until_quiet(sock)
+    welcome = recv_line(sock)
     print(f"Servidor: {welcome.strip()}\n")
+
+    # Respuestas terminadas en END (sin esperar un timeout por comando)
+    sock.sendall(b"PROTO 2\n")
+    framed = recv_line(sock) == "PROTO 2\n" and recv_response(sock) == ""
+    print(f"Protocolo: {'2 (respuestas con END)' if framed else '1 (lectura por silencio)'}")
     
     # Listar turnos disponibles
     send_cmd(sock, "LIST", "Listar todos los turnos disponibles")
-    time.sleep(1)
     
     print("\n" + "="*60)
     print("PRUEBA 1: Reservar un turno disponible")
     print("="*60)
     # Reservar un turno específico que DEBERÍA estar disponible (slot 3)
     send_cmd(sock, "BOOK 3|Juan Pérez|Corte", "✓ Reservar slot 3 (debe funcionar)")
-    time.sleep(0.5)
     
     print("\n" + "="*60)
     print("PRUEBA 2: Intentar reservar el MISMO turno")
     print("="*60)
     # Intentar reservar el MISMO turno (debe fallar)
     send_cmd(sock, "BOOK 3|Carlos López|Tinte", "✗ Intentar reservar slot 3 nuevamente (debe FALLAR)")
-    time.sleep(0.5)
     
     print("\n" + "="*60)
     print("PRUEBA 3: Reservar un turno diferente")
     print("="*60)
     # Reservar un turno diferente (debe funcionar)
     send_cmd(sock, "BOOK 4|Maria García|Pedicure", "✓ Reservar slot 4 (debe funcionar)")
-    time.sleep(0.5)
     
     print("\n" + "="*60)
     print("PRUEBA 4: Listar turnos actualizado")
     print("="*60)
     # Listar de nuevo para ver cambios
     send_cmd(sock, "LIST", "Verificar que slots 3 y 4 no están en la lista")
-    time.sleep(0.5)
     
     # QUIT
     send_cmd(sock, "QUIT", "Cerrar conexión")
@@ -48,26 +48,26 @@ class TaskWorker:
             ok = svc.book(slot_id, name, service)
             
             if ok:
-                logger.info(f"✓ Reserva exitosa: slot={slot_id}, cliente={name}, servicio={service}")
+                logger.info("✓ Reserva exitosa: slot=%s, cliente=%s, servicio=%s", slot_id, name, service)
             else:
-                logger.warning(f"✗ Reserva fallida: slot={slot_id} (no disponible o no existe)")
+                logger.warning("✗ Reserva fallida: slot=%s (no disponible o no existe)", slot_id)
                 
         elif action == 'cancel_id':
             slot_id = task.get('slot_id')
             ok = svc.cancel_by_slot(slot_id)
             
             if ok:
-                logger.info(f"✓ Cancelación exitosa: slot={slot_id}")
+                logger.info("✓ Cancelación exitosa: slot=%s", slot_id)
             else:
-                logger.warning(f"✗ Cancelación fallida: slot={slot_id} (no encontrado)")
+                logger.warning("✗ Cancelación fallida: slot=%s (no encontrado)", slot_id)
                 
         elif action == 'cancel_name':
             name = task.get('name')
             n = svc.cancel_by_customer(name)
-            logger.info(f"✓ Cancelados {n} turnos del cliente: {name}")
+            logger.info("✓ Cancelados %s turnos del cliente: %s", n, name)
             
         else:
-            logger.error(f"Tarea con action desconocida: {task}")
+            logger.error("Tarea con action desconocida: %s", task)
 
     def run(self):
         """Loop principal del worker."""
@@ -80,12 +80,12 @@ class TaskWorker:
                 try:
                     # Esperar tarea con timeout
                     task = self.task_queue.get(timeout=1)
-                    logger.debug(f"Tarea recibida: {task}")
+                    logger.debug("Tarea recibida: %s", task)
                     
                     try:
                         self._process(task)
                     except Exception as e:
-                        logger.error(f"Error procesando tarea {task}: {e}", exc_info=True)
+                        logger.error("Error procesando tarea %s: %s", task, e, exc_info=True)
                         
                     # Pequeña pausa entre tareas
                     time.sleep(Config.WORKER_SLEEP_TIME)